@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import environ
 from datetime import timedelta
+from corsheaders.defaults import default_headers
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -76,6 +77,9 @@ MIDDLEWARE = [
 CORS_ALLOW_ALL_ORIGINS = env.bool("CORS_ALLOW_ALL_ORIGINS", default=False)
 CORS_ALLOW_CREDENTIALS = env.bool("CORS_ALLOW_CREDENTIALS", default=False)
 CORS_ALLOWED_ORIGINS = env.list("CORS_ALLOWED_ORIGINS", default=[])
+# 공정표 조건부 요청(ETag / If-Match / If-None-Match)
+CORS_ALLOW_HEADERS = (*default_headers, "if-match", "if-none-match")
+CORS_EXPOSE_HEADERS = ["ETag", "X-Operating-Rate-Status"]
 
 ROOT_URLCONF = "backend.urls"
 
@@ -159,6 +163,15 @@ STATIC_ROOT = '/var/www/static'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# 엑셀/보고서 출력 캐시 (입력 해시 키, 용량 초과 시 오래 쓰지 않은 파일부터 삭제)
+EXPORT_CACHE_DIR = MEDIA_ROOT / 'export_cache'
+EXPORT_CACHE_MAX_BYTES = env.int("EXPORT_CACHE_MAX_BYTES", default=512 * 1024 * 1024)
+
+# 비동기 출력 작업 (작업 스레드 수, 결과 파일 보관 시간)
+EXPORT_JOB_DIR = MEDIA_ROOT / 'export_jobs'
+EXPORT_JOB_WORKERS = env.int("EXPORT_JOB_WORKERS", default=2)
+EXPORT_JOB_TTL_SECONDS = env.int("EXPORT_JOB_TTL_SECONDS", default=60 * 60)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
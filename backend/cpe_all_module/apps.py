@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CpeAllModuleConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "cpe_all_module"
+
+    def ready(self):
+        # Import signals
+        import cpe_all_module.signals
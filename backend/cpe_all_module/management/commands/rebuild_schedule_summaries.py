@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from cpe_all_module.models import ConstructionScheduleItem
+from cpe_all_module.utils.schedule_summary import refresh_project_summary
+
+
+class Command(BaseCommand):
+    help = "Rebuild project schedule summaries (portfolio list) from stored schedules."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project-ids", default=None, help="Comma-separated project ids")
+
+    def handle(self, *args, **options):
+        containers = ConstructionScheduleItem.objects.order_by()
+        if options["project_ids"]:
+            project_ids = [s.strip() for s in options["project_ids"].split(",") if s.strip()]
+            containers = containers.filter(project_id__in=project_ids)
+
+        total = 0
+        for project_id in sorted(set(containers.values_list("project_id", flat=True)), key=str):
+            if refresh_project_summary(project_id) is not None:
+                total += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Summary rebuild finished. projects={total}"))
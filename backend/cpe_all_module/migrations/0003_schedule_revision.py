@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpe_all_module', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='constructionscheduleitem',
+            name='revision',
+            field=models.PositiveBigIntegerField(default=0, verbose_name='리비전'),
+        ),
+    ]
@@ -0,0 +1,186 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# 이 시점의 utils.schedule_rows 고정 사본 (이후 코드 변경과 무관하게 같은 행을 만든다)
+ACTIVITY_TEXT_FIELDS = (
+    ("main_category", 120), ("process", 120), ("sub_process", 120), ("work_type", 255),
+    ("standard_code", 100), ("operating_rate_type", 50), ("unit", 50),
+)
+ACTIVITY_NUMBER_FIELDS = ("quantity", "productivity", "crew_size", "working_days", "calendar_days")
+
+
+def _text(value, max_length):
+    if value is None:
+        return ""
+    return str(value)[:max_length]
+
+
+def _number(value):
+    if value in (None, ""):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number == number else None
+
+
+def _collections(raw_data):
+    if isinstance(raw_data, list):
+        return raw_data, [], []
+    if not isinstance(raw_data, dict):
+        return [], [], []
+    sub_tasks = raw_data.get("sub_tasks") or raw_data.get("subTasks") or []
+    return raw_data.get("items") or [], raw_data.get("links") or [], sub_tasks
+
+
+def _keyed(rows):
+    seen = set()
+    for position, row in enumerate(rows):
+        if not isinstance(row, dict):
+            continue
+        key = _text(row.get("id"), 100) or f"@{position}"
+        if key in seen:
+            key = f"{key}@{position}"[-100:]
+        seen.add(key)
+        yield key, position, row
+
+
+def _activity_values(position, item):
+    values = {"position": position, "payload": item}
+    for field, max_length in ACTIVITY_TEXT_FIELDS:
+        values[field] = _text(item.get(field), max_length)
+    for field in ACTIVITY_NUMBER_FIELDS:
+        values[field] = _number(item.get(field))
+    return values
+
+
+def _link_values(position, link):
+    return {
+        "position": position,
+        "payload": link,
+        "from_key": _text(link.get("from"), 100),
+        "to_key": _text(link.get("to"), 100),
+        "link_type": _text(link.get("type") or "FS", 2).upper(),
+        "lag": _number(link.get("lag")) or 0.0,
+    }
+
+
+def _sub_task_values(position, sub_task):
+    return {
+        "position": position,
+        "payload": sub_task,
+        "item_key": _text(sub_task.get("itemId"), 100),
+        "start_day": _number(sub_task.get("startDay")),
+        "duration_days": _number(sub_task.get("durationDays")),
+    }
+
+
+def backfill_schedule_rows(apps, schema_editor):
+    """기존 공정표 JSON → 정규화 행"""
+    ConstructionScheduleItem = apps.get_model("cpe_all_module", "ConstructionScheduleItem")
+    row_models = (
+        (apps.get_model("cpe_all_module", "ScheduleActivity"), "item_key", 0, _activity_values),
+        (apps.get_model("cpe_all_module", "ScheduleLink"), "link_key", 1, _link_values),
+        (apps.get_model("cpe_all_module", "ScheduleSubTask"), "sub_task_key", 2, _sub_task_values),
+    )
+    for container in ConstructionScheduleItem.objects.iterator(chunk_size=100):
+        collections = _collections(container.data)
+        for model, key_field, index, build_values in row_models:
+            model.objects.bulk_create(
+                [
+                    model(
+                        container_id=container.id,
+                        project_id=container.project_id,
+                        **{key_field: key},
+                        **build_values(position, row),
+                    )
+                    for key, position, row in _keyed(collections[index])
+                ],
+                batch_size=500,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpe_all_module', '0003_schedule_revision'),
+        ('cpe_module', '0005_operating_rate_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_key', models.CharField(max_length=100, verbose_name='항목 ID')),
+                ('position', models.PositiveIntegerField(default=0, verbose_name='순서')),
+                ('main_category', models.CharField(blank=True, default='', max_length=120, verbose_name='대공종')),
+                ('process', models.CharField(blank=True, default='', max_length=120, verbose_name='공정')),
+                ('sub_process', models.CharField(blank=True, default='', max_length=120, verbose_name='세부공정')),
+                ('work_type', models.CharField(blank=True, default='', max_length=255, verbose_name='작업')),
+                ('standard_code', models.CharField(blank=True, default='', max_length=100, verbose_name='표준코드')),
+                ('operating_rate_type', models.CharField(blank=True, default='', max_length=50, verbose_name='가동률 구분')),
+                ('unit', models.CharField(blank=True, default='', max_length=50, verbose_name='단위')),
+                ('quantity', models.FloatField(blank=True, null=True, verbose_name='수량')),
+                ('productivity', models.FloatField(blank=True, null=True, verbose_name='1일 작업량')),
+                ('crew_size', models.FloatField(blank=True, null=True, verbose_name='작업조')),
+                ('working_days', models.FloatField(blank=True, null=True, verbose_name='작업일수')),
+                ('calendar_days', models.FloatField(blank=True, null=True, verbose_name='공기(달력일)')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='원본 항목')),
+                ('container', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activities', to='cpe_all_module.constructionscheduleitem', verbose_name='공정표')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_activities', to='cpe_module.project', verbose_name='프로젝트')),
+            ],
+            options={
+                'verbose_name': '공정표 항목',
+                'verbose_name_plural': '공정표 항목 목록',
+                'ordering': ['container', 'position'],
+                'indexes': [models.Index(fields=['container', 'item_key'], name='sched_act_container_key'), models.Index(fields=['project', 'main_category'], name='sched_act_project_cat'), models.Index(fields=['main_category', 'process'], name='sched_act_cat_process'), models.Index(fields=['standard_code'], name='sched_act_standard_code')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ScheduleLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('link_key', models.CharField(max_length=100, verbose_name='연결 ID')),
+                ('position', models.PositiveIntegerField(default=0, verbose_name='순서')),
+                ('from_key', models.CharField(blank=True, default='', max_length=100, verbose_name='선행 항목 ID')),
+                ('to_key', models.CharField(blank=True, default='', max_length=100, verbose_name='후행 항목 ID')),
+                ('link_type', models.CharField(default='FS', max_length=2, verbose_name='연결 유형')),
+                ('lag', models.FloatField(default=0.0, verbose_name='지연일')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='원본 연결')),
+                ('container', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='link_rows', to='cpe_all_module.constructionscheduleitem', verbose_name='공정표')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_links', to='cpe_module.project', verbose_name='프로젝트')),
+            ],
+            options={
+                'verbose_name': '공정표 연결',
+                'verbose_name_plural': '공정표 연결 목록',
+                'ordering': ['container', 'position'],
+                'indexes': [models.Index(fields=['container', 'link_key'], name='sched_link_container_key'), models.Index(fields=['container', 'from_key'], name='sched_link_from'), models.Index(fields=['container', 'to_key'], name='sched_link_to')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ScheduleSubTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sub_task_key', models.CharField(max_length=100, verbose_name='세부작업 ID')),
+                ('position', models.PositiveIntegerField(default=0, verbose_name='순서')),
+                ('item_key', models.CharField(blank=True, default='', max_length=100, verbose_name='상위 항목 ID')),
+                ('start_day', models.FloatField(blank=True, null=True, verbose_name='시작일')),
+                ('duration_days', models.FloatField(blank=True, null=True, verbose_name='기간')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='원본 세부작업')),
+                ('container', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sub_task_rows', to='cpe_all_module.constructionscheduleitem', verbose_name='공정표')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_sub_tasks', to='cpe_module.project', verbose_name='프로젝트')),
+            ],
+            options={
+                'verbose_name': '공정표 세부작업',
+                'verbose_name_plural': '공정표 세부작업 목록',
+                'ordering': ['container', 'position'],
+                'indexes': [models.Index(fields=['container', 'sub_task_key'], name='sched_sub_container_key'), models.Index(fields=['container', 'item_key'], name='sched_sub_item')],
+            },
+        ),
+        migrations.RunPython(backfill_schedule_rows, migrations.RunPython.noop),
+    ]
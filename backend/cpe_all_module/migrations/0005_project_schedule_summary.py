@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpe_all_module', '0004_schedule_rows'),
+        ('cpe_module', '0005_operating_rate_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectScheduleSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('revision', models.PositiveBigIntegerField(default=0, verbose_name='공정표 리비전')),
+                ('total_days', models.FloatField(default=0.0, verbose_name='총 공기(달력일)')),
+                ('critical_path_days', models.FloatField(default=0.0, verbose_name='주공정 일수')),
+                ('finish_date', models.DateField(blank=True, null=True, verbose_name='준공 예정일')),
+                ('item_count', models.PositiveIntegerField(default=0, verbose_name='항목 수')),
+                ('category_days', models.JSONField(blank=True, default=dict, verbose_name='대공종별 공기')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='갱신일')),
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_summary', to='cpe_module.project', verbose_name='프로젝트')),
+            ],
+            options={
+                'verbose_name': '공정표 요약',
+                'verbose_name_plural': '공정표 요약 목록',
+            },
+        ),
+    ]
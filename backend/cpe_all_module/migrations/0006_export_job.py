@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:25
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpe_all_module', '0005_project_schedule_summary'),
+        ('cpe_module', '0005_operating_rate_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('excel', '엑셀'), ('report', '보고서')], max_length=10, verbose_name='출력 종류')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '생성 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=10, verbose_name='상태')),
+                ('progress', models.PositiveSmallIntegerField(default=0, verbose_name='진행률')),
+                ('stage', models.CharField(blank=True, default='', max_length=30, verbose_name='단계')),
+                ('error', models.TextField(blank=True, default='', verbose_name='오류')),
+                ('filename', models.CharField(blank=True, default='', max_length=255, verbose_name='파일명')),
+                ('artifact', models.CharField(blank=True, default='', max_length=255, verbose_name='결과 파일 경로')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='요청일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='갱신일')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='완료일')),
+                ('expires_at', models.DateTimeField(blank=True, null=True, verbose_name='만료일')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to='cpe_module.project', verbose_name='프로젝트')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_export_jobs', to=settings.AUTH_USER_MODEL, verbose_name='요청 사용자')),
+            ],
+            options={
+                'verbose_name': '출력 작업',
+                'verbose_name_plural': '출력 작업 목록',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='export_job_status'), models.Index(fields=['expires_at'], name='export_job_expires')],
+            },
+        ),
+    ]
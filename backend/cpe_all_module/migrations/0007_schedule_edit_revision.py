@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:59
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_revision(apps, schema_editor):
+    """기존 공정표는 현재 revision 을 마지막 사용자 저장으로 본다"""
+    ConstructionScheduleItem = apps.get_model("cpe_all_module", "ConstructionScheduleItem")
+    ConstructionScheduleItem.objects.update(edit_revision=F("revision"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpe_all_module', '0006_export_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='constructionscheduleitem',
+            name='edit_revision',
+            field=models.PositiveBigIntegerField(default=0, verbose_name='사용자 저장 리비전'),
+        ),
+        migrations.RunPython(copy_revision, migrations.RunPython.noop),
+    ]
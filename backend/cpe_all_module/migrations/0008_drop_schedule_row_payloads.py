@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:23
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpe_all_module', '0007_schedule_edit_revision'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='scheduleactivity',
+            name='payload',
+        ),
+        migrations.RemoveField(
+            model_name='schedulelink',
+            name='payload',
+        ),
+        migrations.RemoveField(
+            model_name='schedulesubtask',
+            name='payload',
+        ),
+    ]
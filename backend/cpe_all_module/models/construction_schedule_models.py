@@ -1,3 +1,6 @@
+import uuid
+
+from django.conf import settings
 from django.db import models
 
 class ConstructionScheduleItem(models.Model):
@@ -8,9 +11,219 @@ class ConstructionScheduleItem(models.Model):
         verbose_name="프로젝트"
     )
     data = models.JSONField(default=list, blank=True, verbose_name="스케줄 데이터 (JSON)")
+    # 저장할 때마다 1씩 증가 (ETag 기준)
+    revision = models.PositiveBigIntegerField(default=0, verbose_name="리비전")
+    # 사용자 저장(save) 시점의 revision. 서버 기간 재계산은 revision 만 올린다 (If-Match 충돌 기준)
+    edit_revision = models.PositiveBigIntegerField(default=0, verbose_name="사용자 저장 리비전")
     
     class Meta:
         verbose_name = "공기산정 상세 항목 (JSON)"
         
     def __str__(self):
         return f"Schedule Data for Project {self.project_id}"
+
+    def save(self, *args, **kwargs):
+        self.revision = (self.revision or 0) + 1
+        self.edit_revision = self.revision
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = [
+                *update_fields,
+                *(field for field in ("revision", "edit_revision") if field not in update_fields),
+            ]
+        super().save(*args, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# 정규화 행 (조회/집계용)
+# 공정표 원본은 ConstructionScheduleItem.data(JSON)이며, 저장 시 아래 행으로 동기화된다.
+# (cpe_all_module.utils.schedule_rows.sync_schedule_rows)
+# ---------------------------------------------------------------------------
+
+class ScheduleActivity(models.Model):
+    container = models.ForeignKey(
+        ConstructionScheduleItem,
+        on_delete=models.CASCADE,
+        related_name="activities",
+        verbose_name="공정표",
+    )
+    project = models.ForeignKey(
+        "cpe_module.Project",
+        on_delete=models.CASCADE,
+        related_name="schedule_activities",
+        verbose_name="프로젝트",
+    )
+    item_key = models.CharField(max_length=100, verbose_name="항목 ID")
+    position = models.PositiveIntegerField(default=0, verbose_name="순서")
+
+    main_category = models.CharField(max_length=120, blank=True, default="", verbose_name="대공종")
+    process = models.CharField(max_length=120, blank=True, default="", verbose_name="공정")
+    sub_process = models.CharField(max_length=120, blank=True, default="", verbose_name="세부공정")
+    work_type = models.CharField(max_length=255, blank=True, default="", verbose_name="작업")
+    standard_code = models.CharField(max_length=100, blank=True, default="", verbose_name="표준코드")
+    operating_rate_type = models.CharField(max_length=50, blank=True, default="", verbose_name="가동률 구분")
+    unit = models.CharField(max_length=50, blank=True, default="", verbose_name="단위")
+
+    quantity = models.FloatField(null=True, blank=True, verbose_name="수량")
+    productivity = models.FloatField(null=True, blank=True, verbose_name="1일 작업량")
+    crew_size = models.FloatField(null=True, blank=True, verbose_name="작업조")
+    working_days = models.FloatField(null=True, blank=True, verbose_name="작업일수")
+    calendar_days = models.FloatField(null=True, blank=True, verbose_name="공기(달력일)")
+
+
+    class Meta:
+        verbose_name = "공정표 항목"
+        verbose_name_plural = "공정표 항목 목록"
+        ordering = ["container", "position"]
+        indexes = [
+            models.Index(fields=["container", "item_key"], name="sched_act_container_key"),
+            models.Index(fields=["project", "main_category"], name="sched_act_project_cat"),
+            models.Index(fields=["main_category", "process"], name="sched_act_cat_process"),
+            models.Index(fields=["standard_code"], name="sched_act_standard_code"),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id} {self.item_key} ({self.main_category})"
+
+
+class ScheduleLink(models.Model):
+    container = models.ForeignKey(
+        ConstructionScheduleItem,
+        on_delete=models.CASCADE,
+        related_name="link_rows",
+        verbose_name="공정표",
+    )
+    project = models.ForeignKey(
+        "cpe_module.Project",
+        on_delete=models.CASCADE,
+        related_name="schedule_links",
+        verbose_name="프로젝트",
+    )
+    link_key = models.CharField(max_length=100, verbose_name="연결 ID")
+    position = models.PositiveIntegerField(default=0, verbose_name="순서")
+    from_key = models.CharField(max_length=100, blank=True, default="", verbose_name="선행 항목 ID")
+    to_key = models.CharField(max_length=100, blank=True, default="", verbose_name="후행 항목 ID")
+    link_type = models.CharField(max_length=2, default="FS", verbose_name="연결 유형")
+    lag = models.FloatField(default=0.0, verbose_name="지연일")
+
+    class Meta:
+        verbose_name = "공정표 연결"
+        verbose_name_plural = "공정표 연결 목록"
+        ordering = ["container", "position"]
+        indexes = [
+            models.Index(fields=["container", "link_key"], name="sched_link_container_key"),
+            models.Index(fields=["container", "from_key"], name="sched_link_from"),
+            models.Index(fields=["container", "to_key"], name="sched_link_to"),
+        ]
+
+    def __str__(self):
+        return f"{self.from_key} -{self.link_type}-> {self.to_key}"
+
+
+class ScheduleSubTask(models.Model):
+    container = models.ForeignKey(
+        ConstructionScheduleItem,
+        on_delete=models.CASCADE,
+        related_name="sub_task_rows",
+        verbose_name="공정표",
+    )
+    project = models.ForeignKey(
+        "cpe_module.Project",
+        on_delete=models.CASCADE,
+        related_name="schedule_sub_tasks",
+        verbose_name="프로젝트",
+    )
+    sub_task_key = models.CharField(max_length=100, verbose_name="세부작업 ID")
+    position = models.PositiveIntegerField(default=0, verbose_name="순서")
+    item_key = models.CharField(max_length=100, blank=True, default="", verbose_name="상위 항목 ID")
+    start_day = models.FloatField(null=True, blank=True, verbose_name="시작일")
+    duration_days = models.FloatField(null=True, blank=True, verbose_name="기간")
+
+    class Meta:
+        verbose_name = "공정표 세부작업"
+        verbose_name_plural = "공정표 세부작업 목록"
+        ordering = ["container", "position"]
+        indexes = [
+            models.Index(fields=["container", "sub_task_key"], name="sched_sub_container_key"),
+            models.Index(fields=["container", "item_key"], name="sched_sub_item"),
+        ]
+
+    def __str__(self):
+        return f"{self.item_key} / {self.sub_task_key}"
+
+
+class ProjectScheduleSummary(models.Model):
+    """프로젝트 목록/대시보드용 공정표 요약 (공정표 저장 시 갱신, cpe_all_module.utils.schedule_summary)"""
+
+    project = models.OneToOneField(
+        "cpe_module.Project",
+        on_delete=models.CASCADE,
+        related_name="schedule_summary",
+        verbose_name="프로젝트",
+    )
+    revision = models.PositiveBigIntegerField(default=0, verbose_name="공정표 리비전")
+    total_days = models.FloatField(default=0.0, verbose_name="총 공기(달력일)")
+    critical_path_days = models.FloatField(default=0.0, verbose_name="주공정 일수")
+    finish_date = models.DateField(null=True, blank=True, verbose_name="준공 예정일")
+    item_count = models.PositiveIntegerField(default=0, verbose_name="항목 수")
+    category_days = models.JSONField(default=dict, blank=True, verbose_name="대공종별 공기")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="갱신일")
+
+    class Meta:
+        verbose_name = "공정표 요약"
+        verbose_name_plural = "공정표 요약 목록"
+
+    def __str__(self):
+        return f"Schedule summary for Project {self.project_id}"
+
+
+class ExportJob(models.Model):
+    """비동기 엑셀/보고서 출력 작업 (cpe_all_module.utils.export_jobs)"""
+
+    KIND_CHOICES = [
+        ("excel", "엑셀"),
+        ("report", "보고서"),
+    ]
+    STATUS_CHOICES = [
+        ("pending", "대기"),
+        ("running", "생성 중"),
+        ("done", "완료"),
+        ("failed", "실패"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    project = models.ForeignKey(
+        "cpe_module.Project",
+        on_delete=models.CASCADE,
+        related_name="export_jobs",
+        verbose_name="프로젝트",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="schedule_export_jobs",
+        verbose_name="요청 사용자",
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, verbose_name="출력 종류")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending", verbose_name="상태")
+    progress = models.PositiveSmallIntegerField(default=0, verbose_name="진행률")
+    stage = models.CharField(max_length=30, blank=True, default="", verbose_name="단계")
+    error = models.TextField(blank=True, default="", verbose_name="오류")
+    filename = models.CharField(max_length=255, blank=True, default="", verbose_name="파일명")
+    artifact = models.CharField(max_length=255, blank=True, default="", verbose_name="결과 파일 경로")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="요청일")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="갱신일")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="완료일")
+    expires_at = models.DateTimeField(null=True, blank=True, verbose_name="만료일")
+
+    class Meta:
+        verbose_name = "출력 작업"
+        verbose_name_plural = "출력 작업 목록"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "updated_at"], name="export_job_status"),
+            models.Index(fields=["expires_at"], name="export_job_expires"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} export for Project {self.project_id} ({self.status})"
@@ -51,14 +51,16 @@ Construction Schedule Item Serializer
 
 import logging
 from rest_framework import serializers
-from ..models import ConstructionScheduleItem
+from cpe_module.models.project_models import Project
+from ..models import ConstructionScheduleItem, ExportJob, ProjectScheduleSummary
 
 logger = logging.getLogger(__name__)
 
 class ConstructionScheduleItemSerializer(serializers.ModelSerializer):
     class Meta:
         model = ConstructionScheduleItem
-        fields = ['id', 'project', 'data']
+        fields = ['id', 'project', 'data', 'revision']
+        read_only_fields = ['revision']
     
     def to_representation(self, instance):
         """데이터 읽기 시 로깅"""
@@ -114,3 +116,41 @@ class ConstructionScheduleItemSerializer(serializers.ModelSerializer):
                 logger.debug(f"  [{idx}] {item.get('work_type')}: remarks='{remarks}' (type: {type(remarks).__name__})")
         
         return super().update(instance, validated_data)
+
+
+class ProjectScheduleSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProjectScheduleSummary
+        fields = ['revision', 'total_days', 'critical_path_days', 'finish_date', 'item_count', 'category_days', 'updated_at']
+
+
+class PortfolioProjectSerializer(serializers.ModelSerializer):
+    """프로젝트 목록 + 공정표 요약 (요약이 없으면 null, 갱신 대기 중이면 schedule_summary_stale=true)"""
+    schedule_summary = serializers.SerializerMethodField()
+    schedule_summary_stale = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Project
+        fields = [
+            'id', 'title', 'description', 'calc_type', 'start_date', 'created_at', 'updated_at',
+            'schedule_summary', 'schedule_summary_stale',
+        ]
+
+    def get_schedule_summary(self, project):
+        try:
+            summary = project.schedule_summary
+        except ProjectScheduleSummary.DoesNotExist:
+            return None
+        return ProjectScheduleSummarySerializer(summary).data
+
+    def get_schedule_summary_stale(self, project):
+        return getattr(project, "schedule_summary_stale", False)
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'project', 'kind', 'status', 'progress', 'stage', 'error', 'filename',
+            'created_at', 'finished_at', 'expires_at',
+        ]
@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from cpe_module.models.project_models import Project
+from .models import ConstructionScheduleItem
+from .utils.schedule_cpm import discard_project_cpm
+from .utils.schedule_rows import sync_schedule_rows
+from .utils.schedule_summary import discard_schedule_summary, refresh_summary_finish_date, schedule_summary_refresh
+
+
+@receiver(post_save, sender=ConstructionScheduleItem)
+def sync_schedule_activity_rows(sender, instance, raw=False, **kwargs):
+    """공정표 JSON 저장 시 정규화 행(항목/연결/세부작업)을 같은 트랜잭션에서 동기화. 요약은 커밋 후 백그라운드 갱신"""
+    if raw:
+        return
+    sync_schedule_rows(instance)
+    schedule_summary_refresh(instance)
+
+
+@receiver(post_delete, sender=ConstructionScheduleItem)
+def discard_schedule_cpm(sender, instance, **kwargs):
+    """삭제 후 같은 id 가 재사용되어도 이전 CPM 계산 결과를 쓰지 않도록 제거"""
+    discard_project_cpm(instance)
+    discard_schedule_summary(instance)
+
+
+@receiver(post_save, sender=Project)
+def refresh_schedule_finish_date(sender, instance, raw=False, created=False, **kwargs):
+    """착공일이 바뀌면 공정표 요약의 준공 예정일 갱신"""
+    if raw or created:
+        return
+    refresh_summary_finish_date(instance)
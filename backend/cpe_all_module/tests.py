@@ -1,13 +1,61 @@
+import copy
+import io
+import os
+import random
+import tempfile
+import zipfile
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import openpyxl
+import xlsxwriter
+
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from cpe_all_module.models import (
     CIPProductivityBasis,
     ConstructionScheduleItem,
+    ExportJob,
     PileProductivityBasis,
+    ProjectScheduleSummary,
+    ScheduleActivity,
+    ScheduleLink,
+    ScheduleSubTask,
+)
+from cpe_all_module.utils.excel.construction_schedule import build_gantt_layout, write_gantt_sheet
+from cpe_all_module.utils.excel.construction_schedule_gantt import (
+    PixelAxis,
+    build_items_with_timing,
+    inject_gantt_drawing,
 )
+from cpe_all_module.utils.excel.construction_schedule_preview import _load_font, build_gantt_preview_png
+from cpe_all_module.utils.export_cache import evict_exports, get_cached_export, store_export
+from cpe_all_module.utils.export_jobs import purge_export_jobs, run_export_job
+from cpe_all_module.utils.schedule_compression import _round1
+from cpe_all_module.utils.schedule_cpm import ScheduleCycleError, compute_cpm, schedule_items_with_timing
+from cpe_all_module.utils.schedule_dates import resolve_item_dates
+from cpe_all_module.utils.schedule_durations import recalculate_item_durations, recalculate_project_durations
+from cpe_all_module.utils.schedule_intervals import IntervalIndex
+from cpe_all_module.utils.schedule_resources import build_crew_histogram
+from cpe_all_module.utils.schedule_rows import sync_schedule_rows
+from cpe_all_module.utils.schedule_summary import refresh_project_summary
+from cpe_all_module.utils.word.cs_data import (
+    _build_monthly_condition_rows,
+    _build_public_legal_holiday_rows,
+    _build_weather_appendix_data,
+)
+from cpe_module.models.operating_rate_models import WorkScheduleWeight
 from cpe_module.models.project_models import Project
+from operatio.models import PublicHoliday, WeatherDailyRecord
+from operatio.weather_conditions import rebuild_daily_conditions
+from operatio.workday_calendar import WorkdayCalendar
 
 
 AUTH_DENIED_STATUS_CODES = {
@@ -141,3 +189,840 @@ class CpeAllApiSmokeTests(APITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
+
+    def test_schedule_operations_apply_partial_changes(self):
+        container = ConstructionScheduleItem.objects.create(
+            project=self.own_project,
+            data={
+                "items": [
+                    {"id": "a", "main_category": "토공사", "working_days": 3},
+                    {"id": "b", "main_category": "토공사", "working_days": 2},
+                ],
+                "links": [{"id": "l1", "from": "a", "to": "b", "type": "FS", "lag": 0}],
+                "sub_tasks": [{"id": "s1", "itemId": "a"}],
+                "cost_inputs": {"rate": 1},
+            },
+        )
+        self.client.force_authenticate(user=self.user)
+        url = f"/api/cpe-all/schedule-item/{container.id}/operations/"
+
+        response = self.client.patch(url, {"operations": [
+            {"op": "update", "collection": "items", "id": "b", "value": {"working_days": 5}},
+            {"op": "add", "collection": "items", "value": {"id": "c", "main_category": "골조공사"}, "after": "a"},
+            {"op": "remove", "collection": "items", "id": "a"},
+            {"op": "add", "collection": "milestones", "value": {"id": "m1", "label": "착공"}},
+            {"op": "set", "section": "cost_inputs", "value": {"rate": 2}},
+        ]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        changes = response.data["changes"]
+        self.assertEqual([row["id"] for row in changes["items"]["upserted"]], ["b", "c"])
+        self.assertEqual(changes["items"]["removed"], ["a"])
+        self.assertEqual(changes["links"]["removed"], ["l1"])
+        self.assertEqual(changes["sub_tasks"]["removed"], ["s1"])
+        self.assertEqual(changes["cost_inputs"], {"rate": 2})
+
+        container.refresh_from_db()
+        self.assertEqual([item["id"] for item in container.data["items"]], ["c", "b"])
+        self.assertEqual(container.data["items"][1]["working_days"], 5)
+        self.assertEqual(container.data["links"], [])
+        self.assertEqual(container.data["milestones"], [{"id": "m1", "label": "착공"}])
+
+        # 하나라도 잘못되면 전체 미적용
+        response = self.client.patch(url, {"operations": [
+            {"op": "remove", "collection": "items", "id": "b"},
+            {"op": "update", "collection": "items", "id": "missing", "value": {}},
+        ]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["operation_index"], 1)
+        container.refresh_from_db()
+        self.assertEqual(len(container.data["items"]), 2)
+
+        other = ConstructionScheduleItem.objects.create(project=self.other_project, data={"items": []})
+        response = self.client.patch(
+            f"/api/cpe-all/schedule-item/{other.id}/operations/",
+            {"operations": [{"op": "add", "value": {"id": "x"}}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_schedule_etag_conditional_requests(self):
+        container = ConstructionScheduleItem.objects.create(
+            project=self.own_project, data={"items": [{"id": "a"}]}
+        )
+        self.assertEqual(container.revision, 1)
+        self.client.force_authenticate(user=self.user)
+        url = f"/api/cpe-all/schedule-item/{container.id}/"
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertEqual(etag, f'"{container.id}-1"')
+        self.assertEqual(response.data["revision"], 1)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        list_url = f"/api/cpe-all/schedule-item/?project_id={self.own_project.id}"
+        list_etag = self.client.get(list_url)["ETag"]
+        self.assertEqual(
+            self.client.get(list_url, HTTP_IF_NONE_MATCH=list_etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        response = self.client.patch(
+            url, {"data": {"items": [{"id": "b"}]}}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], f'"{container.id}-2"')
+
+        # 이전 ETag 로 저장 → 412, 데이터 유지
+        response = self.client.patch(
+            url, {"data": {"items": [{"id": "stale"}]}}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(response.data["revision"], 2)
+        response = self.client.patch(
+            f"{url}operations/",
+            {"operations": [{"op": "remove", "id": "b"}]},
+            format="json",
+            HTTP_IF_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        container.refresh_from_db()
+        self.assertEqual(container.data, {"items": [{"id": "b"}]})
+        self.assertEqual(container.revision, 2)
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.client.get(list_url, HTTP_IF_NONE_MATCH=list_etag).status_code,
+            status.HTTP_200_OK,
+        )
+
+        # 서버 기간 재계산(revision 만 증가)은 충돌이 아님
+        ConstructionScheduleItem.objects.filter(pk=container.pk).update(revision=F("revision") + 1)
+        response = self.client.patch(
+            url, {"data": {"items": [{"id": "c"}]}}, format="json", HTTP_IF_MATCH=f'"{container.id}-2"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], f'"{container.id}-4"')
+
+    def test_schedule_rows_follow_json_and_answer_portfolio_queries(self):
+        container = ConstructionScheduleItem.objects.create(
+            project=self.own_project,
+            data={
+                "items": [
+                    {"id": "a", "main_category": "3. 골조공사", "process": "RC공사", "standard_code": "S-1", "working_days": 10},
+                    {"id": "b", "main_category": "2. 토공사", "process": "터파기", "working_days": "4.5"},
+                ],
+                "links": [{"id": "l1", "from": "b", "to": "a", "type": "ss", "lag": 2}],
+                "sub_tasks": [{"id": "s1", "itemId": "a", "startDay": 1, "durationDays": 3}],
+            },
+        )
+        ConstructionScheduleItem.objects.create(
+            project=self.other_project,
+            data=[{"id": "x", "main_category": "3. 골조공사", "standard_code": "S-1", "working_days": 99}],
+        )
+
+        activities = {row.item_key: row for row in ScheduleActivity.objects.filter(container=container)}
+        self.assertEqual(activities["b"].working_days, 4.5)
+        self.assertEqual(activities["a"].standard_code, "S-1")
+        link = ScheduleLink.objects.get(container=container)
+        self.assertEqual((link.from_key, link.to_key, link.link_type, link.lag), ("b", "a", "SS", 2.0))
+        self.assertEqual(ScheduleSubTask.objects.get(container=container).item_key, "a")
+
+        # 항목 수정/삭제 → 변경된 행만 갱신, 삭제된 행 제거
+        a_id = activities["a"].id
+        container.data["items"] = [dict(container.data["items"][0], working_days=12)]
+        container.data["links"] = []
+        container.save()
+        self.assertEqual(list(ScheduleActivity.objects.filter(container=container).values_list("id", "working_days")), [(a_id, 12.0)])
+        self.assertFalse(ScheduleLink.objects.filter(container=container).exists())
+
+        # 저장된 인덱스 컬럼과 비교 → 그대로면 0행, data 를 제자리 수정해도 바뀐 행만 반영
+        self.assertEqual(sync_schedule_rows(container), 0)
+        container.data["items"][0]["process"] = "철골공사"
+        self.assertEqual(sync_schedule_rows(container), 1)
+        self.assertEqual(ScheduleActivity.objects.get(id=a_id).process, "철골공사")
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get("/api/cpe-all/schedule-item/standard-code-usage/?code=S-1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{"project_id": self.own_project.id, "title": "Own Total Project", "items": 1}])
+
+        response = self.client.get("/api/cpe-all/schedule-item/category-totals/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["main_category"], "3. 골조공사")
+        self.assertEqual(response.data[0]["working_days"], 12.0)
+
+    def test_cpm_endpoint_returns_floats(self):
+        ConstructionScheduleItem.objects.create(
+            project=self.own_project,
+            data={
+                "items": [{"id": "a", "calendar_days": 4}, {"id": "b", "calendar_days": 2}],
+                "links": [{"id": "l1", "from": "a", "to": "b", "type": "SS", "lag": 1}],
+            },
+        )
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(f"/api/cpe-all/schedule-item/cpm/?project_id={self.own_project.id}")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["project_duration"], 4.0)
+        self.assertEqual(response.data["critical_path"], ["a"])
+        self.assertEqual(response.data["activities"][1]["total_float"], 1.0)
+
+    def test_cpm_item_edit_returns_changed_activities(self):
+        container = ConstructionScheduleItem.objects.create(
+            project=self.own_project,
+            data={
+                "items": [
+                    {"id": "a", "calendar_days": 4},
+                    {"id": "b", "calendar_days": 2},
+                    {"id": "c", "calendar_days": 10, "_startDay": 0},
+                ],
+                "links": [{"id": "l1", "from": "a", "to": "b", "type": "FS"}],
+            },
+        )
+        self.client.force_authenticate(user=self.user)
+        url = f"/api/cpe-all/schedule-item/{container.id}/cpm/"
+
+        # b 만 늘어나고 공기(c 의 10일)는 그대로 → b 관련 값만 반환
+        response = self.client.patch(url, {"id": "b", "calendar_days": 5}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["project_duration_changed"])
+        self.assertEqual([row["id"] for row in response.data["activities"]], ["a", "b"])
+        self.assertEqual(response.data["activities"][1]["early_finish"], 9.0)
+
+        response = self.client.patch(url, {"id": "b", "calendar_days": 8}, format="json")
+        self.assertTrue(response.data["project_duration_changed"])
+        self.assertEqual(response.data["project_duration"], 12.0)
+        self.assertEqual(len(response.data["activities"]), 3)
+
+        container.refresh_from_db()
+        self.assertEqual(container.data["items"][1]["calendar_days"], 8)
+        self.assertEqual(container.revision, 3)
+
+        response = self.client.patch(url, {"id": "missing", "calendar_days": 1}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_compress_returns_ranked_item_diffs(self):
+        ConstructionScheduleItem.objects.create(
+            project=self.own_project,
+            data={
+                "items": [
+                    {"id": "a", "quantity": 100, "productivity": 1, "crew_size": 2, "operating_rate_value": 100, "calendar_days": 50},
+                    {"id": "b", "quantity": 20, "productivity": 1, "crew_size": 1, "operating_rate_value": 100, "calendar_days": 20},
+                ],
+                "links": [{"from": "a", "to": "b", "type": "FS"}],
+            },
+        )
+        self.client.force_authenticate(user=self.user)
+        url = "/api/cpe-all/schedule-item/compress/"
+
+        response = self.client.post(url, {"project_id": str(self.own_project.id), "target_days": 0}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(url, {
+            "project_id": str(self.own_project.id),
+            "target_days": 50,
+            "crew_bounds": {"a": {"max": 3}, "b": {"max": 2}},
+            "strategies": ["crew", "parallel"],
+        }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["project_duration"], 70)
+        first = response.data["proposals"][0]
+        self.assertTrue(first["reached_target"])
+        self.assertEqual((first["strategy"], first["added_crew"]), ("parallel", 0))
+        crew = next(proposal for proposal in response.data["proposals"] if proposal["strategy"] == "crew")
+        # 인원 상한 안에서만 증원
+        changes = {change["id"]: change for change in crew["changes"]}
+        self.assertLessEqual(changes["a"]["after"]["crew_size"], 3)
+        self.assertEqual(changes["a"]["before"]["crew_size"], 2)
+
+    def test_crew_histogram_endpoint(self):
+        ConstructionScheduleItem.objects.create(
+            project=self.own_project,
+            data=[{"id": "a", "main_category": "토공", "calendar_days": 3, "crew_size": 4}],
+        )
+        self.client.force_authenticate(user=self.user)
+        url = "/api/cpe-all/schedule-item/crew-histogram/"
+
+        response = self.client.get(url, {"project_id": str(self.own_project.id), "crew_limit": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {"project_id": str(self.own_project.id), "level": "1"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["daily"], response.data["peak"]), ([4, 4, 4], 4))
+        self.assertEqual(response.data["leveled"]["shifts"], [])
+
+    def test_portfolio_lists_projects_with_schedule_summary(self):
+        self.own_project.start_date = date(2025, 3, 3)
+        self.own_project.save(update_fields=["start_date"])
+        second = Project.objects.create(user=self.user, title="No Schedule", calc_type="TOTAL")
+        with patch("cpe_all_module.utils.schedule_summary._enqueue") as enqueue, \
+                patch("cpe_module.utils.operating_rate_queue._enqueue"), \
+                self.captureOnCommitCallbacks(execute=True):
+            container = ConstructionScheduleItem.objects.create(
+                project=self.own_project,
+                data={"items": [
+                    {"id": "a", "main_category": "토공", "calendar_days": 5, "front_parallel_days": 1},
+                    {"id": "b", "main_category": "골조", "calendar_days": 4},
+                    {"id": "c", "main_category": "골조", "calendar_days": 3, "remarks": "병행작업"},
+                ], "links": [{"from": "a", "to": "b", "type": "FS"}]},
+            )
+        # 저장 요청에서는 요약을 계산하지 않고 커밋 후 백그라운드 갱신만 예약
+        enqueue.assert_called_once_with(self.own_project.id)
+        self.assertFalse(ProjectScheduleSummary.objects.exists())
+        ConstructionScheduleItem.objects.create(project=self.other_project, data=[{"id": "x", "calendar_days": 9}])
+        self.client.force_authenticate(user=self.user)
+
+        portfolio_url = "/api/cpe-all/schedule-item/portfolio/"
+
+        response = self.client.get(portfolio_url, {"page_size": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual([row["id"] for row in response.data["results"]], [str(second.id)])
+        self.assertIsNone(response.data["results"][0]["schedule_summary"])
+        self.assertFalse(response.data["results"][0]["schedule_summary_stale"])
+
+        # 요약이 없으면 조회 요청에서 계산하지 않고 stale 표시 + 백그라운드 갱신 예약
+        with patch("cpe_all_module.utils.schedule_summary._enqueue", side_effect=refresh_project_summary) as enqueue, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(portfolio_url, {"page_size": 1, "page": 2})
+        self.assertIsNone(response.data["results"][0]["schedule_summary"])
+        self.assertTrue(response.data["results"][0]["schedule_summary_stale"])
+        enqueue.assert_called_once_with(self.own_project.id)
+
+        response = self.client.get(portfolio_url, {"page_size": 1, "page": 2})
+        self.assertFalse(response.data["results"][0]["schedule_summary_stale"])
+        summary = response.data["results"][0]["schedule_summary"]
+        self.assertEqual((summary["total_days"], summary["critical_path_days"], summary["item_count"]), (12.0, 8.0, 3))
+        self.assertEqual(summary["category_days"], {"토공": 5.0, "골조": 7.0})
+        self.assertEqual(summary["finish_date"], "2025-03-14")
+
+        # 착공일 변경 → 준공 예정일만 갱신
+        self.own_project.start_date = date(2025, 4, 1)
+        self.own_project.save()
+        self.assertEqual(ProjectScheduleSummary.objects.get(project=self.own_project).finish_date, date(2025, 4, 12))
+
+        # 백그라운드 반영 전 조회는 저장된 요약을 stale 로 돌려준다
+        container.data["items"][1]["calendar_days"] = 6
+        container.save()
+        response = self.client.get(portfolio_url, {"page_size": 1, "page": 2})
+        summary = response.data["results"][0]["schedule_summary"]
+        self.assertEqual((summary["total_days"], response.data["results"][0]["schedule_summary_stale"]), (12.0, True))
+
+    def test_rebuild_schedule_summaries_command(self):
+        ConstructionScheduleItem.objects.create(
+            project=self.own_project, data={"items": [{"id": "a", "calendar_days": 5}]}
+        )
+        self.assertFalse(ProjectScheduleSummary.objects.exists())
+
+        out = io.StringIO()
+        call_command("rebuild_schedule_summaries", stdout=out)
+
+        self.assertIn("projects=1", out.getvalue())
+        self.assertEqual(ProjectScheduleSummary.objects.get(project=self.own_project).total_days, 5.0)
+
+    def test_export_excel_is_served_from_cache_until_inputs_change(self):
+        container = ConstructionScheduleItem.objects.create(
+            project=self.own_project,
+            data={"items": [{"id": "a", "main_category": "토공", "calendar_days": 3, "crew_size": 2}]},
+        )
+        self.client.force_authenticate(user=self.user)
+        url = "/api/cpe-all/schedule-item/export-excel/"
+        params = {"project_id": str(self.own_project.id)}
+
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(EXPORT_CACHE_DIR=cache_dir):
+            first = self.client.get(url, params)
+            self.assertEqual((first.status_code, first["X-Export-Cache"]), (status.HTTP_200_OK, "miss"))
+            second = self.client.get(url, params)
+            self.assertEqual(second["X-Export-Cache"], "hit")
+            self.assertEqual(b"".join(second.streaming_content), first.content)
+
+            container.data["items"][0]["calendar_days"] = 4
+            container.save()
+            self.assertEqual(self.client.get(url, params)["X-Export-Cache"], "miss")
+            WorkScheduleWeight.objects.update_or_create(
+                project=self.own_project, main_category="토공", defaults={"operating_rate": 70}
+            )
+            self.assertEqual(self.client.get(url, params)["X-Export-Cache"], "miss")
+            self.assertEqual(len(os.listdir(cache_dir)), 3)
+
+            # 출력 직전 가동률 반영으로 기간이 바뀌면 바뀐 공정표로 출력
+            def recalculate(project_id):
+                ConstructionScheduleItem.objects.filter(project_id=project_id).update(
+                    data={"items": [{"id": "a", "main_category": "토공", "calendar_days": 6, "crew_size": 2}]},
+                    revision=F("revision") + 1,
+                )
+
+            with patch("cpe_all_module.views.construction_schedule.flush_operating_rates", side_effect=recalculate):
+                self.assertEqual(self.client.get(url, params)["X-Export-Cache"], "miss")
+
+    def test_export_job_lifecycle(self):
+        ConstructionScheduleItem.objects.create(
+            project=self.own_project,
+            data={"items": [{"id": "a", "main_category": "토공", "calendar_days": 3, "crew_size": 2}]},
+        )
+        self.client.force_authenticate(user=self.user)
+        url = "/api/cpe-all/schedule-item/export-jobs/"
+
+        response = self.client.post(url, {"project_id": str(self.own_project.id), "kind": "pdf"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with tempfile.TemporaryDirectory() as media_dir, override_settings(
+            EXPORT_CACHE_DIR=os.path.join(media_dir, "cache"), EXPORT_JOB_DIR=os.path.join(media_dir, "jobs")
+        ):
+            response = self.client.post(url, {"project_id": str(self.own_project.id), "kind": "excel"}, format="json")
+            self.assertEqual((response.status_code, response.data["status"]), (status.HTTP_202_ACCEPTED, "pending"))
+            job_id = response.data["id"]
+            response = self.client.get(f"{url}{job_id}/download/")
+            self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+            # 작업 스레드 대신 직접 실행
+            self.assertEqual(run_export_job(job_id), "done")
+            self.assertIsNone(run_export_job(job_id))
+            response = self.client.get(f"{url}{job_id}/")
+            self.assertEqual((response.data["status"], response.data["progress"]), ("done", 100))
+            response = self.client.get(f"{url}{job_id}/download/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(b"".join(response.streaming_content).startswith(b"PK"))
+
+            self.client.force_authenticate(user=self.other_user)
+            self.assertEqual(self.client.get(f"{url}{job_id}/").status_code, status.HTTP_404_NOT_FOUND)
+
+            ExportJob.objects.filter(pk=job_id).update(expires_at=timezone.now() - timedelta(seconds=1))
+            self.assertEqual(purge_export_jobs(), 1)
+            self.assertEqual(os.listdir(os.path.join(media_dir, "jobs")), [])
+
+    def test_export_cache_evicts_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(EXPORT_CACHE_DIR=cache_dir):
+            for index, key in enumerate(("a", "b", "c")):
+                store_export(key, b"x" * 10)
+                os.utime(os.path.join(cache_dir, f"{key}.bin"), (index, index))
+            self.assertIsNotNone(get_cached_export("a"))  # a 사용 → 가장 최근
+
+            self.assertEqual(evict_exports(20), 1)
+            self.assertIsNone(get_cached_export("b"))
+            self.assertIsNotNone(get_cached_export("c"))
+            self.assertIsNotNone(get_cached_export("a"))
+
+    def test_calendar_dates_uses_project_start_date(self):
+        self.own_project.start_date = date(2025, 3, 3)
+        self.own_project.save(update_fields=["start_date"])
+        ConstructionScheduleItem.objects.create(
+            project=self.own_project,
+            data={"items": [
+                {"id": "a", "main_category": "미등록", "working_days": 5, "calendar_days": 7},
+                {"id": "b", "main_category": "미등록", "working_days": 3, "calendar_days": 4},
+            ]},
+        )
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(
+            f"/api/cpe-all/schedule-item/calendar-dates/?project_id={self.other_project.id}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(
+            f"/api/cpe-all/schedule-item/calendar-dates/?project_id={self.own_project.id}"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["start_date"], date(2025, 3, 3))
+        # 저장 시 생성된 가동률 항목(주 6일) 기준: 3/3~3/7, 3/8~3/11 (일요일 제외)
+        self.assertEqual(response.data["finish_date"], date(2025, 3, 11))
+        self.assertEqual([row["start_day"] for row in response.data["items"]], [0, 5])
+
+
+class ScheduleDateResolutionTests(TestCase):
+    def setUp(self):
+        self.calendar = WorkdayCalendar.from_dates([date(2025, 1, 8)])
+        self.weight = SimpleNamespace(pk=1, sector_type="PRIVATE", work_week_days=5)
+        self.weights = {"토공사": self.weight}
+
+    def test_items_chain_over_workdays_and_holidays(self):
+        items = [
+            {"id": "a", "main_category": "토공사", "working_days": 3},
+            {"id": "b", "main_category": "토공사", "working_days": 2},
+        ]
+
+        rows = resolve_item_dates(items, date(2025, 1, 6), self.weights, {}, self.calendar)
+
+        # 1/6(월)~1/9(목), 1/8 공휴일 제외 → 4일
+        self.assertEqual(rows[0]["calendar_days"], 4)
+        self.assertEqual(rows[0]["finish_date"], date(2025, 1, 9))
+        # 1/10(금) 착수, 주말 제외 1/13(월) 완료
+        self.assertEqual(rows[1]["start_date"], date(2025, 1, 10))
+        self.assertEqual(rows[1]["finish_date"], date(2025, 1, 13))
+
+    def test_monthly_rates_stretch_duration(self):
+        rates = [0.0] * 12
+        rates[0] = 0.5
+        items = [{"id": "a", "main_category": "토공사", "working_days": 1}]
+
+        rows = resolve_item_dates(items, date(2025, 1, 6), self.weights, {1: rates}, self.calendar)
+
+        self.assertEqual(rows[0]["calendar_days"], 2)
+        self.assertEqual(rows[0]["finish_date"], date(2025, 1, 7))
+
+
+class ScheduleCpmTests(TestCase):
+    def test_link_types_floats_and_critical_path(self):
+        items = [
+            {"id": "a", "calendar_days": 5},
+            {"id": "b", "calendar_days": 3},
+            {"id": "c", "calendar_days": 4},
+            {"id": "d", "calendar_days": 2},
+        ]
+        links = [
+            {"id": "l1", "from": "a", "to": "b", "type": "FS", "lag": 1},
+            {"id": "l2", "from": "a", "to": "c", "type": "SS", "lag": 2},
+            {"id": "l3", "from": "b", "to": "d", "type": "FS"},
+            {"id": "l4", "from": "c", "to": "d", "type": "FF"},
+            {"id": "bad", "from": "a", "to": "missing"},
+        ]
+
+        schedule = compute_cpm(items, links)
+
+        self.assertEqual(schedule.early_start, [0.0, 6.0, 2.0, 9.0])
+        self.assertEqual(schedule.project_duration, 11.0)
+        self.assertEqual(schedule.critical_path, ["a", "b", "d"])
+        self.assertEqual(schedule.total_float[2], 5.0)
+        self.assertEqual(schedule.free_float[2], 5.0)
+        self.assertEqual(schedule.ignored_links, ["bad"])
+
+    def test_unlinked_items_keep_list_order_layout(self):
+        items = [
+            {"id": "a", "calendar_days": 5},
+            {"id": "b", "calendar_days": 3, "front_parallel_days": 2},
+        ]
+        planned = build_items_with_timing(items)
+
+        timing = schedule_items_with_timing(items, [])
+
+        self.assertEqual([row["start_day"] for row in timing], [row["start_day"] for row in planned])
+
+    def test_incremental_update_matches_full_recompute(self):
+        items = [
+            {"id": "a", "calendar_days": 5},
+            {"id": "b", "calendar_days": 3},
+            {"id": "c", "calendar_days": 4},
+            {"id": "d", "calendar_days": 2},
+            {"id": "e", "calendar_days": 6},
+        ]
+        links = [
+            {"from": "a", "to": "b", "type": "FS", "lag": 1},
+            {"from": "a", "to": "c", "type": "SS", "lag": 2},
+            {"from": "b", "to": "d", "type": "FS"},
+            {"from": "c", "to": "d", "type": "FF"},
+        ]
+        network = compute_cpm(copy.deepcopy(items), links)
+
+        for item_id, changes in (
+            ("c", {"calendar_days": 9}),
+            ("e", {"_startDay": 3}),
+            ("a", {"calendar_days": 1}),
+            ("e", {"_startDay": None}),
+        ):
+            changed, _moved = network.update_item(item_id, **changes)
+            next(item for item in items if item["id"] == item_id).update(changes)
+            expected = compute_cpm(copy.deepcopy(items), links).as_dict()
+            self.assertEqual(network.as_dict(), expected)
+            self.assertIn(network.index_by_id[item_id], changed)
+
+        batch = {"b": {"calendar_days": 7}, "e": {"calendar_days": 1, "_startDay": 2}}
+        network.update_items(batch)
+        for item_id, changes in batch.items():
+            next(item for item in items if item["id"] == item_id).update(changes)
+        self.assertEqual(network.as_dict(), compute_cpm(copy.deepcopy(items), links).as_dict())
+
+    def test_driving_items_follow_list_order_chain(self):
+        items = [
+            {"id": "a", "calendar_days": 5},
+            {"id": "b", "calendar_days": 3},
+            {"id": "c", "calendar_days": 4},
+            {"id": "d", "calendar_days": 2},
+        ]
+        # d 는 연결이 없어 목록 순서 누적 배치(a → b → c 화면 위치) 뒤에 놓인다
+        links = [{"from": "a", "to": "c", "type": "SS"}]
+        network = compute_cpm(items, links)
+
+        driving = [network.items[index]["id"] for index in network.driving_items()]
+        self.assertEqual(driving, ["d", "c", "b", "a"])
+        # TF 는 연결만 보므로 주공정에는 d 만 잡힌다
+        self.assertEqual(network.critical_path, ["d"])
+
+    def test_cycle_is_reported(self):
+        items = [{"id": "a", "calendar_days": 1}, {"id": "b", "calendar_days": 1}]
+        links = [{"from": "a", "to": "b"}, {"from": "b", "to": "a"}]
+
+        with self.assertRaises(ScheduleCycleError) as ctx:
+            compute_cpm(items, links)
+        self.assertEqual(ctx.exception.item_ids, ["a", "b"])
+
+
+class ScheduleCrewHistogramTests(TestCase):
+    def test_histogram_and_leveling_within_float(self):
+        items = [
+            {"id": "a", "main_category": "토공", "calendar_days": 2, "crew_size": 1},
+            {"id": "b", "main_category": "골조", "calendar_days": 2, "crew_size": 6},
+            {"id": "c", "main_category": "골조", "calendar_days": 2, "crew_size": 6},
+            {"id": "d", "main_category": "마감", "calendar_days": 4, "crew_size": 1},
+        ]
+        links = [{"from": "a", "to": "b"}, {"from": "a", "to": "c"}, {"from": "b", "to": "d"}]
+        sub_tasks = [{"itemId": "d", "startDay": 6, "durationDays": 1.5, "crew_size": 2}]
+
+        result = build_crew_histogram(items, links, sub_tasks, level=True, crew_limit=8)
+        self.assertEqual(result["total_days"], 8)
+        self.assertEqual(result["daily"], [1, 1, 12, 12, 1, 1, 3, 3])
+        self.assertEqual((result["peak"], result["peak_day"], result["days_over_limit"]), (12, 2, 2))
+        categories = {row["main_category"]: row for row in result["categories"]}
+        self.assertEqual(categories["골조"]["crew_days"], 24)
+
+        # c 는 자유 여유 4일 → 겹치지 않게 늦춰 최대 인원을 줄임 (다른 항목/공기는 그대로)
+        leveled = result["leveled"]
+        self.assertEqual(leveled["peak"], 7)
+        self.assertEqual(leveled["days_over_limit"], 0)
+        self.assertEqual([(row["id"], row["new_start_day"]) for row in leveled["shifts"]], [("c", 4.0)])
+        self.assertEqual(leveled["crew_days"], result["crew_days"])
+
+
+class ScheduleIntervalIndexTests(TestCase):
+    def test_contained_and_overlapping_match_full_scan(self):
+        rng = random.Random(3)
+        intervals = []
+        for idx in range(300):
+            start = rng.randint(0, 200) + rng.choice([0, 0.5])
+            intervals.append((start, start + rng.randint(0, 40), idx))
+        index = IntervalIndex(intervals)
+
+        for _ in range(100):
+            start = rng.randint(-10, 220) + rng.choice([0, 0.5])
+            end = start + rng.randint(0, 60)
+            self.assertEqual(
+                index.contained(start, end),
+                [idx for s, e, idx in intervals if s >= start and e <= end],
+            )
+            self.assertEqual(
+                index.overlapping(start, end),
+                [idx for s, e, idx in intervals if s < end and e > start],
+            )
+        self.assertEqual(IntervalIndex([]).contained(0, 10), [])
+
+
+class GanttDrawingTests(TestCase):
+    def test_pixel_axis_matches_linear_scan(self):
+        sizes = [80, 0, 95, 12, 12, 0, 0, 40]
+
+        def linear(px):
+            idx, remaining = 0, max(0, px)
+            while idx < len(sizes) - 1 and remaining >= sizes[idx]:
+                remaining -= sizes[idx]
+                idx += 1
+            return idx, int(min(remaining, sizes[idx] - 1 if sizes[idx] > 0 else 0))
+
+        axis = PixelAxis(sizes)
+        for px in [-5, 0, 79, 79.5, 80, 174.9, 175, 199, 238, 239.25, 500]:
+            self.assertEqual(axis.locate(px), linear(px))
+
+    def test_inject_streams_drawing_into_gantt_sheet(self):
+        output = io.BytesIO()
+        wb = xlsxwriter.Workbook(output, {"in_memory": True})
+        wb.add_worksheet("공사예정공정표").write(0, 0, "x")
+        wb.close()
+        shapes = [
+            {"type": "rect", "x": 3, "y": 4, "w": 30, "h": 10, "fill": "EF4444"},
+            {"type": "text", "x": 3, "y": 4, "w": 30, "h": 10, "text": "A&B <1>", "font": {"bold": True}},
+            {"type": "line", "x1": 0, "y1": 0, "x2": 90, "y2": 0, "line": {"color": "94A3B8", "arrow": "triangle"}},
+        ]
+        result = inject_gantt_drawing(
+            output.getvalue(), shapes=shapes, last_col=10, gantt_row=3, timeline_start_col=5, data_start_row=5
+        )
+
+        with zipfile.ZipFile(io.BytesIO(result)) as zf:
+            drawing = zf.read("xl/drawings/drawing1.xml").decode("utf-8")
+            sheet = zf.read("xl/worksheets/sheet1.xml").decode("utf-8")
+            rels = zf.read("xl/worksheets/_rels/sheet1.xml.rels").decode("utf-8")
+            content_types = zf.read("[Content_Types].xml").decode("utf-8")
+        self.assertEqual(drawing.count("<xdr:twoCellAnchor>"), 3)
+        self.assertIn("<a:t>A&amp;B &lt;1&gt;</a:t>", drawing)
+        self.assertIn('<a:headEnd type="triangle" w="lg" len="lg" />', drawing)
+        self.assertTrue(sheet.endswith('<drawing r:id="rId1"/></worksheet>'))
+        self.assertIn('Target="../drawings/drawing1.xml"', rels)
+        self.assertIn('PartName="/xl/drawings/drawing1.xml"', content_types)
+
+
+    def test_gantt_grid_and_bohal_blanks_are_conditional_formats(self):
+        items = [
+            {"id": "a", "main_category": "골조", "work_type": "A", "calendar_days": 40},
+            {"id": "b", "main_category": "골조", "work_type": "B", "calendar_days": 25},
+        ]
+        output = io.BytesIO()
+        wb = xlsxwriter.Workbook(output, {"in_memory": True})
+        meta = write_gantt_sheet(
+            wb, items, [], [], "p", date(2025, 1, 1), include_bohal_table=True, holiday_set={"2025-01-28"}
+        )
+        wb.close()
+        ws = openpyxl.load_workbook(io.BytesIO(output.getvalue()))["공사예정공정표"]
+
+        # 격자 칸은 셀 기록 없이 조건부 서식 구간(2행 × 첫/가운데/끝 열)으로만 표시
+        grid_rows = range(meta["data_start_row"] + 1, meta["gantt_row"] + 1)
+        grid_cols = range(meta["timeline_start_col"] + 1, meta["last_col"] + 2)
+        self.assertFalse(any(ws.cell(r, c).has_style for r in grid_rows for c in grid_cols))
+        ranges = {str(cf.sqref) for cf in ws.conditional_formatting}
+        self.assertTrue({"F6", "G6:K6", "L6", "F7", "G7:K7", "L7", "F13:BR14"} <= ranges)
+        self.assertIn("J13:J14 Q13:Q14", next(r for r in ranges if r.startswith("J13")))
+
+        # 보할표는 작업일만 1, 빈 칸은 셀 없이 조건부 서식. 합계는 그대로
+        bohal_first = meta["gantt_row"] + 6
+        values = [[ws.cell(bohal_first + idx, 6 + day).value for day in range(65)] for idx in range(2)]
+        self.assertEqual({value for row in values for value in row}, {1, None})
+        self.assertIsNone(values[0][4])  # 1/5 일요일
+        self.assertIsNone(values[0][27])  # 1/28 공휴일
+        self.assertEqual(sum(1 for value in values[0] if value == 1), 40 - 6 - 1)
+        self.assertEqual(ws.cell(bohal_first + 2, 6).value, 1)
+
+    def test_layout_is_shared_by_sheet_and_preview(self):
+        items = [
+            {"id": "a", "main_category": "토공", "work_type": "A", "calendar_days": 12},
+            {"id": "b", "main_category": "골조", "work_type": "B", "calendar_days": 20, "front_parallel_days": 3},
+        ]
+        links = [{"id": "l1", "from": "a", "to": "b", "type": "FS", "lag": 0}]
+        layout = build_gantt_layout(items, [], links, date(2025, 1, 1))
+        wb = xlsxwriter.Workbook(io.BytesIO(), {"in_memory": True})
+        meta = write_gantt_sheet(wb, items, [], links, "p", date(2025, 1, 1))
+        wb.close()
+        self.assertEqual(meta["shapes"], layout["shapes"])
+        self.assertEqual((meta["last_col"], meta["gantt_row"]), (layout["last_col"], layout["gantt_row"]))
+
+        _load_font.cache_clear()
+        png = build_gantt_preview_png(items, [], links, "p", date(2025, 1, 1))
+        self.assertTrue(png.startswith(b"\x89PNG"))
+        self.assertGreater(_load_font.cache_info().hits, 0)
+
+class ScheduleDurationTests(TestCase):
+    def test_item_durations_match_frontend_calculate_item(self):
+        rates = [
+            {"main_category": "3. 골조공사", "operating_rate": "80.00", "work_week_days": 6},
+            {"main_category": "3. 골조공사|||RC공사", "operating_rate": "50.00", "work_week_days": 6},
+            {"main_category": "2. 토공사", "operating_rate": None, "work_week_days": 5},
+        ]
+        items = [
+            {"id": "a", "main_category": "3. 골조공사", "process": "RC공사", "quantity": 100, "productivity": "2", "crew_size": 5},
+            {"id": "b", "main_category": "3. 골조공사", "process": "철골", "quantity": 100, "productivity": 2, "crew_size": 5, "application_rate": 50},
+            {"id": "c", "main_category": "2. 토공사", "quantity": 70, "productivity": 1, "crew_size": 0},
+            {"id": "d", "main_category": "9. 기타", "quantity": 10, "productivity": 0, "operating_rate_value": 90, "cp_checked": False, "parallel_rate": 30},
+        ]
+
+        a, b, c, d = recalculate_item_durations(items, rates)
+        self.assertEqual((a["working_days"], a["operating_rate_value"], a["calendar_days"]), (10.0, 50.0, 20.0))
+        self.assertEqual((b["operating_rate_value"], b["calendar_days"], b["parallel_rate"]), (80.0, 6.3, 50.0))
+        self.assertEqual((c["daily_production"], c["working_days"], c["calendar_days"], c["calendar_months"]), (1.0, 70.0, 98.0, 3.3))
+        self.assertEqual((d["working_days"], d["calendar_days"], d["operating_rate_value"]), (0.0, 0.0, 90.0))
+        self.assertEqual((d["cp_checked"], d["parallel_rate"], d["application_rate"]), (False, 100.0, 100.0))
+        self.assertNotIn("working_days", items[0])
+
+    def test_rounding_matches_js_to_fixed(self):
+        # (12.35).toFixed(1) === "12.3", (1.45).toFixed(1) === "1.4" (정확한 이진값 기준)
+        rates = [{"main_category": "토공", "operating_rate": "100", "work_week_days": 7}]
+        items = [
+            {"id": "a", "main_category": "토공", "quantity": 12.35, "productivity": 1, "crew_size": 1},
+            {"id": "b", "main_category": "토공", "quantity": 1.45, "productivity": 1, "crew_size": 1},
+            {"id": "c", "main_category": "토공", "quantity": 2.5, "productivity": 1, "crew_size": 1},
+        ]
+        self.assertEqual(
+            [item["calendar_days"] for item in recalculate_item_durations(items, rates)],
+            [12.3, 1.4, 2.5],
+        )
+        self.assertEqual((_round1(12.35), _round1(1.45), _round1(0.25)), (12.3, 1.4, 0.3))
+
+    def test_project_durations_follow_operating_rates(self):
+        user = get_user_model().objects.create_user(username="duration_user", password="StrongPass!123")
+        project = Project.objects.create(user=user, title="Duration Project", calc_type="TOTAL")
+        weight = WorkScheduleWeight.objects.create(project=project, main_category="3. 골조공사", operating_rate=50)
+        container = ConstructionScheduleItem.objects.create(
+            project=project,
+            data={"items": [{"id": "a", "main_category": "3. 골조공사", "quantity": 30, "productivity": 1, "crew_size": 1}], "links": []},
+        )
+
+        # 요약(CPM 전체 계산)은 행 잠금 트랜잭션 밖, 커밋 후 백그라운드에서 갱신
+        with patch("cpe_all_module.utils.schedule_summary._enqueue") as enqueue, \
+                self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(recalculate_project_durations(project.id), 1)
+        enqueue.assert_called_once_with(project.id)
+        self.assertFalse(ProjectScheduleSummary.objects.filter(project=project).exists())
+        container.refresh_from_db()
+        self.assertEqual((container.revision, container.edit_revision), (2, 1))
+        self.assertEqual(container.data["items"][0]["calendar_days"], 60.0)
+        self.assertEqual(ScheduleActivity.objects.get(container=container).calendar_days, 60.0)
+        self.assertEqual(container.data["links"], [])
+
+        # 변경 없으면 저장하지 않음 (파생 키만 빠진 항목 포함)
+        self.assertEqual(recalculate_project_durations(project.id), 0)
+        for key in ("parallel_rate", "cp_checked", "application_rate"):
+            container.data["items"][0].pop(key)
+        container.save()
+        self.assertEqual(recalculate_project_durations(project.id), 0)
+        weight.operating_rate = 75
+        weight.save()
+        recalculate_project_durations(project.id)
+        container.refresh_from_db()
+        self.assertEqual((container.revision, container.data["items"][0]["calendar_days"]), (4, 40.0))
+
+
+class ScheduleReportWeatherDataTests(TestCase):
+    STATION_ID = 108
+
+    def setUp(self):
+        records = []
+        day = date(2023, 1, 1)
+        step = 0
+        while day <= date(2024, 12, 31):
+            step += 1
+            records.append(WeatherDailyRecord(
+                station_id=self.STATION_ID,
+                date=day,
+                avgTa=(step * 7) % 45 - 15.0,
+                minTa=(step * 11) % 45 - 20.0,
+                maxTa=(step * 13) % 50 - 10.0,
+                sumRn=None if step % 3 else float(step % 30),
+                ddMes=None if step % 5 else float(step % 25),
+                maxInsWs=float(step % 20),
+                payload={},
+            ))
+            day += timedelta(days=1)
+        WeatherDailyRecord.objects.bulk_create(records)
+
+    def test_condition_bitmap_matches_raw_record_counts(self):
+        years = [2023, 2024]
+        raw_rows = _build_monthly_condition_rows(self.STATION_ID, years)
+        raw_appendix = _build_weather_appendix_data([], [], self.STATION_ID, years, region="서울")
+
+        # 일부 연도만 비트맵이 있으면 나머지 날은 원본 일자료로 센다
+        rebuild_daily_conditions(self.STATION_ID, date(2024, 1, 1), date(2024, 12, 31))
+        self.assertEqual(_build_monthly_condition_rows(self.STATION_ID, years), raw_rows)
+
+        rebuild_daily_conditions(self.STATION_ID)
+
+        self.assertEqual(_build_monthly_condition_rows(self.STATION_ID, years), raw_rows)
+        self.assertEqual(
+            _build_weather_appendix_data([], [], self.STATION_ID, years, region="서울"),
+            raw_appendix,
+        )
+        self.assertTrue(any(any(row["monthly"]) for row in raw_rows[0]))
+
+    def test_public_legal_holiday_rows_project_fallback_year(self):
+        PublicHoliday.objects.create(date=date(2025, 1, 1), name="신정", seq=1, locdate=20250101)
+        PublicHoliday.objects.create(date=date(2025, 3, 2), name="휴일", seq=1, locdate=20250302)
+
+        rows = _build_public_legal_holiday_rows(date(2025, 6, 1), max_years=2)
+
+        self.assertEqual([row["year"] for row in rows], [2025, 2026])
+        # 2025: 1월 일요일 4 + 신정, 3월 일요일 5 (3/2 일요일 공휴일은 중복)
+        self.assertEqual(rows[0]["monthly"][0], 5)
+        self.assertEqual(rows[0]["monthly"][2], 5)
+        # 2026: 2025년 공휴일 투영 → 1/1(목), 3/2(월)
+        self.assertEqual(rows[1]["monthly"][0], 5)
+        self.assertEqual(rows[1]["monthly"][2], 6)
+        self.assertEqual(rows[1]["total"], 52 + 2)
@@ -2,16 +2,23 @@ import math
 import unicodedata
 from datetime import timedelta
 
+from xlsxwriter.utility import xl_range
+
 from cpe_module.models.operating_rate_models import WorkScheduleWeight
+from operatio.workday_calendar import WorkdayCalendar
 
+from ..schedule_cpm import schedule_items_with_timing
 from .construction_schedule_gantt import (
-    build_items_with_timing,
+    DATA_ROW_HEIGHT,
     build_subtask_list,
     build_cp_meta,
+    build_cp_index,
     is_parallel,
     arrow_dir_by_vector,
     category_color_hex,
+    gantt_col_pixels,
     inject_gantt_drawing,
+    row_height_to_px,
 )
 
 
@@ -148,23 +155,115 @@ def write_table_sheet(wb, items, ordered_categories, grouped, rate_summary, rate
     ws.set_row(2, 20)
 
 
-def write_gantt_sheet(
-    wb,
-    items,
-    sub_tasks,
-    links,
-    project_name,
-    start_date,
-    custom_milestones=None,
-    cost_inputs=None,
-    include_bohal_table=False,
-    work_week_days=6,
-    holiday_set=None,
-):
-    # ---- Sheet 2: Gantt (shape-based, Excel-editable) ----
-    gantt_ws = wb.add_worksheet("공사예정공정표")
+def write_crew_sheet(wb, histogram, project_name, start_date):
+    """일일 투입 인원 시트 (build_crew_histogram 결과, 대공종별 누적 영역 차트 포함)"""
+    ws = wb.add_worksheet("인력 투입")
+    categories = histogram["categories"]
+    leveled = histogram.get("leveled")
+    header = ["일차", "날짜", "합계"]
+    if leveled:
+        header.append("평준화 합계")
+    category_col = len(header)
+    header += [row["main_category"] for row in categories]
+
+    fmt_title = wb.add_format({'bold': True, 'font_size': 13, 'align': 'left', 'valign': 'vcenter', 'border': 1})
+    fmt_title_red = wb.add_format({'bold': True, 'font_color': '#C00000', 'align': 'left', 'valign': 'vcenter', 'border': 1})
+    fmt_header = wb.add_format({'bold': True, 'bg_color': '#D9D9D9', 'align': 'center', 'valign': 'vcenter', 'border': 1, 'text_wrap': True})
+    fmt_center = wb.add_format({'align': 'center', 'valign': 'vcenter', 'border': 1})
+    fmt_date = wb.add_format({'align': 'center', 'valign': 'vcenter', 'border': 1, 'num_format': 'yyyy-mm-dd'})
+    fmt_number = wb.add_format({'align': 'right', 'valign': 'vcenter', 'border': 1, 'num_format': '#,##0.0'})
+    fmt_total = wb.add_format({'bold': True, 'align': 'right', 'valign': 'vcenter', 'border': 1, 'num_format': '#,##0.0', 'bg_color': '#FFF7C7'})
+
+    last_col = max(len(header), 4) - 1
+    summary = (
+        f"최대 {histogram['peak']:,.1f}명 ({histogram['peak_day'] + 1}일차) / "
+        f"평균 {histogram['average']:,.1f}명 / 총 {histogram['crew_days']:,.0f}인일"
+    )
+    if leveled:
+        summary += f" / 평준화 후 최대 {leveled['peak']:,.1f}명"
+    ws.merge_range(0, 0, 0, last_col, "인력 투입 계획", fmt_title)
+    ws.merge_range(1, 0, 1, 1, f"공사명 : {project_name}", fmt_title)
+    ws.merge_range(1, 2, 1, last_col, summary, fmt_title_red)
+    ws.write_row(2, 0, header, fmt_header)
+
+    first_row = 3
+    for day in range(histogram["total_days"]):
+        row_idx = first_row + day
+        ws.write_number(row_idx, 0, day + 1, fmt_center)
+        ws.write_datetime(row_idx, 1, start_date + timedelta(days=day), fmt_date)
+        ws.write_number(row_idx, 2, histogram["daily"][day], fmt_total)
+        if leveled:
+            ws.write_number(row_idx, 3, leveled["daily"][day], fmt_total)
+        for offset, row in enumerate(categories):
+            ws.write_number(row_idx, category_col + offset, row["daily"][day], fmt_number)
+
+    ws.set_column(0, 0, 6)
+    ws.set_column(1, 1, 11)
+    ws.set_column(2, category_col - 1, 10)
+    ws.set_column(category_col, last_col, 12)
+    ws.set_row(2, 32)
+    ws.freeze_panes(first_row, 2)
+
+    last_row = first_row + histogram["total_days"] - 1
+    if histogram["total_days"] <= 0 or not categories:
+        return
+    chart = wb.add_chart({'type': 'area', 'subtype': 'stacked'})
+    for offset, row in enumerate(categories):
+        col = category_col + offset
+        chart.add_series({
+            'name': ["인력 투입", 2, col],
+            'categories': ["인력 투입", first_row, 0, last_row, 0],
+            'values': ["인력 투입", first_row, col, last_row, col],
+            'fill': {'color': f"#{category_color_hex(row['main_category'])}"},
+        })
+    if leveled:
+        line = wb.add_chart({'type': 'line'})
+        line.add_series({
+            'name': ["인력 투입", 2, 3],
+            'categories': ["인력 투입", first_row, 0, last_row, 0],
+            'values': ["인력 투입", first_row, 3, last_row, 3],
+            'line': {'color': '#C00000', 'width': 1.5},
+        })
+        chart.combine(line)
+    chart.set_title({'name': '일일 투입 인원'})
+    chart.set_x_axis({'name': '일차'})
+    chart.set_y_axis({'name': '인원(명)'})
+    chart.set_legend({'position': 'bottom'})
+    chart.set_size({'width': 960, 'height': 360})
+    ws.insert_chart(first_row, last_col + 2, chart)
+
+
+def _edge_bands(first, last):
+    """[first, last] → (시작, 끝, 첫 줄 여부, 끝 줄 여부) 구간: 첫 줄 / 가운데 / 끝 줄 (한 줄이면 첫 줄)"""
+    if last < first:
+        return []
+    bands = [(first, first, True, first == last)]
+    if last - first > 1:
+        bands.append((first + 1, last - 1, False, False))
+    if last > first:
+        bands.append((last, last, False, True))
+    return bands
+
+
+def _column_runs(columns):
+    """정렬된 열 번호 → 연속 구간 [(시작, 끝)]"""
+    runs = []
+    for col in columns:
+        if runs and runs[-1][1] == col - 1:
+            runs[-1][1] = col
+        else:
+            runs.append([col, col])
+    return runs
+
+
+def build_gantt_layout(items, sub_tasks, links, start_date, custom_milestones=None):
+    """공정표 → 간트 배치 (워크북 없이 계산)
 
-    items_with_timing = build_items_with_timing(items)
+    엑셀 시트(write_gantt_sheet)와 보고서용 PNG(build_gantt_preview_png)가 같은 결과를 쓴다.
+    shapes 좌표는 타임라인 원점(첫 데이터 행 위 / 첫 타임라인 열 왼쪽) 기준 px 이다.
+    """
+    # 연결(links) 반영 CPM 일정 (연결이 없으면 기존 목록 순서 배치와 동일)
+    items_with_timing = schedule_items_with_timing(items, links)
     subtask_list = build_subtask_list(sub_tasks)
 
     max_milestone_day = 0.0
@@ -192,119 +291,6 @@ def write_gantt_sheet(
     timeline_start_col = 5
     last_col = timeline_start_col - 1 + total_units
 
-    # Formats
-    gantt_title_fmt = wb.add_format({'bold': True, 'font_size': 14, 'align': 'center', 'valign': 'vcenter'})
-    gantt_header_fmt = wb.add_format({'bold': True, 'bg_color': '#D9D9D9', 'align': 'center', 'valign': 'vcenter', 'border': 1})
-    gantt_left_fmt = wb.add_format({'align': 'left', 'valign': 'vcenter', 'border': 1})
-    gantt_right_fmt = wb.add_format({'align': 'right', 'valign': 'vcenter', 'border': 1, 'num_format': '#,##0.0'})
-    gantt_grid_fmt = wb.add_format({
-        'top': 4,      # Dotted
-        'bottom': 4,   # Dotted
-        'left': 4,     # Dotted
-        'right': 4,    # Dotted
-        'top_color': '#D3D3D3',
-        'bottom_color': '#D3D3D3',
-        'left_color': '#D3D3D3',
-        'right_color': '#D3D3D3'
-    })
-    # Border formats for outer edges (black solid outside, dotted gray inside)
-    gantt_grid_top_fmt = wb.add_format({
-        'top': 1,      # Solid black
-        'top_color': '#000000',
-        'bottom': 4,   # Dotted gray
-        'bottom_color': '#D3D3D3',
-        'left': 4,     # Dotted gray
-        'left_color': '#D3D3D3',
-        'right': 4,    # Dotted gray
-        'right_color': '#D3D3D3'
-    })
-    gantt_grid_bottom_fmt = wb.add_format({
-        'top': 4,      # Dotted gray
-        'top_color': '#D3D3D3',
-        'bottom': 1,   # Solid black
-        'bottom_color': '#000000',
-        'left': 4,     # Dotted gray
-        'left_color': '#D3D3D3',
-        'right': 4,    # Dotted gray
-        'right_color': '#D3D3D3'
-    })
-    gantt_grid_left_fmt = wb.add_format({
-        'top': 4,      # Dotted gray
-        'top_color': '#D3D3D3',
-        'bottom': 4,   # Dotted gray
-        'bottom_color': '#D3D3D3',
-        'left': 1,     # Solid black
-        'left_color': '#000000',
-        'right': 4,    # Dotted gray
-        'right_color': '#D3D3D3'
-    })
-    gantt_grid_right_fmt = wb.add_format({
-        'top': 4,      # Dotted gray
-        'top_color': '#D3D3D3',
-        'bottom': 4,   # Dotted gray
-        'bottom_color': '#D3D3D3',
-        'left': 4,     # Dotted gray
-        'left_color': '#D3D3D3',
-        'right': 1,    # Solid black
-        'right_color': '#000000'
-    })
-    gantt_grid_corner_tl_fmt = wb.add_format({
-        'top': 1,      # Solid black
-        'top_color': '#000000',
-        'bottom': 4,   # Dotted gray
-        'bottom_color': '#D3D3D3',
-        'left': 1,     # Solid black
-        'left_color': '#000000',
-        'right': 4,    # Dotted gray
-        'right_color': '#D3D3D3'
-    })
-    gantt_grid_corner_tr_fmt = wb.add_format({
-        'top': 1,      # Solid black
-        'top_color': '#000000',
-        'bottom': 4,   # Dotted gray
-        'bottom_color': '#D3D3D3',
-        'left': 4,     # Dotted gray
-        'left_color': '#D3D3D3',
-        'right': 1,    # Solid black
-        'right_color': '#000000'
-    })
-    gantt_grid_corner_bl_fmt = wb.add_format({
-        'top': 4,      # Dotted gray
-        'top_color': '#D3D3D3',
-        'bottom': 1,   # Solid black
-        'bottom_color': '#000000',
-        'left': 1,     # Solid black
-        'left_color': '#000000',
-        'right': 4,    # Dotted gray
-        'right_color': '#D3D3D3'
-    })
-    gantt_grid_corner_br_fmt = wb.add_format({
-        'top': 4,      # Dotted gray
-        'top_color': '#D3D3D3',
-        'bottom': 1,   # Solid black
-        'bottom_color': '#000000',
-        'left': 4,     # Dotted gray
-        'left_color': '#D3D3D3',
-        'right': 1,    # Solid black
-        'right_color': '#000000'
-    })
-    bohal_title_fmt = wb.add_format({'bold': True, 'bg_color': '#FFF2CC', 'align': 'left', 'valign': 'vcenter', 'border': 1})
-    bohal_header_fmt = wb.add_format({'bold': True, 'bg_color': '#E2E8F0', 'align': 'center', 'valign': 'vcenter', 'border': 1})
-    bohal_left_fmt = wb.add_format({'align': 'left', 'valign': 'vcenter', 'border': 1})
-    bohal_cost_fmt = wb.add_format({'align': 'right', 'valign': 'vcenter', 'border': 1, 'num_format': '#,##0'})
-    bohal_pct_fmt = wb.add_format({'align': 'right', 'valign': 'vcenter', 'border': 1, 'num_format': '0.0"%"'})
-
-    # Title and headers
-    gantt_ws.merge_range(0, 0, 0, last_col, "공 사 예 정 공 정 표", gantt_title_fmt)
-    gantt_ws.merge_range(1, 0, 1, timeline_start_col - 1, f"공사명 : {project_name}", gantt_left_fmt)
-    gantt_ws.merge_range(1, timeline_start_col, 1, last_col, "", gantt_left_fmt)
-
-    gantt_ws.merge_range(2, 0, 3, 0, "구분", gantt_header_fmt)
-    gantt_ws.merge_range(2, 1, 3, 1, "공정", gantt_header_fmt)
-    gantt_ws.merge_range(2, 2, 3, 2, "공종", gantt_header_fmt)
-    gantt_ws.merge_range(2, 3, 3, 3, "Calendar Day", gantt_header_fmt)
-    gantt_ws.merge_range(2, 4, 3, 4, "", gantt_header_fmt)
-
     # Timeline headers (year/month + day)
     timeline_months = []
     timeline_days = []
@@ -335,53 +321,14 @@ def write_gantt_sheet(
             label = f"{day_number + 1}일"
         timeline_days.append(label)
 
-    month_col = timeline_start_col
-    last_year_label = None
-    for month in timeline_months:
-        label = month["label"]
-        if date_scale >= 30:
-            year = label.split(".")[0]
-            label = year if year != last_year_label else ""
-            last_year_label = year
-        end_col = month_col + month["count"] - 1
-        if end_col > month_col:
-            gantt_ws.merge_range(2, month_col, 2, end_col, label, gantt_header_fmt)
-        else:
-            gantt_ws.write(2, month_col, label, gantt_header_fmt)
-        month_col = end_col + 1
-
-    for idx, label in enumerate(timeline_days):
-        col = timeline_start_col + idx
-        gantt_ws.write(3, col, str(label).replace("일", ""), gantt_header_fmt)
-
-    # Sub-header row (row 4): "적정공기 계획" and "총간관리일"
-    subheader_fmt = wb.add_format({'align': 'center', 'valign': 'vcenter', 'border': 1})
-    gantt_ws.merge_range(4, 0, 4, 2, "적정공기 계획", subheader_fmt)
-    gantt_ws.write(4, 3, "총간관리일", subheader_fmt)
-    gantt_ws.write(4, 4, "", subheader_fmt)
-    for col in range(timeline_start_col, last_col + 1):
-        gantt_ws.write(4, col, "", subheader_fmt)
-
-    # Column sizing (needed before shape positioning)
-    gantt_ws.set_column(0, 0, 10.625)
-    gantt_ws.set_column(1, 1, 13.375)
-    gantt_ws.set_column(2, 2, 26.875)
-    gantt_ws.set_column(3, 3, 11.375)
-    gantt_ws.set_column(4, 4, 9.625)
-    for col in range(timeline_start_col, last_col + 1):
-        gantt_ws.set_column(col, col, 5.625)
-    gantt_ws.set_row(0, 39.95)
-    gantt_ws.set_row(1, 30)
-    gantt_ws.set_row(2, 30)
-    gantt_ws.set_row(3, 30)
-    gantt_ws.set_row(4, 60)
-
     data_start_row = 5
     gantt_row = data_start_row
     item_positions = {}
+    col_pixels = gantt_col_pixels(last_col)
+    data_row_px = row_height_to_px(DATA_ROW_HEIGHT)
 
     def _day_to_px(day):
-        unit_px = gantt_ws._size_col(timeline_start_col)
+        unit_px = col_pixels[timeline_start_col]
         return max(0, (day / date_scale) * unit_px)
 
     shapes = []
@@ -389,51 +336,20 @@ def write_gantt_sheet(
     row_tops = {}
     running_y = 0
     for r in range(data_start_row, data_start_row + len(items_with_timing) + 5):
-        gantt_ws.set_row(r, 30)
         row_tops[r] = running_y
-        running_y += gantt_ws._size_row(r)
+        running_y += data_row_px
 
     cp_meta = build_cp_meta(items_with_timing)
+    cp_index = build_cp_index(items_with_timing, cp_meta)
+    subtasks_by_item = {}
+    for sub in subtask_list:
+        subtasks_by_item.setdefault(sub["item_id"], []).append(sub)
 
     for item_meta in items_with_timing:
         item = item_meta["item"]
         start_day = float(item_meta["start_day"])
         duration = max(1.0, float(item_meta["duration"] or 0))
 
-        gantt_ws.write(gantt_row, 0, item.get("main_category", ""), gantt_left_fmt)
-        gantt_ws.write(gantt_row, 1, item.get("process", ""), gantt_left_fmt)
-        gantt_ws.write(gantt_row, 2, item.get("work_type", ""), gantt_left_fmt)
-        gantt_ws.write(gantt_row, 3, item.get("calendar_days", ""), gantt_right_fmt)
-        # Apply border formats based on position
-        is_first_row = (gantt_row == data_start_row)
-        is_last_row = (gantt_row == data_start_row + len(items_with_timing) - 1)
-        
-        gantt_ws.write(gantt_row, 4, "", gantt_grid_fmt)
-        for col in range(timeline_start_col, last_col + 1):
-            # Determine which format to use
-            fmt = gantt_grid_fmt
-            is_left_col = (col == timeline_start_col)
-            is_right_col = (col == last_col)
-            
-            if is_first_row and is_left_col:
-                fmt = gantt_grid_corner_tl_fmt
-            elif is_first_row and is_right_col:
-                fmt = gantt_grid_corner_tr_fmt
-            elif is_last_row and is_left_col:
-                fmt = gantt_grid_corner_bl_fmt
-            elif is_last_row and is_right_col:
-                fmt = gantt_grid_corner_br_fmt
-            elif is_first_row:
-                fmt = gantt_grid_top_fmt
-            elif is_last_row:
-                fmt = gantt_grid_bottom_fmt
-            elif is_left_col:
-                fmt = gantt_grid_left_fmt
-            elif is_right_col:
-                fmt = gantt_grid_right_fmt
-            
-            gantt_ws.write(gantt_row, col, "", fmt)
-
         item_positions[item.get("id")] = {
             "row": gantt_row,
             "start_day": start_day,
@@ -446,19 +362,8 @@ def write_gantt_sheet(
         is_cp = meta.get("is_cp", False)
         front_parallel = float(item.get("front_parallel_days") or 0)
         back_parallel = float(item.get("back_parallel_days") or 0)
-        contained = []
-        if is_cp:
-            for other in items_with_timing:
-                other_id = other["item"].get("id")
-                if other_id == item.get("id"):
-                    continue
-                other_meta = cp_meta.get(other_id)
-                if not other_meta or not other_meta.get("is_cp"):
-                    continue
-                if other_meta["red_start"] >= red_start and other_meta["red_end"] <= red_end:
-                    contained.append(other_meta)
 
-        row_height = gantt_ws._size_row(gantt_row)
+        row_height = data_row_px
         row_top = row_tops.get(gantt_row, 0)
         label_top_y = max(0, row_top - 4)
         bar_height = 6
@@ -491,16 +396,11 @@ def write_gantt_sheet(
         })
 
         # Precompute contained parallel segments for overlay
-        contained_parallel = []
-        for other in items_with_timing:
-            other_id = other["item"].get("id")
-            if other_id == item.get("id"):
-                continue
-            other_meta = cp_meta.get(other_id)
-            if not other_meta or not other_meta.get("is_cp"):
-                continue
-            if other_meta["red_start"] >= red_start and other_meta["red_end"] <= red_end:
-                contained_parallel.append(other_meta)
+        contained_parallel = [
+            other_meta
+            for other, other_meta in cp_index.contained(red_start, red_end)
+            if other["item"].get("id") != item.get("id")
+        ]
 
         # Critical path segment (red)
         if is_cp and red_end > red_start:
@@ -560,7 +460,7 @@ def write_gantt_sheet(
 
         # Subtasks as thin blue bar near bottom of row
         if subtask_list:
-            for sub in [s for s in subtask_list if s["item_id"] == item.get("id")]:
+            for sub in subtasks_by_item.get(item.get("id"), []):
                 sub_start = float(sub["start_day"])
                 sub_duration = max(1.0, float(sub["duration"] or 0))
                 sub_start_px = _day_to_px(sub_start)
@@ -671,8 +571,8 @@ def write_gantt_sheet(
             lag = float(link.get("lag") or 0)
             x1_px = _day_to_px(x1)
             x2_px = _day_to_px(x2 + lag)
-            y1_px = from_pos.get("y_px", row_tops.get(row_y1, 0) + int(gantt_ws._size_row(row_y1) / 2))
-            y2_px = to_pos.get("y_px", row_tops.get(row_y2, 0) + int(gantt_ws._size_row(row_y2) / 2))
+            y1_px = from_pos.get("y_px", row_tops.get(row_y1, 0) + int(data_row_px / 2))
+            y2_px = to_pos.get("y_px", row_tops.get(row_y2, 0) + int(data_row_px / 2))
             node_radius = 2
             dy = y2_px - y1_px
             dx = x2_px - x1_px
@@ -781,8 +681,8 @@ def write_gantt_sheet(
 
         start_x = _day_to_px(red_end)
         end_x = _day_to_px(target_red_start)
-        start_y = from_pos.get("y_px", row_tops.get(from_pos["row"], 0) + int(gantt_ws._size_row(from_pos["row"]) / 2))
-        end_y = to_pos.get("y_px", row_tops.get(to_pos["row"], 0) + int(gantt_ws._size_row(to_pos["row"]) / 2))
+        start_y = from_pos.get("y_px", row_tops.get(from_pos["row"], 0) + int(data_row_px / 2))
+        end_y = to_pos.get("y_px", row_tops.get(to_pos["row"], 0) + int(data_row_px / 2))
 
         shapes.append({
             'type': 'line',
@@ -793,16 +693,11 @@ def write_gantt_sheet(
         })
 
         # Contained CP detours
-        contained = []
-        for other in items_with_timing:
-            other_id = other["item"].get("id")
-            if other_id == item.get("id"):
-                continue
-            other_meta = cp_meta.get(other_id)
-            if not other_meta or not other_meta.get("is_cp"):
-                continue
-            if other_meta["red_start"] >= red_start and other_meta["red_end"] <= red_end:
-                contained.append((other, other_meta))
+        contained = [
+            (other, other_meta)
+            for other, other_meta in cp_index.contained(red_start, red_end)
+            if other["item"].get("id") != item.get("id")
+        ]
 
         if contained:
             contained.sort(key=lambda x: x[1]["red_start"])
@@ -813,7 +708,7 @@ def write_gantt_sheet(
                 down_x = _day_to_px(other_meta["red_start"])
                 up_x = _day_to_px(other_meta["red_end"])
                 outer_y = start_y
-                inner_y = inner_pos.get("y_px", row_tops.get(inner_pos["row"], 0) + int(gantt_ws._size_row(inner_pos["row"]) / 2))
+                inner_y = inner_pos.get("y_px", row_tops.get(inner_pos["row"], 0) + int(data_row_px / 2))
                 shapes.append({
                     'type': 'line',
                     'x1': down_x, 'y1': outer_y,
@@ -838,7 +733,7 @@ def write_gantt_sheet(
             'x': ref_x_px,
             'y': y,
             'w': 2,
-            'h': gantt_ws._size_row(r),
+            'h': data_row_px,
             'line': {'color': 'FF0000', 'width': 1}
         })
 
@@ -1036,7 +931,7 @@ def write_gantt_sheet(
                 else:
                     text_width += 8
             
-            col4_width_px = gantt_ws._size_col(4)  # ~72 pixels
+            col4_width_px = col_pixels[4]  # ~72 pixels
             min_width = col4_width_px - 4
             
             # Adjust box size to fit text, but at least column 4 width
@@ -1076,6 +971,234 @@ def write_gantt_sheet(
                 'font': {'size': 9, 'color': 'FFFFFF', 'bold': True}
             })
 
+    return {
+        "items_with_timing": items_with_timing,
+        "total_days": total_days,
+        "date_scale": date_scale,
+        "timeline_months": timeline_months,
+        "timeline_days": timeline_days,
+        "timeline_start_col": timeline_start_col,
+        "last_col": last_col,
+        "data_start_row": data_start_row,
+        "gantt_row": gantt_row,
+        "shapes": shapes,
+    }
+
+
+def write_gantt_sheet(
+    wb,
+    items,
+    sub_tasks,
+    links,
+    project_name,
+    start_date,
+    custom_milestones=None,
+    cost_inputs=None,
+    include_bohal_table=False,
+    work_week_days=6,
+    holiday_set=None,
+):
+    # ---- Sheet 2: Gantt (shape-based, Excel-editable) ----
+    gantt_ws = wb.add_worksheet("공사예정공정표")
+
+    layout = build_gantt_layout(items, sub_tasks, links, start_date, custom_milestones)
+    items_with_timing = layout["items_with_timing"]
+    total_days = layout["total_days"]
+    date_scale = layout["date_scale"]
+    timeline_start_col = layout["timeline_start_col"]
+    last_col = layout["last_col"]
+    data_start_row = layout["data_start_row"]
+    gantt_row = layout["gantt_row"]
+
+    # Formats
+    gantt_title_fmt = wb.add_format({'bold': True, 'font_size': 14, 'align': 'center', 'valign': 'vcenter'})
+    gantt_header_fmt = wb.add_format({'bold': True, 'bg_color': '#D9D9D9', 'align': 'center', 'valign': 'vcenter', 'border': 1})
+    gantt_left_fmt = wb.add_format({'align': 'left', 'valign': 'vcenter', 'border': 1})
+    gantt_right_fmt = wb.add_format({'align': 'right', 'valign': 'vcenter', 'border': 1, 'num_format': '#,##0.0'})
+    gantt_grid_fmt = wb.add_format({
+        'top': 4,      # Dotted
+        'bottom': 4,   # Dotted
+        'left': 4,     # Dotted
+        'right': 4,    # Dotted
+        'top_color': '#D3D3D3',
+        'bottom_color': '#D3D3D3',
+        'left_color': '#D3D3D3',
+        'right_color': '#D3D3D3'
+    })
+    # Border formats for outer edges (black solid outside, dotted gray inside)
+    gantt_grid_top_fmt = wb.add_format({
+        'top': 1,      # Solid black
+        'top_color': '#000000',
+        'bottom': 4,   # Dotted gray
+        'bottom_color': '#D3D3D3',
+        'left': 4,     # Dotted gray
+        'left_color': '#D3D3D3',
+        'right': 4,    # Dotted gray
+        'right_color': '#D3D3D3'
+    })
+    gantt_grid_bottom_fmt = wb.add_format({
+        'top': 4,      # Dotted gray
+        'top_color': '#D3D3D3',
+        'bottom': 1,   # Solid black
+        'bottom_color': '#000000',
+        'left': 4,     # Dotted gray
+        'left_color': '#D3D3D3',
+        'right': 4,    # Dotted gray
+        'right_color': '#D3D3D3'
+    })
+    gantt_grid_left_fmt = wb.add_format({
+        'top': 4,      # Dotted gray
+        'top_color': '#D3D3D3',
+        'bottom': 4,   # Dotted gray
+        'bottom_color': '#D3D3D3',
+        'left': 1,     # Solid black
+        'left_color': '#000000',
+        'right': 4,    # Dotted gray
+        'right_color': '#D3D3D3'
+    })
+    gantt_grid_right_fmt = wb.add_format({
+        'top': 4,      # Dotted gray
+        'top_color': '#D3D3D3',
+        'bottom': 4,   # Dotted gray
+        'bottom_color': '#D3D3D3',
+        'left': 4,     # Dotted gray
+        'left_color': '#D3D3D3',
+        'right': 1,    # Solid black
+        'right_color': '#000000'
+    })
+    gantt_grid_corner_tl_fmt = wb.add_format({
+        'top': 1,      # Solid black
+        'top_color': '#000000',
+        'bottom': 4,   # Dotted gray
+        'bottom_color': '#D3D3D3',
+        'left': 1,     # Solid black
+        'left_color': '#000000',
+        'right': 4,    # Dotted gray
+        'right_color': '#D3D3D3'
+    })
+    gantt_grid_corner_tr_fmt = wb.add_format({
+        'top': 1,      # Solid black
+        'top_color': '#000000',
+        'bottom': 4,   # Dotted gray
+        'bottom_color': '#D3D3D3',
+        'left': 4,     # Dotted gray
+        'left_color': '#D3D3D3',
+        'right': 1,    # Solid black
+        'right_color': '#000000'
+    })
+    gantt_grid_corner_bl_fmt = wb.add_format({
+        'top': 4,      # Dotted gray
+        'top_color': '#D3D3D3',
+        'bottom': 1,   # Solid black
+        'bottom_color': '#000000',
+        'left': 1,     # Solid black
+        'left_color': '#000000',
+        'right': 4,    # Dotted gray
+        'right_color': '#D3D3D3'
+    })
+    gantt_grid_corner_br_fmt = wb.add_format({
+        'top': 4,      # Dotted gray
+        'top_color': '#D3D3D3',
+        'bottom': 1,   # Solid black
+        'bottom_color': '#000000',
+        'left': 4,     # Dotted gray
+        'left_color': '#D3D3D3',
+        'right': 1,    # Solid black
+        'right_color': '#000000'
+    })
+    bohal_title_fmt = wb.add_format({'bold': True, 'bg_color': '#FFF2CC', 'align': 'left', 'valign': 'vcenter', 'border': 1})
+    bohal_header_fmt = wb.add_format({'bold': True, 'bg_color': '#E2E8F0', 'align': 'center', 'valign': 'vcenter', 'border': 1})
+    bohal_left_fmt = wb.add_format({'align': 'left', 'valign': 'vcenter', 'border': 1})
+    bohal_cost_fmt = wb.add_format({'align': 'right', 'valign': 'vcenter', 'border': 1, 'num_format': '#,##0'})
+    bohal_pct_fmt = wb.add_format({'align': 'right', 'valign': 'vcenter', 'border': 1, 'num_format': '0.0"%"'})
+
+    # Title and headers
+    gantt_ws.merge_range(0, 0, 0, last_col, "공 사 예 정 공 정 표", gantt_title_fmt)
+    gantt_ws.merge_range(1, 0, 1, timeline_start_col - 1, f"공사명 : {project_name}", gantt_left_fmt)
+    gantt_ws.merge_range(1, timeline_start_col, 1, last_col, "", gantt_left_fmt)
+
+    gantt_ws.merge_range(2, 0, 3, 0, "구분", gantt_header_fmt)
+    gantt_ws.merge_range(2, 1, 3, 1, "공정", gantt_header_fmt)
+    gantt_ws.merge_range(2, 2, 3, 2, "공종", gantt_header_fmt)
+    gantt_ws.merge_range(2, 3, 3, 3, "Calendar Day", gantt_header_fmt)
+    gantt_ws.merge_range(2, 4, 3, 4, "", gantt_header_fmt)
+
+    month_col = timeline_start_col
+    last_year_label = None
+    for month in layout["timeline_months"]:
+        label = month["label"]
+        if date_scale >= 30:
+            year = label.split(".")[0]
+            label = year if year != last_year_label else ""
+            last_year_label = year
+        end_col = month_col + month["count"] - 1
+        if end_col > month_col:
+            gantt_ws.merge_range(2, month_col, 2, end_col, label, gantt_header_fmt)
+        else:
+            gantt_ws.write(2, month_col, label, gantt_header_fmt)
+        month_col = end_col + 1
+
+    for idx, label in enumerate(layout["timeline_days"]):
+        col = timeline_start_col + idx
+        gantt_ws.write(3, col, str(label).replace("일", ""), gantt_header_fmt)
+
+    # Sub-header row (row 4): "적정공기 계획" and "총간관리일"
+    subheader_fmt = wb.add_format({'align': 'center', 'valign': 'vcenter', 'border': 1})
+    gantt_ws.merge_range(4, 0, 4, 2, "적정공기 계획", subheader_fmt)
+    gantt_ws.write(4, 3, "총간관리일", subheader_fmt)
+    gantt_ws.write(4, 4, "", subheader_fmt)
+    for col in range(timeline_start_col, last_col + 1):
+        gantt_ws.write(4, col, "", subheader_fmt)
+
+    # Column sizing (needed before shape positioning)
+    gantt_ws.set_column(0, 0, 10.625)
+    gantt_ws.set_column(1, 1, 13.375)
+    gantt_ws.set_column(2, 2, 26.875)
+    gantt_ws.set_column(3, 3, 11.375)
+    gantt_ws.set_column(4, 4, 9.625)
+    gantt_ws.set_column(timeline_start_col, last_col, 5.625)
+    gantt_ws.set_row(0, 39.95)
+    gantt_ws.set_row(1, 30)
+    gantt_ws.set_row(2, 30)
+    gantt_ws.set_row(3, 30)
+    gantt_ws.set_row(4, 60)
+
+    for row, item_meta in enumerate(items_with_timing, start=data_start_row):
+        item = item_meta["item"]
+        gantt_ws.write(row, 0, item.get("main_category", ""), gantt_left_fmt)
+        gantt_ws.write(row, 1, item.get("process", ""), gantt_left_fmt)
+        gantt_ws.write(row, 2, item.get("work_type", ""), gantt_left_fmt)
+        gantt_ws.write(row, 3, item.get("calendar_days", ""), gantt_right_fmt)
+        gantt_ws.write(row, 4, "", gantt_grid_fmt)
+    for r in range(data_start_row, data_start_row + len(items_with_timing) + 5):
+        gantt_ws.set_row(r, DATA_ROW_HEIGHT)
+
+    # 타임라인 격자: 셀마다 쓰지 않고 구간(바깥 테두리 실선, 안쪽 점선)별 조건부 서식 하나씩
+    for first_row, end_row, is_first_row, is_last_row in _edge_bands(data_start_row, gantt_row - 1):
+        for first_col, end_col, is_left_col, is_right_col in _edge_bands(timeline_start_col, last_col):
+            fmt = gantt_grid_fmt
+            if is_first_row and is_left_col:
+                fmt = gantt_grid_corner_tl_fmt
+            elif is_first_row and is_right_col:
+                fmt = gantt_grid_corner_tr_fmt
+            elif is_last_row and is_left_col:
+                fmt = gantt_grid_corner_bl_fmt
+            elif is_last_row and is_right_col:
+                fmt = gantt_grid_corner_br_fmt
+            elif is_first_row:
+                fmt = gantt_grid_top_fmt
+            elif is_last_row:
+                fmt = gantt_grid_bottom_fmt
+            elif is_left_col:
+                fmt = gantt_grid_left_fmt
+            elif is_right_col:
+                fmt = gantt_grid_right_fmt
+            gantt_ws.conditional_format(first_row, first_col, end_row, end_col, {
+                'type': 'formula',
+                'criteria': 'TRUE',
+                'format': fmt,
+            })
+
     if include_bohal_table:
         normalized_cost_inputs = {}
         if isinstance(cost_inputs, dict):
@@ -1103,29 +1226,14 @@ def write_gantt_sheet(
             })
 
         # --- Workday / holiday classification (frontend parity) ---
-        holiday_lookup = holiday_set if isinstance(holiday_set, (set, frozenset)) else set()
-        try:
-            wwd = int(work_week_days)
-        except (TypeError, ValueError):
-            wwd = 6
-
-        def _is_working(offset_idx):
-            d = start_date + timedelta(days=offset_idx)
-            # frontend rule: workWeekDays>=7 all, 6 exclude Sunday, 5 exclude Sat+Sun
-            # python weekday(): Mon=0..Sun=6
-            dow = d.weekday()
-            if wwd >= 7:
-                base = True
-            elif wwd == 6:
-                base = dow != 6  # not Sunday
-            else:
-                base = dow < 5  # Mon-Fri
-            if not base:
-                return False
-            return d.isoformat() not in holiday_lookup
-
+        # workWeekDays>=7 all, 6 exclude Sunday, 5 exclude Sat+Sun, holidays excluded
         matrix_days = total_days  # one column per calendar day
-        working_flags = [_is_working(i) for i in range(matrix_days)]
+        holiday_calendar = WorkdayCalendar.from_dates(
+            holiday_set if isinstance(holiday_set, (set, frozenset)) else ()
+        )
+        working_flags = holiday_calendar.workday_flags(
+            start_date, matrix_days, work_week_days=work_week_days
+        ).tolist()
 
         # --- Formats ---
         bohal_day_header_fmt = wb.add_format({
@@ -1155,8 +1263,9 @@ def write_gantt_sheet(
             matrix_last_col = 4
 
         # Day columns width (narrow, per-day) — only set beyond existing gantt last_col
-        for col in range(max(matrix_day_start_col, last_col + 1), matrix_last_col + 1):
-            gantt_ws.set_column(col, col, 3.2)
+        first_day_col = max(matrix_day_start_col, last_col + 1)
+        if first_day_col <= matrix_last_col:
+            gantt_ws.set_column(first_day_col, matrix_last_col, 3.2)
 
         bohal_title_row = gantt_row + 2
         bohal_month_row = bohal_title_row + 1
@@ -1211,18 +1320,29 @@ def write_gantt_sheet(
                 gantt_ws.write(target_row, 3, row["cost"], bohal_cost_fmt)
                 gantt_ws.write(target_row, 4, ratio, bohal_pct_fmt)
 
-                s = row["start_day"]
-                e = s + row["duration"]
-                for offset in range(matrix_days):
-                    col = matrix_day_start_col + offset
-                    in_span = row["duration"] > 0 and s <= offset < e
-                    active = in_span and working_flags[offset]
-                    if active:
-                        gantt_ws.write(target_row, col, 1, bohal_cell_active_fmt)
-                        day_totals[offset] += 1
-                    else:
-                        fmt = bohal_cell_off_fmt if not working_flags[offset] else bohal_cell_idle_fmt
-                        gantt_ws.write(target_row, col, 0, fmt)
+                # 기간 안의 작업일만 1 로 쓴다 (나머지 칸은 아래 조건부 서식)
+                if row["duration"] > 0:
+                    s = row["start_day"]
+                    e = s + row["duration"]
+                    for offset in range(max(0, math.ceil(s)), min(matrix_days, math.ceil(e))):
+                        if working_flags[offset]:
+                            gantt_ws.write(target_row, matrix_day_start_col + offset, 1, bohal_cell_active_fmt)
+                            day_totals[offset] += 1
+
+            # 빈 칸: 휴일 열은 음영, 나머지는 테두리만 (행 × 일수만큼 셀을 쓰지 않도록 구간 단위 조건부 서식)
+            last_data_row = bohal_data_row + len(bohal_rows) - 1
+            off_runs = _column_runs(matrix_day_start_col + offset for offset in range(matrix_days) if not working_flags[offset])
+            if off_runs:
+                gantt_ws.conditional_format(bohal_data_row, off_runs[0][0], last_data_row, off_runs[0][1], {
+                    'type': 'blanks',
+                    'format': bohal_cell_off_fmt,
+                    'multi_range': " ".join(xl_range(bohal_data_row, c0, last_data_row, c1) for c0, c1 in off_runs),
+                })
+            if matrix_days > 0:
+                gantt_ws.conditional_format(bohal_data_row, matrix_day_start_col, last_data_row, matrix_last_col, {
+                    'type': 'blanks',
+                    'format': bohal_cell_idle_fmt,
+                })
 
             total_row = bohal_data_row + len(bohal_rows)
             gantt_ws.merge_range(total_row, 0, total_row, 2, "합계", bohal_header_fmt)
@@ -1240,7 +1360,7 @@ def write_gantt_sheet(
             )
 
     return {
-        "shapes": shapes,
+        "shapes": layout["shapes"],
         "last_col": last_col,
         "gantt_row": gantt_row,
         "timeline_start_col": timeline_start_col,
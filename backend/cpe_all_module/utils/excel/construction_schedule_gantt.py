@@ -1,7 +1,14 @@
 import math
+import re
+import shutil
+from bisect import bisect_right
 from io import BytesIO
+from itertools import accumulate
 import zipfile
 import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+from ..schedule_intervals import IntervalIndex
 
 
 def is_parallel(item):
@@ -109,375 +116,334 @@ def build_cp_meta(items_with_timing):
     return cp_meta
 
 
-def inject_gantt_drawing(xlsx_bytes, *, shapes, last_col, gantt_row, timeline_start_col, data_start_row):
-    NS = {
-        'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
-        'rel': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
-        'xdr': 'http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing',
-        'a': 'http://schemas.openxmlformats.org/drawingml/2006/main'
-    }
-    for k, v in NS.items():
-        ET.register_namespace('' if k == 'main' else k, v)
-
-    def col_width_to_px(width):
-        max_digit_width = 7.0
-        padding = 5.0
-        if width <= 0:
-            return 0
-        if width < 1:
-            return int(width * (max_digit_width + padding) + 0.5)
-        return int(width * max_digit_width + 0.5) + int(padding)
-
-    def row_height_to_px(height_pt):
-        return int(height_pt * 4 / 3 + 0.5)
-
-    def px_to_col_off(x_px, col_pixels):
-        col = 0
-        remaining = max(0, x_px)
-        while col < len(col_pixels) - 1 and remaining >= col_pixels[col]:
-            remaining -= col_pixels[col]
-            col += 1
-        remaining = min(remaining, col_pixels[col] - 1 if col_pixels[col] > 0 else 0)
-        return col, int(remaining)
-
-    def px_to_row_off(y_px, row_pixels):
-        row = 0
-        remaining = max(0, y_px)
-        while row < len(row_pixels) - 1 and remaining >= row_pixels[row]:
-            remaining -= row_pixels[row]
-            row += 1
-        remaining = min(remaining, row_pixels[row] - 1 if row_pixels[row] > 0 else 0)
-        return row, int(remaining)
-
-    def px_to_emu(px):
-        return int(px * 9525)
-
-    # Build column/row pixel maps
-    col_pixels = []
-    for c in range(0, last_col + 1):
-        if c == 0:
-            w = 10.625
-        elif c == 1:
-            w = 13.375
-        elif c == 2:
-            w = 26.875
-        elif c == 3:
-            w = 11.375
-        elif c == 4:
-            w = 9.625
-        else:
-            w = 5.625
-        col_pixels.append(col_width_to_px(w))
-    row_pixels = []
-    for r in range(0, gantt_row + 5):
-        if r == 0:
-            h = 39.95
-        elif r == 4:
-            h = 60
-        else:
-            h = 30
-        row_pixels.append(row_height_to_px(h))
-
-    timeline_origin_x = sum(col_pixels[:timeline_start_col])
-    timeline_origin_y = sum(row_pixels[:data_start_row])
-
-    # Create drawing XML
-    wsdr = ET.Element(ET.QName(NS['xdr'], 'wsDr'))
-    shape_id = 1
-
-    def add_shape(shape):
-        nonlocal shape_id
-        is_ellipse = shape['type'] == 'ellipse'
-        if shape['type'] == 'line':
-            abs_x1 = timeline_origin_x + shape['x1']
-            abs_y1 = timeline_origin_y + shape['y1']
-            abs_x2 = timeline_origin_x + shape['x2']
-            abs_y2 = timeline_origin_y + shape['y2']
-            col1, x1 = px_to_col_off(abs_x1, col_pixels)
-            row1, y1 = px_to_row_off(abs_y1, row_pixels)
-            col2, x2 = px_to_col_off(abs_x2, col_pixels)
-            row2, y2 = px_to_row_off(abs_y2, row_pixels)
-        else:
-            abs_x = timeline_origin_x + shape['x']
-            abs_y = timeline_origin_y + shape['y']
-            abs_w = max(1, shape['w'])
-            abs_h = max(1, shape['h'])
-            if is_ellipse:
-                size = max(abs_w, abs_h)
-                abs_w = size
-                abs_h = size
-
-            col1, x1 = px_to_col_off(abs_x, col_pixels)
-            row1, y1 = px_to_row_off(abs_y, row_pixels)
-            if not is_ellipse:
-                col2, x2 = px_to_col_off(abs_x + abs_w, col_pixels)
-                row2, y2 = px_to_row_off(abs_y + abs_h, row_pixels)
+def build_cp_index(items_with_timing, cp_meta):
+    """CP 구간 색인. 조회 결과는 (item_meta, cp_meta) 를 items_with_timing 순서로 돌려준다"""
+    entries = []
+    for item_meta in items_with_timing:
+        meta = cp_meta.get(item_meta["item"].get("id"))
+        if meta and meta.get("is_cp"):
+            entries.append((meta["red_start"], meta["red_end"], (item_meta, meta)))
+    return IntervalIndex(entries)
+
+
+XDR_NS = 'http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing'
+A_NS = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+DRAWING_REL_TYPE = REL_NS + '/drawing'
+DRAWING_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.drawing+xml'
+GANTT_SHEET_NAME = '공사예정공정표'
+DATA_ROW_HEIGHT = 30
+
+_DRAWING_TAG_RE = re.compile(rb'<drawing\b[^>]*/>')
+_PAGE_SETUP_RE = re.compile(rb'<pageSetup\b[^>]*/>')
+_REL_PREFIX_RE = re.compile(rb'xmlns:(\w+)="' + REL_NS.encode('utf-8') + rb'"')
+_ATTR_ENTITIES = {'"': '&quot;', '\r': '&#13;', '\n': '&#10;', '\t': '&#09;'}
+
+
+def _attr(value):
+    return escape(value, _ATTR_ENTITIES)
+
+
+def col_width_to_px(width):
+    max_digit_width = 7.0
+    padding = 5.0
+    if width <= 0:
+        return 0
+    if width < 1:
+        return int(width * (max_digit_width + padding) + 0.5)
+    return int(width * max_digit_width + 0.5) + int(padding)
+
+
+def row_height_to_px(height_pt):
+    return int(height_pt * 4 / 3 + 0.5)
+
+
+def gantt_col_pixels(last_col):
+    """간트 시트 열 너비(px): A~E 고정폭, 이후 타임라인 열"""
+    fixed = (10.625, 13.375, 26.875, 11.375, 9.625)
+    return [col_width_to_px(fixed[c] if c < len(fixed) else 5.625) for c in range(0, last_col + 1)]
+
+
+def gantt_row_pixels(row_count):
+    """간트 시트 행 높이(px): 제목 39.95pt, 5행 60pt, 나머지 30pt"""
+    return [
+        row_height_to_px(39.95 if r == 0 else 60 if r == 4 else DATA_ROW_HEIGHT) for r in range(0, row_count)
+    ]
+
+
+class PixelAxis:
+    """열/행 픽셀 크기 누적합 → (셀 번호, 셀 안 오프셋) 조회 (bisect)"""
+
+    def __init__(self, sizes):
+        self.sizes = list(sizes)
+        self.edges = list(accumulate(self.sizes, initial=0))
+
+    def origin(self, index):
+        return self.edges[index]
+
+    def locate(self, px):
+        # 크기 0 인 셀은 건너뛰고, 마지막 셀을 넘는 위치는 마지막 셀 끝에 붙인다
+        px = max(0, px)
+        index = min(bisect_right(self.edges, px) - 1, len(self.sizes) - 1)
+        remaining = px - self.edges[index]
+        size = self.sizes[index]
+        remaining = min(remaining, size - 1 if size > 0 else 0)
+        return index, int(remaining)
+
+
+def _px_to_emu(px):
+    return int(px * 9525)
 
+
+def _anchor_point(tag, col, col_off, row, row_off):
+    return (
+        f'<xdr:{tag}><xdr:col>{col}</xdr:col><xdr:colOff>{_px_to_emu(col_off)}</xdr:colOff>'
+        f'<xdr:row>{row}</xdr:row><xdr:rowOff>{_px_to_emu(row_off)}</xdr:rowOff></xdr:{tag}>'
+    )
+
+
+def _line_xml(line, width, default_color, arrows):
+    parts = [f'<a:ln w="{int(width * 12700)}"><a:solidFill>'
+             f'<a:srgbClr val="{_attr(line.get("color", default_color))}" /></a:solidFill>']
+    dash = line.get('dash')
+    if dash:
+        parts.append(f'<a:prstDash val="{_attr(dash)}" />')
+    if arrows and line.get('arrow') == 'triangle':
+        end = 'tailEnd' if line.get('arrow_dir', 'head') == 'tail' else 'headEnd'
+        parts.append(f'<a:{end} type="triangle" w="lg" len="lg" />')
+    parts.append('</a:ln>')
+    return ''.join(parts)
+
+
+def _shape_xml(shape, shape_id, cols, rows, origin_x, origin_y):
+    """도형 하나의 anchor XML 조각"""
+    kind = shape['type']
+    is_ellipse = kind == 'ellipse'
+    if kind == 'line':
+        col1, x1 = cols.locate(origin_x + shape['x1'])
+        row1, y1 = rows.locate(origin_y + shape['y1'])
+        col2, x2 = cols.locate(origin_x + shape['x2'])
+        row2, y2 = rows.locate(origin_y + shape['y2'])
+    else:
+        abs_x = origin_x + shape['x']
+        abs_y = origin_y + shape['y']
+        abs_w = max(1, shape['w'])
+        abs_h = max(1, shape['h'])
         if is_ellipse:
-            anchor = ET.SubElement(wsdr, ET.QName(NS['xdr'], 'oneCellAnchor'))
-            frm = ET.SubElement(anchor, ET.QName(NS['xdr'], 'from'))
-            ET.SubElement(frm, ET.QName(NS['xdr'], 'col')).text = str(col1)
-            ET.SubElement(frm, ET.QName(NS['xdr'], 'colOff')).text = str(px_to_emu(x1))
-            ET.SubElement(frm, ET.QName(NS['xdr'], 'row')).text = str(row1)
-            ET.SubElement(frm, ET.QName(NS['xdr'], 'rowOff')).text = str(px_to_emu(y1))
-            ET.SubElement(
-                anchor,
-                ET.QName(NS['xdr'], 'ext'),
-                cx=str(px_to_emu(abs_w)),
-                cy=str(px_to_emu(abs_h))
-            )
-        else:
-            anchor = ET.SubElement(wsdr, ET.QName(NS['xdr'], 'twoCellAnchor'))
-            frm = ET.SubElement(anchor, ET.QName(NS['xdr'], 'from'))
-            ET.SubElement(frm, ET.QName(NS['xdr'], 'col')).text = str(col1)
-            ET.SubElement(frm, ET.QName(NS['xdr'], 'colOff')).text = str(px_to_emu(x1))
-            ET.SubElement(frm, ET.QName(NS['xdr'], 'row')).text = str(row1)
-            ET.SubElement(frm, ET.QName(NS['xdr'], 'rowOff')).text = str(px_to_emu(y1))
-            to = ET.SubElement(anchor, ET.QName(NS['xdr'], 'to'))
-            ET.SubElement(to, ET.QName(NS['xdr'], 'col')).text = str(col2)
-            ET.SubElement(to, ET.QName(NS['xdr'], 'colOff')).text = str(px_to_emu(x2))
-            ET.SubElement(to, ET.QName(NS['xdr'], 'row')).text = str(row2)
-            ET.SubElement(to, ET.QName(NS['xdr'], 'rowOff')).text = str(px_to_emu(y2))
-
-        if shape['type'] in ('cxn', 'cxn_bend'):
-            sp = ET.SubElement(anchor, ET.QName(NS['xdr'], 'cxnSp'))
-            nv = ET.SubElement(sp, ET.QName(NS['xdr'], 'nvCxnSpPr'))
-            ET.SubElement(nv, ET.QName(NS['xdr'], 'cNvPr'), id=str(shape_id), name=f"Connector {shape_id}")
-            ET.SubElement(nv, ET.QName(NS['xdr'], 'cNvCxnSpPr'))
-            ET.SubElement(nv, ET.QName(NS['xdr'], 'nvPr'))
-            sppr = ET.SubElement(sp, ET.QName(NS['xdr'], 'spPr'))
-            xfrm = ET.SubElement(sppr, ET.QName(NS['a'], 'xfrm'))
-            ET.SubElement(xfrm, ET.QName(NS['a'], 'off'), x="0", y="0")
-            ET.SubElement(xfrm, ET.QName(NS['a'], 'ext'),
-                          cx=str(px_to_emu(abs_w)), cy=str(px_to_emu(abs_h)))
-            prst_type = "bentConnector2" if shape['type'] == 'cxn_bend' else "straightConnector1"
-            prst = ET.SubElement(sppr, ET.QName(NS['a'], 'prstGeom'), prst=prst_type)
-            ET.SubElement(prst, ET.QName(NS['a'], 'avLst'))
-            line = shape.get('line')
-            if line:
-                width_pt = float(line.get('width', 1))
-                ln = ET.SubElement(sppr, ET.QName(NS['a'], 'ln'), w=str(int(width_pt * 12700)))
-                lsolid = ET.SubElement(ln, ET.QName(NS['a'], 'solidFill'))
-                ET.SubElement(lsolid, ET.QName(NS['a'], 'srgbClr'), val=line.get('color', 'FF0000'))
-                dash = line.get('dash')
-                if dash:
-                    ET.SubElement(ln, ET.QName(NS['a'], 'prstDash'), val=dash)
-                if line.get('arrow') == 'triangle':
-                    arrow_dir = line.get('arrow_dir', 'head')
-                    if arrow_dir == 'tail':
-                        ET.SubElement(ln, ET.QName(NS['a'], 'tailEnd'), type="triangle", w="lg", len="lg")
-                    else:
-                        ET.SubElement(ln, ET.QName(NS['a'], 'headEnd'), type="triangle", w="lg", len="lg")
-            ET.SubElement(anchor, ET.QName(NS['xdr'], 'clientData'))
-        elif shape['type'] == 'line':
-            sp = ET.SubElement(anchor, ET.QName(NS['xdr'], 'sp'))
-            nv = ET.SubElement(sp, ET.QName(NS['xdr'], 'nvSpPr'))
-            ET.SubElement(nv, ET.QName(NS['xdr'], 'cNvPr'), id=str(shape_id), name=f"Line {shape_id}")
-            ET.SubElement(nv, ET.QName(NS['xdr'], 'cNvSpPr'))
-            ET.SubElement(nv, ET.QName(NS['xdr'], 'nvPr'))
-            sppr = ET.SubElement(sp, ET.QName(NS['xdr'], 'spPr'))
-            xfrm = ET.SubElement(sppr, ET.QName(NS['a'], 'xfrm'))
-            ET.SubElement(xfrm, ET.QName(NS['a'], 'off'), x="0", y="0")
-            ET.SubElement(xfrm, ET.QName(NS['a'], 'ext'), cx="0", cy="0")
-            prst = ET.SubElement(sppr, ET.QName(NS['a'], 'prstGeom'), prst="line")
-            ET.SubElement(prst, ET.QName(NS['a'], 'avLst'))
-            line = shape.get('line')
-            if line:
-                ln = ET.SubElement(sppr, ET.QName(NS['a'], 'ln'), w=str(int(line.get('width', 1) * 12700)))
-                lsolid = ET.SubElement(ln, ET.QName(NS['a'], 'solidFill'))
-                ET.SubElement(lsolid, ET.QName(NS['a'], 'srgbClr'), val=line.get('color', '94A3B8'))
-                dash = line.get('dash')
-                if dash:
-                    ET.SubElement(ln, ET.QName(NS['a'], 'prstDash'), val=dash)
-                if line.get('arrow') == 'triangle':
-                    arrow_dir = line.get('arrow_dir', 'head')
-                    if arrow_dir == 'tail':
-                        ET.SubElement(ln, ET.QName(NS['a'], 'tailEnd'), type="triangle", w="lg", len="lg")
-                    else:
-                        ET.SubElement(ln, ET.QName(NS['a'], 'headEnd'), type="triangle", w="lg", len="lg")
-            ET.SubElement(anchor, ET.QName(NS['xdr'], 'clientData'))
+            abs_w = abs_h = max(abs_w, abs_h)
+        col1, x1 = cols.locate(abs_x)
+        row1, y1 = rows.locate(abs_y)
+        if not is_ellipse:
+            col2, x2 = cols.locate(abs_x + abs_w)
+            row2, y2 = rows.locate(abs_y + abs_h)
+
+    if is_ellipse:
+        anchor_tag = 'oneCellAnchor'
+        parts = [
+            '<xdr:oneCellAnchor>',
+            _anchor_point('from', col1, x1, row1, y1),
+            f'<xdr:ext cx="{_px_to_emu(abs_w)}" cy="{_px_to_emu(abs_h)}" />',
+        ]
+    else:
+        anchor_tag = 'twoCellAnchor'
+        parts = [
+            '<xdr:twoCellAnchor>',
+            _anchor_point('from', col1, x1, row1, y1),
+            _anchor_point('to', col2, x2, row2, y2),
+        ]
+
+    line = shape.get('line')
+    if kind in ('cxn', 'cxn_bend'):
+        prst_type = "bentConnector2" if kind == 'cxn_bend' else "straightConnector1"
+        parts.append(
+            f'<xdr:cxnSp><xdr:nvCxnSpPr><xdr:cNvPr id="{shape_id}" name="Connector {shape_id}" />'
+            '<xdr:cNvCxnSpPr /><xdr:nvPr /></xdr:nvCxnSpPr><xdr:spPr>'
+            f'<a:xfrm><a:off x="0" y="0" /><a:ext cx="{_px_to_emu(abs_w)}" cy="{_px_to_emu(abs_h)}" /></a:xfrm>'
+            f'<a:prstGeom prst="{prst_type}"><a:avLst /></a:prstGeom>'
+        )
+        if line:
+            parts.append(_line_xml(line, float(line.get('width', 1)), 'FF0000', arrows=True))
+        parts.append('</xdr:spPr></xdr:cxnSp>')
+    elif kind == 'line':
+        parts.append(
+            f'<xdr:sp><xdr:nvSpPr><xdr:cNvPr id="{shape_id}" name="Line {shape_id}" />'
+            '<xdr:cNvSpPr /><xdr:nvPr /></xdr:nvSpPr><xdr:spPr>'
+            '<a:xfrm><a:off x="0" y="0" /><a:ext cx="0" cy="0" /></a:xfrm>'
+            '<a:prstGeom prst="line"><a:avLst /></a:prstGeom>'
+        )
+        if line:
+            parts.append(_line_xml(line, line.get('width', 1), '94A3B8', arrows=True))
+        parts.append('</xdr:spPr></xdr:sp>')
+    else:
+        # 회전은 1/60000 도 단위 (180° = 10800000)
+        rotation = shape.get('rotation')
+        xfrm = '<a:xfrm>' if rotation is None else f'<a:xfrm rot="{int(rotation * 60000)}">'
+        prst_type = "rect" if kind == 'text' else kind
+        parts.append(
+            f'<xdr:sp><xdr:nvSpPr><xdr:cNvPr id="{shape_id}" name="Shape {shape_id}" />'
+            '<xdr:cNvSpPr /><xdr:nvPr /></xdr:nvSpPr><xdr:spPr>'
+            f'{xfrm}<a:off x="0" y="0" /><a:ext cx="{_px_to_emu(abs_w)}" cy="{_px_to_emu(abs_h)}" /></a:xfrm>'
+            f'<a:prstGeom prst="{_attr(prst_type)}"><a:avLst /></a:prstGeom>'
+        )
+        fill = shape.get('fill')
+        if kind != 'text' and fill:
+            parts.append(f'<a:solidFill><a:srgbClr val="{_attr(fill)}" /></a:solidFill>')
         else:
-            sp = ET.SubElement(anchor, ET.QName(NS['xdr'], 'sp'))
-            nv = ET.SubElement(sp, ET.QName(NS['xdr'], 'nvSpPr'))
-            ET.SubElement(nv, ET.QName(NS['xdr'], 'cNvPr'), id=str(shape_id), name=f"Shape {shape_id}")
-            ET.SubElement(nv, ET.QName(NS['xdr'], 'cNvSpPr'))
-            ET.SubElement(nv, ET.QName(NS['xdr'], 'nvPr'))
-
-            sppr = ET.SubElement(sp, ET.QName(NS['xdr'], 'spPr'))
-            xfrm = ET.SubElement(sppr, ET.QName(NS['a'], 'xfrm'))
-            # Add rotation if specified (in degrees, converted to 60000ths of a degree)
-            rotation = shape.get('rotation')
-            if rotation is not None:
-                # Excel uses 60000ths of a degree for rotation (e.g., 180° = 10800000)
-                xfrm.set('rot', str(int(rotation * 60000)))
-            ET.SubElement(xfrm, ET.QName(NS['a'], 'off'), x="0", y="0")
-            ET.SubElement(xfrm, ET.QName(NS['a'], 'ext'),
-                          cx=str(px_to_emu(abs_w)), cy=str(px_to_emu(abs_h)))
-
-            prst_type = "rect" if shape['type'] == 'text' else shape['type']
-            prst = ET.SubElement(sppr, ET.QName(NS['a'], 'prstGeom'), prst=prst_type)
-            ET.SubElement(prst, ET.QName(NS['a'], 'avLst'))
-
-            fill = shape.get('fill')
-            if shape['type'] == 'text':
-                ET.SubElement(sppr, ET.QName(NS['a'], 'noFill'))
-            elif fill:
-                solid = ET.SubElement(sppr, ET.QName(NS['a'], 'solidFill'))
-                ET.SubElement(solid, ET.QName(NS['a'], 'srgbClr'), val=fill)
+            parts.append('<a:noFill />')
+        if line and kind != 'text':
+            parts.append(_line_xml(line, line.get('width', 1), '000000', arrows=False))
+        parts.append('</xdr:spPr>')
+
+        if kind == 'text':
+            font = shape.get('font', {})
+            rpr = f'<a:rPr lang="ko-KR" sz="{int(font.get("size", 8) * 100)}"'
+            if font.get('bold'):
+                rpr += ' b="1"'
+            color = font.get('color')
+            if color:
+                rpr += f'><a:solidFill><a:srgbClr val="{_attr(color)}" /></a:solidFill></a:rPr>'
             else:
-                ET.SubElement(sppr, ET.QName(NS['a'], 'noFill'))
-
-            line = shape.get('line')
-            if line and shape['type'] != 'text':
-                ln = ET.SubElement(sppr, ET.QName(NS['a'], 'ln'), w=str(int(line.get('width', 1) * 12700)))
-                lsolid = ET.SubElement(ln, ET.QName(NS['a'], 'solidFill'))
-                ET.SubElement(lsolid, ET.QName(NS['a'], 'srgbClr'), val=line.get('color', '000000'))
-                dash = line.get('dash')
-                if dash:
-                    ET.SubElement(ln, ET.QName(NS['a'], 'prstDash'), val=dash)
-
-            if shape['type'] == 'text':
-                tx = ET.SubElement(sp, ET.QName(NS['xdr'], 'txBody'))
-                ET.SubElement(tx, ET.QName(NS['a'], 'bodyPr'), wrap="none")
-                ET.SubElement(tx, ET.QName(NS['a'], 'lstStyle'))
-                p = ET.SubElement(tx, ET.QName(NS['a'], 'p'))
-                r = ET.SubElement(p, ET.QName(NS['a'], 'r'))
-                rpr = ET.SubElement(
-                    r,
-                    ET.QName(NS['a'], 'rPr'),
-                    lang="ko-KR",
-                    sz=str(int(shape.get('font', {}).get('size', 8) * 100))
-                )
-                if shape.get('font', {}).get('bold'):
-                    rpr.set('b', '1')
-                color = shape.get('font', {}).get('color')
-                if color:
-                    solid = ET.SubElement(rpr, ET.QName(NS['a'], 'solidFill'))
-                    ET.SubElement(solid, ET.QName(NS['a'], 'srgbClr'), val=color)
-                ET.SubElement(r, ET.QName(NS['a'], 't')).text = shape.get('text', '')
-                ET.SubElement(p, ET.QName(NS['a'], 'endParaRPr'), lang="ko-KR")
-
-            ET.SubElement(anchor, ET.QName(NS['xdr'], 'clientData'))
-        shape_id += 1
-
-    for shape in shapes:
-        add_shape(shape)
-
-    drawing_xml = ET.tostring(wsdr, encoding='utf-8', xml_declaration=True)
+                rpr += ' />'
+            text = shape.get('text', '')
+            run_text = f'<a:t>{escape(text)}</a:t>' if text else '<a:t />'
+            parts.append(
+                '<xdr:txBody><a:bodyPr wrap="none" /><a:lstStyle /><a:p>'
+                f'<a:r>{rpr}{run_text}</a:r><a:endParaRPr lang="ko-KR" /></a:p></xdr:txBody>'
+            )
+        parts.append('</xdr:sp>')
+    parts.append(f'<xdr:clientData /></xdr:{anchor_tag}>')
+    return ''.join(parts)
+
+
+def write_gantt_drawing(stream, shapes, *, last_col, gantt_row, timeline_start_col, data_start_row):
+    """간트 도형 drawing XML 을 stream(바이너리)에 도형 단위로 바로 쓴다"""
+    cols = PixelAxis(gantt_col_pixels(last_col))
+    rows = PixelAxis(gantt_row_pixels(gantt_row + 5))
+    origin_x = cols.origin(timeline_start_col)
+    origin_y = rows.origin(data_start_row)
+
+    stream.write(b"<?xml version='1.0' encoding='utf-8'?>\n")
+    if not shapes:
+        stream.write(f'<xdr:wsDr xmlns:xdr="{XDR_NS}" />'.encode('utf-8'))
+        return
+    stream.write(f'<xdr:wsDr xmlns:a="{A_NS}" xmlns:xdr="{XDR_NS}">'.encode('utf-8'))
+    for shape_id, shape in enumerate(shapes, start=1):
+        stream.write(_shape_xml(shape, shape_id, cols, rows, origin_x, origin_y).encode('utf-8'))
+    stream.write(b'</xdr:wsDr>')
+
+
+def _find_gantt_sheet(zin):
+    wb_root = ET.fromstring(zin.read('xl/workbook.xml'))
+    sheet_rid = None
+    for s in wb_root.findall(f'.//{{{MAIN_NS}}}sheet'):
+        if s.get('name') == GANTT_SHEET_NAME:
+            sheet_rid = s.get(f'{{{REL_NS}}}id')
+            break
+    rels_root = ET.fromstring(zin.read('xl/_rels/workbook.xml.rels'))
+    for rel in rels_root:
+        if rel.get('Id') == sheet_rid:
+            return rel.get('Target')
+    return None
 
-    with zipfile.ZipFile(BytesIO(xlsx_bytes), 'r') as zin:
-        names = zin.namelist()
 
-    # Resolve sheet path for gantt
-    with zipfile.ZipFile(BytesIO(xlsx_bytes), 'r') as zin:
-        wb_xml = zin.read('xl/workbook.xml')
-        wb_root = ET.fromstring(wb_xml)
-        sheets = wb_root.findall('.//{http://schemas.openxmlformats.org/spreadsheetml/2006/main}sheet')
-        sheet_rid = None
-        for s in sheets:
-            if s.get('name') == '공사예정공정표':
-                sheet_rid = s.get('{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id')
-                break
-        rels_root = ET.fromstring(zin.read('xl/_rels/workbook.xml.rels'))
-        sheet_target = None
-        for rel in rels_root:
-            if rel.get('Id') == sheet_rid:
-                sheet_target = rel.get('Target')
-                break
-
-    if not sheet_target:
-        print("[export-excel] gantt_inject: sheet_target not found")
-        return xlsx_bytes
-
-    sheet_path = 'xl/' + sheet_target
-    sheet_rels_path = 'xl/worksheets/_rels/' + sheet_target.split('/')[-1] + '.rels'
-
-    # New drawing id
-    drawing_numbers = []
-    for name in names:
-        if name.startswith('xl/drawings/drawing') and name.endswith('.xml'):
-            try:
-                drawing_numbers.append(int(name.replace('xl/drawings/drawing', '').replace('.xml', '')))
-            except ValueError:
-                pass
-    drawing_id = max(drawing_numbers) + 1 if drawing_numbers else 1
-    drawing_name = f'xl/drawings/drawing{drawing_id}.xml'
-    print(f"[export-excel] gantt_inject: drawing_id={drawing_id} sheet={sheet_path}")
-
-    # Update sheet XML to reference drawing
-    with zipfile.ZipFile(BytesIO(xlsx_bytes), 'r') as zin:
-        sheet_xml = zin.read(sheet_path)
-    sheet_root = ET.fromstring(sheet_xml)
-    drawing_tag = sheet_root.find('{http://schemas.openxmlformats.org/spreadsheetml/2006/main}drawing')
-    if drawing_tag is not None:
-        sheet_root.remove(drawing_tag)
-    drawing_tag = ET.Element(ET.QName(NS['main'], 'drawing'))
-    # Place drawing tag at end (after pageSetup if present) to match schema order.
-    page_setup = sheet_root.find('{http://schemas.openxmlformats.org/spreadsheetml/2006/main}pageSetup')
-    if page_setup is not None:
-        parent = sheet_root
-        idx = list(parent).index(page_setup)
-        parent.insert(idx + 1, drawing_tag)
+def _insert_before(xml, closing_tag, fragment):
+    idx = xml.rfind(closing_tag)
+    return xml[:idx] + fragment + xml[idx:]
+
+
+def _link_sheet_drawing(sheet_xml, rid):
+    """시트 XML 에 <drawing r:id> 추가 (기존 drawing 태그는 교체). pageSetup 뒤 → 스키마 순서"""
+    sheet_xml = _DRAWING_TAG_RE.sub(b'', sheet_xml, count=1)
+    prefix = _REL_PREFIX_RE.search(sheet_xml)
+    if prefix:
+        tag = f'<drawing {prefix.group(1).decode()}:id="{rid}"/>'
     else:
-        sheet_root.append(drawing_tag)
-    # Update rels to point to drawing
-    ns_rels = 'http://schemas.openxmlformats.org/package/2006/relationships'
-    try:
-        with zipfile.ZipFile(BytesIO(xlsx_bytes), 'r') as zin:
-            sheet_rels_xml = zin.read(sheet_rels_path)
-        rels_root = ET.fromstring(sheet_rels_xml)
-    except KeyError:
-        rels_root = ET.Element(ET.QName(ns_rels, 'Relationships'))
-
-    existing_ids = {rel.get('Id') for rel in rels_root.findall(f'{{{ns_rels}}}Relationship')}
-    rid_num = 1
-    new_rid = f"rId{rid_num}"
-    while new_rid in existing_ids:
-        rid_num += 1
-        new_rid = f"rId{rid_num}"
+        tag = f'<drawing xmlns:r="{REL_NS}" r:id="{rid}"/>'
+    page_setup = _PAGE_SETUP_RE.search(sheet_xml)
+    if page_setup:
+        return sheet_xml[:page_setup.end()] + tag.encode('utf-8') + sheet_xml[page_setup.end():]
+    return _insert_before(sheet_xml, b'</worksheet>', tag.encode('utf-8'))
 
-    drawing_tag.set(ET.QName(NS['rel'], 'id'), new_rid)
-    ET.SubElement(rels_root, ET.QName(ns_rels, 'Relationship'), Id=new_rid,
-                  Type='http://schemas.openxmlformats.org/officeDocument/2006/relationships/drawing',
-                  Target=f"../drawings/drawing{drawing_id}.xml")
 
-    sheet_xml_out = ET.tostring(sheet_root, encoding='utf-8', xml_declaration=True)
-    rels_xml_out = ET.tostring(rels_root, encoding='utf-8', xml_declaration=True)
+def inject_gantt_drawing(xlsx_bytes, *, shapes, last_col, gantt_row, timeline_start_col, data_start_row):
+    """xlsxwriter 결과물의 간트 시트에 도형 drawing 파트를 추가
 
-    # Update [Content_Types].xml
+    도형 XML 은 ElementTree 트리를 만들지 않고 출력 zip 항목에 도형 단위로 바로 쓰며,
+    시트/관계/콘텐츠 형식 파트는 필요한 태그만 바이트 단위로 끼워 넣는다 (시트 XML 재직렬화 없음).
+    """
     with zipfile.ZipFile(BytesIO(xlsx_bytes), 'r') as zin:
+        names = set(zin.namelist())
+        sheet_target = _find_gantt_sheet(zin)
+        if not sheet_target:
+            print("[export-excel] gantt_inject: sheet_target not found")
+            return xlsx_bytes
+
+        sheet_path = 'xl/' + sheet_target
+        sheet_rels_path = 'xl/worksheets/_rels/' + sheet_target.split('/')[-1] + '.rels'
+
+        # New drawing id
+        drawing_numbers = []
+        for name in names:
+            if name.startswith('xl/drawings/drawing') and name.endswith('.xml'):
+                try:
+                    drawing_numbers.append(int(name.replace('xl/drawings/drawing', '').replace('.xml', '')))
+                except ValueError:
+                    pass
+        drawing_id = max(drawing_numbers) + 1 if drawing_numbers else 1
+        drawing_name = f'xl/drawings/drawing{drawing_id}.xml'
+        print(f"[export-excel] gantt_inject: drawing_id={drawing_id} sheet={sheet_path}")
+
+        # 시트 관계: 비어 있는 rId 로 drawing 연결
+        if sheet_rels_path in names:
+            rels_xml = zin.read(sheet_rels_path)
+        else:
+            rels_xml = (
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<Relationships xmlns="{PKG_REL_NS}"></Relationships>'
+            ).encode('utf-8')
+        existing_ids = {rel.get('Id') for rel in ET.fromstring(rels_xml).findall(f'{{{PKG_REL_NS}}}Relationship')}
+        rid_num = 1
+        while f"rId{rid_num}" in existing_ids:
+            rid_num += 1
+        new_rid = f"rId{rid_num}"
+        rels_xml = _insert_before(rels_xml, b'</Relationships>', (
+            f'<Relationship Id="{new_rid}" Type="{DRAWING_REL_TYPE}" Target="../drawings/drawing{drawing_id}.xml"/>'
+        ).encode('utf-8'))
+
+        sheet_xml = _link_sheet_drawing(zin.read(sheet_path), new_rid)
+
         content_xml = zin.read('[Content_Types].xml')
-    ct_root = ET.fromstring(content_xml)
-    override_exists = False
-    for ov in ct_root.findall('{http://schemas.openxmlformats.org/package/2006/content-types}Override'):
-        if ov.get('PartName') == f"/xl/drawings/drawing{drawing_id}.xml":
-            override_exists = True
-            break
-    if not override_exists:
-        ct_ns = 'http://schemas.openxmlformats.org/package/2006/content-types'
-        ET.SubElement(ct_root, ET.QName(ct_ns, 'Override'),
-                      PartName=f"/xl/drawings/drawing{drawing_id}.xml",
-                      ContentType="application/vnd.openxmlformats-officedocument.drawing+xml")
-    content_xml_out = ET.tostring(ct_root, encoding='utf-8', xml_declaration=True)
-
-    # Write new zip
-    out_buf = BytesIO()
-    with zipfile.ZipFile(BytesIO(xlsx_bytes), 'r') as zin, zipfile.ZipFile(out_buf, 'w', zipfile.ZIP_DEFLATED) as zout:
-        for item in zin.infolist():
-            name = item.filename
-            if name == sheet_path:
-                zout.writestr(name, sheet_xml_out)
-            elif name == sheet_rels_path:
-                zout.writestr(name, rels_xml_out)
-            elif name == '[Content_Types].xml':
-                zout.writestr(name, content_xml_out)
-            else:
-                zout.writestr(name, zin.read(name))
-        # Add drawing part if not already in archive
-        if drawing_name not in names:
-            zout.writestr(drawing_name, drawing_xml)
-        # Add sheet rels if it didn't exist
-        if sheet_rels_path not in names:
-            zout.writestr(sheet_rels_path, rels_xml_out)
+        part_name = f'PartName="/xl/drawings/drawing{drawing_id}.xml"'.encode('utf-8')
+        if part_name not in content_xml:
+            content_xml = _insert_before(content_xml, b'</Types>', (
+                f'<Override PartName="/xl/drawings/drawing{drawing_id}.xml" ContentType="{DRAWING_CONTENT_TYPE}"/>'
+            ).encode('utf-8'))
+
+        replaced = {sheet_path: sheet_xml, sheet_rels_path: rels_xml, '[Content_Types].xml': content_xml}
+        out_buf = BytesIO()
+        with zipfile.ZipFile(out_buf, 'w', zipfile.ZIP_DEFLATED) as zout:
+            for item in zin.infolist():
+                name = item.filename
+                if name in replaced:
+                    zout.writestr(name, replaced[name])
+                    continue
+                with zin.open(item) as src, zout.open(name, 'w') as dst:
+                    shutil.copyfileobj(src, dst)
+            # Add drawing part if not already in archive
+            if drawing_name not in names:
+                with zout.open(drawing_name, 'w') as dst:
+                    write_gantt_drawing(
+                        dst,
+                        shapes,
+                        last_col=last_col,
+                        gantt_row=gantt_row,
+                        timeline_start_col=timeline_start_col,
+                        data_start_row=data_start_row,
+                    )
+            # Add sheet rels if it didn't exist
+            if sheet_rels_path not in names:
+                zout.writestr(sheet_rels_path, rels_xml)
 
     return out_buf.getvalue()
@@ -1,26 +1,11 @@
-from datetime import timedelta
+from functools import lru_cache
 from io import BytesIO
 import math
 
 from PIL import Image, ImageDraw, ImageFont
-import xlsxwriter
 
-from .construction_schedule import write_gantt_sheet
-from .construction_schedule_gantt import build_items_with_timing
-
-
-def _col_width_to_px(width):
-    max_digit_width = 7.0
-    padding = 5.0
-    if width <= 0:
-        return 0
-    if width < 1:
-        return int(width * (max_digit_width + padding) + 0.5)
-    return int(width * max_digit_width + 0.5) + int(padding)
-
-
-def _row_height_to_px(height_pt):
-    return int(height_pt * 4 / 3 + 0.5)
+from .construction_schedule import build_gantt_layout
+from .construction_schedule_gantt import gantt_col_pixels, gantt_row_pixels
 
 
 def _hex_to_rgb(hex_color, default=(0, 0, 0)):
@@ -33,7 +18,9 @@ def _hex_to_rgb(hex_color, default=(0, 0, 0)):
     return default
 
 
+@lru_cache(maxsize=None)
 def _load_font(size=12, bold=False):
+    # 글꼴 파일 로드는 비싸므로 (크기, 굵기)별로 한 번만 연다
     candidates = [
         "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf" if bold else "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
         "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
@@ -85,42 +72,16 @@ def _draw_text(draw, x, y, text, size=11, color=(0, 0, 0), bold=False):
 
 
 def build_gantt_preview_png(items, sub_tasks, links, project_name, start_date):
-    output = BytesIO()
-    wb = xlsxwriter.Workbook(output, {"in_memory": True})
-    meta = write_gantt_sheet(wb, items, sub_tasks, links, project_name, start_date)
-    wb.close()
-
-    last_col = int(meta.get("last_col", 10))
-    gantt_row = int(meta.get("gantt_row", 10))
-    timeline_start_col = int(meta.get("timeline_start_col", 5))
-    data_start_row = int(meta.get("data_start_row", 5))
-    shapes = list(meta.get("shapes") or [])
-
-    col_pixels = []
-    for c in range(0, last_col + 1):
-        if c == 0:
-            w = 10.625
-        elif c == 1:
-            w = 13.375
-        elif c == 2:
-            w = 26.875
-        elif c == 3:
-            w = 11.375
-        elif c == 4:
-            w = 9.625
-        else:
-            w = 5.625
-        col_pixels.append(_col_width_to_px(w))
-
-    row_pixels = []
-    for r in range(0, max(gantt_row + 4, data_start_row + len(items) + 2)):
-        if r == 0:
-            h = 39.95
-        elif r == 4:
-            h = 60
-        else:
-            h = 30
-        row_pixels.append(_row_height_to_px(h))
+    """간트 배치(build_gantt_layout)를 Pillow 로 직접 그린 PNG (보고서 삽입용)"""
+    layout = build_gantt_layout(items, sub_tasks, links, start_date)
+    last_col = layout["last_col"]
+    gantt_row = layout["gantt_row"]
+    timeline_start_col = layout["timeline_start_col"]
+    data_start_row = layout["data_start_row"]
+    shapes = layout["shapes"]
+
+    col_pixels = gantt_col_pixels(last_col)
+    row_pixels = gantt_row_pixels(max(gantt_row + 4, data_start_row + len(items) + 2))
 
     x_offsets = [0]
     for w in col_pixels:
@@ -161,21 +122,8 @@ def build_gantt_preview_png(items, sub_tasks, links, project_name, start_date):
     _draw_text(draw, x_offsets[3] + 10, y_offsets[4] + 20, "총간관리일", size=11, bold=True)
 
     # Timeline headers (10d fixed)
-    total_units = max(1, last_col - timeline_start_col + 1)
-    timeline_days = []
-    timeline_months = []
-    current_month_key = None
-    for unit in range(total_units):
-        day_number = unit * 10
-        unit_date = start_date + timedelta(days=day_number)
-        month_key = f"{unit_date.year}-{unit_date.month}"
-        if month_key != current_month_key:
-            timeline_months.append({"label": f"{unit_date.year}.{unit_date.month:02d}", "count": 1})
-            current_month_key = month_key
-        else:
-            timeline_months[-1]["count"] += 1
-        dekad = math.floor((unit_date.day - 1) / 10)
-        timeline_days.append(["상순", "중순", "하순"][dekad] if dekad < 3 else f"{day_number + 1}")
+    timeline_months = layout["timeline_months"]
+    timeline_days = layout["timeline_days"]
 
     month_col = timeline_start_col
     for month in timeline_months:
@@ -191,8 +139,7 @@ def build_gantt_preview_png(items, sub_tasks, links, project_name, start_date):
             break
         _draw_text(draw, x_offsets[col] + 6, y_offsets[3] + 8, str(label).replace("일", ""), size=9)
 
-    items_with_timing = build_items_with_timing(items)
-    for idx, item_meta in enumerate(items_with_timing):
+    for idx, item_meta in enumerate(layout["items_with_timing"]):
         item = item_meta["item"]
         row = data_start_row + idx
         if row + 1 >= len(y_offsets):
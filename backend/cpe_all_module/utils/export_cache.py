@@ -0,0 +1,117 @@
+"""
+엑셀/보고서 출력 파일 캐시
+
+출력은 공정표 JSON 외에 가동률(WorkScheduleWeight), 근무조건, 기상/공휴일 데이터에 따라 달라진다.
+이 입력과 출력 옵션을 정규화해 sha256 키를 만들고, 같은 키의 파일이 있으면 다시 만들지 않고 그대로 내려보낸다.
+- 공정표 변경은 container.revision, 기상/공휴일 변경은 operatio data_versions 로 키가 바뀐다.
+- 출력 코드가 바뀌면 EXPORT_CACHE_VERSION 을 올린다.
+- 저장은 임시 파일 → os.replace 로 원자적으로 하고, 조회 시 mtime 을 갱신해
+  EXPORT_CACHE_MAX_BYTES 를 넘으면 오래 쓰지 않은 파일부터 지운다 (LRU).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+
+from cpe_module.models.calc_models import ConstructionOverview, WorkCondition
+from cpe_module.models.operating_rate_models import WorkScheduleWeight
+from operatio.data_versions import get_data_versions
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CACHE_VERSION = 3
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+FILE_SUFFIX = ".bin"
+
+
+def _cache_dir():
+    return Path(getattr(settings, "EXPORT_CACHE_DIR", Path(settings.MEDIA_ROOT) / "export_cache"))
+
+
+def _max_bytes():
+    return int(getattr(settings, "EXPORT_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+
+def _rows(queryset):
+    return [
+        {field: value for field, value in row.items() if field not in ("id", "project_id", "created_at", "updated_at")}
+        for row in queryset.order_by("id").values()
+    ]
+
+
+def export_cache_key(kind, container, project, start_date, options=None):
+    """출력 종류 + 공정표 리비전 + 프로젝트 입력(가동률/근무조건/개요) + 기상·공휴일 버전 + 옵션 → sha256"""
+    project_id = project.pk
+    payload = {
+        "version": EXPORT_CACHE_VERSION,
+        "kind": kind,
+        "container": [container.pk, container.revision],
+        "title": project.title,
+        "start_date": start_date,
+        "weights": _rows(WorkScheduleWeight.objects.filter(project_id=project_id)),
+        "work_condition": _rows(WorkCondition.objects.filter(project_id=project_id)),
+        "overview": _rows(ConstructionOverview.objects.filter(project_id=project_id)),
+        "data_versions": get_data_versions(),
+        "options": options or {},
+    }
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _path(key):
+    return _cache_dir() / f"{key}{FILE_SUFFIX}"
+
+
+def get_cached_export(key):
+    """캐시된 파일 경로 (없으면 None). 사용 시각(mtime)을 갱신한다"""
+    path = _path(key)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    return path
+
+
+def store_export(key, content):
+    """content(bytes)를 캐시에 저장하고 용량 초과분을 정리. 저장 경로 반환 (실패 시 None)"""
+    directory = _cache_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(content)
+        os.replace(temp_path, _path(key))
+    except OSError:
+        logger.warning("export cache write failed for %s", key, exc_info=True)
+        return None
+    evict_exports(_max_bytes())
+    return _path(key)
+
+
+def evict_exports(max_bytes):
+    """전체 크기가 max_bytes 이하가 될 때까지 오래 사용하지 않은 파일부터 삭제. 삭제 수 반환"""
+    entries = []
+    total = 0
+    for path in _cache_dir().glob(f"*{FILE_SUFFIX}"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+    removed = 0
+    for _mtime, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
@@ -0,0 +1,166 @@
+"""
+비동기 엑셀/보고서 출력 작업
+
+보고서 출력은 간트 PNG, 기상 부록, docx 생성을 한 요청 안에서 처리하므로 큰 프로젝트는
+gunicorn 동기 워커(3개, 120초 제한)를 오래 붙잡거나 시간 초과가 났다.
+출력 작업 요청은 ExportJob 행만 만들고 바로 응답하며, 생성은 프로세스 내 작업 스레드 풀
+(EXPORT_JOB_WORKERS, 가동률 지연 재계산 큐와 같은 방식)에서 진행한다.
+- 진행률/단계는 ExportJob 행에 기록하므로 어느 웹 워커에서든 조회할 수 있다.
+- 결과 파일은 EXPORT_JOB_DIR(MEDIA_ROOT/export_jobs)에 저장하고 EXPORT_JOB_TTL_SECONDS 뒤 만료된다.
+- 출력 캐시(export_cache)에 같은 입력의 결과가 있으면 복사만 한다.
+- 프로세스 재시작 등으로 STALE_SECONDS 동안 갱신이 없는 대기/진행 작업은 실패로 정리한다.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from cpe_module.utils.operating_rate_queue import flush_operating_rates
+
+from ..models.construction_schedule_models import ConstructionScheduleItem, ExportJob
+from .export_cache import get_cached_export, store_export
+from .schedule_exports import build_export, export_target
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 60 * 60
+DEFAULT_WORKERS = 2
+STALE_SECONDS = 15 * 60
+ACTIVE_STATUSES = ("pending", "running")
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _job_dir():
+    return Path(getattr(settings, "EXPORT_JOB_DIR", Path(settings.MEDIA_ROOT) / "export_jobs"))
+
+
+def _ttl():
+    return timedelta(seconds=int(getattr(settings, "EXPORT_JOB_TTL_SECONDS", DEFAULT_TTL_SECONDS)))
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = int(getattr(settings, "EXPORT_JOB_WORKERS", DEFAULT_WORKERS))
+            _executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="schedule-export")
+        return _executor
+
+
+def artifact_path(job):
+    return _job_dir() / job.artifact if job.artifact else None
+
+
+def enqueue_export_job(job):
+    """트랜잭션 커밋 후 작업 스레드에 실행 예약"""
+    job_id = job.pk
+    transaction.on_commit(lambda: _get_executor().submit(_run_in_worker, job_id))
+
+
+def _run_in_worker(job_id):
+    close_old_connections()
+    try:
+        run_export_job(job_id)
+    except Exception:
+        logger.exception("export job crashed: %s", job_id)
+    finally:
+        close_old_connections()
+
+
+def _update(job_id, **fields):
+    ExportJob.objects.filter(pk=job_id).update(updated_at=timezone.now(), **fields)
+
+
+def _write_artifact(target, content):
+    fd, temp_path = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(content)
+    os.replace(temp_path, target)
+
+
+def run_export_job(job_id):
+    """대기 중인 작업 하나를 실행하고 최종 상태 반환 (이미 다른 스레드가 가져갔으면 None)"""
+    claimed = ExportJob.objects.filter(pk=job_id, status="pending").update(
+        status="running", progress=1, stage="start", updated_at=timezone.now()
+    )
+    if not claimed:
+        return None
+    job = ExportJob.objects.select_related("project").get(pk=job_id)
+
+    def progress(percent, stage):
+        _update(job_id, progress=percent, stage=stage)
+
+    try:
+        # 지연 재계산 대기 중이면 가동률(기간 재계산 포함)을 먼저 반영하고 공정표를 읽는다
+        flush_operating_rates(job.project_id)
+        container = ConstructionScheduleItem.objects.filter(project=job.project).first()
+        if container is None or not container.data:
+            raise ValueError("schedule data not found")
+
+        cache_key, filename, _content_type = export_target(job.kind, job.project, container)
+        directory = _job_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / f"{job.pk}{Path(filename).suffix}"
+
+        cached = get_cached_export(cache_key)
+        try:
+            if cached is None:
+                raise FileNotFoundError
+            shutil.copyfile(cached, target)
+        except FileNotFoundError:
+            content = build_export(job.kind, job.project, container, progress)
+            progress(95, "store")
+            store_export(cache_key, content)
+            _write_artifact(target, content)
+    except Exception as exc:
+        logger.exception("export job failed: %s", job_id)
+        now = timezone.now()
+        _update(
+            job_id,
+            status="failed",
+            stage="",
+            error=str(exc)[:500] or exc.__class__.__name__,
+            finished_at=now,
+            expires_at=now + _ttl(),
+        )
+        return "failed"
+
+    now = timezone.now()
+    _update(
+        job_id,
+        status="done",
+        progress=100,
+        stage="done",
+        filename=filename,
+        artifact=target.name,
+        finished_at=now,
+        expires_at=now + _ttl(),
+    )
+    return "done"
+
+
+def purge_export_jobs():
+    """만료된 작업과 결과 파일 삭제, 오래 갱신이 없는 대기/진행 작업은 실패 처리. 삭제 수 반환"""
+    now = timezone.now()
+    ExportJob.objects.filter(
+        status__in=ACTIVE_STATUSES,
+        updated_at__lt=now - timedelta(seconds=STALE_SECONDS),
+    ).update(status="failed", error="export job timed out", finished_at=now, expires_at=now + _ttl(), updated_at=now)
+
+    expired = list(ExportJob.objects.filter(expires_at__lt=now).values_list("pk", "artifact"))
+    for _pk, artifact in expired:
+        if artifact:
+            (_job_dir() / artifact).unlink(missing_ok=True)
+    ExportJob.objects.filter(pk__in=[pk for pk, _artifact in expired]).delete()
+    return len(expired)
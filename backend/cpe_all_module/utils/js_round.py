@@ -0,0 +1,17 @@
+"""
+JS Number.prototype.toFixed 와 같은 반올림 (Django 의존 없음)
+
+toFixed 는 입력 float 의 정확한 이진값을 반올림하므로 12.35(=12.3499999...)는 12.3 이 된다.
+floor(x * 10**d + 0.5) 는 10진 표기를 반올림해 12.4 가 되어 브라우저(solver.js)와 달라진다.
+"""
+
+import math
+from decimal import ROUND_HALF_UP, Decimal
+
+
+def to_fixed(value, digits):
+    """float(value.toFixed(digits)) 대응. 유한하지 않은 값은 그대로 반환"""
+    value = float(value)
+    if not math.isfinite(value):
+        return value
+    return float(Decimal(value).quantize(Decimal(10) ** -digits, rounding=ROUND_HALF_UP))
@@ -0,0 +1,392 @@
+"""
+목표 공기 단축 제안 (공정 압축 solver)
+
+목표 총공기와 항목별 투입 인원 범위를 받아 주공정 항목의 인원(crew_size) / 병행 적용률(application_rate)을
+조정하는 안을 찾는다. 방식은 greedy crashing:
+    1) 공기를 결정하는 경로(CpmNetwork.driving_items) 항목의 한 단계 조정 중 "추가 비용 / 단축 일수" 가 가장 작은 것을 적용
+       (CpmNetwork.update_item 으로 증분 재계산) → 목표 공기 이하가 될 때까지 반복
+    2) 목표 달성 후 여유가 큰 항목부터 조정을 되돌려(인원 하한까지 감원 포함) 추가 인원을 줄인다
+인원 증원 시 생산성 체감은 frontend solveForCrewSize 와 같다.
+
+전략(crew / parallel / mixed)별 탐색은 프로세스 풀에서 병렬로 돌리고, 시간 예산을 넘기면
+그때까지의 결과를 돌려준다. 결과는 패널에서 바로 적용할 수 있는 항목별 before/after 필드 diff 다.
+워커 프로세스는 Django 없이 이 모듈과 schedule_cpm, js_round 만 import 한다.
+"""
+
+import copy
+import logging
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from .js_round import to_fixed
+from .schedule_cpm import FLOAT_EPSILON, compute_cpm
+
+logger = logging.getLogger(__name__)
+
+# solver.js solveForCrewSize 와 같은 인원 증원 체감 효율
+DIMINISHING_ALPHA = 0.05
+MIN_EFFICIENCY = 0.6
+
+CREW_STEP = 1.0
+# 인원 상한을 지정하지 않은 항목: 현재 인원의 배수까지
+DEFAULT_MAX_CREW_FACTOR = 2.0
+APPLICATION_STEP = 10.0
+MIN_APPLICATION_RATE = 50.0
+# mixed 전략에서 적용률 한 단계를 인원 몇 명 증원과 같은 비용으로 볼지
+PARALLEL_STEP_COST = 1.0
+
+DEFAULT_TIME_BUDGET = 5.0
+MAX_TIME_BUDGET = 30.0
+# 예산 초과 후 결과 회수 대기
+POOL_GRACE_SECONDS = 2.0
+MAX_WORKERS = 3
+
+STRATEGIES = {
+    "crew": "인력 증원",
+    "parallel": "병행 작업",
+    "mixed": "인력 증원 + 병행 작업",
+}
+DIFF_FIELDS = (
+    "crew_size",
+    "productivity",
+    "base_productivity",
+    "daily_production",
+    "working_days",
+    "application_rate",
+    "parallel_rate",
+    "calendar_days",
+    "calendar_months",
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _number(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return number if math.isfinite(number) else 0.0
+
+
+def _round1(value):
+    """JS toFixed(1) 과 같은 반올림 (schedule_durations 와 동일)"""
+    return to_fixed(value, 1)
+
+
+def _efficiency(crew, base_crew):
+    if crew <= base_crew:
+        return 1.0
+    return max(MIN_EFFICIENCY, 1 - DIMINISHING_ALPHA * (crew - base_crew))
+
+
+def normalize_crew_bounds(raw_bounds):
+    """{item_id: {"min": n, "max": n}} 검증 → {str(item_id): (min, max)} (값 오류 시 ValueError)"""
+    if raw_bounds in (None, ""):
+        return {}
+    if not isinstance(raw_bounds, dict):
+        raise ValueError("crew_bounds must be an object keyed by item id")
+    bounds = {}
+    for item_id, bound in raw_bounds.items():
+        if not isinstance(bound, dict):
+            raise ValueError(f"crew_bounds['{item_id}'] must be an object")
+        low = bound.get("min")
+        high = bound.get("max")
+        low = None if low in (None, "") else float(low)
+        high = None if high in (None, "") else float(high)
+        if (low is not None and low < 0) or (high is not None and high <= 0):
+            raise ValueError(f"crew_bounds['{item_id}'] must be positive")
+        if low is not None and high is not None and low > high:
+            raise ValueError(f"crew_bounds['{item_id}'] min is greater than max")
+        bounds[str(item_id)] = (low, high)
+    return bounds
+
+
+class _Activity:
+    """조정 가능한 항목 하나의 인원/적용률 상태와 기간 모델"""
+
+    __slots__ = (
+        "id", "quantity", "productivity", "base_crew", "rate", "cp_checked",
+        "base_application", "crew", "application", "min_crew", "max_crew",
+    )
+
+    def __init__(self, item, bound):
+        self.id = item.get("id")
+        self.quantity = _number(item.get("quantity"))
+        self.productivity = _number(item.get("productivity"))
+        self.base_crew = _number(item.get("crew_size")) or 1.0
+        self.rate = _number(item.get("operating_rate_value")) or 100.0
+        self.cp_checked = item.get("cp_checked") is not False
+        application = item.get("application_rate")
+        if application is None:
+            application = item.get("parallel_rate")
+        application = _number(application) if application not in (None, "") else 100.0
+        self.base_application = min(100.0, max(0.0, application)) if self.cp_checked else 100.0
+
+        low, high = bound or (None, None)
+        self.min_crew = self.base_crew if low is None else min(low, self.base_crew)
+        default_high = math.ceil(self.base_crew * DEFAULT_MAX_CREW_FACTOR)
+        self.max_crew = max(self.base_crew, default_high if high is None else high)
+        self.crew = self.base_crew
+        self.application = self.base_application
+
+    def duration(self, crew, application):
+        daily_production = self.productivity * _efficiency(crew, self.base_crew) * crew
+        working_days = self.quantity / daily_production
+        return _round1(working_days / (self.rate / 100) * application / 100)
+
+    def crash_moves(self, strategy):
+        """한 단계 단축 후보 (crew, application, 비용)"""
+        if strategy in ("crew", "mixed") and self.crew + CREW_STEP <= self.max_crew + FLOAT_EPSILON:
+            yield self.crew + CREW_STEP, self.application, CREW_STEP
+        if (
+            strategy in ("parallel", "mixed")
+            and self.cp_checked
+            and self.application - APPLICATION_STEP >= MIN_APPLICATION_RATE - FLOAT_EPSILON
+        ):
+            yield self.crew, self.application - APPLICATION_STEP, PARALLEL_STEP_COST
+
+    def relax_move(self):
+        """한 단계 되돌리기 후보 (인원 감원 우선, 다음 적용률 복구)"""
+        if self.crew - CREW_STEP >= self.min_crew - FLOAT_EPSILON:
+            return self.crew - CREW_STEP, self.application
+        if self.application < self.base_application:
+            return self.crew, min(self.base_application, self.application + APPLICATION_STEP)
+        return None
+
+
+def _crash(network, activities, target, strategy, deadline):
+    """공기 결정 경로 항목을 비용/단축일 순으로 조정. 시간 초과 시 True"""
+    while network.project_duration > target + FLOAT_EPSILON:
+        if time.monotonic() > deadline:
+            return True
+        candidates = []
+        for index in network.driving_items():
+            activity = activities[index]
+            if activity is None:
+                continue
+            current = network.durations[index]
+            best = None
+            for crew, application, cost in activity.crash_moves(strategy):
+                duration = activity.duration(crew, application)
+                saved = current - duration
+                if saved <= FLOAT_EPSILON:
+                    continue
+                score = cost / saved
+                if best is None or score < best[0]:
+                    best = (score, saved, index, crew, application, duration)
+            if best is not None:
+                candidates.append(best)
+        if not candidates:
+            break
+
+        # 한 경로 위 항목들의 단축은 공기에 누적되므로 남은 차이만큼 싼 순서로 한 번에 반영
+        candidates.sort()
+        gap = network.project_duration - target
+        changes = {}
+        for _score, saved, index, crew, application, duration in candidates:
+            activity = activities[index]
+            activity.crew, activity.application = crew, application
+            changes[activity.id] = {"calendar_days": duration}
+            gap -= saved
+            if gap <= FLOAT_EPSILON:
+                break
+        network.update_items(changes)
+    return False
+
+
+def _relax(network, activities, limit, deadline):
+    """공기 limit 을 넘지 않는 범위에서 여유가 큰 항목부터 조정을 되돌림. 시간 초과 시 True"""
+    total_float = network.total_float
+    driving = set(network.driving_items())
+    candidates = sorted(
+        (index for index, activity in enumerate(activities) if activity is not None),
+        key=lambda index: -total_float[index],
+    )
+    for index in candidates:
+        activity = activities[index]
+        while True:
+            if time.monotonic() > deadline:
+                return True
+            move = activity.relax_move()
+            if move is None:
+                break
+            previous = network.durations[index]
+            duration = activity.duration(*move)
+            # 공기 결정 경로 항목은 늘어난 만큼 공기도 늘어나므로 남은 여유를 넘으면 시험 없이 건너뜀
+            if index in driving and duration - previous > limit - network.project_duration + FLOAT_EPSILON:
+                break
+            network.update_item(activity.id, calendar_days=duration)
+            if network.project_duration > limit + FLOAT_EPSILON:
+                network.update_item(activity.id, calendar_days=previous)
+                break
+            activity.crew, activity.application = move
+    return False
+
+
+def _run_strategy(items, links, target, bounds, strategy, budget):
+    """워커 진입점: 전략 하나로 탐색 → 항목별 (crew, application) 상태"""
+    deadline = time.monotonic() + budget
+    network = compute_cpm(copy.deepcopy(items), links)
+    activities = []
+    for item in network.items:
+        activity = _Activity(item, bounds.get(str(item.get("id"))))
+        crashable = activity.quantity > 0 and activity.productivity > 0 and activity.id not in (None, "")
+        activities.append(activity if crashable else None)
+
+    timed_out = _crash(network, activities, target, strategy, deadline)
+    if not timed_out:
+        timed_out = _relax(network, activities, max(target, network.project_duration), deadline)
+    return {
+        "strategy": strategy,
+        "project_duration": network.project_duration,
+        "timed_out": timed_out,
+        "states": {
+            str(activity.id): (activity.crew, activity.application)
+            for activity in activities
+            if activity is not None
+            and (activity.crew != activity.base_crew or activity.application != activity.base_application)
+        },
+    }
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # fork 는 서버의 백그라운드 스레드(가동률 큐 등) 상태까지 복제하므로 spawn 사용
+            _executor = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _reset_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _search(items, links, target, bounds, strategies, budget):
+    try:
+        executor = _get_executor()
+        futures = {
+            executor.submit(_run_strategy, items, links, target, bounds, strategy, budget): strategy
+            for strategy in strategies
+        }
+    except (BrokenProcessPool, OSError) as exc:
+        logger.warning("schedule compression pool unavailable, running inline: %s", exc)
+        _reset_executor()
+        share = budget / max(len(strategies), 1)
+        return [_run_strategy(items, links, target, bounds, strategy, share) for strategy in strategies], False
+
+    done, pending = wait(futures, timeout=budget + POOL_GRACE_SECONDS)
+    for future in pending:
+        future.cancel()
+    results = []
+    for future in done:
+        try:
+            results.append(future.result())
+        except BrokenProcessPool:
+            _reset_executor()
+            logger.warning("schedule compression worker died (%s)", futures[future])
+    return results, bool(pending)
+
+
+def _item_label(item):
+    return {field: item.get(field) for field in ("main_category", "process", "work_type")}
+
+
+def _build_proposal(result, items_by_id):
+    # 워커(spawn)는 Django 를 초기화하지 않으므로 모델을 import 하는 모듈은 여기서 불러온다
+    from .schedule_durations import recalculate_item_durations
+
+    changes = []
+    added_crew = 0.0
+    parallel_changes = 0
+    for item_id, (crew, application) in result["states"].items():
+        before = items_by_id[item_id]
+        activity = _Activity(before, None)
+        updated = dict(before, crew_size=crew, application_rate=application)
+        if crew != activity.base_crew:
+            updated["productivity"] = activity.productivity * _efficiency(crew, activity.base_crew)
+            updated["base_productivity"] = activity.productivity
+            added_crew += crew - activity.base_crew
+        if application != activity.base_application:
+            parallel_changes += 1
+        (after,) = recalculate_item_durations([updated], [])
+        diff_fields = [field for field in DIFF_FIELDS if before.get(field) != after.get(field)]
+        changes.append({
+            "id": before.get("id"),
+            **_item_label(before),
+            "before": {field: before.get(field) for field in diff_fields},
+            "after": {field: after.get(field) for field in diff_fields},
+        })
+    return {
+        "strategy": result["strategy"],
+        "label": STRATEGIES[result["strategy"]],
+        "project_duration": round(result["project_duration"], 1),
+        "added_crew": round(added_crew, 1),
+        "parallel_changes": parallel_changes,
+        "timed_out": result["timed_out"],
+        "changes": changes,
+    }
+
+
+def propose_schedule_compression(
+    items,
+    links,
+    target_days,
+    crew_bounds=None,
+    strategies=None,
+    time_budget=DEFAULT_TIME_BUDGET,
+):
+    """
+    목표 공기(target_days) 달성을 위한 조정안 목록.
+    목표 달성안 우선, 그다음 추가 인원 / 병행 조정 수 / 공기 순으로 정렬하고 같은 조정안은 하나만 남긴다.
+    crew_bounds 는 {item_id: {"min": n, "max": n}}. 값이 잘못되면 ValueError, 순환 연결이면 ScheduleCycleError.
+    """
+    bounds = normalize_crew_bounds(crew_bounds)
+    baseline = compute_cpm(copy.deepcopy(items), links)
+    response = {
+        "project_duration": baseline.project_duration,
+        "target_days": target_days,
+        "proposals": [],
+        "timed_out": False,
+    }
+    if baseline.project_duration <= target_days + FLOAT_EPSILON:
+        return response
+
+    strategies = [strategy for strategy in (strategies or STRATEGIES) if strategy in STRATEGIES]
+    budget = min(max(float(time_budget), 0.1), MAX_TIME_BUDGET)
+    results, timed_out = _search(baseline.items, links, target_days, bounds, strategies, budget)
+
+    items_by_id = {str(item.get("id")): item for item in baseline.items}
+    proposals = []
+    seen = set()
+    for result in results:
+        key = tuple(sorted(result["states"].items()))
+        if not result["states"] or key in seen:
+            continue
+        seen.add(key)
+        proposal = _build_proposal(result, items_by_id)
+        proposal["reached_target"] = result["project_duration"] <= target_days + FLOAT_EPSILON
+        proposals.append(proposal)
+
+    proposals.sort(key=lambda proposal: (
+        not proposal["reached_target"],
+        proposal["added_crew"],
+        proposal["parallel_changes"],
+        proposal["project_duration"],
+    ))
+    response["proposals"] = proposals
+    response["timed_out"] = timed_out or any(proposal["timed_out"] for proposal in proposals)
+    return response
@@ -0,0 +1,530 @@
+"""
+공정표 CPM(Critical Path Method) 계산
+
+items + links 로 네트워크를 만들어 전진/후진 계산으로 ES/EF/LS/LF, 전체 여유(TF)/자유 여유(FF)와
+주공정(critical path)을 구한다. 위상 정렬(Kahn) 한 번 + 간선 순회 두 번으로 O(V+E).
+
+연결 유형 (lag 는 일 단위, 음수 허용):
+    FS: 후행 ES ≥ 선행 EF + lag
+    SS: 후행 ES ≥ 선행 ES + lag
+    FF: 후행 EF ≥ 선행 EF + lag
+    SF: 후행 EF ≥ 선행 ES + lag
+
+선행 연결이 없는 항목은 화면과 같은 배치(build_items_with_timing: _startDay 또는 목록 순서 누적)를
+시작 하한으로 사용하므로, 연결이 없는 공정표는 기존 출력과 동일한 일정이 된다.
+선행 연결이 있는 항목은 연결 조건(및 _startDay 가 있으면 그 값 이상)으로 배치한다.
+
+프로젝트별 마지막 계산 결과를 컨테이너 revision 기준으로 보관하고(take/store_project_cpm),
+막대 하나의 기간/시작일 수정은 CpmNetwork.update_item() 으로 값이 바뀌는 항목까지만 다시 계산한다.
+"""
+
+import heapq
+import math
+import threading
+from collections import OrderedDict, deque
+
+from .excel.construction_schedule_gantt import build_items_with_timing
+
+
+LINK_TYPES = ("FS", "SS", "FF", "SF")
+FLOAT_EPSILON = 1e-6
+# 증분 수정 가능한 항목 필드
+EDITABLE_FIELDS = ("calendar_days", "_startDay")
+MAX_CACHED_NETWORKS = 32
+
+
+class ScheduleCycleError(ValueError):
+    """연결이 순환하여 일정 계산 불가"""
+
+    def __init__(self, item_ids):
+        self.item_ids = item_ids
+        super().__init__(f"schedule links contain a cycle: {', '.join(map(str, item_ids[:20]))}")
+
+
+def _to_float(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _parse_links(links, index_by_id):
+    """유효한 연결 → (선행 index, 후행 index, 유형, lag). 잘못된 연결은 ignored 로 분리"""
+    edges = []
+    ignored = []
+    for link in links or []:
+        if not isinstance(link, dict):
+            continue
+        source = index_by_id.get(str(link.get("from")))
+        target = index_by_id.get(str(link.get("to")))
+        if source is None or target is None or source == target:
+            ignored.append(link.get("id"))
+            continue
+        link_type = str(link.get("type") or "FS").upper()
+        if link_type not in LINK_TYPES:
+            link_type = "FS"
+        edges.append((source, target, link_type, _to_float(link.get("lag"))))
+    return edges, ignored
+
+
+def _link_bound(link_type, lag, source_start, source_finish, target_duration):
+    """선행 값으로 본 후행 ES 하한"""
+    if link_type == "FS":
+        return source_finish + lag
+    if link_type == "SS":
+        return source_start + lag
+    if link_type == "FF":
+        return source_finish + lag - target_duration
+    return source_start + lag - target_duration
+
+
+def _link_tail(link_type, lag, target_tail, target_duration, source_duration):
+    """후행 tail(= 공기 - LF)로 본 선행 tail 하한. LF 를 공기 기준 거리로 두면 공기가 바뀌어도 재계산 불필요"""
+    if link_type == "FS":
+        return target_tail + target_duration + lag
+    if link_type == "SS":
+        return target_tail + target_duration + lag - source_duration
+    if link_type == "FF":
+        return target_tail + lag
+    return target_tail + lag - source_duration
+
+
+def _link_slack(link_type, lag, source_start, source_finish, target_start, target_finish):
+    if link_type == "FS":
+        return target_start - source_finish - lag
+    if link_type == "SS":
+        return target_start - source_start - lag
+    if link_type == "FF":
+        return target_finish - source_finish - lag
+    return target_finish - source_start - lag
+
+
+class CpmNetwork:
+    """
+    CPM 네트워크와 마지막 계산 결과. 배열은 items 순서와 같다.
+    update_item() 은 수정한 항목만 dirty 로 두고 값이 바뀌는 후행(전진)/선행(후진) 항목까지만 다시 계산한다.
+    """
+
+    def __init__(self, items, links):
+        self.items = [item for item in items or [] if isinstance(item, dict)]
+        count = len(self.items)
+        self.index_by_id = {}
+        for index, item in enumerate(self.items):
+            self.index_by_id.setdefault(str(item.get("id")), index)
+
+        edges, self.ignored_links = _parse_links(links, self.index_by_id)
+        self.successors = [[] for _ in range(count)]
+        self.predecessors = [[] for _ in range(count)]
+        for source, target, link_type, lag in edges:
+            self.successors[source].append((target, link_type, lag))
+            self.predecessors[target].append((source, link_type, lag))
+
+        self.order = self._topological_order()
+        self.rank = [0] * count
+        for position, index in enumerate(self.order):
+            self.rank[index] = position
+
+        self.durations = [_to_float(item.get("calendar_days")) for item in self.items]
+        self.front = [_to_float(item.get("front_parallel_days")) for item in self.items]
+        self.back = [_to_float(item.get("back_parallel_days")) for item in self.items]
+        self.plan_start = [0.0] * count
+        self.plan_end = [0.0] * count
+        self._replan(0, full=True)
+
+        self.early_start = [self._release(index) for index in range(count)]
+        self.early_finish = [0.0] * count
+        for index in self.order:
+            self._forward(index)
+        self.tail = [0.0] * count
+        for index in reversed(self.order):
+            self._backward(index)
+        self.project_duration = max(self.early_finish, default=0.0)
+        self.successor_slack = [self._successor_slack(index) for index in range(count)]
+
+    def _topological_order(self):
+        """Kahn 위상 정렬 (동순위는 목록 순서)"""
+        count = len(self.items)
+        remaining = [len(preds) for preds in self.predecessors]
+        queue = deque(index for index in range(count) if not remaining[index])
+        order = []
+        while queue:
+            index = queue.popleft()
+            order.append(index)
+            for target, _type, _lag in self.successors[index]:
+                remaining[target] -= 1
+                if not remaining[target]:
+                    queue.append(target)
+        if len(order) != count:
+            raise ScheduleCycleError([self.items[index].get("id") for index in range(count) if remaining[index]])
+        return order
+
+    def _replan(self, first, full=False):
+        """
+        화면 배치(build_items_with_timing)와 같은 목록 순서 누적 배치를 first 부터 다시 계산.
+        누적 CP 종료값이 이전과 같아지면 이후 항목은 바뀌지 않으므로 중단. 배치가 바뀐 index 반환
+        """
+        changed = []
+        cumulative = self.plan_end[first - 1] if first > 0 else 0.0
+        for index in range(first, len(self.items)):
+            pinned = self.items[index].get("_startDay")
+            if pinned is not None:
+                start = _to_float(pinned)
+            elif index == 0:
+                start = 0.0
+            else:
+                start = max(0.0, cumulative - self.front[index])
+            cumulative = max(cumulative, start + self.durations[index] - self.back[index])
+            if start != self.plan_start[index]:
+                self.plan_start[index] = start
+                changed.append(index)
+            if not full and index > first and cumulative == self.plan_end[index]:
+                break
+            self.plan_end[index] = cumulative
+        return changed
+
+    def _release(self, index):
+        """선행 연결 없는 항목: 화면 배치 / 연결 있는 항목: _startDay 가 있으면 그 값, 없으면 0"""
+        if not self.predecessors[index]:
+            return self.plan_start[index]
+        if self.items[index].get("_startDay") is not None:
+            return max(0.0, self.plan_start[index])
+        return 0.0
+
+    def _forward(self, index):
+        """선행 값으로 ES/EF 재계산. 바뀌었으면 True"""
+        start = self._release(index)
+        duration = self.durations[index]
+        for source, link_type, lag in self.predecessors[index]:
+            bound = _link_bound(link_type, lag, self.early_start[source], self.early_finish[source], duration)
+            if bound > start:
+                start = bound
+        finish = start + duration
+        if start == self.early_start[index] and finish == self.early_finish[index]:
+            return False
+        self.early_start[index] = start
+        self.early_finish[index] = finish
+        return True
+
+    def _backward(self, index):
+        """후행 값으로 tail 재계산. 바뀌었으면 True"""
+        tail = 0.0
+        for target, link_type, lag in self.successors[index]:
+            bound = _link_tail(link_type, lag, self.tail[target], self.durations[target], self.durations[index])
+            if bound > tail:
+                tail = bound
+        if tail == self.tail[index]:
+            return False
+        self.tail[index] = tail
+        return True
+
+    def _successor_slack(self, index):
+        """후행 연결 기준 최소 여유 (후행 없으면 inf). 자유 여유 = min(공기 - EF, 이 값)"""
+        slack = math.inf
+        for target, link_type, lag in self.successors[index]:
+            slack = min(slack, _link_slack(
+                link_type, lag,
+                self.early_start[index], self.early_finish[index],
+                self.early_start[target], self.early_finish[target],
+            ))
+        return slack
+
+    # ---- 결과 ----
+
+    @property
+    def late_finish(self):
+        return [self.project_duration - tail for tail in self.tail]
+
+    @property
+    def late_start(self):
+        return [self.project_duration - tail - duration for tail, duration in zip(self.tail, self.durations)]
+
+    @property
+    def free_float(self):
+        return [self._free_float(index) for index in range(len(self.items))]
+
+    def _free_float(self, index):
+        return max(0.0, min(self.project_duration - self.early_finish[index], self.successor_slack[index]))
+
+    @property
+    def total_float(self):
+        return [self._total_float(index) for index in range(len(self.items))]
+
+    def _total_float(self, index):
+        return self.project_duration - self.tail[index] - self.durations[index] - self.early_start[index]
+
+    def delay_allowances(self):
+        """
+        항목별로 다른 항목 일정과 공기를 바꾸지 않고 시작을 늦출 수 있는 일수.
+        자유 여유에 더해, 뒤에 목록 순서 배치를 따르는 항목(선행 연결/_startDay 없음)이 있으면
+        누적 CP 종료값을 넘겨 늦출 수 없다.
+        """
+        allowances = [0.0] * len(self.items)
+        followers = False
+        for index in reversed(range(len(self.items))):
+            allowance = self._free_float(index)
+            if followers:
+                previous_end = self.plan_end[index - 1] if index > 0 else 0.0
+                own_end = self.early_start[index] + self.durations[index] - self.back[index]
+                # 누적 종료값을 정하는 항목은 늦추면 뒤 항목 배치가 밀린다
+                limit = 0.0 if self.plan_end[index] > previous_end else self.plan_end[index] - own_end
+                allowance = min(allowance, limit)
+            allowances[index] = max(0.0, allowance)
+            if not self.predecessors[index] and self.items[index].get("_startDay") is None:
+                followers = True
+        return allowances
+
+    def is_critical(self, index):
+        return self._total_float(index) <= FLOAT_EPSILON
+
+    @property
+    def critical_path(self):
+        """여유 0 인 항목 id (위상 순서)"""
+        return [self.items[index].get("id") for index in self.order if self.is_critical(index)]
+
+    def driving_items(self):
+        """
+        공기를 결정하는 경로에서 기간을 줄이면 공기가 줄어드는 항목 index (끝에서부터).
+        TF 는 연결만 보므로 목록 순서 누적 배치(연결 없는 항목)로 이어진 구간도 함께 따라간다.
+        """
+        count = len(self.items)
+        if not count:
+            return []
+        # plan_end[i] 를 만든 항목 (목록 순서 누적 CP 종료값의 출처)
+        setter = []
+        cumulative = None
+        for index in range(count):
+            end = self.plan_start[index] + self.durations[index] - self.back[index]
+            if cumulative is None or end > cumulative:
+                cumulative = end
+                setter.append(index)
+            else:
+                setter.append(setter[-1])
+
+        def plan_source(index):
+            """목록 배치 시작을 정한 앞 항목 (고정 시작일 / 0 으로 잘린 경우 없음)"""
+            if index == 0 or self.items[index].get("_startDay") is not None:
+                return None
+            if self.plan_end[index - 1] - self.front[index] <= FLOAT_EPSILON:
+                return None
+            return setter[index - 1]
+
+        result = []
+        seen = set()
+        index = max(range(count), key=lambda node: (self.early_finish[node], node))
+        need_finish = True
+        on_plan = False
+        while index is not None and index not in seen:
+            seen.add(index)
+            if on_plan:
+                result.append(index)
+                index = plan_source(index)
+                continue
+
+            start = self.early_start[index]
+            binding = None
+            for source, link_type, lag in self.predecessors[index]:
+                bound = _link_bound(
+                    link_type, lag, self.early_start[source], self.early_finish[source], self.durations[index]
+                )
+                if abs(bound - start) <= FLOAT_EPSILON:
+                    binding = (source, link_type)
+                    break
+
+            if binding is not None:
+                source, link_type = binding
+                # FF/SF 는 종료가 선행에 묶이므로 기간을 줄여도 종료가 당겨지지 않음
+                if need_finish and link_type in ("FS", "SS"):
+                    result.append(index)
+                need_finish = link_type in ("FS", "FF")
+                index = source
+                continue
+
+            if need_finish:
+                result.append(index)
+            if start > FLOAT_EPSILON and abs(self._release(index) - start) <= FLOAT_EPSILON:
+                on_plan = True
+                index = plan_source(index)
+            else:
+                index = None
+        return result
+
+    def activity(self, index):
+        late_finish = self.project_duration - self.tail[index]
+        return {
+            "id": self.items[index].get("id"),
+            "duration": self.durations[index],
+            "early_start": self.early_start[index],
+            "early_finish": self.early_finish[index],
+            "late_start": late_finish - self.durations[index],
+            "late_finish": late_finish,
+            "total_float": self._total_float(index),
+            "free_float": self._free_float(index),
+            "critical": self.is_critical(index),
+        }
+
+    def as_dict(self):
+        return {
+            "project_duration": self.project_duration,
+            "critical_path": self.critical_path,
+            "activities": [self.activity(index) for index in range(len(self.items))],
+            "ignored_links": self.ignored_links,
+        }
+
+    # ---- 증분 재계산 ----
+
+    def update_item(self, item_id, **changes):
+        """
+        항목 하나의 calendar_days / _startDay 변경을 반영하고 값이 바뀐 항목 index 집합과
+        공기 변경 여부를 반환. 공기가 바뀌면 모든 항목의 LS/LF/TF 가 함께 바뀐다.
+        """
+        return self.update_items({item_id: changes})
+
+    def update_items(self, changes_by_id):
+        """여러 항목 변경({item_id: {field: value}})을 한 번의 전진/후진 계산으로 반영 (반환값은 update_item 과 같음)"""
+        indexes = []
+        resized = []
+        for item_id, changes in changes_by_id.items():
+            index = self.index_by_id.get(str(item_id))
+            if index is None:
+                raise KeyError(item_id)
+            item = self.items[index]
+            for field, value in changes.items():
+                if field == "calendar_days":
+                    item[field] = value
+                    duration = _to_float(value)
+                    if duration != self.durations[index]:
+                        resized.append(index)
+                    self.durations[index] = duration
+                elif field in EDITABLE_FIELDS:
+                    item[field] = value
+                else:
+                    raise ValueError(f"unsupported field '{field}'")
+            indexes.append(index)
+
+        # 목록 순서 배치 → 시작 하한이 바뀐 항목 + 수정 항목이 전진 계산 dirty
+        # (앞 항목부터 다시 배치해야 중간 조기 종료가 뒤 항목 변경을 놓치지 않음)
+        dirty = set(indexes)
+        for index in sorted(dirty):
+            dirty.update(self._replan(index))
+        changed = set()
+        heap = [(self.rank[node], node) for node in dirty]
+        heapq.heapify(heap)
+        queued = set(dirty)
+        while heap:
+            _rank, node = heapq.heappop(heap)
+            if not self._forward(node):
+                continue
+            changed.add(node)
+            for target, _type, _lag in self.successors[node]:
+                if target not in queued:
+                    queued.add(target)
+                    heapq.heappush(heap, (self.rank[target], target))
+
+        # 기간이 바뀐 경우만 후진 계산 (선행 쪽으로, 위상 역순)
+        if resized:
+            seeds = set(resized)
+            for index in resized:
+                seeds.update(source for source, _type, _lag in self.predecessors[index])
+            heap = [(-self.rank[node], node) for node in seeds]
+            heapq.heapify(heap)
+            queued = set(seeds)
+            while heap:
+                _rank, node = heapq.heappop(heap)
+                if not self._backward(node):
+                    continue
+                changed.add(node)
+                for source, _type, _lag in self.predecessors[node]:
+                    if source not in queued:
+                        queued.add(source)
+                        heapq.heappush(heap, (-self.rank[source], source))
+
+        project_duration = max(self.early_finish, default=0.0)
+        duration_moved = project_duration != self.project_duration
+        self.project_duration = project_duration
+
+        # 후행 기준 여유: ES/EF 가 바뀐 항목과 그 선행만 (공기 항은 조회 시 반영)
+        targets = set(changed)
+        for node in changed:
+            targets.update(source for source, _type, _lag in self.predecessors[node])
+        for node in targets:
+            slack = self._successor_slack(node)
+            if slack != self.successor_slack[node]:
+                self.successor_slack[node] = slack
+                changed.add(node)
+        return changed, duration_moved
+
+
+def compute_cpm(items, links):
+    """items(dict 목록) + links → CpmNetwork. 순환이 있으면 ScheduleCycleError"""
+    return CpmNetwork(items, links)
+
+
+def schedule_items_with_timing(items, links):
+    """출력용 build_items_with_timing 대체: CPM 시작일 사용, 순환이면 기존 배치로 대체"""
+    try:
+        schedule = compute_cpm(items, links)
+    except ScheduleCycleError:
+        return build_items_with_timing(items)
+    total_float = schedule.total_float
+    return [
+        {
+            "item": item,
+            "start_day": schedule.early_start[index],
+            "duration": schedule.durations[index],
+            "total_float": total_float[index],
+            "critical": schedule.is_critical(index),
+        }
+        for index, item in enumerate(schedule.items)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# 프로젝트별 마지막 계산 결과 (프로세스 내, 컨테이너 revision 기준)
+# ---------------------------------------------------------------------------
+
+_networks = OrderedDict()
+_networks_lock = threading.Lock()
+
+
+def _schedule_network_input(raw_data):
+    if isinstance(raw_data, list):
+        return raw_data, []
+    if not isinstance(raw_data, dict):
+        return [], []
+    return raw_data.get("items") or [], raw_data.get("links") or []
+
+
+def _cache_key(container):
+    return (container.pk, str(container.project_id))
+
+
+def take_project_cpm(container):
+    """캐시에서 꺼내거나(revision 일치 시) 새로 계산. 수정이 끝나면 store_project_cpm 으로 돌려놓는다"""
+    with _networks_lock:
+        cached = _networks.pop(_cache_key(container), None)
+    if cached is not None and cached[0] == container.revision:
+        return cached[1]
+    return CpmNetwork(*_schedule_network_input(container.data))
+
+
+def store_project_cpm(container, network):
+    key = _cache_key(container)
+    with _networks_lock:
+        cached = _networks.get(key)
+        if cached is not None and cached[0] > container.revision:
+            return
+        _networks[key] = (container.revision, network)
+        _networks.move_to_end(key)
+        while len(_networks) > MAX_CACHED_NETWORKS:
+            _networks.popitem(last=False)
+
+
+def get_project_cpm(container):
+    network = take_project_cpm(container)
+    store_project_cpm(container, network)
+    return network
+
+
+def discard_project_cpm(container):
+    with _networks_lock:
+        _networks.pop(_cache_key(container), None)
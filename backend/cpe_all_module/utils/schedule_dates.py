@@ -0,0 +1,168 @@
+"""
+날짜 기반 공정 일정 산정
+
+연평균 가동률(calendar_days = working_days / operating_rate) 대신, 프로젝트 착공일부터 실제 달력을 따라
+공종별 일별 작업 가능 기대값(작업일 여부 × (1 - 해당 월 기후불능 확률))을 누적해 각 항목의 착수/완료일을 구한다.
+누적합 + searchsorted 로 항목당 O(log n)에 완료일을 찾는다.
+"""
+
+from datetime import date as date_cls
+from datetime import timedelta
+
+import numpy as np
+
+from cpe_module.models.calc_models import WorkCondition
+from cpe_module.models.operating_rate_models import WorkScheduleWeight
+from cpe_module.utils.operating_rate_defaults import PROCESS_KEY_DELIMITER
+from cpe_module.utils.operating_rate_engine import OperatingRateEngine
+from operatio.workday_calendar import HOLIDAY_FALLBACK_YEAR, get_workday_calendar
+
+
+MIN_HORIZON_DAYS = 366 * 2
+MAX_HORIZON_DAYS = 366 * 60
+
+
+def _to_float(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class DailyAvailability:
+    """착공일부터 days일 동안의 일별 작업 가능 기대값 누적합"""
+
+    def __init__(self, start_date, days, calendar, sector_type="PRIVATE", work_week_days=6, monthly_rates=None):
+        flags = calendar.workday_flags(start_date, days, sector_type, work_week_days, HOLIDAY_FALLBACK_YEAR)
+        availability = flags.astype(float)
+        if monthly_rates is not None:
+            months = (np.datetime64(start_date, "D") + np.arange(days)).astype("datetime64[M]").astype(np.int64) % 12
+            availability *= 1.0 - np.asarray(monthly_rates)[months]
+        # cumsum[i] = 0 ~ i-1일의 작업 가능 기대값 합
+        self.cumsum = np.concatenate(([0.0], np.cumsum(availability)))
+
+    def end_offset(self, start_offset, working_days):
+        """start_offset부터 working_days 만큼 일한 뒤의 종료 offset(미포함). 범위를 넘으면 None"""
+        if working_days <= 0:
+            return start_offset
+        target = self.cumsum[start_offset] + working_days - 1e-9
+        index = int(np.searchsorted(self.cumsum, target, side="left"))
+        if index >= len(self.cumsum):
+            return None
+        return index
+
+
+def _weight_for_item(item, weights_by_category):
+    main_category = item.get("main_category") or ""
+    process = item.get("process")
+    if process:
+        weight = weights_by_category.get(f"{main_category}{PROCESS_KEY_DELIMITER}{process}")
+        if weight:
+            return weight
+    return weights_by_category.get(main_category)
+
+
+def resolve_item_dates(items, start_date, weights_by_category, monthly_rates_by_weight, calendar, horizon_days=None):
+    """공정표 항목 순서(CP 연결 + 앞/뒤 병행일)를 유지하면서 날짜 기준으로 착수/완료일 산정"""
+    items = [item for item in (items or []) if isinstance(item, dict)]
+    total_working_days = sum(_to_float(item.get("working_days")) for item in items)
+    horizon = horizon_days or max(MIN_HORIZON_DAYS, int(total_working_days * 3) + 366)
+
+    while True:
+        availability_cache = {}
+        results = []
+        cumulative_cp_end = 0.0
+        overflow = False
+
+        for idx, item in enumerate(items):
+            front_parallel = _to_float(item.get("front_parallel_days"))
+            back_parallel = _to_float(item.get("back_parallel_days"))
+            start_override = item.get("_startDay")
+            if start_override is not None:
+                start_day = _to_float(start_override)
+            elif idx == 0:
+                start_day = 0.0
+            else:
+                start_day = max(0.0, cumulative_cp_end - front_parallel)
+            start_offset = int(round(start_day))
+
+            working_days = _to_float(item.get("working_days"))
+            weight = _weight_for_item(item, weights_by_category)
+            if weight is None:
+                # 가동률 항목이 없으면 기존 calendar_days 유지
+                duration = int(round(_to_float(item.get("calendar_days"))))
+            else:
+                availability = availability_cache.get(weight.pk)
+                if availability is None:
+                    availability = DailyAvailability(
+                        start_date,
+                        horizon,
+                        calendar,
+                        weight.sector_type,
+                        weight.work_week_days or 6,
+                        monthly_rates_by_weight.get(weight.pk),
+                    )
+                    availability_cache[weight.pk] = availability
+                end_offset = (
+                    availability.end_offset(start_offset, working_days) if start_offset < horizon else None
+                )
+                if end_offset is None:
+                    overflow = True
+                    break
+                duration = end_offset - start_offset
+
+            cumulative_cp_end = max(cumulative_cp_end, start_offset + duration - back_parallel)
+            finish_date = start_date + timedelta(days=start_offset + max(duration, 1) - 1)
+            results.append({
+                "id": item.get("id"),
+                "main_category": item.get("main_category"),
+                "process": item.get("process"),
+                "working_days": working_days,
+                "start_day": start_offset,
+                "calendar_days": duration,
+                "start_date": start_date + timedelta(days=start_offset),
+                "finish_date": finish_date,
+            })
+
+        if not overflow or horizon >= MAX_HORIZON_DAYS:
+            return results
+        horizon = min(horizon * 2, MAX_HORIZON_DAYS)
+
+
+def build_schedule_dates(project, items):
+    """프로젝트 착공일/가동률 지역 기준으로 항목별 착수·완료일 산정"""
+    from cpe_module.views.operating_rate import parse_years, resolve_station_id
+
+    start_date = project.start_date or date_cls.today()
+    weights = list(WorkScheduleWeight.objects.filter(project=project))
+    weights_by_category = {weight.main_category: weight for weight in weights}
+
+    work_condition = WorkCondition.objects.filter(project=project).first()
+    region = work_condition.region if work_condition and work_condition.region else "서울"
+    years = parse_years(work_condition.data_years if work_condition else None)
+    station_id = resolve_station_id({"region": region})
+
+    monthly_rates_by_weight = {}
+    if station_id and weights:
+        end_year = date_cls.today().year - 1
+        engine = OperatingRateEngine.load(station_id, end_year - years + 1, end_year)
+        for weight in weights:
+            monthly_rates_by_weight[weight.pk] = engine.monthly_nonwork_rates(
+                weight,
+                weight.work_week_days or 6,
+                weight.winter_criteria or "AVG",
+            )
+
+    results = resolve_item_dates(
+        items,
+        start_date,
+        weights_by_category,
+        monthly_rates_by_weight,
+        get_workday_calendar(),
+    )
+    finish_date = max((row["finish_date"] for row in results), default=start_date)
+    return {
+        "start_date": start_date,
+        "finish_date": finish_date,
+        "items": results,
+    }
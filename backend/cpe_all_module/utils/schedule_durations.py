@@ -0,0 +1,202 @@
+"""
+공정표 항목 기간 일괄 재계산 (frontend utils/solver.js calculateItem 포팅)
+
+가동률이 바뀌면 지금까지는 화면이 열린 동안 브라우저가 항목별로 다시 계산해 저장했기 때문에
+공정표를 열지 않은 프로젝트는 엑셀/보고서에 이전 가동률 기준 공기가 남았다.
+calculate_operating_rates 가 가동률을 갱신하면 서버에서 전 항목을 배열 연산으로 다시 계산한다.
+- 가동률 조회: operating_rate_key → main|||process → main_category (findOperatingRateForItem 과 동일)
+- 반올림: JS toFixed 와 같이 float 의 정확한 값을 반올림 (js_round.to_fixed)
+"""
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F
+
+from cpe_module.models.calc_models import WorkCondition
+from cpe_module.models.operating_rate_models import WorkScheduleWeight
+from cpe_module.utils.operating_rate_defaults import PROCESS_KEY_DELIMITER
+
+from ..models.construction_schedule_models import ConstructionScheduleItem
+from .js_round import to_fixed
+from .schedule_rows import sync_schedule_rows
+from .schedule_summary import schedule_summary_refresh
+
+DEFAULT_WORK_DAY_TYPE = "6d"
+RATE_FIELDS = ("main_category", "operating_rate", "work_week_days", "pct_7d", "pct_6d", "pct_5d")
+# 이 값이 바뀐 항목만 재계산 결과로 저장 (parallel_rate 등 파생 키 차이는 무시)
+DURATION_FIELDS = ("operating_rate_value", "working_days", "calendar_days", "calendar_months")
+
+
+def _to_number(value):
+    """parseFloat 대응 (변환 불가 → NaN)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _number_or(value, default):
+    """parseFloat(value) || default 대응 (NaN/0 → default)"""
+    number = _to_number(value)
+    return number if number == number and number else default
+
+
+def _durations_changed(old, new):
+    for field in DURATION_FIELDS:
+        before, after = _to_number(old.get(field)), _to_number(new.get(field))
+        if before != after and not (before != before and after != after):
+            return True
+    return False
+
+
+def _key(value):
+    return str(value or "").strip()
+
+
+def _js_round(values, digits):
+    return np.array([to_fixed(value, digits) for value in values], dtype=float)
+
+
+def rate_lookup(rates):
+    """가동률 목록 → {키: 가동률}. 같은 키는 첫 항목 우선 (Array.find 와 동일)"""
+    lookup = {}
+    for rate in rates:
+        key = _key(rate.get("main_category"))
+        if key:
+            lookup.setdefault(key, rate)
+    return lookup
+
+
+def find_rate_for_item(lookup, item):
+    explicit_key = _key(item.get("operating_rate_key"))
+    if explicit_key and explicit_key in lookup:
+        return lookup[explicit_key]
+
+    main_category = _key(item.get("main_category"))
+    if not main_category:
+        return None
+    process = _key(item.get("process"))
+    if process:
+        rate = lookup.get(f"{main_category}{PROCESS_KEY_DELIMITER}{process}")
+        if rate is not None:
+            return rate
+    return lookup.get(main_category)
+
+
+def _rate_value(item, rate, work_day_type):
+    value = 100.0
+    if item.get("operating_rate_value"):
+        value = _to_number(item.get("operating_rate_value"))
+    if rate is None:
+        return value
+    if rate.get("operating_rate") not in (None, ""):
+        return _to_number(rate["operating_rate"])
+    if rate.get("work_week_days"):
+        return rate["work_week_days"] / 7 * 100
+    pct = rate.get(f"pct_{work_day_type}" if work_day_type in ("5d", "7d") else "pct_6d")
+    return _to_number(pct if pct not in (None, "") else 100)
+
+
+def recalculate_item_durations(items, rates, work_day_type=DEFAULT_WORK_DAY_TYPE):
+    """items 의 작업일/공기 필드를 가동률 기준으로 다시 계산한 새 목록 반환 (입력은 변경하지 않음)"""
+    items = [item for item in items if isinstance(item, dict)]
+    if not items:
+        return []
+    lookup = rate_lookup(rates)
+
+    cp_checked = np.array([item.get("cp_checked") is not False for item in items])
+    quantity = np.array([_number_or(item.get("quantity"), 0.0) for item in items])
+    productivity = np.array([_number_or(item.get("productivity"), 0.0) for item in items])
+    crew_size = np.array([_number_or(item.get("crew_size"), 1.0) for item in items])
+    # cp 체크 시 application_rate ?? parallel_rate, 해제 시 100
+    raw_application = np.array([
+        _to_number(item["application_rate"] if item.get("application_rate") is not None else item.get("parallel_rate"))
+        if checked else 100.0
+        for item, checked in zip(items, cp_checked)
+    ])
+    rate_value = np.array([_rate_value(item, find_rate_for_item(lookup, item), work_day_type) for item in items])
+
+    application = np.where(np.isfinite(raw_application), np.clip(raw_application, 0, 100), 100.0)
+    daily_production = productivity * crew_size
+    with np.errstate(divide="ignore", invalid="ignore"):
+        working_days = np.where(daily_production > 0, quantity / daily_production, 0.0)
+        base_calendar = np.where(rate_value > 0, working_days / (rate_value / 100), 0.0)
+    calendar_days = base_calendar * (application / 100)
+
+    columns = {
+        "productivity": _js_round(productivity, 3),
+        "daily_production": _js_round(daily_production, 3),
+        "working_days": _js_round(working_days, 2),
+        "application_rate": _js_round(application, 1),
+        "parallel_rate": np.where(cp_checked, _js_round(100 - application, 1), 100.0),
+        "calendar_days": _js_round(calendar_days, 1),
+        "calendar_months": _js_round(calendar_days / 30, 1),
+    }
+    results = []
+    for idx, item in enumerate(items):
+        updated = dict(item)
+        updated.update({field: float(values[idx]) for field, values in columns.items()})
+        updated["operating_rate_value"] = None if rate_value[idx] != rate_value[idx] else float(rate_value[idx])
+        updated["cp_checked"] = bool(cp_checked[idx])
+        results.append(updated)
+    return results
+
+
+def _project_work_day_type(project_id):
+    work_cond = WorkCondition.objects.filter(project_id=project_id).only("earthwork_type").first()
+    if work_cond and str(work_cond.earthwork_type or "") in ("5", "6", "7"):
+        return f"{work_cond.earthwork_type}d"
+    return DEFAULT_WORK_DAY_TYPE
+
+
+def recalculate_project_durations(project_id):
+    """프로젝트 공정표 항목 기간을 현재 가동률로 다시 계산. 기간이 바뀐 항목 수 반환
+
+    가동률 재계산 직후 호출되므로 save() 대신 update 로 저장해 post_save(가동률 재계산 예약)가
+    다시 걸리지 않게 하고, 리비전 증가와 정규화 행 동기화는 직접 처리한다. 요약은 커밋 후 백그라운드에서 갱신한다.
+    edit_revision 은 그대로 두므로 클라이언트의 If-Match 저장은 412 가 되지 않는다.
+    """
+    rates = list(WorkScheduleWeight.objects.filter(project_id=project_id).values(*RATE_FIELDS))
+    if not rates:
+        return 0
+    work_day_type = _project_work_day_type(project_id)
+
+    with transaction.atomic():
+        container = (
+            ConstructionScheduleItem.objects.select_for_update()
+            .filter(project_id=project_id)
+            .order_by("id")
+            .first()
+        )
+        if container is None:
+            return 0
+        data = container.data
+        items = data if isinstance(data, list) else (data.get("items") or []) if isinstance(data, dict) else []
+        if not items:
+            return 0
+
+        recalculated = iter(recalculate_item_durations(items, rates, work_day_type))
+        new_items = []
+        changed = 0
+        for item in items:
+            if not isinstance(item, dict):
+                new_items.append(item)
+                continue
+            new = next(recalculated)
+            if _durations_changed(item, new):
+                new_items.append(new)
+                changed += 1
+            else:
+                new_items.append(item)
+        if not changed:
+            return 0
+
+        container.data = new_items if isinstance(data, list) else {**data, "items": new_items}
+        ConstructionScheduleItem.objects.filter(pk=container.pk).update(
+            data=container.data,
+            revision=F("revision") + 1,
+        )
+        container.revision += 1
+        sync_schedule_rows(container)
+        schedule_summary_refresh(container)
+    return changed
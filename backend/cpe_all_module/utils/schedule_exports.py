@@ -0,0 +1,207 @@
+"""
+공정표 엑셀/보고서 출력 생성
+
+동기 출력 API(export-excel / export-report)와 비동기 출력 작업(export_jobs)이 같은 생성 코드를 쓴다.
+progress(percent, stage) 콜백으로 단계별 진행률을 알린다.
+"""
+
+import io
+import logging
+from datetime import date as date_cls, timedelta
+
+import xlsxwriter
+
+from cpe_module.models.calc_models import WorkCondition
+from cpe_module.models.operating_rate_models import WorkScheduleWeight
+from operatio.workday_calendar import get_workday_calendar
+
+from .excel.construction_schedule import (
+    build_rate_summary,
+    extract_schedule_payload,
+    group_items_by_category,
+    inject_gantt_drawing,
+    write_crew_sheet,
+    write_gantt_sheet,
+    write_table_sheet,
+)
+from .excel.construction_schedule_preview import build_gantt_preview_png
+from .export_cache import export_cache_key
+from .schedule_cpm import schedule_items_with_timing
+from .schedule_resources import build_crew_histogram
+from .word.construction_schedule import build_schedule_report_aux_data, build_schedule_report_docx
+
+EXCEL = "excel"
+REPORT = "report"
+EXPORT_KINDS = (EXCEL, REPORT)
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+logger = logging.getLogger(__name__)
+
+
+def _no_progress(percent, stage):
+    return None
+
+
+def safe_filename(name):
+    return "".join(ch if ch not in '\\/:*?\"<>|' else "_" for ch in name)
+
+
+def export_start_date(project):
+    return project.start_date if project.start_date else date_cls.today()
+
+
+def export_target(kind, project, container):
+    """(캐시 키, 파일명, content type)"""
+    start_date = export_start_date(project)
+    if kind == REPORT:
+        # 표지에 출력 연월이 들어가므로 월 단위로 키를 나눈다
+        cache_key = export_cache_key(
+            REPORT, container, project, start_date, {"month": date_cls.today().strftime("%Y-%m")}
+        )
+        return cache_key, f"공사기간_산정_보고서_{safe_filename(project.title)}.docx", DOCX_CONTENT_TYPE
+    cache_key = export_cache_key(EXCEL, container, project, start_date)
+    return cache_key, f"공사기간_산정_기준_{safe_filename(project.title)}.xlsx", XLSX_CONTENT_TYPE
+
+
+def build_excel_export(project, container, progress=_no_progress):
+    project_id = project.id
+    raw_data = container.data
+    items, sub_tasks, links = extract_schedule_payload(raw_data)
+    cost_inputs = raw_data.get("cost_inputs", {}) if isinstance(raw_data, dict) else {}
+    milestones = raw_data.get("milestones", []) if isinstance(raw_data, dict) else []
+    project_name = project.title
+    start_date = export_start_date(project)
+
+    weight_rows = list(
+        WorkScheduleWeight.objects.filter(project_id=project_id)
+        .values("main_category", "operating_rate", "sector_type", "work_week_days")
+    )
+    rate_map = {row["main_category"]: row["operating_rate"] for row in weight_rows}
+
+    public_count = sum(1 for r in weight_rows if (r.get("sector_type") or "PUBLIC").upper() == "PUBLIC")
+    private_count = len(weight_rows) - public_count
+    sector_type = "PRIVATE" if private_count > public_count else "PUBLIC"
+
+    grouped, ordered_categories = group_items_by_category(items)
+
+    work_condition = WorkCondition.objects.filter(project_id=project_id).first()
+    region = work_condition.region if work_condition and work_condition.region else ""
+
+    work_week_days = 6
+    if work_condition and work_condition.earthwork_type:
+        try:
+            work_week_days = int(work_condition.earthwork_type)
+        except (TypeError, ValueError):
+            work_week_days = 6
+
+    rate_summary = build_rate_summary(project_id, ordered_categories, rate_map, region)
+
+    max_item_end = max(
+        (meta["start_day"] + meta["duration"] for meta in schedule_items_with_timing(items, links)),
+        default=0.0,
+    )
+    for ms in milestones if isinstance(milestones, list) else []:
+        try:
+            max_item_end = max(max_item_end, float(ms.get("day") or ms.get("endDay") or 0))
+        except (TypeError, ValueError, AttributeError):
+            continue
+    span_days = max(1, int(round(max_item_end)) + 1)
+    end_date = start_date + timedelta(days=span_days)
+
+    holiday_set = {
+        d.isoformat()
+        for d in get_workday_calendar().holiday_dates_between(start_date, end_date, sector_type)
+    }
+
+    output = io.BytesIO()
+    wb = xlsxwriter.Workbook(output, {'in_memory': True})
+
+    # ---- Sheet 1: Table ----
+    progress(10, "table")
+    write_table_sheet(wb, items, ordered_categories, grouped, rate_summary, rate_map, project_name)
+
+    # ---- Sheet 2: Gantt (shape-based, Excel-editable) ----
+    progress(25, "gantt")
+    gantt_meta = write_gantt_sheet(
+        wb,
+        items,
+        sub_tasks,
+        links,
+        project_name,
+        start_date,
+        custom_milestones=milestones,
+        cost_inputs=cost_inputs,
+        include_bohal_table=True,
+        work_week_days=work_week_days,
+        holiday_set=holiday_set,
+    )
+    logger.debug("[export-excel] gantt_shapes_count=%s", len(gantt_meta['shapes']))
+
+    # ---- Sheet 3: 일일 투입 인원 ----
+    progress(60, "crew")
+    write_crew_sheet(
+        wb,
+        build_crew_histogram(items, links, sub_tasks, level=True),
+        project_name,
+        start_date,
+    )
+
+    progress(70, "workbook")
+    wb.close()
+    output.seek(0)
+
+    progress(90, "drawing")
+    return inject_gantt_drawing(output.read(), **gantt_meta)
+
+
+def build_report_export(project, container, progress=_no_progress):
+    project_id = project.id
+    items, sub_tasks, links = extract_schedule_payload(container.data)
+    project_name = project.title
+
+    progress(10, "gantt")
+    gantt_image_bytes = build_gantt_preview_png(
+        items=items,
+        sub_tasks=sub_tasks,
+        links=links,
+        project_name=project_name,
+        start_date=export_start_date(project),
+    )
+
+    rate_qs = WorkScheduleWeight.objects.filter(project_id=project_id).values("main_category", "operating_rate")
+    rate_map = {row["main_category"]: row["operating_rate"] for row in rate_qs}
+
+    grouped, ordered_categories = group_items_by_category(items)
+
+    work_condition = WorkCondition.objects.filter(project_id=project_id).first()
+    region = work_condition.region if work_condition and work_condition.region else ""
+    work_condition_years = work_condition.data_years if work_condition and work_condition.data_years else 10
+
+    progress(40, "weather")
+    rate_summary = build_rate_summary(project_id, ordered_categories, rate_map, region)
+    report_aux_data = build_schedule_report_aux_data(
+        project_id=project_id,
+        ordered_categories=ordered_categories,
+        region=region,
+        project_start_date=project.start_date,
+        work_condition_years=work_condition_years,
+    )
+
+    progress(70, "document")
+    return build_schedule_report_docx(
+        project_name=project_name,
+        rate_summary=rate_summary,
+        ordered_categories=ordered_categories,
+        grouped_items=grouped,
+        rate_map=rate_map,
+        region=region,
+        gantt_image_bytes=gantt_image_bytes,
+        **report_aux_data,
+    )
+
+
+def build_export(kind, project, container, progress=_no_progress):
+    builder = build_report_export if kind == REPORT else build_excel_export
+    return builder(project, container, progress)
@@ -0,0 +1,79 @@
+"""
+공정표 구간 색인 (CP 구간 포함/겹침 조회)
+
+간트 출력은 항목마다 다른 모든 항목을 돌며 자기 CP 구간(red_start~red_end) 안에 들어오는 구간을 찾았기 때문에
+항목 수 n 에 대해 O(n²) 였다. 구간을 시작일 순으로 정렬하고 끝일 최소/최대 sparse table 을 두어
+- contained(start, end): start <= s 이고 e <= end 인 구간
+- overlapping(start, end): s < end 이고 e > start 인 구간
+을 O(log n + k) 로 찾는다 (k = 결과 수). 시작일 범위는 bisect, 그 안의 끝일 조건은 구간 최소/최대값이
+조건을 만족하는 쪽만 나눠 내려가므로 결과 하나당 상수 번 조회로 끝난다.
+결과는 입력 순서대로 돌려주므로 기존 루프와 출력 순서가 같다. 구간은 s <= e 를 가정한다.
+"""
+
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+
+def _sparse_table(values, pick):
+    """values 구간 최소/최대 위치 sparse table (pick: np.less_equal → 최소, np.greater_equal → 최대)"""
+    levels = [np.arange(len(values))]
+    width = 1
+    while width * 2 <= len(values):
+        prev = levels[-1]
+        left, right = prev[:len(prev) - width], prev[width:]
+        levels.append(np.where(pick(values[left], values[right]), left, right))
+        width *= 2
+    return [level.tolist() for level in levels]
+
+
+class IntervalIndex:
+    """(시작, 끝, 값) 목록에 대한 포함/겹침 조회 색인"""
+
+    def __init__(self, intervals):
+        intervals = list(intervals)
+        starts = np.asarray([float(start) for start, _, _ in intervals], dtype=float)
+        order = np.argsort(starts, kind="stable")
+        ends = np.asarray([float(intervals[pos][1]) for pos in order], dtype=float)
+        self._order = order.tolist()
+        self._values = [value for _, _, value in intervals]
+        self._starts = starts[order].tolist()
+        self._ends = ends.tolist()
+        self._min_end = _sparse_table(ends, np.less_equal)
+        self._max_end = _sparse_table(ends, np.greater_equal)
+
+    def __len__(self):
+        return len(self._order)
+
+    def _range_pick(self, table, lo, hi, better):
+        """정렬 위치 [lo, hi) 의 최소/최대 끝일 위치"""
+        level = (hi - lo).bit_length() - 1
+        left, right = table[level][lo], table[level][hi - (1 << level)]
+        return left if better(self._ends[left], self._ends[right]) else right
+
+    def _report(self, table, lo, hi, accept, better):
+        found = []
+        stack = [(lo, hi)]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            pos = self._range_pick(table, lo, hi, better)
+            if not accept(self._ends[pos]):
+                continue
+            found.append(self._order[pos])
+            stack.append((lo, pos))
+            stack.append((pos + 1, hi))
+        found.sort()
+        return [self._values[idx] for idx in found]
+
+    def contained(self, start, end):
+        """[start, end] 안에 완전히 들어오는 구간의 값 (입력 순서)"""
+        lo = bisect_left(self._starts, start)
+        hi = bisect_right(self._starts, end)
+        return self._report(self._min_end, lo, hi, lambda value: value <= end, lambda a, b: a <= b)
+
+    def overlapping(self, start, end):
+        """(start, end) 와 길이 있게 겹치는 구간의 값 (입력 순서)"""
+        hi = bisect_left(self._starts, end)
+        return self._report(self._max_end, 0, hi, lambda value: value > start, lambda a, b: a >= b)
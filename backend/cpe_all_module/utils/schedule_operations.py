@@ -0,0 +1,183 @@
+"""
+공정표 부분 수정(operation) 적용
+
+간트 드래그/셀 편집마다 data 전체를 올리는 대신, 항목 단위 operation 목록만 받아 서버에서 적용한다.
+
+operation 형식:
+    {"op": "add",     "collection": "items", "value": {...}, "index": 3}        # 또는 "after"/"before": <id>
+    {"op": "replace", "collection": "items", "id": "earth-1", "value": {...}}
+    {"op": "update",  "collection": "links", "id": "link-1", "value": {"lag": 2}}  # 얕은 병합
+    {"op": "remove",  "collection": "items", "id": "earth-1"}                   # 연결 link/sub_task 함께 삭제
+    {"op": "move",    "collection": "items", "id": "earth-1", "after": "earth-0"}
+    {"op": "set",     "section": "cost_inputs", "value": {...}}                 # weight_inputs/cost_inputs
+"""
+
+import copy
+
+
+COLLECTIONS = ("items", "links", "sub_tasks", "milestones")
+SECTIONS = ("weight_inputs", "cost_inputs")
+OPERATIONS = ("add", "replace", "update", "remove", "move", "set")
+
+
+class ScheduleOperationError(ValueError):
+    def __init__(self, index, message):
+        self.index = index
+        super().__init__(f"operations[{index}]: {message}")
+
+
+def normalize_schedule_data(raw_data):
+    """list(구버전 items 배열) / dict 모두 collection 키를 가진 dict로 변환 (원본은 변경하지 않음)"""
+    if isinstance(raw_data, list):
+        data = {"items": copy.deepcopy(raw_data)}
+    elif isinstance(raw_data, dict):
+        data = copy.deepcopy(raw_data)
+    else:
+        data = {}
+    if "sub_tasks" not in data and "subTasks" in data:
+        data["sub_tasks"] = data.pop("subTasks")
+    for key in COLLECTIONS:
+        if not isinstance(data.get(key), list):
+            data[key] = []
+    return data
+
+
+def _find(rows, row_id):
+    for pos, row in enumerate(rows):
+        if isinstance(row, dict) and str(row.get("id")) == str(row_id):
+            return pos
+    return None
+
+
+def _insert_position(rows, operation, index):
+    for key, offset in (("after", 1), ("before", 0)):
+        anchor = operation.get(key)
+        if anchor is not None:
+            pos = _find(rows, anchor)
+            if pos is None:
+                raise ScheduleOperationError(index, f"{key} id '{anchor}' not found")
+            return pos + offset
+    position = operation.get("index")
+    if position is None:
+        return len(rows)
+    try:
+        return max(0, min(int(position), len(rows)))
+    except (TypeError, ValueError):
+        raise ScheduleOperationError(index, "index must be an integer")
+
+
+class _ChangeSet:
+    def __init__(self):
+        self.upserted = {key: {} for key in COLLECTIONS}
+        self.removed = {key: [] for key in COLLECTIONS}
+        self.sections = set()
+
+    def upsert(self, collection, row):
+        self.upserted[collection][str(row.get("id"))] = row
+        if str(row.get("id")) in self.removed[collection]:
+            self.removed[collection].remove(str(row.get("id")))
+
+    def remove(self, collection, row_id):
+        self.upserted[collection].pop(str(row_id), None)
+        if str(row_id) not in self.removed[collection]:
+            self.removed[collection].append(str(row_id))
+
+    def as_dict(self, data):
+        changes = {}
+        for key in COLLECTIONS:
+            if self.upserted[key] or self.removed[key]:
+                changes[key] = {
+                    "upserted": list(self.upserted[key].values()),
+                    "removed": self.removed[key],
+                }
+        for section in sorted(self.sections):
+            changes[section] = data.get(section)
+        return changes
+
+
+def _remove_item_dependents(data, item_id, changes):
+    """항목 삭제 시 해당 항목을 참조하는 link / sub_task 함께 삭제 (프론트 deleteItem 과 동일)"""
+    kept = []
+    for link in data["links"]:
+        if isinstance(link, dict) and item_id in (str(link.get("from")), str(link.get("to"))):
+            changes.remove("links", link.get("id"))
+        else:
+            kept.append(link)
+    data["links"] = kept
+
+    kept = []
+    for sub_task in data["sub_tasks"]:
+        if isinstance(sub_task, dict) and str(sub_task.get("itemId")) == item_id:
+            changes.remove("sub_tasks", sub_task.get("id"))
+        else:
+            kept.append(sub_task)
+    data["sub_tasks"] = kept
+
+
+def apply_schedule_operations(raw_data, operations):
+    """operation 목록을 순서대로 적용한 (새 data, 변경 내역) 반환. 하나라도 잘못되면 ScheduleOperationError"""
+    if not isinstance(operations, list):
+        raise ScheduleOperationError(0, "operations must be a list")
+
+    data = normalize_schedule_data(raw_data)
+    changes = _ChangeSet()
+
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            raise ScheduleOperationError(index, "operation must be an object")
+        op = operation.get("op")
+        if op not in OPERATIONS:
+            raise ScheduleOperationError(index, f"unsupported op '{op}'")
+
+        if op == "set":
+            section = operation.get("section")
+            if section not in SECTIONS:
+                raise ScheduleOperationError(index, f"section must be one of {', '.join(SECTIONS)}")
+            value = operation.get("value")
+            if not isinstance(value, dict):
+                raise ScheduleOperationError(index, "value must be an object")
+            data[section] = value
+            changes.sections.add(section)
+            continue
+
+        collection = operation.get("collection", "items")
+        if collection not in COLLECTIONS:
+            raise ScheduleOperationError(index, f"collection must be one of {', '.join(COLLECTIONS)}")
+        rows = data[collection]
+        value = operation.get("value")
+
+        if op == "add":
+            if not isinstance(value, dict) or value.get("id") in (None, ""):
+                raise ScheduleOperationError(index, "value must be an object with id")
+            if _find(rows, value["id"]) is not None:
+                raise ScheduleOperationError(index, f"id '{value['id']}' already exists")
+            rows.insert(_insert_position(rows, operation, index), value)
+            changes.upsert(collection, value)
+            continue
+
+        row_id = operation.get("id")
+        pos = _find(rows, row_id) if row_id is not None else None
+        if pos is None:
+            raise ScheduleOperationError(index, f"id '{row_id}' not found in {collection}")
+
+        if op == "replace":
+            if not isinstance(value, dict):
+                raise ScheduleOperationError(index, "value must be an object")
+            rows[pos] = dict(value, id=rows[pos]["id"])
+            changes.upsert(collection, rows[pos])
+        elif op == "update":
+            if not isinstance(value, dict):
+                raise ScheduleOperationError(index, "value must be an object")
+            rows[pos] = dict(rows[pos], **{key: val for key, val in value.items() if key != "id"})
+            changes.upsert(collection, rows[pos])
+        elif op == "remove":
+            removed = rows.pop(pos)
+            changes.remove(collection, removed["id"])
+            if collection == "items":
+                _remove_item_dependents(data, str(removed["id"]), changes)
+        elif op == "move":
+            row = rows.pop(pos)
+            rows.insert(_insert_position(rows, operation, index), row)
+            changes.upsert(collection, row)
+
+    return data, changes.as_dict(data)
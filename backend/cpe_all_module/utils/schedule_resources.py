@@ -0,0 +1,178 @@
+"""
+공정표 인력 투입 히스토그램 / 평준화
+
+항목(및 sub_tasks)의 crew_size 를 일 단위 격자에 올려 전체/대공종별 일일 투입 인원과 최대 인원을 구한다.
+격자 범위는 화면 dailyLoads(ganttUtils)와 같이 floor(시작일) 이상 ceil(시작일 + 기간) 미만이고,
+누적은 차분 배열(np.add.at + cumsum)로 O(막대 수 + 일수).
+sub_task 는 자체 crew_size 가 없으면 상위 항목 인원을 쓴다.
+
+평준화(level=True)는 여유가 있는 항목을 다른 항목 일정과 공기를 바꾸지 않는 범위(CpmNetwork.delay_allowances)
+안에서 하루 단위로 늦춰 최대 인원을 줄인다. 인원이 많은 항목부터 최대 인원 → 구간 합 → 이동 일수 순으로 고른다.
+shifts 의 new_start_day 는 _startDay 로 그대로 반영할 수 있다.
+"""
+
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .excel.construction_schedule_gantt import build_items_with_timing, build_subtask_list
+from .schedule_cpm import ScheduleCycleError, compute_cpm
+
+DEFAULT_CATEGORY = "기타"
+
+
+def _crew(value):
+    """parseFloat(crew_size) || 0"""
+    try:
+        crew = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return crew if math.isfinite(crew) and crew > 0 else 0.0
+
+
+def _item_rows(items, links):
+    """(item, 시작일, 기간, 늦출 수 있는 일수). 순환 연결이면 기존 배치 + 평준화 없음"""
+    try:
+        network = compute_cpm(items, links)
+    except ScheduleCycleError:
+        return [(meta["item"], meta["start_day"], meta["duration"], 0.0) for meta in build_items_with_timing(items)]
+    allowances = network.delay_allowances()
+    return [
+        (item, network.early_start[index], network.durations[index], allowances[index])
+        for index, item in enumerate(network.items)
+    ]
+
+
+class CrewBars:
+    """히스토그램에 올릴 막대 배열 (항목 막대 뒤에 sub_task 막대)"""
+
+    def __init__(self, items, links=None, sub_tasks=None):
+        rows = _item_rows(items, links)
+        self.categories = []
+        category_codes = {}
+
+        def code(item):
+            category = str(item.get("main_category") or DEFAULT_CATEGORY)
+            if category not in category_codes:
+                category_codes[category] = len(self.categories)
+                self.categories.append(category)
+            return category_codes[category]
+
+        starts, durations, crews, codes, allowances, ids = [], [], [], [], [], []
+        items_by_id = {}
+        for item, start, duration, allowance in rows:
+            items_by_id.setdefault(str(item.get("id")), item)
+            starts.append(start)
+            durations.append(duration)
+            crews.append(_crew(item.get("crew_size")))
+            codes.append(code(item))
+            allowances.append(allowance)
+            ids.append(item.get("id"))
+        self.item_count = len(rows)
+
+        for sub in build_subtask_list(sub_tasks):
+            parent = items_by_id.get(str(sub["item_id"]))
+            if parent is None:
+                continue
+            own_crew = sub["subtask"].get("crew_size")
+            starts.append(sub["start_day"])
+            durations.append(sub["duration"])
+            crews.append(_crew(own_crew if own_crew not in (None, "") else parent.get("crew_size")))
+            codes.append(code(parent))
+            allowances.append(0.0)
+            ids.append(None)
+
+        starts = np.asarray(starts, dtype=float)
+        ends = starts + np.maximum(np.asarray(durations, dtype=float), 0.0)
+        self.starts = starts
+        self.first_days = np.floor(np.maximum(starts, 0.0)).astype(np.int64)
+        self.last_days = np.maximum(np.ceil(ends).astype(np.int64), self.first_days)
+        self.crews = np.asarray(crews, dtype=float)
+        self.codes = np.asarray(codes, dtype=np.int64)
+        self.allowances = np.floor(np.asarray(allowances, dtype=float) + 1e-9).astype(np.int64)
+        self.ids = ids
+        self.day_count = int(self.last_days.max()) if len(self.last_days) else 0
+
+    def grid(self, shifts=None):
+        """대공종 × 일 투입 인원 배열"""
+        first = self.first_days if shifts is None else self.first_days + shifts
+        last = self.last_days if shifts is None else self.last_days + shifts
+        diff = np.zeros((len(self.categories), self.day_count + 1))
+        np.add.at(diff, (self.codes, first), self.crews)
+        np.add.at(diff, (self.codes, last), -self.crews)
+        return np.cumsum(diff, axis=1)[:, :self.day_count]
+
+
+def level_crews(bars):
+    """여유 안에서 항목 시작을 늦춰 최대 인원을 줄인 일 단위 이동량 배열"""
+    shifts = np.zeros(len(bars.crews), dtype=np.int64)
+    if not bars.day_count:
+        return shifts
+    total = bars.grid().sum(axis=0)
+    widths = bars.last_days - bars.first_days
+    candidates = [
+        index for index in range(bars.item_count)
+        if bars.crews[index] > 0 and widths[index] > 0 and bars.allowances[index] > 0
+    ]
+    candidates.sort(key=lambda index: (-bars.crews[index], -widths[index], index))
+
+    for index in candidates:
+        first, width, crew = bars.first_days[index], widths[index], bars.crews[index]
+        max_shift = min(int(bars.allowances[index]), bars.day_count - first - width)
+        if max_shift <= 0:
+            continue
+        total[first:first + width] -= crew
+        windows = sliding_window_view(total, width)[first:first + max_shift + 1]
+        peaks = np.round(np.maximum(windows.max(axis=1) + crew, total.max()), 6)
+        sums = np.round(windows.sum(axis=1), 6)
+        shift = int(np.lexsort((np.arange(len(peaks)), sums, peaks))[0])
+        total[first + shift:first + shift + width] += crew
+        shifts[index] = shift
+    return shifts
+
+
+def _summary(grid, categories, crew_limit=None):
+    total = grid.sum(axis=0)
+    peak_day = int(total.argmax()) if total.size else 0
+    summary = {
+        "daily": np.round(total, 2).tolist(),
+        "peak": round(float(total.max()), 2) if total.size else 0.0,
+        "peak_day": peak_day,
+        "average": round(float(total.mean()), 2) if total.size else 0.0,
+        "crew_days": round(float(total.sum()), 2),
+        "categories": [
+            {
+                "main_category": category,
+                "daily": np.round(row, 2).tolist(),
+                "peak": round(float(row.max()), 2) if row.size else 0.0,
+                "crew_days": round(float(row.sum()), 2),
+            }
+            for category, row in zip(categories, grid)
+        ],
+    }
+    if crew_limit is not None:
+        summary["days_over_limit"] = int((total > crew_limit + 1e-9).sum())
+    return summary
+
+
+def build_crew_histogram(items, links=None, sub_tasks=None, level=False, crew_limit=None):
+    """일일 투입 인원(전체/대공종별)과 최대 인원. level=True 면 평준화 결과(leveled)도 함께 반환"""
+    bars = CrewBars(items, links, sub_tasks)
+    result = {"total_days": bars.day_count, **_summary(bars.grid(), bars.categories, crew_limit)}
+    if not level:
+        return result
+
+    shifts = level_crews(bars)
+    leveled = _summary(bars.grid(shifts), bars.categories, crew_limit)
+    leveled["shifts"] = [
+        {
+            "id": bars.ids[index],
+            "start_day": float(bars.starts[index]),
+            "new_start_day": float(bars.starts[index] + shifts[index]),
+            "shift_days": int(shifts[index]),
+        }
+        for index in np.flatnonzero(shifts)
+    ]
+    result["leveled"] = leveled
+    return result
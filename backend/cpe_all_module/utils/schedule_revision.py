@@ -0,0 +1,59 @@
+"""
+공정표 리비전 기반 ETag
+
+ConstructionScheduleItem.revision 은 저장할 때마다 증가하므로 (id, revision) 만으로
+data 를 읽지 않고 강한 ETag 를 만들 수 있다.
+- GET: If-None-Match 가 일치하면 304 (data 직렬화 생략)
+- PUT/PATCH: If-Match 가 마지막 사용자 저장(edit_revision) 이전 리비전이면 412 (다른 창/사용자의 저장을 덮어쓰지 않음)
+  가동률 반영으로 서버가 기간만 다시 계산해 올린 리비전은 충돌로 보지 않는다.
+"""
+
+import hashlib
+
+
+def schedule_etag(pk, revision):
+    return f'"{pk}-{revision}"'
+
+
+def schedule_list_etag(rows):
+    """[(id, revision), ...] → 목록 ETag (항목 추가/삭제/저장 시 변경)"""
+    digest = hashlib.sha1(";".join(f"{pk}-{revision}" for pk, revision in rows).encode()).hexdigest()
+    return f'"list-{digest[:32]}"'
+
+
+def _parse_etags(header):
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def if_none_match(request, etag):
+    """If-None-Match 일치 여부 (약한 비교: W/ 접두어 무시)"""
+    header = request.headers.get("If-None-Match")
+    if not header or etag is None:
+        return False
+    for tag in _parse_etags(header):
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def if_match_failed(request, pk, revision, edit_revision=None):
+    """If-Match 가 있고 어느 태그도 edit_revision~revision 범위의 ETag 가 아니면 True
+    (강한 비교, 헤더 없으면 검사 안 함)"""
+    header = request.headers.get("If-Match")
+    if not header:
+        return False
+    tags = _parse_etags(header)
+    if "*" in tags:
+        return False
+    first = revision if edit_revision is None else min(edit_revision, revision)
+    prefix = f'"{pk}-'
+    for tag in tags:
+        if not (tag.startswith(prefix) and tag.endswith('"')):
+            continue
+        try:
+            tag_revision = int(tag[len(prefix):-1])
+        except ValueError:
+            continue
+        if first <= tag_revision <= revision:
+            return False
+    return True
@@ -0,0 +1,183 @@
+"""
+공정표 정규화 행 동기화 / 조회
+
+ConstructionScheduleItem.data(JSON)는 기존 API 호환을 위해 그대로 원본으로 두고,
+저장될 때마다 items / links / sub_tasks 를 ScheduleActivity / ScheduleLink / ScheduleSubTask 행으로 맞춘다.
+id 기준으로 비교해 바뀐 행만 insert/update/delete 하므로 항목 하나 수정 시 행 하나만 갱신된다.
+대공종·공정·표준코드 조회와 프로젝트 간 집계는 JSON 전체를 읽지 않고 SQL 로 처리한다.
+"""
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from ..models.construction_schedule_models import ScheduleActivity, ScheduleLink, ScheduleSubTask
+
+
+ACTIVITY_TEXT_FIELDS = (
+    "main_category", "process", "sub_process", "work_type",
+    "standard_code", "operating_rate_type", "unit",
+)
+ACTIVITY_NUMBER_FIELDS = ("quantity", "productivity", "crew_size", "working_days", "calendar_days")
+
+
+def _text(value, max_length):
+    if value is None:
+        return ""
+    return str(value)[:max_length]
+
+
+def _number(value):
+    if value in (None, ""):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number == number else None  # NaN 제외
+
+
+def _collections(raw_data):
+    if isinstance(raw_data, list):
+        return raw_data, [], []
+    if not isinstance(raw_data, dict):
+        return [], [], []
+    sub_tasks = raw_data.get("sub_tasks") or raw_data.get("subTasks") or []
+    return raw_data.get("items") or [], raw_data.get("links") or [], sub_tasks
+
+
+def _keyed(rows):
+    """dict 행만 골라 (key, position, row). id 가 없거나 중복이면 위치로 구분"""
+    seen = set()
+    for position, row in enumerate(rows):
+        if not isinstance(row, dict):
+            continue
+        key = _text(row.get("id"), 100) or f"@{position}"
+        if key in seen:
+            key = f"{key}@{position}"[-100:]
+        seen.add(key)
+        yield key, position, row
+
+
+def activity_values(position, item):
+    values = {"position": position}
+    for field in ACTIVITY_TEXT_FIELDS:
+        max_length = ScheduleActivity._meta.get_field(field).max_length
+        values[field] = _text(item.get(field), max_length)
+    for field in ACTIVITY_NUMBER_FIELDS:
+        values[field] = _number(item.get(field))
+    return values
+
+
+def link_values(position, link):
+    return {
+        "position": position,
+        "from_key": _text(link.get("from"), 100),
+        "to_key": _text(link.get("to"), 100),
+        "link_type": _text(link.get("type") or "FS", 2).upper(),
+        "lag": _number(link.get("lag")) or 0.0,
+    }
+
+
+def sub_task_values(position, sub_task):
+    return {
+        "position": position,
+        "item_key": _text(sub_task.get("itemId"), 100),
+        "start_day": _number(sub_task.get("startDay")),
+        "duration_days": _number(sub_task.get("durationDays")),
+    }
+
+
+def build_row_values(raw_data):
+    """JSON data → {key 필드: {key: values}}"""
+    items, links, sub_tasks = _collections(raw_data)
+    return {
+        "item_key": {key: activity_values(pos, row) for key, pos, row in _keyed(items)},
+        "link_key": {key: link_values(pos, row) for key, pos, row in _keyed(links)},
+        "sub_task_key": {key: sub_task_values(pos, row) for key, pos, row in _keyed(sub_tasks)},
+    }
+
+
+ROW_MODELS = (
+    (ScheduleActivity, "item_key", ("position", *ACTIVITY_TEXT_FIELDS, *ACTIVITY_NUMBER_FIELDS)),
+    (ScheduleLink, "link_key", ("position", "from_key", "to_key", "link_type", "lag")),
+    (ScheduleSubTask, "sub_task_key", ("position", "item_key", "start_day", "duration_days")),
+)
+
+
+def _sync_model(model, key_field, update_fields, container, desired):
+    # 행에는 인덱스 컬럼만 있으므로 저장된 컬럼 값이 곧 이전 상태 (JSON 원본은 다시 읽지 않음)
+    existing = {
+        row[1]: (row[0], row[2:])
+        for row in model.objects.filter(container=container).values_list("id", key_field, *update_fields)
+    }
+    stale = [pk for key, (pk, _current) in existing.items() if key not in desired]
+    created = []
+    changed = []
+    for key, values in desired.items():
+        row = existing.get(key)
+        if row is None:
+            created.append(model(container=container, project_id=container.project_id, **{key_field: key}, **values))
+        elif row[1] != tuple(values[field] for field in update_fields):
+            changed.append(model(id=row[0], **values))
+
+    if stale:
+        model.objects.filter(id__in=stale).delete()
+    if created:
+        model.objects.bulk_create(created, batch_size=500)
+    if changed:
+        model.objects.bulk_update(changed, update_fields, batch_size=500)
+    return len(created) + len(changed) + len(stale)
+
+
+def sync_schedule_rows(container):
+    """컨테이너 data 를 정규화 행에 반영. 변경(추가/수정/삭제)된 행 수 반환"""
+    row_values = build_row_values(container.data)
+    with transaction.atomic():
+        return sum(
+            _sync_model(model, key_field, update_fields, container, row_values[key_field])
+            for model, key_field, update_fields in ROW_MODELS
+        )
+
+
+# ---------------------------------------------------------------------------
+# 조회
+# ---------------------------------------------------------------------------
+
+def project_category_pairs(project_id):
+    """프로젝트 공정표의 (대공종, 공정) 목록 (중복 제외)"""
+    return set(
+        ScheduleActivity.objects.filter(project_id=project_id)
+        .exclude(main_category="")
+        .order_by()
+        .values_list("main_category", "process")
+        .distinct()
+    )
+
+
+def projects_using_standard_code(projects, standard_code):
+    """표준코드를 사용하는 프로젝트별 항목 수"""
+    return list(
+        ScheduleActivity.objects.filter(project__in=projects, standard_code=standard_code)
+        .order_by()
+        .values("project_id", "project__title")
+        .annotate(items=Count("id"))
+        .order_by("project_id")
+    )
+
+
+def category_totals(projects, main_category=None):
+    """대공종별 프로젝트 수 / 항목 수 / 작업일수·공기 합계"""
+    queryset = ScheduleActivity.objects.filter(project__in=projects).exclude(main_category="")
+    if main_category:
+        queryset = queryset.filter(main_category=main_category)
+    return list(
+        queryset.order_by()
+        .values("main_category")
+        .annotate(
+            projects=Count("project", distinct=True),
+            items=Count("id"),
+            working_days=Sum("working_days"),
+            calendar_days=Sum("calendar_days"),
+        )
+        .order_by("main_category")
+    )
@@ -0,0 +1,164 @@
+"""
+프로젝트 공정표 요약 (포트폴리오 목록용)
+
+프로젝트 목록 화면이 공기/주공정/준공일을 보여주려면 프로젝트마다 공정표 JSON 전체를 받아 계산해야 했다.
+공정표가 저장될 때 요약 한 행(ProjectScheduleSummary)을 갱신해 두고, 목록은 프로젝트 + 요약 join 한 번으로 조회한다.
+요약은 CPM 전체 계산이 필요하므로 저장 요청 안에서 만들지 않고, 커밋 후 백그라운드 스레드가 프로젝트 단위로 갱신한다.
+목록 조회는 저장된 요약을 그대로 돌려주고, 없거나 revision 이 뒤처진 요약은 stale 로 표시해 갱신을 예약한다(mark_stale_summaries).
+기존 공정표 일괄 생성/재계산은 manage.py rebuild_schedule_summaries 로 한다.
+- total_days: CPM 일정 기준 마지막 종료일 (순환 연결이면 기존 배치)
+- critical_path_days: 주공정 구간 합 (병행작업 제외, 항목별 기간 - 앞/뒤 병행일)
+- category_days: 대공종별 첫 착수 ~ 마지막 종료 일수
+- finish_date: 착공일 + 총 공기 (마지막 날 포함), 착공일이 없으면 None
+"""
+
+import logging
+import math
+import threading
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+
+from ..models.construction_schedule_models import ConstructionScheduleItem, ProjectScheduleSummary
+from .excel.construction_schedule_gantt import build_cp_meta
+from .schedule_cpm import schedule_items_with_timing
+from .schedule_rows import _collections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATEGORY = "기타"
+
+# 갱신 대기 중인 project_id
+_pending = set()
+_condition = threading.Condition()
+_worker = None
+
+
+def finish_date_for(start_date, total_days):
+    if not start_date:
+        return None
+    return start_date + timedelta(days=max(math.ceil(total_days - 1e-9), 1) - 1)
+
+
+def build_schedule_summary(raw_data, start_date=None):
+    """공정표 JSON → 요약 필드 dict"""
+    items, links, _sub_tasks = _collections(raw_data)
+    items = [item for item in items if isinstance(item, dict)]
+    timing = schedule_items_with_timing(items, links)
+
+    total_days = 0.0
+    spans = {}
+    for meta in timing:
+        start, end = meta["start_day"], meta["start_day"] + meta["duration"]
+        total_days = max(total_days, end)
+        category = str(meta["item"].get("main_category") or DEFAULT_CATEGORY)
+        first, last = spans.get(category, (start, end))
+        spans[category] = (min(first, start), max(last, end))
+    critical_path_days = sum(
+        meta["red_end"] - meta["red_start"] for meta in build_cp_meta(timing).values() if meta["is_cp"]
+    )
+    total_days = round(total_days, 1)
+    return {
+        "total_days": total_days,
+        "critical_path_days": round(critical_path_days, 1),
+        "finish_date": finish_date_for(start_date, total_days),
+        "item_count": len(items),
+        "category_days": {category: round(last - first, 1) for category, (first, last) in spans.items()},
+    }
+
+
+def sync_schedule_summary(container):
+    """컨테이너(프로젝트의 첫 공정표)의 요약 갱신. 같은 프로젝트의 다른 컨테이너 저장은 무시"""
+    primary_id = (
+        ConstructionScheduleItem.objects.filter(project_id=container.project_id)
+        .order_by("id")
+        .values_list("id", flat=True)
+        .first()
+    )
+    if primary_id != container.pk:
+        return None
+    start_date = container.project.start_date
+    summary, _created = ProjectScheduleSummary.objects.update_or_create(
+        project_id=container.project_id,
+        defaults={"revision": container.revision, **build_schedule_summary(container.data, start_date)},
+    )
+    return summary
+
+
+def schedule_summary_refresh(container):
+    """커밋 후 백그라운드에서 요약 갱신 예약"""
+    project_id = container.project_id
+    transaction.on_commit(lambda: _enqueue(project_id))
+
+
+def _enqueue(project_id):
+    global _worker
+    with _condition:
+        _pending.add(project_id)
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_worker_loop, daemon=True)
+            _worker.start()
+        _condition.notify()
+
+
+def _worker_loop():
+    while True:
+        with _condition:
+            while not _pending:
+                _condition.wait()
+            project_id = _pending.pop()
+        try:
+            refresh_project_summary(project_id)
+        except Exception:
+            logger.exception("schedule summary refresh failed for project_id=%s", project_id)
+        finally:
+            close_old_connections()
+
+
+def refresh_project_summary(project_id):
+    container = ConstructionScheduleItem.objects.filter(project_id=project_id).order_by("id").first()
+    if container is None:
+        return None
+    return sync_schedule_summary(container)
+
+
+def mark_stale_summaries(projects):
+    """요약이 없거나 공정표 revision 보다 오래된 프로젝트에 schedule_summary_stale=True 를 붙이고
+    백그라운드 갱신을 예약한다 (조회 요청에서는 CPM 을 계산하지 않음)"""
+    projects = list(projects)
+    revisions = {}
+    for project_id, revision in (
+        ConstructionScheduleItem.objects.filter(project_id__in=[project.pk for project in projects])
+        .order_by("project_id", "id")
+        .values_list("project_id", "revision")
+    ):
+        revisions.setdefault(project_id, revision)
+    for project in projects:
+        revision = revisions.get(project.pk)
+        try:
+            summary = project.schedule_summary
+        except ProjectScheduleSummary.DoesNotExist:
+            summary = None
+        project.schedule_summary_stale = revision is not None and (summary is None or summary.revision != revision)
+        if project.schedule_summary_stale:
+            project_id = project.pk
+            transaction.on_commit(lambda project_id=project_id: _enqueue(project_id))
+    return projects
+
+
+def refresh_summary_finish_date(project):
+    """착공일 변경 시 준공 예정일만 다시 계산"""
+    summary = ProjectScheduleSummary.objects.filter(project=project).only("id", "total_days", "finish_date").first()
+    if summary is None:
+        return
+    finish_date = finish_date_for(project.start_date, summary.total_days)
+    if summary.finish_date != finish_date:
+        ProjectScheduleSummary.objects.filter(pk=summary.pk).update(finish_date=finish_date)
+
+
+def discard_schedule_summary(container):
+    """공정표 삭제 시 요약 제거 (남은 공정표가 있으면 그것으로 다시 계산)"""
+    ProjectScheduleSummary.objects.filter(project_id=container.project_id).delete()
+    remaining = ConstructionScheduleItem.objects.filter(project_id=container.project_id).order_by("id").first()
+    if remaining is not None:
+        sync_schedule_summary(remaining)
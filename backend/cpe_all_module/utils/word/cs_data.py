@@ -1,12 +1,15 @@
 """Data assembly for construction schedule Word report."""
 
 from calendar import monthrange
+from collections import Counter
 from datetime import date as date_cls
 import re
 
 from cpe_module.models.operating_rate_models import WorkScheduleWeight
 from cpe_module.models.calc_models import ConstructionOverview
-from operatio.models import PublicHoliday, WeatherDailyRecord, WeatherStation
+from operatio.models import WeatherDailyCondition, WeatherDailyRecord, WeatherStation
+from operatio.weather_conditions import CONDITION_BIT_BY_CODE, weather_facts
+from operatio.workday_calendar import get_workday_calendar
 
 from .cs_common import to_number
 from .cs_template import (
@@ -16,36 +19,12 @@ from .cs_template import (
 )
 
 
-def _count_sundays_in_month(year, month):
-    days_in_month = monthrange(year, month)[1]
-    count = 0
-    for day in range(1, days_in_month + 1):
-        if date_cls(year, month, day).weekday() == 6:
-            count += 1
-    return count
-
-
-def _project_holiday_dates(source_dates, target_year):
-    projected = set()
-    for date_value in source_dates:
-        try:
-            projected.add(date_value.replace(year=target_year))
-        except ValueError:
-            if date_value.month == 2 and date_value.day == 29:
-                projected.add(date_cls(target_year, 2, 28))
-    return projected
-
-
 def _build_public_legal_holiday_rows(project_start_date=None, max_years=7):
-    all_years = list(
-        PublicHoliday.objects.filter(is_holiday="Y")
-        .values_list("date__year", flat=True)
-        .distinct()
-    )
-    if not all_years:
+    calendar = get_workday_calendar()
+    available_years = calendar.sector_years("PUBLIC")
+    if not available_years:
         return []
 
-    available_years = sorted(set(all_years))
     if project_start_date:
         start_year = project_start_date.year
     elif 2024 in available_years:
@@ -56,31 +35,9 @@ def _build_public_legal_holiday_rows(project_start_date=None, max_years=7):
     fallback_year = 2025 if 2025 in available_years else available_years[0]
     result = []
     for year in range(start_year, start_year + max_years):
-        date_qs = PublicHoliday.objects.filter(
-            date__year=year,
-            is_holiday="Y",
-        ).values_list("date", flat=True)
-        holiday_dates = set(date_qs)
-        if holiday_dates:
-            year_dates = holiday_dates
-        else:
-            fallback_dates = set(
-                PublicHoliday.objects.filter(
-                    date__year=fallback_year,
-                    is_holiday="Y",
-                ).values_list("date", flat=True)
-            )
-            year_dates = _project_holiday_dates(fallback_dates, year)
-
-        monthly_counts = []
-        for month in range(1, 13):
-            sundays = _count_sundays_in_month(year, month)
-            holiday_extra = sum(
-                1
-                for date_value in year_dates
-                if date_value.month == month and date_value.weekday() != 6
-            )
-            monthly_counts.append(sundays + holiday_extra)
+        # 일요일 + 일요일이 아닌 공휴일 (주6일 달력의 휴일)
+        year_calendar = calendar.year(year, "PUBLIC", 6, fallback_year)
+        monthly_counts = year_calendar.monthly_counts(~year_calendar.workday)
 
         result.append({
             "year": year,
@@ -186,7 +143,8 @@ def _pick_analysis_years(station_id, years_count):
     if not station_id:
         return []
     qs_years = (
-        WeatherDailyRecord.objects.filter(station_id=station_id)
+        weather_facts(station_id)
+        .order_by()
         .values_list("date__year", flat=True)
         .distinct()
     )
@@ -312,18 +270,18 @@ def _build_monthly_condition_rows(station_id, analysis_years):
     if not station_id or not analysis_years:
         return [], ""
 
-    records = _load_weather_records(station_id, analysis_years)
-    if not records:
+    counts, has_data = _count_condition_days(station_id, analysis_years)
+    if not has_data:
         return [], ""
 
     year_count = len(analysis_years)
     rows = []
-    for label, predicate in MONTHLY_CONDITION_DEFS:
-        monthly_counts = [0] * 12
-        for record in records:
-            if predicate(record):
-                month_idx = record["date"].month - 1
-                monthly_counts[month_idx] += 1
+    for label, _predicate in MONTHLY_CONDITION_DEFS:
+        year_map = counts.get(_extract_condition_code(label), {})
+        monthly_counts = [
+            sum(months[month_idx] for months in year_map.values())
+            for month_idx in range(12)
+        ]
         monthly_avg = [round(value / year_count, 1) for value in monthly_counts]
         rows.append({"label": label, "monthly": monthly_avg})
 
@@ -344,8 +302,7 @@ def _load_weather_records(station_id, analysis_years):
     if not station_id or not analysis_years:
         return []
     return list(
-        WeatherDailyRecord.objects.filter(
-            station_id=station_id,
+        weather_facts(station_id).filter(
             date__year__in=analysis_years,
         ).values(
             "date",
@@ -359,6 +316,55 @@ def _load_weather_records(station_id, analysis_years):
     )
 
 
+def _count_condition_days(station_id, analysis_years):
+    """기준 코드별 {연도: 월별 일수}와 자료 존재 여부.
+
+    WeatherDailyCondition 비트맵이 있는 날은 (연, 월, 비트) 단위로 묶어 세고,
+    비트맵이 없는 날은 원본 일자료에 MONTHLY_CONDITION_DEFS 조건을 적용한다.
+    """
+    counts = {}
+    for label, _predicate in MONTHLY_CONDITION_DEFS:
+        code = _extract_condition_code(label)
+        if code:
+            counts[code] = {year: [0] * 12 for year in analysis_years}
+    if not station_id or not analysis_years:
+        return counts, False
+
+    conditions = WeatherDailyCondition.objects.filter(
+        station_id=station_id,
+        date__year__in=analysis_years,
+    )
+    flag_counts = Counter(
+        (day.year, day.month, flags)
+        for day, flags in conditions.values_list("date", "flags")
+    )
+    for code, year_map in counts.items():
+        bit = CONDITION_BIT_BY_CODE.get(code)
+        if bit is None:
+            continue
+        for (year, month, flags), days in flag_counts.items():
+            if flags >> bit & 1 and year in year_map:
+                year_map[year][month - 1] += days
+
+    records = list(
+        WeatherDailyRecord.objects.filter(
+            station_id=station_id,
+            date__year__in=analysis_years,
+        ).exclude(
+            date__in=conditions.values("date"),
+        ).values("date", "avgTa", "maxTa", "minTa", "sumRn", "ddMes", "maxInsWs")
+    )
+    for label, predicate in MONTHLY_CONDITION_DEFS:
+        year_map = counts.get(_extract_condition_code(label))
+        if year_map is None:
+            continue
+        for record in records:
+            year = record["date"].year
+            if year in year_map and predicate(record):
+                year_map[year][record["date"].month - 1] += 1
+    return counts, bool(flag_counts) or bool(records)
+
+
 def _ordered_weight_labels(weight_by_category, ordered_categories):
     ordered_labels = []
     for label in OPERATING_RATE_PREFERRED_ORDER:
@@ -759,35 +765,25 @@ def _build_weather_appendix_data(
     else:
         period_label = "-"
 
-    records = _load_weather_records(station_id, analysis_years)
-    if not records or not analysis_years:
+    counts, has_data = _count_condition_days(station_id, analysis_years)
+    if not has_data or not analysis_years:
         return {
             "region_label": region_label,
             "period_label": period_label,
             "appendices": [],
         }
 
-    condition_defs = []
     label_by_code = {}
-    for label, predicate in MONTHLY_CONDITION_DEFS:
+    for label, _predicate in MONTHLY_CONDITION_DEFS:
         code = _extract_condition_code(label)
         if not code:
             continue
-        detail = str(label).replace(code, "", 1).strip()
-        condition_defs.append((code, detail, predicate))
-        label_by_code[code] = detail
+        label_by_code[code] = str(label).replace(code, "", 1).strip()
 
-    code_year_month_counts = {}
-    for code, _detail, predicate in condition_defs:
-        year_map = {year: [0.0] * 12 for year in analysis_years}
-        for record in records:
-            if not predicate(record):
-                continue
-            year = record["date"].year
-            month_idx = record["date"].month - 1
-            if year in year_map:
-                year_map[year][month_idx] += 1.0
-        code_year_month_counts[code] = year_map
+    code_year_month_counts = {
+        code: {year: [float(value) for value in months] for year, months in year_map.items()}
+        for code, year_map in counts.items()
+    }
 
     weight_by_category = {}
     for weight in (weights or []):
@@ -895,10 +891,6 @@ def _build_weather_appendix_data(
         "⑭": {"field": "maxInsWs", "label": "순간최대풍속(m/s)"},
         "⑮": {"field": "maxInsWs", "label": "순간최대풍속(m/s)"},
     }
-    records_by_date = {
-        (record["date"].year, record["date"].month, record["date"].day): record
-        for record in records
-    }
     yearly_status_tables = []
     applied_sources = {}
     ordered_source_fields = []
@@ -919,6 +911,12 @@ def _build_weather_appendix_data(
             if code not in applied_sources[field_name]["codes"]:
                 applied_sources[field_name]["codes"].append(code)
 
+    # 일별 현황표는 실제 관측값이 필요하므로 적용 기준이 있을 때만 원본 일자료를 읽는다
+    records = _load_weather_records(station_id, analysis_years) if ordered_source_fields else []
+    records_by_date = {
+        (record["date"].year, record["date"].month, record["date"].day): record
+        for record in records
+    }
     for field_name in ordered_source_fields:
         source_label = applied_sources[field_name]["source_label"]
         applied_codes = applied_sources[field_name]["codes"]
@@ -3,37 +3,64 @@ from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
-from django.http import HttpResponse
+from rest_framework.pagination import PageNumberPagination
+from django.db import transaction
+from django.http import FileResponse, HttpResponse
 from django.shortcuts import get_object_or_404
-from datetime import date as date_cls, timedelta
-import io
-import xlsxwriter
-from ..models.construction_schedule_models import ConstructionScheduleItem
-from ..serializers.construction_schedule_serializers import ConstructionScheduleItemSerializer
-from cpe_module.models.operating_rate_models import WorkScheduleWeight
-from cpe_module.models.calc_models import WorkCondition
+from django.utils import timezone
+from ..models.construction_schedule_models import ConstructionScheduleItem, ExportJob
+from ..serializers.construction_schedule_serializers import (
+    ConstructionScheduleItemSerializer,
+    ExportJobSerializer,
+    PortfolioProjectSerializer,
+)
 from cpe_module.models.project_models import Project
-from operatio.models import PublicHoliday
-from cpe_all_module.utils.excel.construction_schedule import (
-    build_rate_summary,
-    extract_schedule_payload,
-    group_items_by_category,
-    inject_gantt_drawing,
-    write_gantt_sheet,
-    write_table_sheet,
+from cpe_module.utils.operating_rate_queue import flush_operating_rates, get_operating_rate_status
+from cpe_all_module.utils.excel.construction_schedule import extract_schedule_payload
+from cpe_all_module.utils.schedule_cpm import (
+    EDITABLE_FIELDS as CPM_EDITABLE_FIELDS,
+    ScheduleCycleError,
+    get_project_cpm,
+    store_project_cpm,
+    take_project_cpm,
+)
+from cpe_all_module.utils.schedule_compression import (
+    DEFAULT_TIME_BUDGET as COMPRESSION_TIME_BUDGET,
+    STRATEGIES as COMPRESSION_STRATEGIES,
+    propose_schedule_compression,
 )
-from cpe_all_module.utils.excel.construction_schedule_gantt import build_items_with_timing
-from cpe_all_module.utils.excel.construction_schedule_preview import (
-    build_gantt_preview_png,
+from cpe_all_module.utils.export_cache import get_cached_export, store_export
+from cpe_all_module.utils.export_jobs import artifact_path, enqueue_export_job, purge_export_jobs
+from cpe_all_module.utils.schedule_dates import build_schedule_dates
+from cpe_all_module.utils.schedule_operations import ScheduleOperationError, apply_schedule_operations
+from cpe_all_module.utils.schedule_rows import category_totals, projects_using_standard_code
+from cpe_all_module.utils.schedule_resources import build_crew_histogram
+from cpe_all_module.utils.schedule_summary import mark_stale_summaries
+from cpe_all_module.utils.schedule_revision import (
+    if_match_failed,
+    if_none_match,
+    schedule_etag,
+    schedule_list_etag,
 )
-from cpe_all_module.utils.word.construction_schedule import (
-    build_schedule_report_aux_data,
-    build_schedule_report_docx,
+from cpe_all_module.utils.schedule_exports import (
+    DOCX_CONTENT_TYPE,
+    EXCEL as EXPORT_EXCEL,
+    EXPORT_KINDS,
+    REPORT as EXPORT_REPORT,
+    XLSX_CONTENT_TYPE,
+    build_export,
+    export_target,
 )
 
 logger = logging.getLogger(__name__)
 
 
+class PortfolioPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
 class ConstructionScheduleItemViewSet(viewsets.ModelViewSet):
     queryset = ConstructionScheduleItem.objects.all()
     serializer_class = ConstructionScheduleItemSerializer
@@ -79,11 +106,87 @@ class ConstructionScheduleItemViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("project access denied")
         serializer.save()
         
+    def _precondition_failed(self, pk, revision):
+        response = Response(
+            {"error": "schedule has been modified", "revision": revision},
+            status=status.HTTP_412_PRECONDITION_FAILED,
+        )
+        response["ETag"] = schedule_etag(pk, revision)
+        return response
+
+    def _not_modified(self, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response["ETag"] = etag
+        return response
+
     def update(self, request, *args, **kwargs):
         logger.debug("Schedule update request keys: %s", list(request.data.keys()))
         if 'data' in request.data:
             logger.debug("Schedule update items count: %s", len(request.data['data']))
-        return super().update(request, *args, **kwargs)
+        with transaction.atomic():
+            # 행 잠금 후 If-Match 확인 → 검사와 저장 사이에 다른 저장이 끼어들지 않음
+            current = (
+                self.get_queryset().select_for_update()
+                .filter(pk=kwargs.get('pk')).values_list('revision', 'edit_revision').first()
+            )
+            if current is not None and if_match_failed(request, kwargs.get('pk'), *current):
+                return self._precondition_failed(kwargs.get('pk'), current[0])
+            response = super().update(request, *args, **kwargs)
+        response["ETag"] = schedule_etag(response.data["id"], response.data["revision"])
+        response["X-Operating-Rate-Status"] = get_operating_rate_status(response.data["project"])
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        # data 를 읽기 전에 리비전만 조회해 변경이 없으면 304
+        current = self.get_queryset().filter(pk=kwargs.get('pk')).values_list('revision', flat=True).first()
+        if current is not None:
+            etag = schedule_etag(kwargs.get('pk'), current)
+            if if_none_match(request, etag):
+                return self._not_modified(etag)
+        response = super().retrieve(request, *args, **kwargs)
+        response["ETag"] = schedule_etag(response.data["id"], response.data["revision"])
+        response["X-Operating-Rate-Status"] = get_operating_rate_status(response.data["project"])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        rows = list(self.filter_queryset(self.get_queryset()).order_by('id').values_list('id', 'revision'))
+        etag = schedule_list_etag(rows)
+        if if_none_match(request, etag):
+            return self._not_modified(etag)
+        response = super().list(request, *args, **kwargs)
+        response["ETag"] = etag
+        return response
+
+    @action(detail=True, methods=['patch'], url_path='operations')
+    def apply_operations(self, request, pk=None):
+        """항목 단위 operation 목록을 행 잠금 트랜잭션에서 적용하고 변경된 항목만 반환"""
+        container = self.get_object()
+        operations = request.data.get('operations') if isinstance(request.data, dict) else None
+        if not isinstance(operations, list) or not operations:
+            return Response({"error": "operations must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with transaction.atomic():
+                locked = ConstructionScheduleItem.objects.select_for_update().get(pk=container.pk)
+                if if_match_failed(request, locked.pk, locked.revision, locked.edit_revision):
+                    return self._precondition_failed(locked.pk, locked.revision)
+                locked.data, changes = apply_schedule_operations(locked.data, operations)
+                locked.save(update_fields=['data'])
+        except ScheduleOperationError as exc:
+            return Response(
+                {"error": str(exc), "operation_index": exc.index},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        response = Response({
+            "id": locked.id,
+            "project": locked.project_id,
+            "revision": locked.revision,
+            "changes": changes,
+        })
+        response["ETag"] = schedule_etag(locked.pk, locked.revision)
+        response["X-Operating-Rate-Status"] = get_operating_rate_status(locked.project_id)
+        return response
 
     @action(detail=False, methods=['post'])
     def initialize_default(self, request):
@@ -110,192 +213,310 @@ class ConstructionScheduleItemViewSet(viewsets.ModelViewSet):
             
         return Response({"message": "Already initialized"}, status=status.HTTP_200_OK)
 
-    @action(detail=False, methods=['get'], url_path='export-excel')
-    def export_excel(self, request):
-        return self._export_excel_impl(request)
-
-    @action(detail=False, methods=['get'], url_path='export-report')
-    def export_report(self, request):
-        try:
-            project_id = request.query_params.get('project_id')
-            if not project_id:
-                return Response({"error": "project_id is required"}, status=status.HTTP_400_BAD_REQUEST)
-
-            project = self._get_owned_project_or_404(project_id)
-            container = ConstructionScheduleItem.objects.filter(project=project).first()
-            if not container or not container.data:
-                return Response({"error": "schedule data not found"}, status=status.HTTP_404_NOT_FOUND)
-
-            raw_data = container.data
-            items, _sub_tasks, _links = extract_schedule_payload(raw_data)
-            if not isinstance(items, list):
-                return Response({"error": "invalid schedule data"}, status=status.HTTP_400_BAD_REQUEST)
-
-            project_name = project.title
-            start_date = project.start_date if project.start_date else date_cls.today()
-
-            gantt_image_bytes = build_gantt_preview_png(
-                items=items,
-                sub_tasks=_sub_tasks,
-                links=_links,
-                project_name=project_name,
-                start_date=start_date,
-            )
-
-            rate_qs = WorkScheduleWeight.objects.filter(project_id=project_id).values("main_category", "operating_rate")
-            rate_map = {row["main_category"]: row["operating_rate"] for row in rate_qs}
-
-            grouped, ordered_categories = group_items_by_category(items)
+    @action(detail=False, methods=['get'], url_path='calendar-dates')
+    def calendar_dates(self, request):
+        project_id = request.query_params.get('project_id')
+        if not project_id:
+            return Response({"error": "project_id is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-            work_condition = WorkCondition.objects.filter(project_id=project_id).first()
-            region = work_condition.region if work_condition and work_condition.region else ""
-            work_condition_years = work_condition.data_years if work_condition and work_condition.data_years else 10
+        project = self._get_owned_project_or_404(project_id)
+        # 가동률 최신화(기간 재계산 포함) 후 공정표를 읽는다
+        flush_operating_rates(project.id)
+        container = ConstructionScheduleItem.objects.filter(project=project).first()
+        if not container or not container.data:
+            return Response({"error": "schedule data not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        items, _sub_tasks, _links = extract_schedule_payload(container.data)
+        if not isinstance(items, list):
+            return Response({"error": "invalid schedule data"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(build_schedule_dates(project, items))
+
+    def _owned_projects(self):
+        return Project.objects.filter(user=self.request.user, is_delete=False)
+
+    @action(detail=False, methods=['get'], url_path='standard-code-usage')
+    def standard_code_usage(self, request):
+        """표준코드를 사용하는 내 프로젝트 목록 (정규화 행 조회)"""
+        code = request.query_params.get('code')
+        if not code:
+            return Response({"error": "code is required"}, status=status.HTTP_400_BAD_REQUEST)
+        rows = projects_using_standard_code(self._owned_projects(), code)
+        return Response([
+            {"project_id": row["project_id"], "title": row["project__title"], "items": row["items"]}
+            for row in rows
+        ])
+
+    @action(detail=False, methods=['get'], url_path='category-totals')
+    def portfolio_category_totals(self, request):
+        """내 프로젝트 전체의 대공종별 작업일수/공기 합계"""
+        return Response(category_totals(self._owned_projects(), request.query_params.get('main_category')))
+
+    @action(detail=False, methods=['get'], url_path='portfolio')
+    def portfolio(self, request):
+        """내 프로젝트 목록 + 공정표 요약(총 공기/주공정/준공일/대공종별 공기), 페이지 단위 (?page=&page_size=)
+        요약이 없거나 공정표보다 오래되면 schedule_summary_stale=true 이고 백그라운드에서 갱신된다."""
+        projects = self._owned_projects().select_related('schedule_summary').order_by('-created_at')
+        paginator = PortfolioPagination()
+        page = mark_stale_summaries(paginator.paginate_queryset(projects, request, view=self))
+        return paginator.get_paginated_response(PortfolioProjectSerializer(page, many=True).data)
+
+    @action(detail=False, methods=['get'], url_path='cpm')
+    def critical_path(self, request):
+        """links(FS/SS/FF/SF + lag) 기준 CPM 일정: ES/EF/LS/LF, 여유, 주공정"""
+        project_id = request.query_params.get('project_id')
+        if not project_id:
+            return Response({"error": "project_id is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-            rate_summary = build_rate_summary(project_id, ordered_categories, rate_map, region)
-            report_aux_data = build_schedule_report_aux_data(
-                project_id=project_id,
-                ordered_categories=ordered_categories,
-                region=region,
-                project_start_date=project.start_date,
-                work_condition_years=work_condition_years,
-            )
+        project = self._get_owned_project_or_404(project_id)
+        container = ConstructionScheduleItem.objects.filter(project=project).first()
+        if not container or not container.data:
+            return Response({"error": "schedule data not found"}, status=status.HTTP_404_NOT_FOUND)
 
-            report_bytes = build_schedule_report_docx(
-                project_name=project_name,
-                rate_summary=rate_summary,
-                ordered_categories=ordered_categories,
-                grouped_items=grouped,
-                rate_map=rate_map,
-                region=region,
-                gantt_image_bytes=gantt_image_bytes,
-                **report_aux_data,
-            )
+        items, _sub_tasks, _links = extract_schedule_payload(container.data)
+        if not isinstance(items, list):
+            return Response({"error": "invalid schedule data"}, status=status.HTTP_400_BAD_REQUEST)
 
-            safe_name = "".join(ch if ch not in '\\/:*?\"<>|' else "_" for ch in project_name)
-            filename = f"공사기간_산정_보고서_{safe_name}.docx"
-            response = HttpResponse(
-                report_bytes,
-                content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            )
-            response["Content-Disposition"] = f'attachment; filename=\"{filename}\"'
-            return response
-        except Exception as exc:
-            logger.exception("export-report failed for project_id=%s", request.query_params.get('project_id'))
+        try:
+            network = get_project_cpm(container)
+        except ScheduleCycleError as exc:
+            return Response({"error": str(exc), "cycle": exc.item_ids}, status=status.HTTP_400_BAD_REQUEST)
+        response = Response(dict(network.as_dict(), revision=container.revision))
+        response["ETag"] = schedule_etag(container.pk, container.revision)
+        return response
+
+    @action(detail=True, methods=['patch'], url_path='cpm')
+    def update_cpm_item(self, request, pk=None):
+        """항목 하나의 기간(calendar_days)/시작일(_startDay) 수정 → 저장 후 증분 CPM 으로 값이 바뀐 항목만 반환"""
+        container = self.get_object()
+        item_id = request.data.get('id') if isinstance(request.data, dict) else None
+        changes = {field: request.data[field] for field in CPM_EDITABLE_FIELDS if field in request.data}
+        if item_id in (None, "") or not changes:
             return Response(
-                {"error": "export-report failed"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {"error": f"id and one of {', '.join(CPM_EDITABLE_FIELDS)} are required"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
+        for field, value in changes.items():
+            if value is None and field == "_startDay":
+                continue
+            try:
+                if float(value) < 0:
+                    raise ValueError
+            except (TypeError, ValueError):
+                return Response({"error": f"{field} must be a non-negative number"}, status=status.HTTP_400_BAD_REQUEST)
 
-    def _export_excel_impl(self, request):
         try:
-            project_id = request.query_params.get('project_id')
-            if not project_id:
-                return Response({"error": "project_id is required"}, status=status.HTTP_400_BAD_REQUEST)
-
-            project = self._get_owned_project_or_404(project_id)
-            container = ConstructionScheduleItem.objects.filter(project=project).first()
-            if not container or not container.data:
-                return Response({"error": "schedule data not found"}, status=status.HTTP_404_NOT_FOUND)
-
-            logger.debug("[export-excel] project_id=%s", project_id)
-            logger.debug("[export-excel] xlsxwriter_version=%s", getattr(xlsxwriter, "__version__", "unknown"))
-            logger.debug("[export-excel] xlsxwriter_path=%s", getattr(xlsxwriter, "__file__", "unknown"))
-
-            raw_data = container.data
-            items, sub_tasks, links = extract_schedule_payload(raw_data)
-            cost_inputs = raw_data.get("cost_inputs", {}) if isinstance(raw_data, dict) else {}
-            milestones = raw_data.get("milestones", []) if isinstance(raw_data, dict) else []
+            with transaction.atomic():
+                locked = ConstructionScheduleItem.objects.select_for_update().get(pk=container.pk)
+                if if_match_failed(request, locked.pk, locked.revision, locked.edit_revision):
+                    return self._precondition_failed(locked.pk, locked.revision)
+                items, _sub_tasks, _links = extract_schedule_payload(locked.data)
+                target = next(
+                    (item for item in items if isinstance(item, dict) and str(item.get("id")) == str(item_id)),
+                    None,
+                ) if isinstance(items, list) else None
+                if target is None:
+                    return Response({"error": f"item '{item_id}' not found"}, status=status.HTTP_404_NOT_FOUND)
+
+                network = take_project_cpm(locked)
+                changed, duration_moved = network.update_item(item_id, **changes)
+                target.update(changes)
+                locked.save(update_fields=['data'])
+                # 커밋된 revision 으로만 보관 (롤백 시 캐시 오염 방지)
+                transaction.on_commit(lambda: store_project_cpm(locked, network))
+        except ScheduleCycleError as exc:
+            return Response({"error": str(exc), "cycle": exc.item_ids}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 공기가 바뀌면 모든 항목의 LS/LF/TF 가 바뀐다
+        indexes = range(len(network.items)) if duration_moved else sorted(changed)
+        response = Response({
+            "id": locked.id,
+            "project": locked.project_id,
+            "revision": locked.revision,
+            "project_duration": network.project_duration,
+            "project_duration_changed": duration_moved,
+            "activities": [network.activity(index) for index in indexes],
+        })
+        response["ETag"] = schedule_etag(locked.pk, locked.revision)
+        response["X-Operating-Rate-Status"] = get_operating_rate_status(locked.project_id)
+        return response
+
+    @action(detail=False, methods=['post'], url_path='compress')
+    def compress_schedule(self, request):
+        """목표 공기(target_days) 달성을 위한 인원/병행 조정안 (항목별 before/after diff, 순위순)"""
+        project_id = request.data.get('project_id')
+        if not project_id:
+            return Response({"error": "project_id is required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            target_days = float(request.data.get('target_days'))
+            if target_days <= 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            return Response({"error": "target_days must be a positive number"}, status=status.HTTP_400_BAD_REQUEST)
+        strategies = request.data.get('strategies') or list(COMPRESSION_STRATEGIES)
+        if not isinstance(strategies, list) or any(strategy not in COMPRESSION_STRATEGIES for strategy in strategies):
+            return Response(
+                {"error": f"strategies must be a list of {', '.join(COMPRESSION_STRATEGIES)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-            if not isinstance(items, list):
-                return Response({"error": "invalid schedule data"}, status=status.HTTP_400_BAD_REQUEST)
+        project = self._get_owned_project_or_404(project_id)
+        container = ConstructionScheduleItem.objects.filter(project=project).first()
+        if not container or not container.data:
+            return Response({"error": "schedule data not found"}, status=status.HTTP_404_NOT_FOUND)
 
-            project_name = project.title
+        items, _sub_tasks, links = extract_schedule_payload(container.data)
+        if not isinstance(items, list):
+            return Response({"error": "invalid schedule data"}, status=status.HTTP_400_BAD_REQUEST)
 
-            weight_rows = list(
-                WorkScheduleWeight.objects.filter(project_id=project_id)
-                .values("main_category", "operating_rate", "sector_type", "work_week_days")
-            )
-            rate_map = {row["main_category"]: row["operating_rate"] for row in weight_rows}
-
-            public_count = sum(1 for r in weight_rows if (r.get("sector_type") or "PUBLIC").upper() == "PUBLIC")
-            private_count = len(weight_rows) - public_count
-            sector_type = "PRIVATE" if private_count > public_count else "PUBLIC"
-
-            grouped, ordered_categories = group_items_by_category(items)
-
-            work_condition = WorkCondition.objects.filter(project_id=project_id).first()
-            region = work_condition.region if work_condition and work_condition.region else ""
-
-            work_week_days = 6
-            if work_condition and work_condition.earthwork_type:
-                try:
-                    work_week_days = int(work_condition.earthwork_type)
-                except (TypeError, ValueError):
-                    work_week_days = 6
-
-            rate_summary = build_rate_summary(project_id, ordered_categories, rate_map, region)
-
-            start_date = project.start_date if project.start_date else date_cls.today()
-
-            max_item_end = 0.0
-            for it in items:
-                try:
-                    max_item_end = max(max_item_end, float(it.get("start_day") or 0) + float(it.get("calendar_days") or 0))
-                except (TypeError, ValueError):
-                    continue
-            for ms in milestones if isinstance(milestones, list) else []:
-                try:
-                    max_item_end = max(max_item_end, float(ms.get("day") or ms.get("endDay") or 0))
-                except (TypeError, ValueError, AttributeError):
-                    continue
-            span_days = max(1, int(round(max_item_end)) + 1)
-            end_date = start_date + timedelta(days=span_days)
-
-            if sector_type == "PRIVATE":
-                holiday_qs = PublicHoliday.objects.filter(date__range=(start_date, end_date), is_private=True)
-            else:
-                holiday_qs = PublicHoliday.objects.filter(date__range=(start_date, end_date), is_holiday='Y')
-            holiday_set = {d.isoformat() for d in holiday_qs.values_list('date', flat=True).distinct()}
-
-            output = io.BytesIO()
-            wb = xlsxwriter.Workbook(output, {'in_memory': True})
-
-            # ---- Sheet 1: Table ----
-            write_table_sheet(wb, items, ordered_categories, grouped, rate_summary, rate_map, project_name)
-
-            # ---- Sheet 2: Gantt (shape-based, Excel-editable) ----
-            gantt_meta = write_gantt_sheet(
-                wb,
+        try:
+            result = propose_schedule_compression(
                 items,
-                sub_tasks,
                 links,
-                project_name,
-                start_date,
-                custom_milestones=milestones,
-                cost_inputs=cost_inputs,
-                include_bohal_table=True,
-                work_week_days=work_week_days,
-                holiday_set=holiday_set,
+                target_days,
+                crew_bounds=request.data.get('crew_bounds'),
+                strategies=strategies,
+                time_budget=request.data.get('time_budget') or COMPRESSION_TIME_BUDGET,
             )
-            logger.debug("[export-excel] gantt_shapes_count=%s", len(gantt_meta['shapes']))
-
-            wb.close()
-            output.seek(0)
+        except ScheduleCycleError as exc:
+            return Response({"error": str(exc), "cycle": exc.item_ids}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(dict(result, revision=container.revision))
+
+    @action(detail=False, methods=['get'], url_path='crew-histogram')
+    def crew_histogram(self, request):
+        """일일 투입 인원(전체/대공종별)과 최대 인원. level=1 이면 여유 안에서 평준화한 결과 포함"""
+        project_id = request.query_params.get('project_id')
+        if not project_id:
+            return Response({"error": "project_id is required"}, status=status.HTTP_400_BAD_REQUEST)
+        crew_limit = request.query_params.get('crew_limit')
+        if crew_limit not in (None, ""):
+            try:
+                crew_limit = float(crew_limit)
+            except (TypeError, ValueError):
+                return Response({"error": "crew_limit must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            crew_limit = None
+        level = request.query_params.get('level') in ('1', 'true', 'True')
 
-            output_bytes = inject_gantt_drawing(output.read(), **gantt_meta)
-            output = io.BytesIO(output_bytes)
+        project = self._get_owned_project_or_404(project_id)
+        container = ConstructionScheduleItem.objects.filter(project=project).first()
+        if not container or not container.data:
+            return Response({"error": "schedule data not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        items, sub_tasks, links = extract_schedule_payload(container.data)
+        if not isinstance(items, list):
+            return Response({"error": "invalid schedule data"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(build_crew_histogram(items, links, sub_tasks, level=level, crew_limit=crew_limit))
+
+    @staticmethod
+    def _export_response(response, filename, cache_status):
+        response["Content-Disposition"] = f'attachment; filename=\"{filename}\"'
+        response["X-Export-Cache"] = cache_status
+        return response
+
+    def _cached_export_response(self, cache_key, filename, content_type):
+        """같은 입력으로 만든 출력 파일이 있으면 파일 스트림 응답"""
+        path = get_cached_export(cache_key)
+        if path is None:
+            return None
+        try:
+            handle = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        return self._export_response(FileResponse(handle, content_type=content_type), filename, "hit")
+
+    def _export_source(self, project_id, flush=False):
+        """출력 대상 (project, container, None) 또는 (None, None, 오류 Response)
+        flush=True 면 지연 재계산 대기 중인 가동률(기간 재계산 포함)을 먼저 반영하고 공정표를 읽는다."""
+        if not project_id:
+            return None, None, Response({"error": "project_id is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-            safe_name = "".join(ch if ch not in '\\/:*?\"<>|' else "_" for ch in project_name)
-            filename = f"공사기간_산정_기준_{safe_name}.xlsx"
-            response = HttpResponse(
-                output.read(),
-                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
-            response["Content-Disposition"] = f'attachment; filename=\"{filename}\"'
-            return response
+        project = self._get_owned_project_or_404(project_id)
+        if flush:
+            flush_operating_rates(project.id)
+        container = ConstructionScheduleItem.objects.filter(project=project).first()
+        if not container or not container.data:
+            return None, None, Response({"error": "schedule data not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        items, _sub_tasks, _links = extract_schedule_payload(container.data)
+        if not isinstance(items, list):
+            return None, None, Response({"error": "invalid schedule data"}, status=status.HTTP_400_BAD_REQUEST)
+        return project, container, None
+
+    def _export_now(self, request, kind):
+        try:
+            project, container, error = self._export_source(request.query_params.get('project_id'), flush=True)
+            if error is not None:
+                return error
+
+            cache_key, filename, content_type = export_target(kind, project, container)
+            cached = self._cached_export_response(cache_key, filename, content_type)
+            if cached is not None:
+                return cached
+
+            content = build_export(kind, project, container)
+            store_export(cache_key, content)
+            return self._export_response(HttpResponse(content, content_type=content_type), filename, "miss")
         except Exception as exc:
-            logger.exception("export-excel failed for project_id=%s", request.query_params.get('project_id'))
+            logger.exception("export-%s failed for project_id=%s", kind, request.query_params.get('project_id'))
             return Response(
-                {"error": "export-excel failed"},
+                {"error": f"export-{kind} failed"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+    @action(detail=False, methods=['get'], url_path='export-excel')
+    def export_excel(self, request):
+        return self._export_now(request, EXPORT_EXCEL)
+
+    @action(detail=False, methods=['get'], url_path='export-report')
+    def export_report(self, request):
+        return self._export_now(request, EXPORT_REPORT)
+
+    @action(detail=False, methods=['post'], url_path='export-jobs')
+    def create_export_job(self, request):
+        """엑셀/보고서 출력 작업 생성 → 202 + 작업 id. 생성은 작업 스레드에서 진행"""
+        kind = request.data.get('kind')
+        if kind not in EXPORT_KINDS:
+            return Response(
+                {"error": f"kind must be one of {', '.join(EXPORT_KINDS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        project, _container, error = self._export_source(request.data.get('project_id'))
+        if error is not None:
+            return error
+
+        purge_export_jobs()
+        job = ExportJob.objects.create(project=project, user=request.user, kind=kind)
+        enqueue_export_job(job)
+        return Response(ExportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    def _get_export_job_or_404(self, job_id):
+        return get_object_or_404(ExportJob, id=job_id, user=self.request.user, project__is_delete=False)
+
+    @action(detail=False, methods=['get'], url_path=r'export-jobs/(?P<job_id>[0-9a-fA-F-]+)')
+    def export_job_status(self, request, job_id=None):
+        """출력 작업 상태 (status, progress, stage)"""
+        return Response(ExportJobSerializer(self._get_export_job_or_404(job_id)).data)
+
+    @action(detail=False, methods=['get'], url_path=r'export-jobs/(?P<job_id>[0-9a-fA-F-]+)/download')
+    def download_export_job(self, request, job_id=None):
+        job = self._get_export_job_or_404(job_id)
+        if job.status != "done":
+            return Response(
+                {"error": "export job is not finished", "status": job.status},
+                status=status.HTTP_409_CONFLICT,
+            )
+        path = artifact_path(job)
+        expired = job.expires_at is not None and job.expires_at <= timezone.now()
+        try:
+            if expired or path is None:
+                raise FileNotFoundError
+            handle = open(path, "rb")
+        except FileNotFoundError:
+            return Response({"error": "export file expired"}, status=status.HTTP_410_GONE)
+        content_type = XLSX_CONTENT_TYPE if job.kind == EXPORT_EXCEL else DOCX_CONTENT_TYPE
+        response = FileResponse(handle, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename=\"{job.filename}\"'
+        return response
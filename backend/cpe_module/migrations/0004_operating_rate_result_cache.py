@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpe_module', '0003_floorbatchtemplate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OperatingRateResultCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('signature', models.CharField(max_length=64, unique=True, verbose_name='기준 signature')),
+                ('station_id', models.IntegerField(verbose_name='지점')),
+                ('working_days', models.IntegerField(default=0, verbose_name='작업일')),
+                ('climate_days_excl_dup', models.IntegerField(default=0, verbose_name='기후불능일(중복제외)')),
+                ('legal_holidays', models.IntegerField(default=0, verbose_name='법정공휴일')),
+                ('operating_rate', models.DecimalField(decimal_places=2, default=0, max_digits=5, verbose_name='가동률(%)')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': '가동률 결과 캐시',
+                'verbose_name_plural': '가동률 결과 캐시 목록',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
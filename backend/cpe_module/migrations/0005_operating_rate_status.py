@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cpe_module', '0004_operating_rate_result_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OperatingRateStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_dirty', models.BooleanField(default=False, verbose_name='재계산 필요')),
+                ('requested_at', models.DateTimeField(blank=True, null=True, verbose_name='재계산 요청 시각')),
+                ('computed_at', models.DateTimeField(blank=True, null=True, verbose_name='재계산 완료 시각')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='마지막 오류')),
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='operating_rate_status', to='cpe_module.project')),
+            ],
+            options={
+                'verbose_name': '가동률 재계산 상태',
+                'verbose_name_plural': '가동률 재계산 상태 목록',
+            },
+        ),
+    ]
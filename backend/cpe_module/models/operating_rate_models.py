@@ -235,3 +235,58 @@ class WorkScheduleWeight(models.Model):
 
     def __str__(self):
         return f"{self.project} - {self.main_category} ({self.operating_rate}%)"
+
+
+class OperatingRateResultCache(models.Model):
+    """
+    가동률 계산 결과 공유 캐시
+    지점/분석기간/기준값/공공·민간/주간작업일/데이터 버전을 정규화한 signature 단위로 저장
+    """
+    signature = models.CharField(max_length=64, unique=True, verbose_name="기준 signature")
+    station_id = models.IntegerField(verbose_name="지점")
+
+    working_days = models.IntegerField(default=0, verbose_name="작업일")
+    climate_days_excl_dup = models.IntegerField(default=0, verbose_name="기후불능일(중복제외)")
+    legal_holidays = models.IntegerField(default=0, verbose_name="법정공휴일")
+    operating_rate = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        default=0,
+        verbose_name="가동률(%)",
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "가동률 결과 캐시"
+        verbose_name_plural = "가동률 결과 캐시 목록"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.station_id} {self.signature[:12]} ({self.operating_rate}%)"
+
+
+class OperatingRateStatus(models.Model):
+    """
+    프로젝트 가동률 재계산 상태 (dirty 표시 후 백그라운드에서 일괄 재계산)
+    """
+    project = models.OneToOneField(
+        'cpe_module.Project',
+        on_delete=models.CASCADE,
+        related_name='operating_rate_status',
+    )
+    is_dirty = models.BooleanField(default=False, verbose_name="재계산 필요")
+    requested_at = models.DateTimeField(null=True, blank=True, verbose_name="재계산 요청 시각")
+    computed_at = models.DateTimeField(null=True, blank=True, verbose_name="재계산 완료 시각")
+    last_error = models.TextField(blank=True, default="", verbose_name="마지막 오류")
+
+    class Meta:
+        verbose_name = "가동률 재계산 상태"
+        verbose_name_plural = "가동률 재계산 상태 목록"
+
+    @property
+    def status(self):
+        return "pending" if self.is_dirty else "fresh"
+
+    def __str__(self):
+        return f"{self.project} ({self.status})"
@@ -1,12 +1,27 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
 from django.contrib.auth import get_user_model
-from unittest.mock import patch
+from django.test import TestCase
+from unittest.mock import Mock, patch
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APIClient, APITestCase
 
 from cpe_module.models.calc_models import ConstructionOverview
 from cpe_module.models.criteria_models import PreparationWork
+from cpe_all_module.models import ConstructionScheduleItem
+from cpe_module.models.operating_rate_models import OperatingRateResultCache, WorkScheduleWeight
 from cpe_module.models.project_models import Project
 from cpe_module.models.quotation_models import Quotation
+from cpe_module.utils import operating_rate_queue
+from cpe_module.utils.operating_rate_comparison import compare_station_rates
+from cpe_module.utils.operating_rate_engine import OperatingRateEngine, parse_wind_threshold
+from cpe_module.views.operating_rate import calculate_operating_rates
+from operatio.data_versions import WEATHER, bump_data_version
+from operatio.models import PublicHoliday, WeatherDailyRecord, WeatherStation
+from operatio.weather_conditions import rebuild_daily_conditions, weather_facts
+from operatio.workday_calendar import HOLIDAY_FALLBACK_YEAR, get_workday_calendar, is_work_weekday
 
 
 AUTH_DENIED_STATUS_CODES = {
@@ -130,3 +145,344 @@ class ProjectApiSmokeTests(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         mock_enqueue_task.assert_not_called()
+
+
+class OperatingRateRecalcQueueTests(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="queue_owner",
+            password="StrongPass!123",
+            email="queue@example.com",
+        )
+        self.project = Project.objects.create(user=self.user, title="Queue Project", calc_type="APARTMENT")
+
+    def test_schedule_saves_mark_pending_and_coalesce_into_one_job(self):
+        # 공정표 요약 갱신 예약(on_commit)은 이 큐와 무관하므로 제외
+        with patch("cpe_all_module.signals.schedule_summary_refresh"), \
+                self.captureOnCommitCallbacks(execute=False) as callbacks:
+            item = ConstructionScheduleItem.objects.create(
+                project=self.project,
+                data={"items": [{"main_category": "토공사", "process": "토사운반"}]},
+            )
+            item.data["items"].append({"main_category": "골조공사"})
+            item.save()
+
+        self.assertEqual(len(callbacks), 2)
+        self.assertFalse(WorkScheduleWeight.objects.filter(project=self.project).exists())
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(f"/api/cpe/work-schedule-weights/{self.project.id}/status/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "pending")
+
+        with patch.object(operating_rate_queue, "_worker", Mock(is_alive=Mock(return_value=True))):
+            for callback in callbacks:
+                callback()
+            self.assertEqual(list(operating_rate_queue._pending), [str(self.project.id)])
+
+        operating_rate_queue.flush_operating_rates(self.project.id)
+
+        self.assertEqual(operating_rate_queue._pending, {})
+        self.assertEqual(
+            set(WorkScheduleWeight.objects.filter(project=self.project).values_list("main_category", flat=True)),
+            {"토공사", "토공사|||토사운반", "골조공사"},
+        )
+        response = self.client.get(f"/api/cpe/work-schedule-weights/{self.project.id}/status/")
+        self.assertEqual(response.data["status"], "fresh")
+
+    def test_recalc_status_blocks_other_users_project(self):
+        other_user = get_user_model().objects.create_user(
+            username="queue_other",
+            password="StrongPass!123",
+            email="queue_other@example.com",
+        )
+        self.client.force_authenticate(user=other_user)
+        response = self.client.get(f"/api/cpe/work-schedule-weights/{self.project.id}/status/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+def reference_year_stats(weight, year, station_id, work_week_days, winter_criteria="AVG"):
+    """OperatingRateEngine.year_stats 검증용 기준 구현 (연도별 queryset 필터 + 날짜 집합)"""
+    year_start, year_end = date(year, 1, 1), date(year, 12, 31)
+    workdays = {
+        year_start + timedelta(days=offset)
+        for offset in range((year_end - year_start).days + 1)
+        if is_work_weekday(year_start + timedelta(days=offset), work_week_days)
+    }
+    if not workdays:
+        return None
+
+    qs = weather_facts(station_id, year_start, year_end)
+    if not qs.exists():
+        return None
+
+    climate_dates = set()
+
+    if weight.winter_threshold_enabled and weight.winter_threshold_value is not None:
+        if winter_criteria == "MIN":
+            filter_kwargs = {"minTa__lte": weight.winter_threshold_value}
+        elif winter_criteria == "MAX":
+            filter_kwargs = {"maxTa__lte": weight.winter_threshold_value}
+        else:
+            filter_kwargs = {"avgTa__lte": weight.winter_threshold_value}
+
+        climate_dates |= set(
+            qs.filter(**filter_kwargs)
+            .values_list("date", flat=True)
+        )
+    if weight.summer_threshold_enabled and weight.summer_threshold_value is not None:
+        climate_dates |= set(
+            qs.filter(maxTa__gte=weight.summer_threshold_value)
+            .values_list("date", flat=True)
+        )
+    if weight.rainfall_threshold_enabled and weight.rainfall_threshold_value is not None:
+        climate_dates |= set(
+            qs.filter(sumRn__gte=weight.rainfall_threshold_value)
+            .values_list("date", flat=True)
+        )
+    if weight.snowfall_threshold_enabled and weight.snowfall_threshold_value is not None:
+        climate_dates |= set(
+            qs.filter(ddMes__gte=weight.snowfall_threshold_value)
+            .values_list("date", flat=True)
+        )
+    wind_threshold = parse_wind_threshold(weight.wind_threshold)
+    if wind_threshold is not None:
+        climate_dates |= set(
+            qs.filter(maxInsWs__gte=wind_threshold)
+            .values_list("date", flat=True)
+        )
+
+    # 기후불능일: 작업일과의 교집합
+    climate_dates = climate_dates & workdays
+
+    # 법정공휴일 - 해당 연도에 데이터가 없으면 2025년 데이터를 요일/날짜 투영하여 사용
+    calendar = get_workday_calendar()
+    year_calendar = calendar.year(year, weight.sector_type, work_week_days, HOLIDAY_FALLBACK_YEAR)
+    legal_holidays_count = calendar.legal_holidays(year, weight.sector_type, work_week_days, HOLIDAY_FALLBACK_YEAR)
+
+    # 중복 제외는 기후불능일에만 적용: 법정공휴일과 겹치는 날을 기후불능일에서 제외
+    holiday_dates_on_workdays = set(
+        calendar.holidays_on_workdays(year, weight.sector_type, work_week_days, HOLIDAY_FALLBACK_YEAR)
+    )
+    climate_dates_excl_holidays = climate_dates - holiday_dates_on_workdays
+
+    # 작업일 = 365 - 기후불능일(중복제외) - 법정공휴일
+    total_days = year_calendar.length
+    working_days = max(total_days - len(climate_dates_excl_holidays) - legal_holidays_count, 0)
+
+    # 가동률 = 작업일 / 365 * 100
+    operating_rate = round((working_days / total_days) * 100, 2) if total_days else 0
+    
+    # 공공 기준일 때 법정공휴일 최소 8일 보장
+    if weight.sector_type == "PUBLIC" and legal_holidays_count < 8:
+        legal_holidays_count = 8
+
+    return {
+        "working_days": working_days,
+        "climate_days_excl_dup": len(climate_dates_excl_holidays),
+        "legal_holidays": legal_holidays_count,
+        "operating_rate": operating_rate,
+    }
+
+
+class OperatingRateEngineTests(TestCase):
+    STATION_ID = 108
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            username="rate_owner",
+            password="StrongPass!123",
+            email="rate@example.com",
+        )
+        self.project = Project.objects.create(user=user, title="Rate Project", calc_type="APARTMENT")
+
+        rng = random.Random(7)
+        records = []
+        day = date(2024, 1, 1)
+        while day <= date(2025, 12, 31):
+            records.append(WeatherDailyRecord(
+                station_id=self.STATION_ID,
+                date=day,
+                avgTa=round(rng.uniform(-12, 30), 1),
+                minTa=round(rng.uniform(-18, 24), 1),
+                maxTa=round(rng.uniform(-6, 36), 1),
+                sumRn=None if rng.random() < 0.4 else round(rng.uniform(0, 60), 1),
+                ddMes=None if rng.random() < 0.8 else round(rng.uniform(0, 10), 1),
+                maxInsWs=round(rng.uniform(2, 20), 1),
+                payload={},
+            ))
+            day += timedelta(days=1)
+        WeatherDailyRecord.objects.bulk_create(records)
+
+        # 2025년만 공휴일 데이터 보유 → 2024년은 2025년 데이터로 대체 투영
+        for seq, (month, day_of_month, is_private) in enumerate(
+            [(1, 1, True), (3, 1, True), (5, 5, False), (6, 6, True), (10, 3, True), (12, 25, False)],
+            start=1,
+        ):
+            holiday = date(2025, month, day_of_month)
+            PublicHoliday.objects.create(
+                date=holiday,
+                name=f"holiday-{seq}",
+                is_private=is_private,
+                seq=seq,
+                locdate=int(holiday.strftime("%Y%m%d")),
+            )
+
+    def _weight(self, sector_type, **overrides):
+        values = {
+            "project": self.project,
+            "main_category": f"{sector_type}-{len(overrides)}",
+            "winter_threshold_value": Decimal("-5.0"),
+            "winter_threshold_enabled": True,
+            "summer_threshold_value": Decimal("33.0"),
+            "summer_threshold_enabled": True,
+            "rainfall_threshold_value": Decimal("10.0"),
+            "rainfall_threshold_enabled": True,
+            "snowfall_threshold_value": Decimal("1.0"),
+            "snowfall_threshold_enabled": True,
+            "wind_threshold": "15m/s",
+            "sector_type": sector_type,
+        }
+        values.update(overrides)
+        return WorkScheduleWeight.objects.create(**values)
+
+    def _assert_year_stats_match_reference(self, engine):
+        weights = [
+            self._weight("PRIVATE"),
+            self._weight("PUBLIC", rainfall_threshold_enabled=False),
+            self._weight("PRIVATE", wind_threshold="미적용", snowfall_threshold_enabled=False),
+        ]
+
+        for weight in weights:
+            for work_week_days in (5, 6, 7):
+                for winter_criteria in ("MIN", "MAX", "AVG"):
+                    expected = []
+                    for year in (2023, 2024, 2025):
+                        stats = reference_year_stats(
+                            weight, year, self.STATION_ID, work_week_days, winter_criteria
+                        )
+                        if stats:
+                            expected.append(dict(stats, year=year))
+
+                    self.assertEqual(
+                        engine.year_stats(weight, work_week_days, winter_criteria),
+                        expected,
+                    )
+
+    def test_year_stats_match_reference_calculation(self):
+        engine = OperatingRateEngine.load(self.STATION_ID, 2023, 2025)
+        self.assertIsNone(engine.frame.flags)
+        self._assert_year_stats_match_reference(engine)
+
+    def test_year_stats_from_condition_bitmap_match_reference_calculation(self):
+        rebuild_daily_conditions(self.STATION_ID)
+        engine = OperatingRateEngine.load(self.STATION_ID, 2023, 2025)
+        self.assertIsNotNone(engine.frame.flags)
+        self._assert_year_stats_match_reference(engine)
+
+    def test_partial_condition_bitmap_falls_back_to_raw_columns(self):
+        # 증분 import 후처럼 2025년만 비트맵이 있어도 2024년이 빠지지 않는다
+        rebuild_daily_conditions(self.STATION_ID, date(2025, 1, 1), date(2025, 12, 31))
+        engine = OperatingRateEngine.load(self.STATION_ID, 2023, 2025)
+        self.assertIsNotNone(engine.frame.flags)
+        self.assertIsNotNone(engine.frame.values)
+        self._assert_year_stats_match_reference(engine)
+
+    def test_average_legal_holidays_uses_holiday_years(self):
+        engine = OperatingRateEngine.load(self.STATION_ID, 2024, 2025)
+
+        # 2025년: 일요일 52일 + 작업요일(월~토) 공휴일 6일
+        self.assertEqual(engine.average_legal_holidays("PUBLIC", 6, 10), 58)
+        # 2025년: 토/일 104일 + 평일 민간 공휴일(1/1, 3/1(토) 제외, 6/6, 10/3) 3일
+        self.assertEqual(engine.average_legal_holidays("PRIVATE", 5, 10), 107)
+
+    def test_calculate_operating_rates_reuses_shared_result_cache(self):
+        settings = {"station_id": self.STATION_ID, "dataYears": 20, "workWeekDays": 6}
+        first = self._weight("PRIVATE")
+        calculate_operating_rates(self.project.id, [first], settings)
+        first.refresh_from_db()
+        self.assertEqual(OperatingRateResultCache.objects.count(), 1)
+
+        other_project = Project.objects.create(
+            user=self.project.user, title="Other Rate Project", calc_type="APARTMENT"
+        )
+        same_preset = self._weight("PRIVATE", project=other_project)
+        with patch(
+            "cpe_module.views.operating_rate.OperatingRateEngine.load",
+            side_effect=AssertionError("cache miss"),
+        ):
+            calculate_operating_rates(other_project.id, [same_preset], settings)
+        same_preset.refresh_from_db()
+
+        for field in ("working_days", "climate_days_excl_dup", "legal_holidays", "operating_rate"):
+            self.assertEqual(getattr(same_preset, field), getattr(first, field))
+
+        # 기상 데이터가 바뀌면 캐시 비움
+        bump_data_version(WEATHER)
+        self.assertFalse(OperatingRateResultCache.objects.exists())
+
+    def test_station_comparison_from_cube_matches_engine(self):
+        WeatherDailyRecord.objects.bulk_create([
+            WeatherDailyRecord(
+                station_id=159,
+                date=record.date,
+                avgTa=record.avgTa - 3 if record.avgTa is not None else None,
+                minTa=record.minTa,
+                maxTa=record.maxTa,
+                sumRn=record.sumRn,
+                ddMes=record.ddMes,
+                maxInsWs=record.maxInsWs,
+                payload={},
+            )
+            for record in WeatherDailyRecord.objects.filter(station_id=self.STATION_ID, date__year=2025)
+        ])
+        WeatherStation.objects.create(station_id=159, name="부산")
+        rebuild_daily_conditions(self.STATION_ID)
+        rebuild_daily_conditions(159)
+
+        weights = [
+            self._weight("PRIVATE"),
+            self._weight("PUBLIC", rainfall_threshold_enabled=False, winter_threshold_value=Decimal("-10")),
+        ]
+        for weight in weights:
+            for work_week_days in (5, 6, 7):
+                results = compare_station_rates(weight, work_week_days, "AVG", 2024, 2025, per_year=True)
+                self.assertEqual([row["station_id"] for row in results], [self.STATION_ID, 159])
+                self.assertEqual(results[1]["name"], "부산")
+                for row in results:
+                    engine = OperatingRateEngine.load(row["station_id"], 2024, 2025)
+                    self.assertEqual(row["years"], engine.year_stats(weight, work_week_days, "AVG"))
+                    self.assertEqual(
+                        row["legal_holidays"],
+                        engine.average_legal_holidays(weight.sector_type, work_week_days, 2),
+                    )
+
+    def test_station_comparison_api_rejects_unsupported_threshold(self):
+        rebuild_daily_conditions(self.STATION_ID)
+        client = APIClient()
+        client.force_authenticate(user=self.project.user)
+        weight = {
+            "sector_type": "PRIVATE",
+            "winter_threshold_enabled": True,
+            "winter_threshold_value": "-5",
+            "rainfall_threshold_enabled": True,
+            "rainfall_threshold_value": "10",
+            "snowfall_threshold_enabled": False,
+            "wind_threshold": "미적용",
+        }
+
+        response = client.post(
+            "/api/cpe/operating-rate-comparison/",
+            {"weight": weight, "dataYears": 30},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["station_id"] for row in response.data["stations"]], [self.STATION_ID])
+
+        weight["winter_criteria"] = "MIN"
+        response = client.post(
+            "/api/cpe/operating-rate-comparison/",
+            {"weight": weight},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -18,6 +18,8 @@ urlpatterns = [
     path("work-schedule-weights/create/", operating_rate.create_work_schedule_weight, name="create_work_schedule_weight"),
     path("work-schedule-weights/<str:project_id>/", operating_rate.detail_work_schedule_weight, name="detail_work_schedule_weight"),
     path("work-schedule-weights/<str:project_id>/update/", operating_rate.update_work_schedule_weight, name="update_work_schedule_weight"),
+    path("work-schedule-weights/<str:project_id>/status/", operating_rate.operating_rate_status, name="operating_rate_status"),
+    path("operating-rate-comparison/", operating_rate.compare_operating_rates, name="compare_operating_rates"),
         
     #criteria
     ##준비 정리 가설 마감공사
@@ -0,0 +1,64 @@
+"""
+가동률 결과 공유 캐시
+
+같은 지점/분석기간/기준값 조합(기본 프리셋 등)은 프로젝트가 달라도 결과가 같으므로
+정규화한 signature(sha256)로 OperatingRateResultCache에 저장해 재사용한다.
+signature에는 기상/공휴일 데이터 버전이 포함되며, 데이터가 바뀌면 시그널로 캐시를 비운다.
+"""
+
+import hashlib
+import json
+
+from ..models.operating_rate_models import OperatingRateResultCache
+from .operating_rate_engine import weight_conditions, workday_weekday_count
+
+
+RESULT_FIELDS = ("working_days", "climate_days_excl_dup", "legal_holidays", "operating_rate")
+
+
+def build_rate_signature(
+    station_id,
+    start_year,
+    end_year,
+    holiday_years,
+    holiday_work_week_days,
+    weight,
+    work_week_days,
+    winter_criteria,
+    data_versions,
+):
+    payload = {
+        "station_id": int(station_id),
+        "years": [start_year, end_year],
+        "holiday_years": holiday_years,
+        "holiday_work_week_days": workday_weekday_count(holiday_work_week_days),
+        "work_week_days": workday_weekday_count(work_week_days),
+        "sector_type": weight.sector_type,
+        # 비활성 기준/미사용 동절기 기준은 제외된 (필드, 비교, 기준값) 목록
+        "conditions": sorted(weight_conditions(weight, winter_criteria)),
+        "data_versions": data_versions,
+    }
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def get_cached_rate(signature):
+    return (
+        OperatingRateResultCache.objects.filter(signature=signature)
+        .values(*RESULT_FIELDS)
+        .first()
+    )
+
+
+def store_cached_rate(signature, station_id, result):
+    OperatingRateResultCache.objects.get_or_create(
+        signature=signature,
+        defaults={
+            "station_id": station_id,
+            **{field: result[field] for field in RESULT_FIELDS},
+        },
+    )
+
+
+def clear_rate_cache():
+    OperatingRateResultCache.objects.all().delete()
@@ -0,0 +1,116 @@
+"""
+지점별 가동률 비교
+
+operatio.condition_cube 의 (지점, 연도, 요일, 공휴일 구분, 비트맵)별 일수 집계로
+하나의 기준 조합(WorkScheduleWeight)에 대한 전국 지점 가동률을 한 번에 계산한다.
+연도별 값은 OperatingRateEngine.year_stats, 평균은 calculate_operating_rates 와 같은 방식으로 구한다.
+"""
+
+import numpy as np
+
+from operatio.condition_cube import get_condition_cube
+from operatio.models import WeatherConditionCube, WeatherStation
+from operatio.weather_conditions import find_condition_bit
+from operatio.workday_calendar import HOLIDAY_FALLBACK_YEAR, SECTOR_PRIVATE, get_workday_calendar, sector_key
+
+from .operating_rate_engine import (
+    PUBLIC_MIN_LEGAL_HOLIDAYS,
+    average_legal_holidays,
+    weight_conditions,
+    workday_weekday_count,
+)
+
+
+class UnsupportedThresholdError(ValueError):
+    """기준값이 비트맵(CONDITION_BITS)에 없어 집계로 계산할 수 없는 경우"""
+
+    def __init__(self, conditions):
+        self.conditions = conditions
+        super().__init__(", ".join(f"{field} {op} {threshold:g}" for field, op, threshold in conditions))
+
+
+def condition_mask(weight, winter_criteria="AVG"):
+    """기준 조합 → 비트 OR mask. 비트맵에 없는 기준이 있으면 UnsupportedThresholdError"""
+    mask = 0
+    unsupported = []
+    for field, op, threshold in weight_conditions(weight, winter_criteria):
+        bit = find_condition_bit(field, op, threshold)
+        if bit is None:
+            unsupported.append((field, op, threshold))
+        else:
+            mask |= 1 << bit
+    if unsupported:
+        raise UnsupportedThresholdError(unsupported)
+    return mask
+
+
+def compare_station_rates(weight, work_week_days, winter_criteria, start_year, end_year, per_year=False):
+    """전체 지점의 평균(및 연도별) 가동률 목록 (기상 자료가 있는 지점만)"""
+    mask = condition_mask(weight, winter_criteria)
+    calendar = get_workday_calendar()
+    cube = get_condition_cube()
+    years = list(range(start_year, end_year + 1))
+
+    selected = (cube.year >= start_year) & (cube.year <= end_year)
+    station_column = cube.station_id[selected]
+    station_ids = np.unique(station_column)
+    if not len(station_ids):
+        return []
+
+    holiday_bit = (
+        WeatherConditionCube.PRIVATE_HOLIDAY
+        if sector_key(weight.sector_type) == SECTOR_PRIVATE
+        else WeatherConditionCube.PUBLIC_HOLIDAY
+    )
+    # 작업 요일이면서 공휴일이 아닌 날 중 기준 비트가 하나라도 있는 날 = 기후불능일(중복 제외)
+    climate = (
+        (cube.weekday[selected] < workday_weekday_count(work_week_days))
+        & ((cube.holiday_class[selected] & holiday_bit) == 0)
+        & ((cube.flags[selected] & mask) != 0)
+    )
+    cells = np.searchsorted(station_ids, station_column) * len(years) + (cube.year[selected] - start_year)
+    size = len(station_ids) * len(years)
+    has_data = (np.bincount(cells, minlength=size) > 0).reshape(len(station_ids), len(years))
+    climate_days = np.bincount(
+        cells, weights=cube.days[selected] * climate, minlength=size
+    ).astype(np.int64).reshape(len(station_ids), len(years))
+
+    legal_counts = [
+        calendar.legal_holidays(year, weight.sector_type, work_week_days, HOLIDAY_FALLBACK_YEAR)
+        for year in years
+    ]
+    total_days = [calendar.year(year).length for year in years]
+    avg_holidays = average_legal_holidays(calendar, weight.sector_type, work_week_days, len(years))
+    names = dict(WeatherStation.objects.values_list("station_id", "name"))
+
+    results = []
+    for row, station_id in enumerate(station_ids.tolist()):
+        stats = []
+        for pos, year in enumerate(years):
+            if not has_data[row, pos]:
+                continue
+            climate_count = int(climate_days[row, pos])
+            legal_holidays = legal_counts[pos]
+            working_days = max(total_days[pos] - climate_count - legal_holidays, 0)
+            if weight.sector_type == "PUBLIC" and legal_holidays < PUBLIC_MIN_LEGAL_HOLIDAYS:
+                legal_holidays = PUBLIC_MIN_LEGAL_HOLIDAYS
+            stats.append({
+                "year": year,
+                "working_days": working_days,
+                "climate_days_excl_dup": climate_count,
+                "legal_holidays": legal_holidays,
+                "operating_rate": round((working_days / total_days[pos]) * 100, 2),
+            })
+
+        result = {
+            "station_id": station_id,
+            "name": names.get(station_id),
+            "working_days": round(sum(s["working_days"] for s in stats) / len(stats)),
+            "climate_days_excl_dup": round(sum(s["climate_days_excl_dup"] for s in stats) / len(stats)),
+            "legal_holidays": avg_holidays,
+            "operating_rate": round(sum(s["operating_rate"] for s in stats) / len(stats), 2),
+        }
+        if per_year:
+            result["years"] = stats
+        results.append(result)
+    return results
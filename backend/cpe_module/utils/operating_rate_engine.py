@@ -0,0 +1,304 @@
+"""
+가동률 산정 엔진
+
+지점(station)의 기준 비트맵(필요 시 일자료 avgTa/minTa/maxTa/sumRn/ddMes/maxInsWs)을 한 번만 조회해
+NumPy 배열로 올려두고, 공종(WorkScheduleWeight) × 연도 조합의 기후불능일/법정공휴일/작업일을 boolean mask로 계산한다.
+"""
+
+from datetime import date as date_cls
+
+import numpy as np
+
+from operatio.models import WeatherDailyCondition, WeatherDailyRecord
+from operatio.weather_conditions import CONDITION_FIELDS, find_condition_bit, weather_facts
+from operatio.workday_calendar import (
+    HOLIDAY_FALLBACK_YEAR,
+    get_workday_calendar,
+    work_weekday_count as workday_weekday_count,
+)
+
+
+WEATHER_FIELDS = CONDITION_FIELDS
+
+# 공공 기준일 때 보장하는 최소 법정공휴일 수
+PUBLIC_MIN_LEGAL_HOLIDAYS = 8
+
+
+def parse_wind_threshold(value):
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text or text in {"미적용", "NONE", "N/A"}:
+        return None
+
+    number_chars = []
+    dot_seen = False
+    for ch in text:
+        if ch.isdigit():
+            number_chars.append(ch)
+        elif ch == "." and not dot_seen:
+            number_chars.append(ch)
+            dot_seen = True
+
+    if not number_chars:
+        return None
+    try:
+        return float("".join(number_chars))
+    except ValueError:
+        return None
+
+
+def weight_conditions(weight, winter_criteria="AVG"):
+    """WorkScheduleWeight의 기후불능 조건을 (필드, 비교, 기준값) 목록으로 변환"""
+    conditions = []
+    if weight.winter_threshold_enabled and weight.winter_threshold_value is not None:
+        if winter_criteria == "MIN":
+            field = "minTa"
+        elif winter_criteria == "MAX":
+            field = "maxTa"
+        else:
+            field = "avgTa"
+        conditions.append((field, "lte", float(weight.winter_threshold_value)))
+    if weight.summer_threshold_enabled and weight.summer_threshold_value is not None:
+        conditions.append(("maxTa", "gte", float(weight.summer_threshold_value)))
+    if weight.rainfall_threshold_enabled and weight.rainfall_threshold_value is not None:
+        conditions.append(("sumRn", "gte", float(weight.rainfall_threshold_value)))
+    if weight.snowfall_threshold_enabled and weight.snowfall_threshold_value is not None:
+        conditions.append(("ddMes", "gte", float(weight.snowfall_threshold_value)))
+    wind_threshold = parse_wind_threshold(weight.wind_threshold)
+    if wind_threshold is not None:
+        conditions.append(("maxInsWs", "gte", wind_threshold))
+    return conditions
+
+
+class StationWeatherFrame:
+    """한 지점의 연속된 연도 구간 일자료를 날짜 인덱스 배열로 보관
+
+    표준 기준은 WeatherDailyCondition 비트맵으로 판정하고, 비트맵에 없는 기준값이거나
+    비트맵 행이 없는 날에만 원본 일자료 컬럼을 읽는다.
+    """
+
+    def __init__(self, station_id, start_year, end_year, flag_rows=None, value_rows=None):
+        self.station_id = station_id
+        self.years = list(range(start_year, end_year + 1))
+        self.origin = date_cls(start_year, 1, 1)
+        self.end = date_cls(end_year, 12, 31)
+        length = (self.end - self.origin).days + 1
+
+        self.year_offsets = np.array(
+            [(date_cls(year, 1, 1) - self.origin).days for year in self.years],
+            dtype=np.int64,
+        )
+        self.year_lengths = np.diff(np.append(self.year_offsets, length))
+        self.weekdays = (self.origin.weekday() + np.arange(length)) % 7
+        days = np.datetime64(self.origin, "D") + np.arange(length)
+        self.months = days.astype("datetime64[M]").astype(np.int64) % 12
+        self.has_record = np.zeros(length, dtype=bool)
+        self.flags = None
+        self.flagged = None
+        self.values = None
+
+        if flag_rows:
+            index = self._index(flag_rows)
+            self.has_record[index] = True
+            self.flagged = self.has_record.copy()
+            self.flags = np.zeros(length, dtype=np.int64)
+            self.flags[index] = [row[1] for row in flag_rows]
+        if value_rows is not None:
+            self._set_values(value_rows)
+
+        self._condition_cache = {}
+        self._workday_cache = {}
+
+    @classmethod
+    def load(cls, station_id, start_year, end_year):
+        date_range = (date_cls(start_year, 1, 1), date_cls(end_year, 12, 31))
+        conditions = WeatherDailyCondition.objects.filter(station_id=station_id, date__range=date_range)
+        flag_rows = list(conditions.values_list("date", "flags"))
+        if not flag_rows:
+            return cls(station_id, start_year, end_year, value_rows=cls._query_values(station_id, start_year, end_year))
+
+        frame = cls(station_id, start_year, end_year, flag_rows=flag_rows)
+        # 비트맵 행이 없는 날(증분 import 직후 등)은 원본 컬럼으로 메운다
+        missing = WeatherDailyRecord.objects.filter(station_id=station_id, date__range=date_range).exclude(
+            date__in=conditions.values("date")
+        )
+        if missing.exists():
+            frame._set_values(cls._query_values(station_id, start_year, end_year))
+        return frame
+
+    @staticmethod
+    def _query_values(station_id, start_year, end_year):
+        return weather_facts(
+            station_id,
+            date_cls(start_year, 1, 1),
+            date_cls(end_year, 12, 31),
+        ).values_list("date", *WEATHER_FIELDS)
+
+    def _index(self, rows):
+        return np.fromiter(
+            ((row[0] - self.origin).days for row in rows), dtype=np.int64, count=len(rows)
+        )
+
+    def _set_values(self, rows):
+        rows = list(rows)
+        index = self._index(rows)
+        self.has_record[index] = True
+        self.values = {}
+        for pos, field in enumerate(WEATHER_FIELDS, start=1):
+            column = np.full(len(self.has_record), np.nan)
+            column[index] = np.array([row[pos] for row in rows], dtype=float)
+            self.values[field] = column
+
+    def __len__(self):
+        return len(self.has_record)
+
+    def index_of(self, value):
+        return (value - self.origin).days
+
+    def per_year(self, mask):
+        return np.add.reduceat(mask.astype(np.int64), self.year_offsets)
+
+    def condition_mask(self, field, op, threshold):
+        key = (field, op, threshold)
+        mask = self._condition_cache.get(key)
+        if mask is None:
+            bit = find_condition_bit(field, op, threshold) if self.flags is not None else None
+            if bit is not None:
+                mask = (self.flags >> bit & 1).astype(bool)
+                if self.values is not None:
+                    # 비트맵 행이 없는 날은 원본 컬럼으로 판정
+                    mask = np.where(self.flagged, mask, self._value_mask(field, op, threshold))
+            else:
+                mask = self._value_mask(field, op, threshold)
+            self._condition_cache[key] = mask
+        return mask
+
+    def _value_mask(self, field, op, threshold):
+        if self.values is None:
+            self._set_values(
+                self._query_values(self.station_id, self.years[0], self.years[-1])
+            )
+        values = self.values[field]
+        with np.errstate(invalid="ignore"):
+            return values <= threshold if op == "lte" else values >= threshold
+
+    def workday_mask(self, work_week_days):
+        count = workday_weekday_count(work_week_days)
+        mask = self._workday_cache.get(count)
+        if mask is None:
+            mask = self.weekdays < count
+            self._workday_cache[count] = mask
+        return mask
+
+    def years_with_records(self):
+        return self.per_year(self.has_record) > 0
+
+
+class OperatingRateEngine:
+    """StationWeatherFrame + WorkdayCalendar 위에서 공종별 가동률을 계산"""
+
+    def __init__(self, frame, calendar):
+        self.frame = frame
+        self.calendar = calendar
+        self._holiday_profile_cache = {}
+        self._legal_average_cache = {}
+
+    @classmethod
+    def load(cls, station_id, start_year, end_year):
+        return cls(
+            StationWeatherFrame.load(station_id, start_year, end_year),
+            get_workday_calendar(),
+        )
+
+    def _holiday_profile(self, sector_type, work_week_days):
+        """연도별 (작업일 중 법정공휴일 mask, 법정공휴일 수)"""
+        cache_key = (sector_type, workday_weekday_count(work_week_days))
+        cached = self._holiday_profile_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        frame = self.frame
+        holiday_mask = np.zeros(len(frame), dtype=bool)
+        legal_counts = []
+        for pos, year in enumerate(frame.years):
+            year_calendar = self.calendar.year(year, sector_type, work_week_days, HOLIDAY_FALLBACK_YEAR)
+            legal_counts.append(
+                self.calendar.legal_holidays(year, sector_type, work_week_days, HOLIDAY_FALLBACK_YEAR)
+            )
+            offset = frame.year_offsets[pos]
+            holiday_mask[offset:offset + year_calendar.length] = year_calendar.holiday_on_workdays
+
+        cached = (holiday_mask, legal_counts)
+        self._holiday_profile_cache[cache_key] = cached
+        return cached
+
+    def _climate_mask(self, weight, work_week_days, winter_criteria):
+        """작업 요일 중 기후불능 조건에 해당하는 날"""
+        frame = self.frame
+        climate = np.zeros(len(frame), dtype=bool)
+        for field, op, threshold in weight_conditions(weight, winter_criteria):
+            climate |= frame.condition_mask(field, op, threshold)
+        return climate & frame.workday_mask(work_week_days)
+
+    def monthly_nonwork_rates(self, weight, work_week_days, winter_criteria="AVG"):
+        """월별 기후불능 확률 (관측 자료가 있는 작업일(공휴일 제외) 중 기후불능일 비율, 길이 12)"""
+        frame = self.frame
+        holiday_on_workdays, _legal = self._holiday_profile(weight.sector_type, work_week_days)
+        candidates = frame.workday_mask(work_week_days) & ~holiday_on_workdays & frame.has_record
+        climate = self._climate_mask(weight, work_week_days, winter_criteria) & candidates
+
+        candidate_counts = np.bincount(frame.months[candidates], minlength=12)
+        climate_counts = np.bincount(frame.months[climate], minlength=12)
+        rates = np.zeros(12)
+        np.divide(climate_counts, candidate_counts, out=rates, where=candidate_counts > 0)
+        return rates
+
+    def year_stats(self, weight, work_week_days, winter_criteria="AVG"):
+        """연도별 통계 목록. 기상 데이터가 없는 연도는 제외한다."""
+        frame = self.frame
+        climate = self._climate_mask(weight, work_week_days, winter_criteria)
+        holiday_on_workdays, legal_counts = self._holiday_profile(weight.sector_type, work_week_days)
+        climate_counts = frame.per_year(climate & ~holiday_on_workdays)
+        has_data = frame.years_with_records()
+
+        stats = []
+        for pos, year in enumerate(frame.years):
+            if not has_data[pos]:
+                continue
+            total_days = int(frame.year_lengths[pos])
+            climate_days = int(climate_counts[pos])
+            legal_holidays = legal_counts[pos]
+            working_days = max(total_days - climate_days - legal_holidays, 0)
+            operating_rate = round((working_days / total_days) * 100, 2) if total_days else 0
+            if weight.sector_type == "PUBLIC" and legal_holidays < PUBLIC_MIN_LEGAL_HOLIDAYS:
+                legal_holidays = PUBLIC_MIN_LEGAL_HOLIDAYS
+            stats.append({
+                "year": year,
+                "working_days": working_days,
+                "climate_days_excl_dup": climate_days,
+                "legal_holidays": legal_holidays,
+                "operating_rate": operating_rate,
+            })
+        return stats
+
+    def average_legal_holidays(self, sector_type, work_week_days, years):
+        """공휴일 데이터가 있는 연도(오름차순 최대 years개)의 평균 법정공휴일 수"""
+        cache_key = (sector_type, workday_weekday_count(work_week_days), years)
+        if cache_key not in self._legal_average_cache:
+            self._legal_average_cache[cache_key] = average_legal_holidays(
+                self.calendar, sector_type, work_week_days, years
+            )
+        return self._legal_average_cache[cache_key]
+
+
+def average_legal_holidays(calendar, sector_type, work_week_days, years):
+    """공휴일 데이터가 있는 연도(오름차순 최대 years개)의 평균 법정공휴일 수 (공공은 최소 8일)"""
+    holiday_stats = [
+        calendar.legal_holidays(year, sector_type, work_week_days)
+        for year in calendar.years[:years]
+    ]
+    average = round(sum(holiday_stats) / len(holiday_stats)) if holiday_stats else 0
+    if sector_type == "PUBLIC" and average < PUBLIC_MIN_LEGAL_HOLIDAYS:
+        average = PUBLIC_MIN_LEGAL_HOLIDAYS
+    return average
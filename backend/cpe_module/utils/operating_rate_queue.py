@@ -0,0 +1,167 @@
+"""
+가동률 지연 재계산 큐
+
+공정표 자동저장마다 가동률을 바로 계산하지 않고 프로젝트를 dirty로 표시한 뒤,
+DEBOUNCE_SECONDS 동안 들어온 저장을 한 번의 재계산으로 묶어 백그라운드 스레드에서 처리한다.
+엑셀/보고서 출력처럼 최신 값이 필요한 곳은 flush_operating_rates()로 즉시 계산한다.
+"""
+
+import logging
+import threading
+import time
+
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from ..models.operating_rate_models import OperatingRateStatus, WorkScheduleWeight
+from .operating_rate_defaults import (
+    PROCESS_KEY_DELIMITER,
+    build_operating_rate_defaults,
+    get_additional_operating_rate_keys,
+    resolve_operating_rate_preset_code,
+)
+
+logger = logging.getLogger(__name__)
+
+# 마지막 저장 후 대기 시간 / 연속 저장 시 최대 대기 시간
+DEBOUNCE_SECONDS = 3.0
+MAX_DELAY_SECONDS = 30.0
+
+# 기본 설정 (OperatingRate.jsx의 defaults와 동일하게 맞춤)
+DEFAULT_RATE_SETTINGS = {
+    "region": "서울",
+    "dataYears": 10,
+    "workWeekDays": 6,
+}
+
+# project_id -> (실행 예정 시각, 최초 요청 시각)
+_pending = {}
+_condition = threading.Condition()
+_worker = None
+
+
+def expand_category_keys(pairs):
+    """(main_category, process) 목록 → 가동률 키 (main_category 및 process 프리셋 키)"""
+    categories = set()
+    for main_category, process in pairs:
+        if not main_category:
+            continue
+
+        categories.add(main_category)
+
+        # process 별 프리셋이 정의된 경우 main|||process 키를 따로 생성
+        if process:
+            process_key = f"{main_category}{PROCESS_KEY_DELIMITER}{process}"
+            if resolve_operating_rate_preset_code(process_key):
+                categories.add(process_key)
+            for extra_key in get_additional_operating_rate_keys(main_category, process):
+                categories.add(extra_key)
+    return categories
+
+
+def mark_operating_rates_dirty(project_id):
+    now = timezone.now()
+    updated = OperatingRateStatus.objects.filter(project_id=project_id).update(
+        is_dirty=True,
+        requested_at=now,
+    )
+    if not updated:
+        OperatingRateStatus.objects.get_or_create(
+            project_id=project_id,
+            defaults={"is_dirty": True, "requested_at": now},
+        )
+    return now
+
+
+def schedule_operating_rate_recalc(project_id):
+    """dirty 표시 후 트랜잭션 커밋 시점에 재계산 예약"""
+    mark_operating_rates_dirty(project_id)
+    transaction.on_commit(lambda: _enqueue(project_id))
+
+
+def get_operating_rate_status(project_id):
+    state = OperatingRateStatus.objects.filter(project_id=project_id).first()
+    return state.status if state else "fresh"
+
+
+def recalculate_project_operating_rates(project_id):
+    """공정표 카테고리 기준으로 가동률 항목 생성 + 재계산. 계산 중 새 요청이 들어오면 dirty 유지."""
+    from cpe_all_module.utils.schedule_rows import project_category_pairs
+    from ..views.operating_rate import calculate_operating_rates
+
+    state = OperatingRateStatus.objects.filter(project_id=project_id).first()
+    requested_at = state.requested_at if state else None
+
+    try:
+        # 정규화 행(ScheduleActivity)에서 (대공종, 공정)만 조회
+        categories = expand_category_keys(project_category_pairs(project_id))
+        for category in categories:
+            if not category:
+                continue
+            WorkScheduleWeight.objects.get_or_create(
+                project_id=project_id,
+                main_category=category,
+                defaults=build_operating_rate_defaults(category),
+            )
+
+        weights = WorkScheduleWeight.objects.filter(
+            project_id=project_id,
+            main_category__in=categories,
+        )
+        calculate_operating_rates(project_id, weights, DEFAULT_RATE_SETTINGS)
+    except Exception as exc:
+        OperatingRateStatus.objects.filter(project_id=project_id).update(last_error=str(exc))
+        raise
+
+    OperatingRateStatus.objects.filter(
+        project_id=project_id,
+        requested_at=requested_at,
+    ).update(is_dirty=False, computed_at=timezone.now(), last_error="")
+
+
+def flush_operating_rates(project_id):
+    """dirty 상태면 대기열에서 빼고 즉시 재계산"""
+    with _condition:
+        _pending.pop(str(project_id), None)
+    if get_operating_rate_status(project_id) == "pending":
+        recalculate_project_operating_rates(project_id)
+
+
+def _enqueue(project_id):
+    global _worker
+    key = str(project_id)
+    now = time.monotonic()
+    with _condition:
+        _due, first_requested = _pending.get(key, (None, now))
+        due = min(now + DEBOUNCE_SECONDS, first_requested + MAX_DELAY_SECONDS)
+        _pending[key] = (due, first_requested)
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_worker_loop, daemon=True)
+            _worker.start()
+        _condition.notify()
+
+
+def _next_due_project():
+    """실행 시각이 된 프로젝트를 꺼낸다 (없으면 대기)"""
+    with _condition:
+        while True:
+            now = time.monotonic()
+            if _pending:
+                key, (due, _first) = min(_pending.items(), key=lambda entry: entry[1][0])
+                if due <= now:
+                    del _pending[key]
+                    return key
+                _condition.wait(due - now)
+            else:
+                _condition.wait()
+
+
+def _worker_loop():
+    while True:
+        project_id = _next_due_project()
+        try:
+            recalculate_project_operating_rates(project_id)
+        except Exception:
+            logger.exception("operating rate recalculation failed for project_id=%s", project_id)
+        finally:
+            close_old_connections()
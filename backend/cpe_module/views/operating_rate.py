@@ -1,5 +1,4 @@
 from datetime import date as date_cls
-from datetime import timedelta
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -7,18 +6,19 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 
-from ..models.operating_rate_models import WorkScheduleWeight
-from cpe_all_module.models.construction_schedule_models import ConstructionScheduleItem
+from ..models.operating_rate_models import OperatingRateStatus, WorkScheduleWeight
+from cpe_all_module.utils.schedule_durations import recalculate_project_durations
+from cpe_all_module.utils.schedule_rows import project_category_pairs
 from ..models.project_models import Project
 from ..models.calc_models import WorkCondition
 from ..serializers.operating_rate_serializers import WorkScheduleWeightSerializer
-from ..utils.operating_rate_defaults import (
-    PROCESS_KEY_DELIMITER,
-    build_operating_rate_defaults,
-    get_additional_operating_rate_keys,
-    resolve_operating_rate_preset_code,
-)
-from operatio.models import WeatherDailyRecord, WeatherStation, PublicHoliday
+from ..utils.operating_rate_defaults import build_operating_rate_defaults
+from ..utils.operating_rate_cache import build_rate_signature, get_cached_rate, store_cached_rate
+from ..utils.operating_rate_comparison import UnsupportedThresholdError, compare_station_rates
+from ..utils.operating_rate_engine import OperatingRateEngine
+from ..utils.operating_rate_queue import expand_category_keys
+from operatio.data_versions import get_data_versions
+from operatio.models import WeatherStation
 
 
 # 목록 조회 (로그인 유저 기준)
@@ -41,35 +41,16 @@ def detail_work_schedule_weight(request, project_id):
 
     project = get_object_or_404(Project, id=project_id, user=request.user)
 
-    schedule_container = ConstructionScheduleItem.objects.filter(project=project).first()
-    raw_data = schedule_container.data if schedule_container else []
-    schedule_items = raw_data.get("items", []) if isinstance(raw_data, dict) else raw_data
+    # 공정표 정규화 행에서 (대공종, 공정)만 조회
     created_weights = []
-
-    for item in schedule_items:
-        if not isinstance(item, dict):
-            continue
-
-        main_category = item.get("main_category")
-        process = item.get("process")
-        if not main_category:
-            continue
-
-        candidate_keys = {main_category}
-        if process:
-            process_key = f"{main_category}{PROCESS_KEY_DELIMITER}{process}"
-            if resolve_operating_rate_preset_code(process_key):
-                candidate_keys.add(process_key)
-            candidate_keys.update(get_additional_operating_rate_keys(main_category, process))
-
-        for category_key in candidate_keys:
-            weight, created = WorkScheduleWeight.objects.get_or_create(
-                project=project,
-                main_category=category_key,
-                defaults=build_operating_rate_defaults(category_key),
-            )
-            if created:
-                created_weights.append(weight)
+    for category_key in expand_category_keys(project_category_pairs(project.id)):
+        weight, created = WorkScheduleWeight.objects.get_or_create(
+            project=project,
+            main_category=category_key,
+            defaults=build_operating_rate_defaults(category_key),
+        )
+        if created:
+            created_weights.append(weight)
 
     if created_weights:
         default_settings = {
@@ -89,6 +70,90 @@ def detail_work_schedule_weight(request, project_id):
     return Response(serializer.data)
 
 
+# 가동률 재계산 상태 (pending: 지연 재계산 대기 중, fresh: 최신)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def operating_rate_status(request, project_id):
+    project = get_object_or_404(Project, id=project_id, user=request.user, is_delete=False)
+    state = OperatingRateStatus.objects.filter(project=project).first()
+    return Response({
+        "status": state.status if state else "fresh",
+        "requested_at": state.requested_at if state else None,
+        "computed_at": state.computed_at if state else None,
+    })
+
+
+COMPARISON_WEIGHT_FIELDS = (
+    "sector_type",
+    "work_week_days",
+    "winter_criteria",
+    "winter_threshold_enabled",
+    "winter_threshold_value",
+    "summer_threshold_enabled",
+    "summer_threshold_value",
+    "rainfall_threshold_enabled",
+    "rainfall_threshold_value",
+    "snowfall_threshold_enabled",
+    "snowfall_threshold_value",
+    "wind_threshold",
+)
+
+
+# 지점별 가동률 비교 (같은 기준 조합으로 전체 관측소 계산)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def compare_operating_rates(request):
+    """
+    Body:
+      weight_id   기존 WorkScheduleWeight id (본인 프로젝트) 또는
+      weight      기준 조합 dict (COMPARISON_WEIGHT_FIELDS)
+      dataYears   분석 기간(년, 기본 10)
+      per_year    true면 연도별 값 포함
+    """
+    payload = request.data if isinstance(request.data, dict) else {}
+    weight_id = payload.get("weight_id")
+    if weight_id:
+        weight = get_object_or_404(
+            WorkScheduleWeight,
+            id=weight_id,
+            project__user=request.user,
+            project__is_delete=False,
+        )
+    elif isinstance(payload.get("weight"), dict):
+        weight = WorkScheduleWeight(**{
+            field: value
+            for field, value in payload["weight"].items()
+            if field in COMPARISON_WEIGHT_FIELDS
+        })
+    else:
+        return Response({"error": "weight_id 또는 weight가 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+    years = parse_years(payload.get("dataYears"))
+    end_year = date_cls.today().year - 1
+    try:
+        results = compare_station_rates(
+            weight,
+            weight.work_week_days or 6,
+            weight.winter_criteria or "AVG",
+            end_year - years + 1,
+            end_year,
+            per_year=bool(payload.get("per_year")),
+        )
+    except UnsupportedThresholdError as exc:
+        return Response(
+            {"error": f"집계에서 지원하지 않는 기준값입니다: {exc}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    except (TypeError, ValueError):
+        return Response({"error": "기준값 형식이 올바르지 않습니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        "start_year": end_year - years + 1,
+        "end_year": end_year,
+        "stations": results,
+    })
+
+
 # 생성
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
@@ -145,198 +210,6 @@ def resolve_station_id(settings):
     station = WeatherStation.objects.first()
     return station.station_id if station else None
 
-def is_workday(day, work_week_days):
-    weekday = day.weekday()  # 0=Mon, 6=Sun
-    if work_week_days >= 7:
-        return True
-    if work_week_days == 6:
-        return weekday <= 5
-    return weekday <= 4
-
-def year_range(year):
-    return date_cls(year, 1, 1), date_cls(year, 12, 31)
-
-
-def parse_wind_threshold(value):
-    if value is None:
-        return None
-    text = str(value).strip()
-    if not text or text in {"미적용", "NONE", "N/A"}:
-        return None
-
-    number_chars = []
-    dot_seen = False
-    for ch in text:
-        if ch.isdigit():
-            number_chars.append(ch)
-        elif ch == "." and not dot_seen:
-            number_chars.append(ch)
-            dot_seen = True
-
-    if not number_chars:
-        return None
-    try:
-        return float("".join(number_chars))
-    except ValueError:
-        return None
-
-def compute_year_stats(weight, year, station_id, work_week_days, winter_criteria="AVG"):
-    year_start, year_end = year_range(year)
-    workdays = {
-        year_start + timedelta(days=offset)
-        for offset in range((year_end - year_start).days + 1)
-        if is_workday(year_start + timedelta(days=offset), work_week_days)
-    }
-    if not workdays:
-        return None
-
-    qs = WeatherDailyRecord.objects.filter(
-        station_id=station_id,
-        date__range=(year_start, year_end),
-    )
-    if not qs.exists():
-        return None
-
-    climate_dates = set()
-
-    if weight.winter_threshold_enabled and weight.winter_threshold_value is not None:
-        if winter_criteria == "MIN":
-            filter_kwargs = {"minTa__lte": weight.winter_threshold_value}
-        elif winter_criteria == "MAX":
-            filter_kwargs = {"maxTa__lte": weight.winter_threshold_value}
-        else:
-            filter_kwargs = {"avgTa__lte": weight.winter_threshold_value}
-
-        climate_dates |= set(
-            qs.filter(**filter_kwargs)
-            .values_list("date", flat=True)
-        )
-    if weight.summer_threshold_enabled and weight.summer_threshold_value is not None:
-        climate_dates |= set(
-            qs.filter(maxTa__gte=weight.summer_threshold_value)
-            .values_list("date", flat=True)
-        )
-    if weight.rainfall_threshold_enabled and weight.rainfall_threshold_value is not None:
-        climate_dates |= set(
-            qs.filter(sumRn__gte=weight.rainfall_threshold_value)
-            .values_list("date", flat=True)
-        )
-    if weight.snowfall_threshold_enabled and weight.snowfall_threshold_value is not None:
-        climate_dates |= set(
-            qs.filter(ddMes__gte=weight.snowfall_threshold_value)
-            .values_list("date", flat=True)
-        )
-    wind_threshold = parse_wind_threshold(weight.wind_threshold)
-    if wind_threshold is not None:
-        climate_dates |= set(
-            qs.filter(maxInsWs__gte=wind_threshold)
-            .values_list("date", flat=True)
-        )
-
-    # 기후불능일: 작업일과의 교집합
-    climate_dates = climate_dates & workdays
-
-    # 법정공휴일 조회 - 해당 연도에 데이터가 없으면 2025년 데이터 사용
-    reference_year = year
-    if weight.sector_type == "PRIVATE":
-        holiday_qs = PublicHoliday.objects.filter(
-            date__range=(year_start, year_end),
-            is_private=True,
-        )
-        if not holiday_qs.exists():
-            # 해당 연도에 데이터 없으면 2025년 데이터로 대체
-            reference_year = 2025
-            ref_start = date_cls(2025, 1, 1)
-            ref_end = date_cls(2025, 12, 31)
-            holiday_qs = PublicHoliday.objects.filter(
-                date__range=(ref_start, ref_end),
-                is_private=True,
-            )
-    else:
-        holiday_qs = PublicHoliday.objects.filter(
-            date__range=(year_start, year_end),
-            is_holiday="Y",
-        )
-        if not holiday_qs.exists():
-            reference_year = 2025
-            ref_start = date_cls(2025, 1, 1)
-            ref_end = date_cls(2025, 12, 31)
-            holiday_qs = PublicHoliday.objects.filter(
-                date__range=(ref_start, ref_end),
-                is_holiday="Y",
-            )
-    
-    # 법정공휴일 날짜 - reference_year의 요일을 기준으로 현재 연도 작업일과 매칭
-    # 요일(월~일)만 비교하여 작업일에 해당하는지 판단
-    all_holiday_dates = set(holiday_qs.values_list("date", flat=True))
-    
-    # 주간 휴일 계산 (주5일이면 토/일, 주6일이면 일요일만)
-    all_days = {
-        year_start + timedelta(days=offset)
-        for offset in range((year_end - year_start).days + 1)
-    }
-    weekend_days = all_days - workdays  # 작업일이 아닌 날 = 주간 휴일
-    
-    # 법정공휴일 중 작업일(요일 기준)에 해당하는 것만 카운트
-    # reference_year 데이터를 사용하는 경우 요일로 판단
-    holidays_on_workdays_count = 0
-    for hdate in all_holiday_dates:
-        weekday = hdate.weekday()
-        # 작업일 요일 범위에 해당하는지 확인
-        if work_week_days >= 7:
-            holidays_on_workdays_count += 1
-        elif work_week_days == 6 and weekday <= 5:
-            holidays_on_workdays_count += 1
-        elif work_week_days == 5 and weekday <= 4:
-            holidays_on_workdays_count += 1
-    
-    # 총 법정공휴일 = 주간 휴일(토/일) + 작업일 중 법정공휴일
-    legal_holidays_count = len(weekend_days) + holidays_on_workdays_count
-
-    # 실제 연도의 법정공휴일 날짜 (기후불능일 중복 제외용)
-    # reference_year(법정공휴일 데이터 연도)가 calculation year(기상 데이터 연도)와 다를 경우
-    # 법정공휴일의 날짜를 calculation year로 투영하여 중복 여부를 판단해야 함
-    holiday_dates_on_workdays = set()
-    
-    if reference_year == year:
-        holiday_dates_on_workdays = all_holiday_dates & workdays
-    else:
-        # 날짜 투영 (월/일 매핑)
-        projected_holidays = set()
-        for h_date in all_holiday_dates:
-            try:
-                # 해당 연도로 날짜 변경
-                new_date = h_date.replace(year=year)
-                projected_holidays.add(new_date)
-            except ValueError:
-                # 2월 29일 처리: 윤년이 아닌해로 투영 시 에러 발생 -> 2월 28일로 매핑하거나 제외
-                # 여기서는 2월 28일로 매핑
-                if h_date.month == 2 and h_date.day == 29:
-                    projected_holidays.add(date_cls(year, 2, 28))
-        
-        holiday_dates_on_workdays = projected_holidays & workdays
-
-    # 중복 제외는 기후불능일에만 적용: 법정공휴일과 겹치는 날을 기후불능일에서 제외
-    climate_dates_excl_holidays = climate_dates - holiday_dates_on_workdays
-
-    # 작업일 = 365 - 기후불능일(중복제외) - 법정공휴일
-    total_days = len(all_days)  # 365
-    working_days = max(total_days - len(climate_dates_excl_holidays) - legal_holidays_count, 0)
-
-    # 가동률 = 작업일 / 365 * 100
-    operating_rate = round((working_days / total_days) * 100, 2) if total_days else 0
-    
-    # 공공 기준일 때 법정공휴일 최소 8일 보장
-    if weight.sector_type == "PUBLIC" and legal_holidays_count < 8:
-        legal_holidays_count = 8
-
-    return {
-        "working_days": working_days,
-        "climate_days_excl_dup": len(climate_dates_excl_holidays),
-        "legal_holidays": legal_holidays_count,
-        "operating_rate": operating_rate,
-    }
-
 def calculate_operating_rates(project_id, weights, settings):
     station_id = resolve_station_id(settings)
     years = parse_years(settings.get("dataYears"))
@@ -344,7 +217,6 @@ def calculate_operating_rates(project_id, weights, settings):
     
     end_year = today.year - 1
     start_year = end_year - years + 1
-    years_range = range(start_year, end_year + 1)
     
     updated_weights = []
 
@@ -356,69 +228,49 @@ def calculate_operating_rates(project_id, weights, settings):
             work_week_days = int(work_week_days)
             work_cond = None
 
+        data_versions = get_data_versions()
+        # 지점 기상자료/공휴일은 캐시 miss가 있을 때 한 번만 조회하고 공종별 계산은 배열 연산으로 처리
+        engine = None
+
         for weight in weights:
             per_weight_work_week_days = weight.work_week_days or 6
             per_weight_winter_criteria = weight.winter_criteria or "AVG"
 
-            stats = []
-            for year in years_range:
-                year_stats = compute_year_stats(weight, year, station_id, per_weight_work_week_days, per_weight_winter_criteria)
-                if year_stats:
-                    stats.append(year_stats)
-
-            if not stats:
-                continue
-
-            avg_working = round(sum(s["working_days"] for s in stats) / len(stats))
-            avg_climate = round(sum(s["climate_days_excl_dup"] for s in stats) / len(stats))
-            avg_operating = round(sum(s["operating_rate"] for s in stats) / len(stats), 2)
-
-            holiday_years = PublicHoliday.objects.values_list('date__year', flat=True).distinct()
-            if holiday_years.exists():
-                holiday_stats = []
-                for h_year in sorted(set(holiday_years))[:years]:
-                    h_year_start = date_cls(h_year, 1, 1)
-                    h_year_end = date_cls(h_year, 12, 31)
-                    
-                    h_all_days = {
-                        h_year_start + timedelta(days=offset)
-                        for offset in range((h_year_end - h_year_start).days + 1)
-                    }
-                    if work_week_days >= 7:
-                        h_workdays = h_all_days
-                    elif work_week_days == 6:
-                        h_workdays = {d for d in h_all_days if d.weekday() <= 5}
-                    else:
-                        h_workdays = {d for d in h_all_days if d.weekday() <= 4}
-                    
-                    h_weekend_days = h_all_days - h_workdays
-                    
-                    if weight.sector_type == "PRIVATE":
-                        h_holiday_qs = PublicHoliday.objects.filter(
-                            date__range=(h_year_start, h_year_end),
-                            is_private=True,
-                        )
-                    else:
-                        h_holiday_qs = PublicHoliday.objects.filter(
-                            date__range=(h_year_start, h_year_end),
-                            is_holiday="Y",
-                        )
-                    
-                    h_all_holidays = set(h_holiday_qs.values_list("date", flat=True))
-                    h_holidays_on_workdays = h_all_holidays & h_workdays
-                    
-                    h_total = len(h_weekend_days) + len(h_holidays_on_workdays)
-                    holiday_stats.append(h_total)
-                
-                if holiday_stats:
-                    avg_holidays = round(sum(holiday_stats) / len(holiday_stats))
-                else:
-                    avg_holidays = 0
+            signature = build_rate_signature(
+                station_id,
+                start_year,
+                end_year,
+                years,
+                work_week_days,
+                weight,
+                per_weight_work_week_days,
+                per_weight_winter_criteria,
+                data_versions,
+            )
+            cached = get_cached_rate(signature)
+            if cached:
+                avg_working = cached["working_days"]
+                avg_climate = cached["climate_days_excl_dup"]
+                avg_holidays = cached["legal_holidays"]
+                avg_operating = cached["operating_rate"]
             else:
-                avg_holidays = 0
-            
-            if weight.sector_type == "PUBLIC" and avg_holidays < 8:
-                avg_holidays = 8
+                if engine is None:
+                    engine = OperatingRateEngine.load(station_id, start_year, end_year)
+
+                stats = engine.year_stats(weight, per_weight_work_week_days, per_weight_winter_criteria)
+                if not stats:
+                    continue
+
+                avg_working = round(sum(s["working_days"] for s in stats) / len(stats))
+                avg_climate = round(sum(s["climate_days_excl_dup"] for s in stats) / len(stats))
+                avg_operating = round(sum(s["operating_rate"] for s in stats) / len(stats), 2)
+                avg_holidays = engine.average_legal_holidays(weight.sector_type, work_week_days, years)
+                store_cached_rate(signature, station_id, {
+                    "working_days": avg_working,
+                    "climate_days_excl_dup": avg_climate,
+                    "legal_holidays": avg_holidays,
+                    "operating_rate": avg_operating,
+                })
 
             weight.working_days = avg_working
             weight.climate_days_excl_dup = avg_climate
@@ -432,7 +284,11 @@ def calculate_operating_rates(project_id, weights, settings):
                 "updated_at",
             ])
             updated_weights.append(weight)
-    
+
+    if updated_weights:
+        # 가동률이 바뀌면 공정표 항목 작업일/공기도 서버에서 바로 맞춤
+        recalculate_project_durations(project_id)
+
     return updated_weights
 
 
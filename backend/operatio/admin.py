@@ -1,5 +1,12 @@
 from django.contrib import admin
-from .models import WeatherStation, WeatherDailyRecord, PublicHoliday
+from .models import (
+    PublicHoliday,
+    WeatherDailyCondition,
+    WeatherDailyRecord,
+    WeatherImportCheckpoint,
+    WeatherPayloadArchive,
+    WeatherStation,
+)
 
 
 @admin.register(WeatherStation)
@@ -196,6 +203,36 @@ class WeatherDailyRecordAdmin(admin.ModelAdmin):
     # 레코드 수가 많을 수 있으므로 페이지당 표시 수 설정
     list_per_page = 50
 
+    def get_queryset(self, request):
+        # 목록 조회 시 원본 payload(JSON)는 읽지 않음
+        return super().get_queryset(request).defer("payload")
+
+
+@admin.register(WeatherDailyCondition)
+class WeatherDailyConditionAdmin(admin.ModelAdmin):
+    list_display = ["date", "station_id", "avgTa", "minTa", "maxTa", "sumRn", "ddMes", "maxInsWs", "flags"]
+    list_filter = ["station_id"]
+    search_fields = ["station_id", "date"]
+    date_hierarchy = "date"
+    ordering = ["-date", "station_id"]
+    list_per_page = 100
+
+
+@admin.register(WeatherPayloadArchive)
+class WeatherPayloadArchiveAdmin(admin.ModelAdmin):
+    list_display = ["station_id", "year", "row_count", "updated_at"]
+    list_filter = ["year"]
+    search_fields = ["station_id"]
+    ordering = ["station_id", "year"]
+    exclude = ["data"]
+
+
+@admin.register(WeatherImportCheckpoint)
+class WeatherImportCheckpointAdmin(admin.ModelAdmin):
+    list_display = ["station_id", "last_date", "updated_at"]
+    search_fields = ["station_id"]
+    ordering = ["station_id"]
+
 
 @admin.register(PublicHoliday)
 class PublicHolidayAdmin(admin.ModelAdmin):
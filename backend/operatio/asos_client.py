@@ -0,0 +1,214 @@
+"""
+ASOS 일자료 API 클라이언트
+
+커넥션 풀을 공유하는 requests.Session 하나로 여러 지점/페이지를 동시에 받는다.
+초당 요청 수 제한(rate limit)과 일시 오류(네트워크/429/5xx) 재시도(지수 backoff)를 담당하며,
+응답 item → WeatherDailyRecord 필드 변환과 bulk upsert 도 이곳에서 한다.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import requests
+from django.db import transaction
+from requests.adapters import HTTPAdapter
+
+from .models import WeatherDailyRecord
+
+
+DEFAULT_API_URL = "http://apis.data.go.kr/1360000/AsosDalyInfoService/getWthrDataList"
+PAGE_SIZE = 999
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 시각(HHMM) 문자열로 저장하는 필드
+TIME_FIELDS = {
+    "ddMefsHrmt",
+    "ddMesHrmt",
+    "hr1MaxIcsrHrmt",
+    "hr1MaxRnHrmt",
+    "maxInsWsHrmt",
+    "maxPsHrmt",
+    "maxTaHrmt",
+    "maxWsHrmt",
+    "mi10MaxRnHrmt",
+    "minPsHrmt",
+    "minRhmHrmt",
+    "minTaHrmt",
+}
+
+
+class AsosApiError(Exception):
+    """API가 정상 코드(00)가 아닌 결과를 돌려준 경우"""
+
+
+def to_float(value):
+    if value is None:
+        return None
+    text = str(value).strip()
+    if text == "":
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def parse_asos_date(value):
+    if len(value) == 8 and value.isdigit():
+        return datetime.strptime(value, "%Y%m%d").date()
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def parse_asos_item(item, station_id, keep_payload=True):
+    """API item → (지점, 일자, WeatherDailyRecord 필드 dict). tm이 없으면 None"""
+    stn_id = item.get("stnId") or station_id
+    tm = item.get("tm")
+    if not tm:
+        return None
+    tm_date = parse_asos_date(tm)
+
+    defaults = {
+        "payload": item if keep_payload else None,
+        "tm": tm_date,
+        "stnId": int(stn_id),
+        "stnNm": item.get("stnNm"),
+    }
+    for key, value in item.items():
+        if key in ("tm", "stnId", "stnNm"):
+            continue
+        if key in TIME_FIELDS:
+            defaults[key] = str(value).strip() if value is not None else None
+        else:
+            defaults[key] = to_float(value)
+    return int(stn_id), tm_date, defaults
+
+
+# bulk upsert 시 갱신하지 않는 필드 (충돌 키 / 최초 생성 시각)
+BULK_SKIP_UPDATE_FIELDS = {"id", "station_id", "date", "created_at"}
+
+
+def upsert_daily_records(parsed_rows, batch_size=PAGE_SIZE, keep_payload=True):
+    """parse_asos_item 결과 목록을 한 트랜잭션에서 bulk upsert. 저장한 행 수 반환
+    keep_payload=False면 이미 저장된 payload는 덮어쓰지 않는다."""
+    records = {}
+    for stn_id, tm_date, defaults in parsed_rows:
+        # 같은 키가 여러 번 오면 마지막 값만 사용 (한 INSERT 안 충돌 방지)
+        records[(stn_id, tm_date)] = WeatherDailyRecord(station_id=stn_id, date=tm_date, **defaults)
+    if not records:
+        return 0
+    update_fields = [
+        field.name
+        for field in WeatherDailyRecord._meta.concrete_fields
+        if field.name not in BULK_SKIP_UPDATE_FIELDS and (keep_payload or field.name != "payload")
+    ]
+    with transaction.atomic():
+        WeatherDailyRecord.objects.bulk_create(
+            list(records.values()),
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["station_id", "date"],
+            update_fields=update_fields,
+        )
+    return len(records)
+
+
+class RateLimiter:
+    """스레드 간 공유하는 최소 요청 간격 제한 (rate=초당 요청 수, 0 이하면 제한 없음)"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait_for = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+
+class AsosClient:
+    def __init__(
+        self,
+        service_key,
+        api_url=DEFAULT_API_URL,
+        rate_limit=10.0,
+        max_retries=3,
+        backoff=1.0,
+        pool_size=8,
+        timeout=30,
+    ):
+        self.service_key = service_key
+        self.api_url = api_url
+        self.max_retries = max(0, max_retries)
+        self.backoff = max(0.0, backoff)
+        self.timeout = timeout
+        self.limiter = RateLimiter(rate_limit)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        self.session.close()
+
+    def _get(self, params):
+        attempt = 0
+        while True:
+            self.limiter.wait()
+            try:
+                response = self.session.get(self.api_url, params=params, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response.json()
+                error = requests.HTTPError(f"HTTP {response.status_code}", response=response)
+            except (requests.ConnectionError, requests.Timeout, ValueError) as exc:
+                error = exc
+            if attempt >= self.max_retries:
+                raise error
+            time.sleep(self.backoff * (2 ** attempt))
+            attempt += 1
+
+    def fetch_page(self, station_id, start, end, page):
+        """(items, totalCount) 반환"""
+        payload = self._get({
+            "serviceKey": self.service_key,
+            "pageNo": page,
+            "numOfRows": PAGE_SIZE,
+            "dataType": "JSON",
+            "dataCd": "ASOS",
+            "dateCd": "DAY",
+            "startDt": start.strftime("%Y%m%d"),
+            "endDt": end.strftime("%Y%m%d"),
+            "stnIds": str(station_id),
+        })
+        header = payload.get("response", {}).get("header", {})
+        result_code = header.get("resultCode")
+        if result_code == "03":
+            # NO_DATA
+            return [], 0
+        if result_code and result_code != "00":
+            raise AsosApiError(f"API error {result_code} {header.get('resultMsg')}")
+        body = payload.get("response", {}).get("body", {})
+        items = (body.get("items") or {}).get("item", []) or []
+        if isinstance(items, dict):
+            items = [items]
+        return items, int(body.get("totalCount") or 0)
+
+    def fetch_station(self, station_id, start, end):
+        """start~end 전체 페이지 (item 목록, 완료 여부).
+        중간 페이지가 비어 totalCount보다 적게 받으면 완료 여부는 False."""
+        items, total_count = self.fetch_page(station_id, start, end, 1)
+        pages = (total_count + PAGE_SIZE - 1) // PAGE_SIZE
+        for page in range(2, pages + 1):
+            page_items, _total = self.fetch_page(station_id, start, end, page)
+            if not page_items:
+                break
+            items.extend(page_items)
+        return items, len(items) >= total_count
@@ -0,0 +1,105 @@
+"""
+지점 × 연도 기준 일수 집계(cube)
+
+WeatherDailyCondition 비트맵을 (지점, 연도, 요일, 공휴일 구분, 비트맵) 단위 일수로 묶어 저장한다.
+주간 작업일/공공·민간 구분/기준 조합이 무엇이든 요일·공휴일 구분으로 작업일을 고르고
+비트 AND 로 기후불능일을 셀 수 있으므로, 전국 지점 가동률을 일자료를 다시 읽지 않고 계산할 수 있다.
+공휴일 구분은 가동률 산정과 같이 공휴일 데이터가 없는 연도는 HOLIDAY_FALLBACK_YEAR를 투영한다.
+"""
+
+import threading
+from collections import Counter
+from datetime import date as date_cls
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .models import WeatherConditionCube, WeatherDailyCondition
+from .workday_calendar import HOLIDAY_FALLBACK_YEAR, SECTOR_PRIVATE, SECTOR_PUBLIC, get_workday_calendar
+
+
+CUBE_FIELDS = ("station_id", "year", "weekday", "holiday_class", "flags", "days")
+
+
+def _holiday_classes(calendar, year):
+    public = calendar.year(year, SECTOR_PUBLIC, 7, HOLIDAY_FALLBACK_YEAR).holiday
+    private = calendar.year(year, SECTOR_PRIVATE, 7, HOLIDAY_FALLBACK_YEAR).holiday
+    return (
+        public.astype(np.int64) * WeatherConditionCube.PUBLIC_HOLIDAY
+        + private.astype(np.int64) * WeatherConditionCube.PRIVATE_HOLIDAY
+    )
+
+
+def rebuild_condition_cube(station_ids=None):
+    """지점(미지정 시 전체)의 집계 행을 비트맵 테이블에서 다시 만든다. 생성 행 수 반환"""
+    if station_ids is None:
+        station_ids = WeatherDailyCondition.objects.order_by().values_list("station_id", flat=True).distinct()
+    calendar = get_workday_calendar()
+    holiday_classes = {}
+    total = 0
+    for station_id in sorted(set(station_ids)):
+        counts = Counter()
+        rows = WeatherDailyCondition.objects.filter(station_id=station_id).values_list("date", "flags")
+        for day, flags in rows.iterator(chunk_size=5000):
+            classes = holiday_classes.get(day.year)
+            if classes is None:
+                classes = holiday_classes[day.year] = _holiday_classes(calendar, day.year)
+            index = (day - date_cls(day.year, 1, 1)).days
+            counts[(day.year, day.weekday(), int(classes[index]), flags)] += 1
+
+        with transaction.atomic():
+            WeatherConditionCube.objects.filter(station_id=station_id).delete()
+            WeatherConditionCube.objects.bulk_create(
+                [
+                    WeatherConditionCube(
+                        station_id=station_id,
+                        year=year,
+                        weekday=weekday,
+                        holiday_class=holiday_class,
+                        flags=flags,
+                        days=days,
+                    )
+                    for (year, weekday, holiday_class, flags), days in counts.items()
+                ],
+                batch_size=2000,
+            )
+        total += len(counts)
+    return total
+
+
+class ConditionCube:
+    """집계 행을 열 단위 NumPy 배열로 보관"""
+
+    def __init__(self, rows, fingerprint=None):
+        self.fingerprint = fingerprint
+        columns = np.array(rows, dtype=np.int64).reshape(-1, len(CUBE_FIELDS))
+        for pos, field in enumerate(CUBE_FIELDS):
+            setattr(self, field, columns[:, pos])
+
+    def __len__(self):
+        return len(self.days)
+
+
+_current = None
+_current_lock = threading.Lock()
+
+
+def _cube_fingerprint():
+    summary = WeatherConditionCube.objects.aggregate(count=Count("id"), last=Max("id"))
+    return (summary["count"], summary["last"])
+
+
+def get_condition_cube():
+    """집계 행이 바뀌지 않았으면(건수/최대 id) 프로세스 내 캐시 재사용"""
+    global _current
+    fingerprint = _cube_fingerprint()
+    cube = _current
+    if cube is None or cube.fingerprint != fingerprint:
+        cube = ConditionCube(
+            list(WeatherConditionCube.objects.order_by().values_list(*CUBE_FIELDS)),
+            fingerprint=fingerprint,
+        )
+        with _current_lock:
+            _current = cube
+    return cube
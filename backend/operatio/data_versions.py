@@ -0,0 +1,33 @@
+"""
+기상/공휴일 데이터 버전
+
+import 명령이 데이터를 바꾸면 bump_data_version()으로 버전을 올리고 weather_data_changed 시그널을 보낸다.
+가동률 결과 캐시 등 파생 데이터는 이 버전을 키에 포함하거나 시그널을 받아 비운다.
+"""
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import WeatherDataVersion
+from .signals import weather_data_changed
+
+
+WEATHER = "weather"
+HOLIDAY = "holiday"
+
+
+def get_data_versions():
+    versions = dict(WeatherDataVersion.objects.values_list("name", "version"))
+    return {
+        WEATHER: versions.get(WEATHER, 0),
+        HOLIDAY: versions.get(HOLIDAY, 0),
+    }
+
+
+def bump_data_version(name):
+    with transaction.atomic():
+        WeatherDataVersion.objects.get_or_create(name=name)
+        WeatherDataVersion.objects.filter(name=name).update(version=F("version") + 1)
+        version = WeatherDataVersion.objects.get(name=name).version
+    weather_data_changed.send(sender=WeatherDataVersion, name=name, version=version)
+    return version
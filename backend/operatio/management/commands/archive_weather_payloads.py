@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from operatio.models import WeatherDailyRecord
+from operatio.payload_archive import archive_station_year
+
+
+class Command(BaseCommand):
+    help = "Move raw ASOS payloads into compressed per-station/year archives and clear them on the daily rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--station-ids", default=None, help="Comma-separated station ids")
+        parser.add_argument("--years", default=None, help="Comma-separated years (default: all)")
+
+    def handle(self, *args, **options):
+        records = WeatherDailyRecord.objects.filter(payload__isnull=False)
+        if options["station_ids"]:
+            station_ids = [int(s.strip()) for s in options["station_ids"].split(",") if s.strip()]
+            records = records.filter(station_id__in=station_ids)
+        if options["years"]:
+            years = [int(s.strip()) for s in options["years"].split(",") if s.strip()]
+            records = records.filter(date__year__in=years)
+
+        targets = sorted(set(records.order_by().values_list("station_id", "date__year")))
+        total = 0
+        for station_id, year in targets:
+            count = archive_station_year(station_id, year)
+            total += count
+            self.stdout.write(f"Station {station_id} {year}: {count} rows")
+
+        self.stdout.write(self.style.SUCCESS(f"Archive finished. rows={total}"))
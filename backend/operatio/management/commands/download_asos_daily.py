@@ -0,0 +1,176 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+
+from django.core.management.base import BaseCommand
+
+from operatio.asos_client import (
+    DEFAULT_API_URL,
+    PAGE_SIZE,
+    AsosClient,
+    parse_asos_item,
+    upsert_daily_records,
+)
+from operatio.data_versions import WEATHER, bump_data_version
+from operatio.models import WeatherImportCheckpoint, WeatherStation
+from operatio.weather_conditions import rebuild_daily_conditions
+
+
+class Command(BaseCommand):
+    help = "Download KMA ASOS daily data concurrently, resuming from per-station checkpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--service-key", default=None, help="Service key for data.go.kr")
+        parser.add_argument("--start", default="20150101", help="Start date (YYYYMMDD)")
+        parser.add_argument("--end", default=None, help="End date (YYYYMMDD). Defaults to yesterday.")
+        parser.add_argument("--station-ids", default=None, help="Comma-separated station ids")
+        parser.add_argument("--workers", type=int, default=4, help="Concurrent station downloads")
+        parser.add_argument("--rate-limit", type=float, default=10.0, help="Max requests per second (0: unlimited)")
+        parser.add_argument("--max-retries", type=int, default=3, help="Retries per request on transient errors")
+        parser.add_argument("--backoff", type=float, default=1.0, help="Initial retry backoff seconds (doubles)")
+        parser.add_argument("--batch-size", type=int, default=PAGE_SIZE, help="bulk_create batch size")
+        parser.add_argument(
+            "--api-url",
+            default=None,
+            help="ASOS daily API url. Defaults to env ASOS_API_URL or data.go.kr",
+        )
+        parser.add_argument(
+            "--skip-payload",
+            action="store_true",
+            help="Do not store the raw API payload on each daily row",
+        )
+        parser.add_argument(
+            "--ignore-checkpoints",
+            action="store_true",
+            help="Fetch the full --start~--end range even if a checkpoint exists",
+        )
+
+    def handle(self, *args, **options):
+        service_key = (
+            options.get("service_key")
+            or os.getenv("WEATHER_API_KEY")
+            or os.getenv("WEATHER_SERVICE_KEY")
+            or os.getenv("DATA_GO_KR_SERVICE_KEY")
+        )
+        if not service_key:
+            self.stderr.write(self.style.ERROR("Missing service key. Use --service-key or env WEATHER_API_KEY."))
+            return
+
+        try:
+            start_date = datetime.strptime(options["start"], "%Y%m%d").date()
+        except ValueError:
+            self.stderr.write(self.style.ERROR(f"Invalid --start {options['start']}"))
+            return
+        max_end_date = date.today() - timedelta(days=1)
+        end_date = max_end_date
+        if options["end"]:
+            try:
+                end_date = min(datetime.strptime(options["end"], "%Y%m%d").date(), max_end_date)
+            except ValueError:
+                pass
+
+        if options["station_ids"]:
+            station_ids = [int(s.strip()) for s in options["station_ids"].split(",") if s.strip()]
+        else:
+            station_ids = list(WeatherStation.objects.values_list("station_id", flat=True))
+        if not station_ids:
+            self.stderr.write(self.style.ERROR("No station ids available. Provide --station-ids or import stations first."))
+            return
+
+        # 체크포인트 이후 구간만 요청
+        checkpoints = {}
+        if not options["ignore_checkpoints"]:
+            checkpoints = dict(
+                WeatherImportCheckpoint.objects.filter(station_id__in=station_ids).values_list("station_id", "last_date")
+            )
+        ranges = {}
+        for station_id in station_ids:
+            first_date = start_date
+            last_imported = checkpoints.get(station_id)
+            if last_imported:
+                first_date = max(first_date, last_imported + timedelta(days=1))
+            if first_date > end_date:
+                self.stdout.write(f"Station {station_id}: up to date ({last_imported})")
+                continue
+            ranges[station_id] = (first_date, end_date)
+
+        client = AsosClient(
+            service_key,
+            api_url=options.get("api_url") or os.getenv("ASOS_API_URL") or DEFAULT_API_URL,
+            rate_limit=options["rate_limit"],
+            max_retries=options["max_retries"],
+            backoff=options["backoff"],
+            pool_size=max(1, options["workers"]),
+        )
+        batch_size = max(1, options["batch_size"] or PAGE_SIZE)
+        total_rows = 0
+        failed = []
+        started_at = time.monotonic()
+
+        # 다운로드만 스레드에서 하고, DB 저장은 메인 스레드에서 지점 단위로 처리
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, options["workers"])) as executor:
+                futures = {
+                    executor.submit(client.fetch_station, station_id, first_date, last_date): station_id
+                    for station_id, (first_date, last_date) in ranges.items()
+                }
+                for future in as_completed(futures):
+                    station_id = futures[future]
+                    try:
+                        items, complete = future.result()
+                    except Exception as exc:
+                        failed.append(station_id)
+                        self.stderr.write(self.style.ERROR(f"Station {station_id}: {exc}"))
+                        continue
+                    total_rows += self._store_station(
+                        station_id,
+                        items,
+                        batch_size,
+                        keep_payload=not options["skip_payload"],
+                        complete=complete,
+                    )
+        finally:
+            client.close()
+
+        if total_rows:
+            bump_data_version(WEATHER)
+
+        elapsed = time.monotonic() - started_at
+        rate = round(total_rows / elapsed, 1) if elapsed > 0 else total_rows
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Download finished. stations={len(ranges) - len(failed)} failed={len(failed)} "
+                f"rows={total_rows} elapsed={elapsed:.1f}s ({rate} rows/s)"
+            )
+        )
+
+    def _store_station(self, station_id, items, batch_size, keep_payload=True, complete=True):
+        parsed_rows = [
+            row for row in (parse_asos_item(item, station_id, keep_payload) for item in items) if row
+        ]
+        stored = upsert_daily_records(parsed_rows, batch_size, keep_payload=keep_payload)
+
+        dates_by_station = {}
+        for stn_id, tm_date, _defaults in parsed_rows:
+            first_last = dates_by_station.setdefault(stn_id, [tm_date, tm_date])
+            first_last[0] = min(first_last[0], tm_date)
+            first_last[1] = max(first_last[1], tm_date)
+        for stn_id, (first_date, last_date) in dates_by_station.items():
+            rebuild_daily_conditions(stn_id, first_date, last_date)
+            if not complete:
+                # 중간 페이지가 빠진 채 끝났으면 다음 실행에서 같은 구간을 다시 받도록 체크포인트 유지
+                continue
+            checkpoint, created = WeatherImportCheckpoint.objects.get_or_create(
+                station_id=stn_id,
+                defaults={"last_date": last_date},
+            )
+            if not created and checkpoint.last_date < last_date:
+                checkpoint.last_date = last_date
+                checkpoint.save(update_fields=["last_date", "updated_at"])
+
+        if complete:
+            self.stdout.write(self.style.SUCCESS(f"Station {station_id}: rows={stored}"))
+        else:
+            self.stdout.write(self.style.WARNING(f"Station {station_id}: rows={stored} (incomplete, checkpoint kept)"))
+        return stored
@@ -1,10 +1,14 @@
 import os
+import time
 from datetime import date, datetime, timedelta
 
 import requests
 from django.core.management.base import BaseCommand
 
+from operatio.asos_client import DEFAULT_API_URL, PAGE_SIZE, parse_asos_item, upsert_daily_records
 from operatio.models import WeatherDailyRecord, WeatherStation
+from operatio.data_versions import WEATHER, bump_data_version
+from operatio.weather_conditions import rebuild_daily_conditions
 
 
 class Command(BaseCommand):
@@ -15,6 +19,17 @@ class Command(BaseCommand):
         parser.add_argument("--start", default="20150101", help="Start date (YYYYMMDD)")
         parser.add_argument("--end", default=None, help="End date (YYYYMMDD). Defaults to today.")
         parser.add_argument("--station-ids", default=None, help="Comma-separated station ids")
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Upsert each page with bulk_create(update_conflicts=True) in one transaction",
+        )
+        parser.add_argument("--batch-size", type=int, default=PAGE_SIZE, help="bulk_create batch size")
+        parser.add_argument(
+            "--api-url",
+            default=None,
+            help="ASOS daily API url. Defaults to env ASOS_API_URL or data.go.kr",
+        )
 
     def handle(self, *args, **options):
         service_key = (
@@ -53,45 +68,26 @@ class Command(BaseCommand):
             self.stderr.write(self.style.ERROR("No station ids available. Provide --station-ids or import stations first."))
             return
 
-        url = "http://apis.data.go.kr/1360000/AsosDalyInfoService/getWthrDataList"
+        url = options.get("api_url") or os.getenv("ASOS_API_URL") or DEFAULT_API_URL
+        bulk = options.get("bulk")
+        batch_size = max(1, options.get("batch_size") or PAGE_SIZE)
         created = 0
         updated = 0
-
-        time_fields = {
-            "ddMefsHrmt",
-            "ddMesHrmt",
-            "hr1MaxIcsrHrmt",
-            "hr1MaxRnHrmt",
-            "maxInsWsHrmt",
-            "maxPsHrmt",
-            "maxTaHrmt",
-            "maxWsHrmt",
-            "mi10MaxRnHrmt",
-            "minPsHrmt",
-            "minRhmHrmt",
-            "minTaHrmt",
-        }
-
-        def to_float(value):
-            if value is None:
-                return None
-            text = str(value).strip()
-            if text == "":
-                return None
-            try:
-                return float(text)
-            except ValueError:
-                return None
+        upserted = 0
+        started_at = time.monotonic()
 
         for station_id in station_ids:
             page = 1
             total_count = None
+            imported_dates = {}
+            station_rows = 0
+            station_started_at = time.monotonic()
 
             while True:
                 params = {
                     "serviceKey": service_key,
                     "pageNo": page,
-                    "numOfRows": 999,
+                    "numOfRows": PAGE_SIZE,
                     "dataType": "JSON",
                     "dataCd": "ASOS",
                     "dateCd": "DAY",
@@ -128,30 +124,21 @@ class Command(BaseCommand):
                         )
                     break
 
+                page_rows = []
                 for item in items:
-                    stn_id = item.get("stnId") or station_id
-                    tm = item.get("tm")
-                    if not tm:
+                    parsed = parse_asos_item(item, station_id)
+                    if parsed is None:
+                        continue
+                    stn_id, tm_date, defaults = parsed
+
+                    first_last = imported_dates.setdefault(int(stn_id), [tm_date, tm_date])
+                    first_last[0] = min(first_last[0], tm_date)
+                    first_last[1] = max(first_last[1], tm_date)
+                    station_rows += 1
+
+                    if bulk:
+                        page_rows.append(parsed)
                         continue
-                    if len(tm) == 8 and tm.isdigit():
-                        tm_date = datetime.strptime(tm, "%Y%m%d").date()
-                    else:
-                        tm_date = datetime.strptime(tm, "%Y-%m-%d").date()
-
-                    defaults = {
-                        "payload": item,
-                        "tm": tm_date,
-                        "stnId": int(stn_id),
-                        "stnNm": item.get("stnNm"),
-                    }
-
-                    for key, value in item.items():
-                        if key in ("tm", "stnId", "stnNm"):
-                            continue
-                        if key in time_fields:
-                            defaults[key] = str(value).strip() if value is not None else None
-                        else:
-                            defaults[key] = to_float(value)
 
                     obj, is_created = WeatherDailyRecord.objects.update_or_create(
                         station_id=int(stn_id),
@@ -163,15 +150,45 @@ class Command(BaseCommand):
                     else:
                         updated += 1
 
+                if page_rows:
+                    upserted += upsert_daily_records(page_rows, batch_size)
+
                 if total_count is not None:
-                    max_pages = (total_count + 998) // 999
+                    max_pages = (total_count + PAGE_SIZE - 1) // PAGE_SIZE
                     if page >= max_pages:
                         break
 
                 page += 1
 
-            self.stdout.write(self.style.SUCCESS(f"Station {station_id}: done"))
+            # 가져온 구간만 기준 비트맵 재계산
+            for stn_id, (first_date, last_date) in imported_dates.items():
+                rebuild_daily_conditions(stn_id, first_date, last_date)
 
+            elapsed = time.monotonic() - station_started_at
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Station {station_id}: done rows={station_rows} ({_rows_per_second(station_rows, elapsed)} rows/s)"
+                )
+            )
+
+        if created or updated or upserted:
+            bump_data_version(WEATHER)
+
+        total_rows = created + updated + upserted
+        elapsed = time.monotonic() - started_at
+        if bulk:
+            summary = f"upserted={upserted}"
+        else:
+            summary = f"created={created} updated={updated}"
         self.stdout.write(
-            self.style.SUCCESS(f"Import finished. created={created} updated={updated}")
+            self.style.SUCCESS(
+                f"Import finished. {summary} elapsed={elapsed:.1f}s "
+                f"({_rows_per_second(total_rows, elapsed)} rows/s)"
+            )
         )
+
+
+def _rows_per_second(rows, elapsed):
+    if elapsed <= 0:
+        return rows
+    return round(rows / elapsed, 1)
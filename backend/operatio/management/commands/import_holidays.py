@@ -2,6 +2,8 @@ import requests
 import holidays
 from datetime import datetime
 from django.core.management.base import BaseCommand
+from operatio.condition_cube import rebuild_condition_cube
+from operatio.data_versions import HOLIDAY, bump_data_version
 from operatio.models import PublicHoliday
 
 
@@ -208,6 +210,11 @@ class Command(BaseCommand):
                 f"{year}년: {year_saved}개 신규 저장, {year_updated}개 업데이트"
             )
 
+        if total_saved or total_updated:
+            bump_data_version(HOLIDAY)
+            # 공휴일 구분이 바뀌므로 지점별 기준 일수 집계 재생성
+            rebuild_condition_cube()
+
         self.stdout.write(
             self.style.SUCCESS(
                 f"\n완료! 총 {total_saved}개 신규 저장, {total_updated}개 업데이트"
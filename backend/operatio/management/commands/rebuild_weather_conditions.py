@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+
+from operatio.condition_cube import rebuild_condition_cube
+from operatio.data_versions import WEATHER, bump_data_version
+from operatio.models import WeatherDailyRecord
+from operatio.weather_conditions import rebuild_daily_conditions
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-station daily threshold bitmaps from stored ASOS records."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--station-ids", default=None, help="Comma-separated station ids")
+        parser.add_argument("--start", default=None, help="Start date (YYYYMMDD)")
+        parser.add_argument("--end", default=None, help="End date (YYYYMMDD)")
+        parser.add_argument(
+            "--cube-only",
+            action="store_true",
+            help="Only rebuild the station x year condition count cube from existing bitmaps",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start_date = datetime.strptime(options["start"], "%Y%m%d").date() if options["start"] else None
+            end_date = datetime.strptime(options["end"], "%Y%m%d").date() if options["end"] else None
+        except ValueError:
+            self.stderr.write(self.style.ERROR("Invalid date. Use YYYYMMDD."))
+            return
+
+        station_ids_arg = options["station_ids"]
+        if station_ids_arg:
+            station_ids = [int(s.strip()) for s in station_ids_arg.split(",") if s.strip()]
+        else:
+            station_ids = sorted(set(WeatherDailyRecord.objects.values_list("station_id", flat=True)))
+
+        if options["cube_only"]:
+            total = rebuild_condition_cube(station_ids)
+            if total:
+                bump_data_version(WEATHER)
+            self.stdout.write(self.style.SUCCESS(f"Cube rebuild finished. rows={total}"))
+            return
+
+        total = 0
+        for station_id in station_ids:
+            count = rebuild_daily_conditions(station_id, start_date, end_date)
+            total += count
+            self.stdout.write(f"Station {station_id}: {count} rows")
+
+        if total:
+            bump_data_version(WEATHER)
+        self.stdout.write(self.style.SUCCESS(f"Rebuild finished. rows={total}"))
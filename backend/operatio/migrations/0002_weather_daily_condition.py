@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operatio', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherDailyCondition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('station_id', models.IntegerField(verbose_name='지점')),
+                ('date', models.DateField(verbose_name='일자')),
+                ('flags', models.IntegerField(default=0, verbose_name='기준 초과 비트')),
+            ],
+            options={
+                'verbose_name': '일자료 기준 비트맵',
+                'verbose_name_plural': '일자료 기준 비트맵 목록',
+                'ordering': ['station_id', 'date'],
+                'constraints': [models.UniqueConstraint(fields=('station_id', 'date'), name='uniq_weather_condition')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operatio', '0002_weather_daily_condition'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherDataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=20, unique=True, verbose_name='데이터 구분')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='버전')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+            ],
+            options={
+                'verbose_name': '데이터 버전',
+                'verbose_name_plural': '데이터 버전 목록',
+                'ordering': ['name'],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operatio', '0003_weather_data_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('station_id', models.IntegerField(unique=True, verbose_name='지점')),
+                ('last_date', models.DateField(verbose_name='마지막 수집일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+            ],
+            options={
+                'verbose_name': '일자료 수집 체크포인트',
+                'verbose_name_plural': '일자료 수집 체크포인트 목록',
+                'ordering': ['station_id'],
+            },
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:38
+
+from django.db import migrations, models
+
+
+FACT_FIELDS = ("avgTa", "minTa", "maxTa", "sumRn", "ddMes", "maxInsWs")
+
+
+def copy_fact_columns(apps, schema_editor):
+    """기존 비트맵 행에 일자료 핵심 컬럼 채우기"""
+    WeatherDailyRecord = apps.get_model("operatio", "WeatherDailyRecord")
+    WeatherDailyCondition = apps.get_model("operatio", "WeatherDailyCondition")
+    station_ids = WeatherDailyCondition.objects.values_list("station_id", flat=True).distinct()
+    for station_id in list(station_ids):
+        values = {
+            row[0]: row[1:]
+            for row in WeatherDailyRecord.objects.filter(station_id=station_id).values_list("date", *FACT_FIELDS)
+        }
+        batch = []
+        for condition in WeatherDailyCondition.objects.filter(station_id=station_id).iterator(chunk_size=2000):
+            row = values.get(condition.date)
+            if row is None:
+                continue
+            for field, value in zip(FACT_FIELDS, row):
+                setattr(condition, field, value)
+            batch.append(condition)
+        WeatherDailyCondition.objects.bulk_update(batch, FACT_FIELDS, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operatio', '0004_weather_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='weatherdailycondition',
+            name='avgTa',
+            field=models.FloatField(blank=True, null=True, verbose_name='avgTa'),
+        ),
+        migrations.AddField(
+            model_name='weatherdailycondition',
+            name='ddMes',
+            field=models.FloatField(blank=True, null=True, verbose_name='ddMes'),
+        ),
+        migrations.AddField(
+            model_name='weatherdailycondition',
+            name='maxInsWs',
+            field=models.FloatField(blank=True, null=True, verbose_name='maxInsWs'),
+        ),
+        migrations.AddField(
+            model_name='weatherdailycondition',
+            name='maxTa',
+            field=models.FloatField(blank=True, null=True, verbose_name='maxTa'),
+        ),
+        migrations.AddField(
+            model_name='weatherdailycondition',
+            name='minTa',
+            field=models.FloatField(blank=True, null=True, verbose_name='minTa'),
+        ),
+        migrations.AddField(
+            model_name='weatherdailycondition',
+            name='sumRn',
+            field=models.FloatField(blank=True, null=True, verbose_name='sumRn'),
+        ),
+        migrations.AlterField(
+            model_name='weatherdailyrecord',
+            name='payload',
+            field=models.JSONField(blank=True, null=True, verbose_name='원본 데이터'),
+        ),
+        migrations.CreateModel(
+            name='WeatherPayloadArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('station_id', models.IntegerField(verbose_name='지점')),
+                ('year', models.IntegerField(verbose_name='연도')),
+                ('row_count', models.IntegerField(default=0, verbose_name='행 수')),
+                ('data', models.BinaryField(verbose_name='압축 데이터')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+            ],
+            options={
+                'verbose_name': '일자료 원본 보관',
+                'verbose_name_plural': '일자료 원본 보관 목록',
+                'ordering': ['station_id', 'year'],
+                'constraints': [models.UniqueConstraint(fields=('station_id', 'year'), name='uniq_weather_payload_archive')],
+            },
+        ),
+        migrations.RunPython(copy_fact_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:40
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+# weather_conditions.CONDITION_BITS 에 추가된 평균기온 -10℃ 이하 비트
+AVG_TA_MINUS_10_BIT = 1 << 17
+
+
+def set_avg_ta_minus_10_bit(apps, schema_editor):
+    WeatherDailyCondition = apps.get_model("operatio", "WeatherDailyCondition")
+    WeatherDailyCondition.objects.filter(avgTa__lte=-10.0).update(flags=F("flags").bitor(AVG_TA_MINUS_10_BIT))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operatio', '0005_slim_weather_facts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherConditionCube',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('station_id', models.IntegerField(verbose_name='지점')),
+                ('year', models.IntegerField(verbose_name='연도')),
+                ('weekday', models.SmallIntegerField(verbose_name='요일')),
+                ('holiday_class', models.SmallIntegerField(default=0, verbose_name='공휴일 구분')),
+                ('flags', models.IntegerField(default=0, verbose_name='기준 초과 비트')),
+                ('days', models.IntegerField(default=0, verbose_name='일수')),
+            ],
+            options={
+                'verbose_name': '기준 일수 집계',
+                'verbose_name_plural': '기준 일수 집계 목록',
+                'ordering': ['station_id', 'year'],
+                'indexes': [models.Index(fields=['year', 'station_id'], name='weather_cube_year_station')],
+            },
+        ),
+        migrations.RunPython(set_avg_ta_minus_10_bit, migrations.RunPython.noop),
+    ]
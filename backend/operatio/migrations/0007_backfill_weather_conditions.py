@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:10
+
+from django.db import migrations
+from django.db.models import F
+
+
+BATCH_SIZE = 2000
+
+# 이 시점의 weather_conditions.CONDITION_BITS / CONDITION_FIELDS 고정 사본 (리스트 순서가 비트 위치)
+CONDITION_FIELDS = ("avgTa", "minTa", "maxTa", "sumRn", "ddMes", "maxInsWs")
+CONDITION_RULES = [
+    ("avgTa", "lte", 0.0),
+    ("avgTa", "lte", -5.0),
+    ("avgTa", "lte", -12.0),
+    ("maxTa", "lte", 0.0),
+    ("minTa", "lte", -10.0),
+    ("minTa", "lte", -12.0),
+    ("maxTa", "gte", 33.0),
+    ("maxTa", "gte", 35.0),
+    ("sumRn", "gte", 5.0),
+    ("sumRn", "gte", 10.0),
+    ("sumRn", "gte", 20.0),
+    ("ddMes", "gte", 5.0),
+    ("ddMes", "gte", 20.0),
+    ("maxInsWs", "gte", 10.0),
+    ("maxInsWs", "gte", 15.0),
+    ("sumRn", "gte", 50.0),
+    ("ddMes", "gte", 1.0),
+    ("avgTa", "lte", -10.0),
+]
+
+
+def condition_flags(values):
+    flags = 0
+    for bit, (field, op, threshold) in enumerate(CONDITION_RULES):
+        value = values.get(field)
+        if value is None:
+            continue
+        if (value <= threshold) if op == "lte" else (value >= threshold):
+            flags |= 1 << bit
+    return flags
+
+
+def backfill_daily_conditions(apps, schema_editor):
+    """비트맵 행이 없는 기존 일자료로 WeatherDailyCondition 채우기"""
+    WeatherDailyRecord = apps.get_model("operatio", "WeatherDailyRecord")
+    WeatherDailyCondition = apps.get_model("operatio", "WeatherDailyCondition")
+    WeatherDataVersion = apps.get_model("operatio", "WeatherDataVersion")
+
+    station_ids = WeatherDailyRecord.objects.order_by().values_list("station_id", flat=True).distinct()
+    changed = False
+    for station_id in sorted(set(station_ids)):
+        existing = WeatherDailyCondition.objects.filter(station_id=station_id).values("date")
+        rows = (
+            WeatherDailyRecord.objects.filter(station_id=station_id)
+            .exclude(date__in=existing)
+            .order_by("date")
+            .values_list("date", *CONDITION_FIELDS)
+        )
+        batch = []
+        for row in rows.iterator(chunk_size=BATCH_SIZE):
+            values = dict(zip(CONDITION_FIELDS, row[1:]))
+            batch.append(WeatherDailyCondition(
+                station_id=station_id,
+                date=row[0],
+                flags=condition_flags(values),
+                **values,
+            ))
+        if batch:
+            WeatherDailyCondition.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+            changed = True
+
+    if not changed:
+        return
+    # 집계 cube(공휴일 달력 필요)는 마이그레이션 후 rebuild_weather_conditions --cube-only 로 다시 만든다.
+    # 이전 비트맵으로 계산된 가동률 결과 캐시 무효화 (data_versions.WEATHER)
+    WeatherDataVersion.objects.get_or_create(name="weather")
+    WeatherDataVersion.objects.filter(name="weather").update(version=F("version") + 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operatio', '0006_weather_condition_cube'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_daily_conditions, migrations.RunPython.noop),
+    ]
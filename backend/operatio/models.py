@@ -144,7 +144,8 @@ class WeatherDailyRecord(models.Model):
     # 합계 일조 시간(hr)
     sumSsHr = models.FloatField(null=True, blank=True, verbose_name="sumSsHr")
     # 원본 응답 JSON
-    payload = models.JSONField(verbose_name="원본 데이터")
+    # 원본 API 응답 (archive_weather_payloads 로 WeatherPayloadArchive에 압축 이관 후 비움)
+    payload = models.JSONField(null=True, blank=True, verbose_name="원본 데이터")
     # 생성 시각
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성일")
     # 수정 시각
@@ -162,6 +163,114 @@ class WeatherDailyRecord(models.Model):
         return f"{self.station_id} {self.date}"
 
 
+class WeatherDailyCondition(models.Model):
+    """일자료 핵심 컬럼 + 기준 초과 비트맵 (operatio.weather_conditions.CONDITION_BITS)
+
+    가동률/보고서 집계는 60여 개 컬럼과 payload를 가진 WeatherDailyRecord 대신 이 좁은 테이블을 읽는다.
+    """
+
+    station_id = models.IntegerField(verbose_name="지점")
+    date = models.DateField(verbose_name="일자")
+    # 기준 코드별 초과 여부 비트
+    flags = models.IntegerField(default=0, verbose_name="기준 초과 비트")
+    avgTa = models.FloatField(null=True, blank=True, verbose_name="avgTa")
+    minTa = models.FloatField(null=True, blank=True, verbose_name="minTa")
+    maxTa = models.FloatField(null=True, blank=True, verbose_name="maxTa")
+    sumRn = models.FloatField(null=True, blank=True, verbose_name="sumRn")
+    ddMes = models.FloatField(null=True, blank=True, verbose_name="ddMes")
+    maxInsWs = models.FloatField(null=True, blank=True, verbose_name="maxInsWs")
+
+    class Meta:
+        verbose_name = "일자료 기준 비트맵"
+        verbose_name_plural = "일자료 기준 비트맵 목록"
+        ordering = ["station_id", "date"]
+        constraints = [
+            models.UniqueConstraint(fields=["station_id", "date"], name="uniq_weather_condition"),
+        ]
+
+    def __str__(self):
+        return f"{self.station_id} {self.date} {self.flags:b}"
+
+
+class WeatherConditionCube(models.Model):
+    """지점 × 연도 × 요일 × 공휴일 구분 × 기준 비트맵별 일수 (전국 가동률 비교용 집계)"""
+
+    # holiday_class 비트: 공공(is_holiday='Y') / 민간(is_private) 공휴일
+    PUBLIC_HOLIDAY = 1
+    PRIVATE_HOLIDAY = 2
+
+    station_id = models.IntegerField(verbose_name="지점")
+    year = models.IntegerField(verbose_name="연도")
+    weekday = models.SmallIntegerField(verbose_name="요일")
+    holiday_class = models.SmallIntegerField(default=0, verbose_name="공휴일 구분")
+    flags = models.IntegerField(default=0, verbose_name="기준 초과 비트")
+    days = models.IntegerField(default=0, verbose_name="일수")
+
+    class Meta:
+        verbose_name = "기준 일수 집계"
+        verbose_name_plural = "기준 일수 집계 목록"
+        ordering = ["station_id", "year"]
+        indexes = [
+            models.Index(fields=["year", "station_id"], name="weather_cube_year_station"),
+        ]
+
+    def __str__(self):
+        return f"{self.station_id} {self.year} {self.weekday} {self.flags:b} ({self.days})"
+
+
+class WeatherPayloadArchive(models.Model):
+    """지점/연도별 원본 payload 묶음 (zlib 압축 JSON: {"YYYY-MM-DD": payload})"""
+
+    station_id = models.IntegerField(verbose_name="지점")
+    year = models.IntegerField(verbose_name="연도")
+    row_count = models.IntegerField(default=0, verbose_name="행 수")
+    data = models.BinaryField(verbose_name="압축 데이터")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일")
+
+    class Meta:
+        verbose_name = "일자료 원본 보관"
+        verbose_name_plural = "일자료 원본 보관 목록"
+        ordering = ["station_id", "year"]
+        constraints = [
+            models.UniqueConstraint(fields=["station_id", "year"], name="uniq_weather_payload_archive"),
+        ]
+
+    def __str__(self):
+        return f"{self.station_id} {self.year} ({self.row_count})"
+
+
+class WeatherImportCheckpoint(models.Model):
+    """지점별 ASOS 일자료 마지막 수집일 (재실행 시 이후 구간만 수집)"""
+
+    station_id = models.IntegerField(unique=True, verbose_name="지점")
+    last_date = models.DateField(verbose_name="마지막 수집일")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일")
+
+    class Meta:
+        verbose_name = "일자료 수집 체크포인트"
+        verbose_name_plural = "일자료 수집 체크포인트 목록"
+        ordering = ["station_id"]
+
+    def __str__(self):
+        return f"{self.station_id} {self.last_date}"
+
+
+class WeatherDataVersion(models.Model):
+    """기상/공휴일 원천 데이터 버전 (import 시 증가, 파생 캐시 무효화 기준)"""
+
+    name = models.CharField(max_length=20, unique=True, verbose_name="데이터 구분")
+    version = models.PositiveBigIntegerField(default=0, verbose_name="버전")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정일")
+
+    class Meta:
+        verbose_name = "데이터 버전"
+        verbose_name_plural = "데이터 버전 목록"
+        ordering = ["name"]
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
 class PublicHoliday(models.Model):
     # 날짜 (YYYYMMDD 형식을 DateField로 저장)
     date = models.DateField(verbose_name="날짜", db_index=True)
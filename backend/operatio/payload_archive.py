@@ -0,0 +1,67 @@
+"""
+일자료 원본 payload 보관
+
+WeatherDailyRecord.payload(JSON)는 집계에 쓰이지 않으면서 행 크기 대부분을 차지하므로,
+지점/연도 단위로 묶어 zlib 압축해 WeatherPayloadArchive에 옮기고 원본 행의 payload는 비운다.
+"""
+
+import json
+import zlib
+from datetime import date as date_cls
+
+from django.db import transaction
+
+from .models import WeatherDailyRecord, WeatherPayloadArchive
+
+
+def _compress(payloads):
+    text = json.dumps(payloads, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return zlib.compress(text.encode("utf-8"), 9)
+
+
+def _decompress(data):
+    return json.loads(zlib.decompress(bytes(data)).decode("utf-8"))
+
+
+def load_archived_payloads(station_id, year):
+    """{"YYYY-MM-DD": payload} (보관본이 없으면 빈 dict)"""
+    archive = WeatherPayloadArchive.objects.filter(station_id=station_id, year=year).first()
+    return _decompress(archive.data) if archive else {}
+
+
+def get_record_payload(station_id, day):
+    """행에 남아 있는 payload 또는 보관본에서 해당 일자 payload"""
+    payload = (
+        WeatherDailyRecord.objects.filter(station_id=station_id, date=day)
+        .values_list("payload", flat=True)
+        .first()
+    )
+    if payload is not None:
+        return payload
+    return load_archived_payloads(station_id, day.year).get(day.isoformat())
+
+
+def archive_station_year(station_id, year):
+    """지점/연도의 payload를 보관본에 합치고 원본 행은 비운다. 옮긴 행 수 반환"""
+    records = WeatherDailyRecord.objects.filter(
+        station_id=station_id,
+        date__range=(date_cls(year, 1, 1), date_cls(year, 12, 31)),
+        payload__isnull=False,
+    )
+    with transaction.atomic():
+        rows = list(records.select_for_update().values_list("id", "date", "payload"))
+        if not rows:
+            return 0
+        archive, _created = WeatherPayloadArchive.objects.select_for_update().get_or_create(
+            station_id=station_id,
+            year=year,
+            defaults={"data": _compress({})},
+        )
+        payloads = _decompress(archive.data)
+        for _id, day, payload in rows:
+            payloads[day.isoformat()] = payload
+        archive.data = _compress(payloads)
+        archive.row_count = len(payloads)
+        archive.save(update_fields=["data", "row_count", "updated_at"])
+        WeatherDailyRecord.objects.filter(id__in=[row[0] for row in rows]).update(payload=None)
+    return len(rows)
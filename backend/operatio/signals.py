@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+
+# 기상/공휴일 데이터가 바뀌었을 때 발송 (kwargs: name, version)
+weather_data_changed = Signal()
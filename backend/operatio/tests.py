@@ -1,8 +1,28 @@
+import json
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from urllib.parse import parse_qs, urlparse
+
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from operatio.models import WeatherStation
+from operatio.data_versions import WEATHER, get_data_versions
+from operatio.models import (
+    PublicHoliday,
+    WeatherDailyCondition,
+    WeatherDailyRecord,
+    WeatherImportCheckpoint,
+    WeatherPayloadArchive,
+    WeatherStation,
+)
+from operatio.payload_archive import get_record_payload
+from operatio.weather_conditions import CONDITION_FIELDS, has_condition, rebuild_daily_conditions, weather_facts
+from operatio.workday_calendar import WorkdayCalendar, get_workday_calendar
 
 
 AUTH_DENIED_STATUS_CODES = {
@@ -38,3 +58,320 @@ class WeatherStationApiSmokeTests(APITestCase):
                 {"station_id": 200, "name": "Station B"},
             ],
         )
+
+
+class WeatherConditionBitmapTests(TestCase):
+    def test_rebuild_sets_threshold_flags_for_date_range(self):
+        WeatherDailyRecord.objects.create(
+            station_id=108, date=date(2024, 1, 10),
+            avgTa=-5.0, minTa=-12.5, maxTa=-1.0, sumRn=None, ddMes=6.0, maxInsWs=12.0, payload={},
+        )
+        WeatherDailyRecord.objects.create(
+            station_id=108, date=date(2024, 7, 10),
+            avgTa=28.0, minTa=24.0, maxTa=35.0, sumRn=20.0, ddMes=None, maxInsWs=15.0, payload={},
+        )
+
+        self.assertEqual(rebuild_daily_conditions(108), 2)
+
+        winter = WeatherDailyCondition.objects.get(station_id=108, date=date(2024, 1, 10)).flags
+        winter_codes = {code for code in "①②③④⑤⑥⑦⑧⑨⑩⑪⑫⑬⑭⑮" if has_condition(winter, code)}
+        self.assertEqual(winter_codes, {"①", "②", "④", "⑤", "⑥", "⑫", "⑭"})
+        self.assertTrue(has_condition(winter, "SNOW_1"))
+
+        summer = WeatherDailyCondition.objects.get(station_id=108, date=date(2024, 7, 10)).flags
+        summer_codes = {code for code in "①②③④⑤⑥⑦⑧⑨⑩⑪⑫⑬⑭⑮" if has_condition(summer, code)}
+        self.assertEqual(summer_codes, {"⑦", "⑧", "⑨", "⑩", "⑪", "⑭", "⑮"})
+        self.assertFalse(has_condition(summer, "RAIN_50"))
+
+        # 기간 재계산은 해당 구간 행만 교체
+        WeatherDailyRecord.objects.filter(date=date(2024, 7, 10)).update(maxTa=30.0)
+        self.assertEqual(rebuild_daily_conditions(108, date(2024, 7, 1), date(2024, 7, 31)), 1)
+        summer = WeatherDailyCondition.objects.get(station_id=108, date=date(2024, 7, 10)).flags
+        self.assertFalse(has_condition(summer, "⑦"))
+        self.assertEqual(WeatherDailyCondition.objects.filter(station_id=108).count(), 2)
+
+    def test_rebuild_command_bumps_weather_version(self):
+        WeatherDailyRecord.objects.create(station_id=108, date=date(2024, 1, 10), avgTa=-5.0, payload={})
+
+        call_command("rebuild_weather_conditions", stdout=StringIO())
+        self.assertEqual(get_data_versions()[WEATHER], 1)
+        call_command("rebuild_weather_conditions", "--station-ids", "999", stdout=StringIO())
+        self.assertEqual(get_data_versions()[WEATHER], 1)
+
+    def test_fact_columns_and_payload_archive(self):
+        WeatherDailyRecord.objects.create(
+            station_id=108, date=date(2024, 1, 10),
+            avgTa=-5.0, minTa=-12.5, maxTa=-1.0, sumRn=None, ddMes=6.0, maxInsWs=12.0,
+            payload={"tm": "2024-01-10", "avgRhm": "55"},
+        )
+        WeatherDailyRecord.objects.create(
+            station_id=108, date=date(2024, 7, 10),
+            avgTa=28.0, minTa=24.0, maxTa=35.0, sumRn=20.0, ddMes=None, maxInsWs=15.0,
+            payload={"tm": "2024-07-10"},
+        )
+        # 비트맵이 없으면 원본 일자료, 만들어지면 좁은 테이블 사용
+        self.assertIs(weather_facts(108).model, WeatherDailyRecord)
+        rebuild_daily_conditions(108)
+        self.assertIs(weather_facts(108).model, WeatherDailyCondition)
+        self.assertEqual(
+            list(weather_facts(108, date(2024, 1, 1), date(2024, 1, 31)).values_list(*(("date",) + CONDITION_FIELDS))),
+            [(date(2024, 1, 10), -5.0, -12.5, -1.0, None, 6.0, 12.0)],
+        )
+        # 비트맵이 일부 날짜에만 있으면 원본으로 되돌아가 빠지는 날이 없다
+        WeatherDailyRecord.objects.create(station_id=108, date=date(2024, 8, 1), avgTa=27.0)
+        self.assertIs(weather_facts(108).model, WeatherDailyRecord)
+        self.assertEqual(weather_facts(108).count(), 3)
+        self.assertIs(weather_facts(108, date(2024, 1, 1), date(2024, 7, 31)).model, WeatherDailyCondition)
+
+        out = StringIO()
+        call_command("archive_weather_payloads", stdout=out)
+
+        self.assertIn("rows=2", out.getvalue())
+        self.assertFalse(WeatherDailyRecord.objects.filter(payload__isnull=False).exists())
+        self.assertEqual(WeatherPayloadArchive.objects.get(station_id=108, year=2024).row_count, 2)
+        self.assertEqual(get_record_payload(108, date(2024, 1, 10)), {"tm": "2024-01-10", "avgRhm": "55"})
+
+
+class WorkdayCalendarTests(TestCase):
+    def setUp(self):
+        # 2025-01-01(수), 2025-03-01(토), 2025-12-25(목)
+        self.calendar = WorkdayCalendar.from_dates(["2025-01-01", "2025-03-01", "2025-12-25"])
+
+    def test_workdays_between_and_nth_workday_after(self):
+        # 2025-01-01 ~ 01-07: 수(공휴일) 목 금 토 일 월 화 → 주6일 5일, 주5일 4일
+        self.assertEqual(self.calendar.workdays_between(date(2025, 1, 1), date(2025, 1, 7), work_week_days=6), 5)
+        self.assertEqual(self.calendar.workdays_between(date(2025, 1, 1), date(2025, 1, 7), work_week_days=5), 4)
+        self.assertEqual(self.calendar.workdays_between(date(2025, 1, 7), date(2025, 1, 1)), 0)
+        # 연도 경계: 2025-12-24(수) ~ 2026-01-02(금), 12/25 공휴일, 12/28 일요일 제외
+        self.assertEqual(self.calendar.workdays_between(date(2025, 12, 24), date(2026, 1, 2), work_week_days=6), 8)
+
+        self.assertEqual(self.calendar.nth_workday_after(date(2024, 12, 31), 1, work_week_days=6), date(2025, 1, 2))
+        self.assertEqual(self.calendar.nth_workday_after(date(2025, 1, 2), 2, work_week_days=5), date(2025, 1, 6))
+        self.assertEqual(self.calendar.nth_workday_after(date(2025, 12, 24), 6, work_week_days=6), date(2026, 1, 1))
+
+    def test_holidays_on_workdays_and_fallback_projection(self):
+        self.assertEqual(
+            self.calendar.holidays_on_workdays(2025, work_week_days=5),
+            [date(2025, 1, 1), date(2025, 12, 25)],
+        )
+        self.assertEqual(self.calendar.legal_holidays(2025, work_week_days=6), 52 + 3)
+
+        # 2026년 데이터 없음 → 2025년 공휴일 투영 (03-01은 2026년 일요일)
+        self.assertEqual(
+            self.calendar.holidays_on_workdays(2026, work_week_days=6, fallback_year=2025),
+            [date(2026, 1, 1), date(2026, 12, 25)],
+        )
+        # 법정공휴일 수는 대체연도(2025) 요일 기준
+        self.assertEqual(self.calendar.legal_holidays(2026, work_week_days=6, fallback_year=2025), 52 + 3)
+        self.assertEqual(self.calendar.legal_holidays(2026, work_week_days=6), 52)
+
+    def test_current_calendar_reloads_when_holidays_change(self):
+        self.assertEqual(get_workday_calendar().years, [])
+        PublicHoliday.objects.create(date=date(2025, 5, 5), name="어린이날", seq=1, locdate=20250505)
+        calendar = get_workday_calendar()
+        self.assertEqual(calendar.years, [2025])
+        self.assertIs(get_workday_calendar(), calendar)
+
+
+def _fake_asos_items(station_id, start, days):
+    return [
+        {
+            "stnId": str(station_id),
+            "stnNm": "서울",
+            "tm": (start + timedelta(days=offset)).isoformat(),
+            "avgTa": str(offset % 30 - 10),
+            "sumRn": "" if offset % 4 else "12.5",
+            "maxInsWs": "7.1",
+            "maxTaHrmt": "1530",
+        }
+        for offset in range(days)
+    ]
+
+
+class _FakeAsosHandler(BaseHTTPRequestHandler):
+    """data.go.kr ASOS 일자료 API 대체 서버 (지점/기간 필터 + 페이지 처리)"""
+
+    items = []
+    requests_seen = []
+    fail_first = set()
+    empty_after_first_page = set()
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        page = int(params["pageNo"][0])
+        size = int(params["numOfRows"][0])
+        station_id = params["stnIds"][0]
+        start = params["startDt"][0]
+        end = params["endDt"][0]
+        self.requests_seen.append((station_id, start, page))
+        if station_id in self.fail_first:
+            self.fail_first.discard(station_id)
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        matched = [
+            item
+            for item in self.items
+            if item["stnId"] == station_id and start <= item["tm"].replace("-", "") <= end
+        ]
+        page_items = matched[(page - 1) * size:page * size]
+        if page > 1 and station_id in self.empty_after_first_page:
+            page_items = []
+        body = {
+            "response": {
+                "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+                "body": {
+                    "totalCount": len(matched),
+                    "items": {"item": page_items},
+                },
+            }
+        }
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class ImportAsosDailyBulkTests(TestCase):
+    def setUp(self):
+        _FakeAsosHandler.items = _fake_asos_items(108, date(2023, 1, 1), 1200)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeAsosHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.api_url = f"http://127.0.0.1:{self.server.server_address[1]}/asos"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _import(self, *extra):
+        out = StringIO()
+        call_command(
+            "import_asos_daily",
+            "--service-key", "test",
+            "--start", "20230101",
+            "--end", "20261231",
+            "--station-ids", "108",
+            "--api-url", self.api_url,
+            *extra,
+            stdout=out,
+            stderr=StringIO(),
+        )
+        return out.getvalue()
+
+    def test_bulk_import_upserts_pages_and_matches_row_path(self):
+        output = self._import("--bulk", "--batch-size", "250")
+
+        self.assertIn("upserted=1200", output)
+        self.assertIn("rows/s", output)
+        self.assertEqual(WeatherDailyRecord.objects.filter(station_id=108).count(), 1200)
+        self.assertEqual(WeatherDailyCondition.objects.filter(station_id=108).count(), 1200)
+        bulk_rows = list(
+            WeatherDailyRecord.objects.order_by("date").values("date", "avgTa", "sumRn", "maxTaHrmt", "stnNm")
+        )
+
+        # 값이 바뀐 재수집은 중복 없이 갱신
+        _FakeAsosHandler.items[0]["avgTa"] = "99"
+        self._import("--bulk")
+        self.assertEqual(WeatherDailyRecord.objects.count(), 1200)
+        self.assertEqual(WeatherDailyRecord.objects.get(date=date(2023, 1, 1)).avgTa, 99.0)
+
+        _FakeAsosHandler.items[0]["avgTa"] = "-10"
+        WeatherDailyRecord.objects.all().delete()
+        self.assertIn("created=1200 updated=0", self._import())
+        self.assertEqual(
+            list(
+                WeatherDailyRecord.objects.order_by("date").values("date", "avgTa", "sumRn", "maxTaHrmt", "stnNm")
+            ),
+            bulk_rows,
+        )
+
+
+class DownloadAsosDailyTests(TestCase):
+    def setUp(self):
+        _FakeAsosHandler.items = (
+            _fake_asos_items(108, date(2024, 1, 1), 1100) + _fake_asos_items(112, date(2024, 1, 1), 1100)
+        )
+        _FakeAsosHandler.requests_seen = []
+        _FakeAsosHandler.fail_first = {"112"}
+        _FakeAsosHandler.empty_after_first_page = set()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeAsosHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.api_url = f"http://127.0.0.1:{self.server.server_address[1]}/asos"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _download(self, end, *extra):
+        out = StringIO()
+        call_command(
+            "download_asos_daily",
+            "--service-key", "test",
+            "--start", "20240101",
+            "--end", end,
+            "--station-ids", "108,112",
+            "--workers", "2",
+            "--rate-limit", "0",
+            "--backoff", "0",
+            "--api-url", self.api_url,
+            *extra,
+            stdout=out,
+            stderr=StringIO(),
+        )
+        return out.getvalue()
+
+    def test_concurrent_download_retries_and_resumes_from_checkpoint(self):
+        output = self._download("20241231")
+
+        self.assertIn("failed=0 rows=732", output)
+        self.assertEqual(WeatherDailyRecord.objects.filter(station_id=112).count(), 366)
+        self.assertEqual(
+            dict(WeatherImportCheckpoint.objects.values_list("station_id", "last_date")),
+            {108: date(2024, 12, 31), 112: date(2024, 12, 31)},
+        )
+        # 112는 첫 요청 503 → 재시도
+        self.assertEqual([seen for seen in _FakeAsosHandler.requests_seen if seen[0] == "112"][:2], [
+            ("112", "20240101", 1),
+            ("112", "20240101", 1),
+        ])
+
+        _FakeAsosHandler.requests_seen = []
+        output = self._download("20250331")
+
+        self.assertIn("rows=180", output)
+        self.assertEqual(
+            sorted(_FakeAsosHandler.requests_seen),
+            [("108", "20250101", 1), ("112", "20250101", 1)],
+        )
+        self.assertEqual(WeatherDailyRecord.objects.count(), 2 * (366 + 90))
+        self.assertEqual(WeatherDailyCondition.objects.filter(station_id=108).count(), 366 + 90)
+
+    def test_truncated_download_keeps_checkpoint_and_skip_payload_keeps_stored_payload(self):
+        _FakeAsosHandler.fail_first = set()
+        _FakeAsosHandler.empty_after_first_page = {"112"}
+
+        # 1004일 = 2페이지, 112는 두 번째 페이지가 비어 중간에 끊김
+        output = self._download("20260930")
+
+        self.assertIn("Station 112: rows=999 (incomplete", output)
+        self.assertEqual(
+            dict(WeatherImportCheckpoint.objects.values_list("station_id", "last_date")),
+            {108: date(2026, 9, 30)},
+        )
+
+        # 재실행은 112의 전체 구간을 다시 받고, --skip-payload는 저장된 payload를 지우지 않는다
+        _FakeAsosHandler.empty_after_first_page = set()
+        _FakeAsosHandler.requests_seen = []
+        self._download("20260930", "--skip-payload")
+
+        self.assertEqual(_FakeAsosHandler.requests_seen, [("112", "20240101", 1), ("112", "20240101", 2)])
+        self.assertEqual(WeatherDailyRecord.objects.filter(station_id=112).count(), 1004)
+        self.assertEqual(WeatherImportCheckpoint.objects.get(station_id=112).last_date, date(2026, 9, 30))
+        self.assertIsNotNone(WeatherDailyRecord.objects.get(station_id=112, date=date(2024, 1, 1)).payload)
+        self.assertIsNone(WeatherDailyRecord.objects.get(station_id=112, date=date(2026, 9, 30)).payload)
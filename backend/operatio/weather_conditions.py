@@ -0,0 +1,117 @@
+"""
+일자료 기준 초과 여부 비트맵 + 핵심 컬럼
+
+표준 기준 코드 ①~⑮(보고서 MONTHLY_CONDITION_DEFS)와 기본 공종 프리셋에서 쓰는 보조 기준을
+(station_id, date)별 정수 비트로 미리 계산하고, 집계에 쓰는 6개 컬럼과 함께 WeatherDailyCondition에 저장한다.
+가동률/보고서 집계는 넓은 WeatherDailyRecord 행 대신 이 비트/컬럼을 읽는다.
+"""
+
+from django.db import transaction
+
+from .condition_cube import rebuild_condition_cube
+from .models import WeatherDailyCondition, WeatherDailyRecord
+
+
+# (코드, 필드, 비교, 기준값) - 리스트 순서가 비트 위치
+CONDITION_BITS = [
+    ("①", "avgTa", "lte", 0.0),
+    ("②", "avgTa", "lte", -5.0),
+    ("③", "avgTa", "lte", -12.0),
+    ("④", "maxTa", "lte", 0.0),
+    ("⑤", "minTa", "lte", -10.0),
+    ("⑥", "minTa", "lte", -12.0),
+    ("⑦", "maxTa", "gte", 33.0),
+    ("⑧", "maxTa", "gte", 35.0),
+    ("⑨", "sumRn", "gte", 5.0),
+    ("⑩", "sumRn", "gte", 10.0),
+    ("⑪", "sumRn", "gte", 20.0),
+    ("⑫", "ddMes", "gte", 5.0),
+    ("⑬", "ddMes", "gte", 20.0),
+    ("⑭", "maxInsWs", "gte", 10.0),
+    ("⑮", "maxInsWs", "gte", 15.0),
+    # 보조 기준 (기본 공종 프리셋)
+    ("RAIN_50", "sumRn", "gte", 50.0),
+    ("SNOW_1", "ddMes", "gte", 1.0),
+    ("AVG_TA_-10", "avgTa", "lte", -10.0),
+]
+
+CONDITION_FIELDS = ("avgTa", "minTa", "maxTa", "sumRn", "ddMes", "maxInsWs")
+
+CONDITION_BIT_BY_CODE = {code: bit for bit, (code, _f, _o, _t) in enumerate(CONDITION_BITS)}
+_CONDITION_BIT_BY_RULE = {
+    (field, op, threshold): bit for bit, (_c, field, op, threshold) in enumerate(CONDITION_BITS)
+}
+
+REBUILD_BATCH_SIZE = 2000
+
+
+def find_condition_bit(field, op, threshold):
+    """기준(필드, 비교, 기준값)이 비트맵에 있으면 비트 위치, 없으면 None"""
+    try:
+        return _CONDITION_BIT_BY_RULE.get((field, op, float(threshold)))
+    except (TypeError, ValueError):
+        return None
+
+
+def condition_flags(values):
+    """필드값 dict → 비트맵 정수"""
+    flags = 0
+    for bit, (_code, field, op, threshold) in enumerate(CONDITION_BITS):
+        value = values.get(field)
+        if value is None:
+            continue
+        if (value <= threshold) if op == "lte" else (value >= threshold):
+            flags |= 1 << bit
+    return flags
+
+
+def has_condition(flags, code):
+    bit = CONDITION_BIT_BY_CODE.get(code)
+    return bit is not None and bool(flags >> bit & 1)
+
+
+def weather_facts(station_id, start_date=None, end_date=None):
+    """집계용 일자료 queryset (date + CONDITION_FIELDS).
+    좁은 WeatherDailyCondition이 기간의 원본 일자를 모두 덮으면 그쪽을, 빠진 날이 있으면 원본 WeatherDailyRecord를 쓴다."""
+    records = _filter_range(WeatherDailyRecord.objects.filter(station_id=station_id), start_date, end_date)
+    facts = _filter_range(WeatherDailyCondition.objects.filter(station_id=station_id), start_date, end_date)
+    if facts.exists() and not records.exclude(date__in=facts.values("date")).exists():
+        return facts
+    return records
+
+
+def _filter_range(queryset, start_date=None, end_date=None):
+    if start_date:
+        queryset = queryset.filter(date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(date__lte=end_date)
+    return queryset
+
+
+def rebuild_daily_conditions(station_id, start_date=None, end_date=None):
+    """지점의 일자료(기간 지정 가능)로 비트맵 행을 다시 만든다. 생성 행 수를 반환."""
+    records = _filter_range(WeatherDailyRecord.objects.filter(station_id=station_id), start_date, end_date)
+    conditions = _filter_range(WeatherDailyCondition.objects.filter(station_id=station_id), start_date, end_date)
+
+    rows = records.values_list("date", *CONDITION_FIELDS).order_by("date")
+    total = 0
+    with transaction.atomic():
+        conditions.delete()
+        batch = []
+        for row in rows.iterator(chunk_size=REBUILD_BATCH_SIZE):
+            values = dict(zip(CONDITION_FIELDS, row[1:]))
+            batch.append(WeatherDailyCondition(
+                station_id=station_id,
+                date=row[0],
+                flags=condition_flags(values),
+                **values,
+            ))
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                WeatherDailyCondition.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            WeatherDailyCondition.objects.bulk_create(batch)
+            total += len(batch)
+    rebuild_condition_cube([station_id])
+    return total
@@ -0,0 +1,233 @@
+"""
+작업일 달력
+
+(연도, 공공/민간, 주간 작업일)별로 366칸 작업일 비트맵과 누적합을 미리 만들어 두고
+"A~B 사이 작업일 수", "기준일로부터 N번째 작업일", "작업 요일에 걸친 공휴일 수"를
+O(1)/O(log n)으로 답한다. 공휴일 데이터는 한 번만 조회하며, 데이터가 바뀌면(건수/수정시각) 다시 읽는다.
+"""
+
+import threading
+from datetime import date as date_cls
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import Count, Max
+
+from .models import PublicHoliday
+
+
+# 해당 연도 공휴일 데이터가 없을 때 대체로 사용하는 연도
+HOLIDAY_FALLBACK_YEAR = 2025
+
+SECTOR_PUBLIC = "PUBLIC"
+SECTOR_PRIVATE = "PRIVATE"
+
+
+def work_weekday_count(work_week_days):
+    """주간 작업일 설정 → 작업 가능한 요일 수 (월=0 부터 연속, 7: 전체 / 6: 일요일 제외 / 그 외: 토·일 제외)"""
+    try:
+        work_week_days = int(work_week_days)
+    except (TypeError, ValueError):
+        work_week_days = 6
+    if work_week_days >= 7:
+        return 7
+    if work_week_days == 6:
+        return 6
+    return 5
+
+
+def is_work_weekday(day, work_week_days):
+    return day.weekday() < work_weekday_count(work_week_days)
+
+
+def sector_key(sector_type):
+    """PRIVATE 외에는 모두 공공(is_holiday='Y') 공휴일 기준"""
+    return SECTOR_PRIVATE if sector_type == SECTOR_PRIVATE else SECTOR_PUBLIC
+
+
+def project_holiday_dates(source_dates, target_year):
+    """다른 연도 공휴일을 월/일 기준으로 target_year에 투영 (2월 29일 → 평년 2월 28일)"""
+    projected = set()
+    for date_value in source_dates:
+        try:
+            projected.add(date_value.replace(year=target_year))
+        except ValueError:
+            if date_value.month == 2 and date_value.day == 29:
+                projected.add(date_cls(target_year, 2, 28))
+    return projected
+
+
+class YearCalendar:
+    """한 해의 작업일 비트맵 (인덱스 = 1월 1일부터의 일수)"""
+
+    def __init__(self, year, work_week_days, holiday_dates, reference_year):
+        self.year = year
+        self.reference_year = reference_year
+        self.start = date_cls(year, 1, 1)
+        self.length = (date_cls(year, 12, 31) - self.start).days + 1
+        self.weekdays = (self.start.weekday() + np.arange(self.length)) % 7
+        self.work_weekday = self.weekdays < work_weekday_count(work_week_days)
+
+        self.holiday = np.zeros(self.length, dtype=bool)
+        for value in holiday_dates:
+            self.holiday[(value - self.start).days] = True
+        self.holiday_on_workdays = self.holiday & self.work_weekday
+        self.workday = self.work_weekday & ~self.holiday
+        # cumsum[i] = 1월 1일 ~ i-1번째 날까지의 작업일 수
+        self.cumsum = np.concatenate(([0], np.cumsum(self.workday, dtype=np.int64)))
+        self.month_offsets = np.array(
+            [(date_cls(year, month, 1) - self.start).days for month in range(1, 13)]
+        )
+
+        self.weekend_days = int(self.length - np.count_nonzero(self.work_weekday))
+        self.holiday_workday_count = int(np.count_nonzero(self.holiday_on_workdays))
+        self.workday_count = int(self.cumsum[-1])
+
+    def index_of(self, day):
+        return (day - self.start).days
+
+    def workdays_until(self, day):
+        """1월 1일 ~ day(포함)까지 작업일 수"""
+        return int(self.cumsum[self.index_of(day) + 1])
+
+    def monthly_counts(self, mask):
+        return [int(value) for value in np.add.reduceat(mask.astype(np.int64), self.month_offsets)]
+
+
+class WorkdayCalendar:
+    """공휴일 데이터 스냅샷 + (연도, 공공/민간, 주간 작업일, 대체연도)별 YearCalendar 캐시"""
+
+    def __init__(self, holiday_rows, fingerprint=None):
+        self.fingerprint = fingerprint
+        self._dates = {SECTOR_PUBLIC: {}, SECTOR_PRIVATE: {}}
+        years = set()
+        for holiday_date, is_holiday, is_private in holiday_rows:
+            years.add(holiday_date.year)
+            if is_holiday == "Y":
+                self._dates[SECTOR_PUBLIC].setdefault(holiday_date.year, set()).add(holiday_date)
+            if is_private:
+                self._dates[SECTOR_PRIVATE].setdefault(holiday_date.year, set()).add(holiday_date)
+        self.years = sorted(years)
+        self._year_cache = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_dates(cls, holiday_dates):
+        """DB 없이 날짜 목록(date 또는 ISO 문자열)만으로 공공/민간 공통 달력 구성"""
+        rows = []
+        for value in holiday_dates or ():
+            if isinstance(value, str):
+                value = date_cls.fromisoformat(value)
+            rows.append((value, "Y", True))
+        return cls(rows)
+
+    def holiday_dates(self, year, sector_type=SECTOR_PUBLIC):
+        return self._dates[sector_key(sector_type)].get(year, set())
+
+    def sector_years(self, sector_type=SECTOR_PUBLIC):
+        return sorted(self._dates[sector_key(sector_type)])
+
+    def year(self, year, sector_type=SECTOR_PUBLIC, work_week_days=6, fallback_year=None):
+        """연도 달력. fallback_year가 있으면 해당 연도 공휴일이 없을 때 fallback_year 공휴일을 투영"""
+        key = (year, sector_key(sector_type), work_weekday_count(work_week_days), fallback_year)
+        calendar = self._year_cache.get(key)
+        if calendar is None:
+            dates = self.holiday_dates(year, sector_type)
+            reference_year = year
+            if not dates and fallback_year is not None:
+                reference_year = fallback_year
+                dates = self.holiday_dates(fallback_year, sector_type)
+                if fallback_year != year:
+                    dates = project_holiday_dates(dates, year)
+            calendar = YearCalendar(year, work_week_days, dates, reference_year)
+            with self._lock:
+                self._year_cache[key] = calendar
+        return calendar
+
+    def legal_holidays(self, year, sector_type=SECTOR_PUBLIC, work_week_days=6, fallback_year=None):
+        """주간 휴일 + 작업 요일에 걸친 공휴일 수.
+        대체연도를 쓰는 경우 공휴일 수는 대체연도 요일 기준으로 센다."""
+        calendar = self.year(year, sector_type, work_week_days, fallback_year)
+        reference = calendar
+        if calendar.reference_year != year:
+            reference = self.year(calendar.reference_year, sector_type, work_week_days)
+        return calendar.weekend_days + reference.holiday_workday_count
+
+    def workdays_between(self, start, end, sector_type=SECTOR_PUBLIC, work_week_days=6, fallback_year=None):
+        """start ~ end(포함) 작업일 수"""
+        if end < start:
+            return 0
+        total = 0
+        for year in range(start.year, end.year + 1):
+            calendar = self.year(year, sector_type, work_week_days, fallback_year)
+            first = start if year == start.year else calendar.start
+            last = end if year == end.year else date_cls(year, 12, 31)
+            total += int(calendar.cumsum[calendar.index_of(last) + 1] - calendar.cumsum[calendar.index_of(first)])
+        return total
+
+    def nth_workday_after(self, start, n, sector_type=SECTOR_PUBLIC, work_week_days=6, fallback_year=None, max_years=50):
+        """start 다음날부터 세어 n번째 작업일 (n<=0이면 start)"""
+        if n <= 0:
+            return start
+        remaining = n
+        day = start + timedelta(days=1)
+        for _ in range(max_years + 1):
+            calendar = self.year(day.year, sector_type, work_week_days, fallback_year)
+            offset = calendar.index_of(day)
+            available = calendar.workday_count - int(calendar.cumsum[offset])
+            if remaining <= available:
+                target = int(calendar.cumsum[offset]) + remaining
+                index = int(np.searchsorted(calendar.cumsum, target)) - 1
+                return calendar.start + timedelta(days=index)
+            remaining -= available
+            day = date_cls(day.year + 1, 1, 1)
+        raise ValueError("no workday found within range")
+
+    def holidays_on_workdays(self, year, sector_type=SECTOR_PUBLIC, work_week_days=6, fallback_year=None):
+        calendar = self.year(year, sector_type, work_week_days, fallback_year)
+        return [calendar.start + timedelta(days=int(i)) for i in np.flatnonzero(calendar.holiday_on_workdays)]
+
+    def holiday_dates_between(self, start, end, sector_type=SECTOR_PUBLIC):
+        return {
+            value
+            for year in range(start.year, end.year + 1)
+            for value in self.holiday_dates(year, sector_type)
+            if start <= value <= end
+        }
+
+    def workday_flags(self, start, days, sector_type=SECTOR_PUBLIC, work_week_days=6, fallback_year=None):
+        """start부터 days일 동안의 작업일 여부 배열"""
+        if days <= 0:
+            return np.zeros(0, dtype=bool)
+        end = start + timedelta(days=days - 1)
+        parts = []
+        for year in range(start.year, end.year + 1):
+            calendar = self.year(year, sector_type, work_week_days, fallback_year)
+            first = calendar.index_of(start) if year == start.year else 0
+            last = calendar.index_of(end) if year == end.year else calendar.length - 1
+            parts.append(calendar.workday[first:last + 1])
+        return np.concatenate(parts)
+
+
+_current = None
+_current_lock = threading.Lock()
+
+
+def _holiday_fingerprint():
+    summary = PublicHoliday.objects.aggregate(count=Count("id"), updated=Max("updated_at"))
+    return (summary["count"], summary["updated"])
+
+
+def get_workday_calendar():
+    """공휴일 데이터가 바뀌지 않았으면 프로세스 내 캐시된 달력을 재사용"""
+    global _current
+    fingerprint = _holiday_fingerprint()
+    calendar = _current
+    if calendar is None or calendar.fingerprint != fingerprint:
+        calendar = WorkdayCalendar(
+            PublicHoliday.objects.values_list("date", "is_holiday", "is_private"),
+            fingerprint=fingerprint,
+        )
+        with _current_lock:
+            _current = calendar
+    return calendar
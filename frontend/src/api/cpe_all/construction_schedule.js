@@ -14,6 +14,7 @@ export const fetchScheduleItems = async (projectId) => {
             if (Array.isArray(rawData)) {
                 return {
                     containerId: container.id,
+                    revision: container.revision,
                     items: rawData,
                     links: [],
                     sub_tasks: [],
@@ -24,6 +25,7 @@ export const fetchScheduleItems = async (projectId) => {
             }
             return {
                 containerId: container.id,
+                revision: container.revision,
                 items: rawData.items || [],
                 links: rawData.links || [],
                 sub_tasks: rawData.sub_tasks || rawData.subTasks || [],
@@ -49,8 +51,12 @@ export const initializeDefaultItems = async (projectId) => {
     }
 };
 
+// Strong ETag of a container revision (matches the server's ETag header)
+const scheduleEtag = (containerId, revision) => `"${containerId}-${revision}"`;
+
 // Update the ENTIRE schedule data (JSON array)
-export const saveScheduleData = async (containerId, payload) => {
+// Pass the revision from the last fetch/save to reject the save (412) if someone else saved in between
+export const saveScheduleData = async (containerId, payload, revision = null) => {
     try {
         const dataPayload = Array.isArray(payload)
             ? payload
@@ -63,15 +69,72 @@ export const saveScheduleData = async (containerId, payload) => {
                 milestones: payload.milestones || []
             };
         // We patch the container with the new data array
-        await api.patch(`${API_URL}${containerId}/`, {
+        const headers = revision != null ? { "If-Match": scheduleEtag(containerId, revision) } : {};
+        const response = await api.patch(`${API_URL}${containerId}/`, {
             data: dataPayload
-        });
+        }, { headers });
+        return response.data?.revision;
     } catch (error) {
         console.error("Error saving schedule data:", error);
         throw error;
     }
 };
 
+// Apply item-level operations (add/replace/update/remove/move/set) instead of uploading the whole document
+export const applyScheduleOperations = async (containerId, operations) => {
+    try {
+        const response = await api.patch(`${API_URL}${containerId}/operations/`, { operations });
+        return response.data;
+    } catch (error) {
+        console.error("Error applying schedule operations:", error);
+        throw error;
+    }
+};
+
+// CPM timing (ES/EF/LS/LF, floats, critical path) computed from items + links
+export const fetchScheduleCpm = async (projectId) => {
+    const response = await api.get(`${API_URL}cpm/`, { params: { project_id: projectId } });
+    return response.data;
+};
+
+// Change one bar's calendar_days/_startDay and get back only the activities whose CPM values changed
+export const updateScheduleItemTiming = async (containerId, itemId, changes, revision = null) => {
+    const headers = revision != null ? { "If-Match": scheduleEtag(containerId, revision) } : {};
+    const response = await api.patch(`${API_URL}${containerId}/cpm/`, { id: itemId, ...changes }, { headers });
+    return response.data;
+};
+
+// Ranked crew/parallel proposals (item before/after diffs) that bring the schedule down to targetDays
+export const proposeScheduleCompression = async (projectId, targetDays, options = {}) => {
+    const { crewBounds, strategies, timeBudget } = options;
+    const response = await api.post(`${API_URL}compress/`, {
+        project_id: projectId,
+        target_days: targetDays,
+        crew_bounds: crewBounds,
+        strategies,
+        time_budget: timeBudget
+    });
+    return response.data;
+};
+
+// Daily headcount (total / per main_category); level=true adds a leveled curve and the start shifts it used
+export const fetchCrewHistogram = async (projectId, options = {}) => {
+    const { level = false, crewLimit } = options;
+    const response = await api.get(`${API_URL}crew-histogram/`, {
+        params: { project_id: projectId, level: level ? 1 : undefined, crew_limit: crewLimit }
+    });
+    return response.data;
+};
+
+// Owned projects with their schedule summary (total/CP days, finish date, per-category days), paginated
+export const fetchSchedulePortfolio = async (options = {}) => {
+    const { page, pageSize } = options;
+    const response = await api.get(`${API_URL}portfolio/`, {
+        params: { page, page_size: pageSize }
+    });
+    return response.data;
+};
+
 export const exportScheduleExcel = async (projectId, options = {}) => {
     const { dateScale } = options;
     return api.get("/cpe-all/schedule-item/export-excel/", {
@@ -87,6 +150,21 @@ export const exportScheduleReport = async (projectId) => {
     });
 };
 
+// Background export: create a job, poll its status/progress, then download the stored file
+export const createExportJob = async (projectId, kind) => {
+    const response = await api.post(`${API_URL}export-jobs/`, { project_id: projectId, kind });
+    return response.data;
+};
+
+export const fetchExportJob = async (jobId) => {
+    const response = await api.get(`${API_URL}export-jobs/${jobId}/`);
+    return response.data;
+};
+
+export const downloadExportJob = async (jobId) => {
+    return api.get(`${API_URL}export-jobs/${jobId}/download/`, { responseType: "blob" });
+};
+
 // Legacy stubs (to avoid breaking imports immediately, but should be unused)
 export const createScheduleItem = async () => { throw new Error("Use saveScheduleData"); };
 export const updateScheduleItem = async () => { throw new Error("Use saveScheduleData"); };